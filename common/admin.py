@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Profile, Emoticon, UserEmoticon, DailyCheckIn, PointHistory, EmailVerification, KakaoUser, BlockedIP, LogFinding
+from .models import Profile, Emoticon, UserEmoticon, DailyCheckIn, PointHistory, EmailVerification, KakaoUser, BlockedIP, LogFinding, OutboundEmail
 
 
 @admin.register(LogFinding)
@@ -82,3 +82,12 @@ class BlockedIPAdmin(admin.ModelAdmin):
     list_filter = ['is_active', 'created_at']
     search_fields = ['ip_address', 'reason']
     ordering = ['-created_at']
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['subject', 'last_error']
+    ordering = ['-created_at']
+    exclude = ['body', 'html_body']  # 인증 코드·임시 비밀번호가 든 본문은 관리자 화면에 표시하지 않음
@@ -0,0 +1,447 @@
+"""
+캐시 백엔드
+
+- InstrumentedLocMemCache: Django LocMemCache 의 get 결과로 hit/miss 를 세어
+  common.services.metrics 의 cache_requests_total 에 기록
+  (get_many·get_or_set 도 내부적으로 get 을 거치므로 함께 집계)
+- SharedMemoryCache: /dev/shm 의 메모리 맵 해시 테이블. 한 호스트의 모든 gunicorn 워커가
+  같은 캐시를 보므로 이메일 인증 쿨다운·차단 IP·레이트 리밋 키가 워커마다 달라지지 않고,
+  max_requests 로 워커가 재시작돼도 캐시가 비지 않음
+
+SharedMemoryCache 구조:
+    [헤더 4KB: 매직·크기 클래스 표] [클래스 0 슬롯들] [클래스 1 슬롯들] ...
+    - 크기 클래스마다 고정 크기 슬롯을 WAYS 개씩 묶은 집합(set-associative) —
+      키 해시로 집합을 고르고, 그 안에서만 찾고 교체하므로 탐색·퇴출이 O(WAYS)
+    - 슬롯: 상태·키 길이·값 길이·만료 시각·마지막 접근(monotonic ns)·키 해시 + 키 + pickle 값
+    - 퇴출: 빈 슬롯 → 만료된 슬롯 → 집합 안에서 가장 오래 안 쓴 슬롯 (집합 단위 LRU)
+    - 잠금: 키 해시로 고른 스트라이프마다 스레드 락 + fcntl 바이트 범위 잠금 (프로세스 간)
+      모든 클래스의 집합 수가 LOCK_STRIPES 의 배수여야 함 — 그래야 h % 집합 수 로 고른 집합이
+      어느 클래스에서든 h % LOCK_STRIPES 스트라이프 하나에만 속해, 한 키가 훑는 모든 집합을
+      그 스트라이프 잠금이 보호함 (배수가 아니면 ImproperlyConfigured)
+    - 백업 파일은 현재 사용자 소유·0600 이어야 사용 (아니면 프로세스 전용 메모리로 대체)
+    - 레이아웃이 바뀌면(배포로 설정·MAGIC 변경) 새 파일을 임시 이름으로 만들어 os.replace 로 바꿔 끼움 —
+      제자리에서 줄이면 아직 옛 파일을 매핑한 프로세스가 SIGBUS 로 죽으므로, 옛 매핑은 그 프로세스가
+      재시작할 때까지 (이름 없는) 옛 파일을 계속 씀
+    - 가장 큰 슬롯보다 큰 값은 저장하지 않음 (memcached 의 항목 크기 제한과 같은 동작)
+    - 파일을 열 수 없거나 fcntl 이 없는 환경(Windows)에서는 프로세스 전용 익명 메모리로 동작
+"""
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import stat
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.cache.backends.locmem import LocMemCache
+
+from common.services import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class InstrumentedLocMemCache(LocMemCache):
+    """hit/miss 를 세는 LocMemCache (라벨 cache=LOCATION)"""
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self._metrics_name = name
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            metrics.CACHE_REQUESTS.inc(cache=self._metrics_name, result='miss')
+            return default
+        metrics.CACHE_REQUESTS.inc(cache=self._metrics_name, result='hit')
+        return value
+
+
+# ---------------------------------------------------------------------- #
+#  공유 메모리 캐시
+# ---------------------------------------------------------------------- #
+MAGIC = b'TCSHMC02'
+HEADER_SIZE = 4096
+WAYS = 8
+LOCK_STRIPES = 64
+# (슬롯 크기, 집합 수) — 슬롯 수는 집합 수 × WAYS, 집합 수는 LOCK_STRIPES 의 배수. 기본 약 44MB, 약 1만 항목
+DEFAULT_SLOT_CLASSES = ((512, 1024), (4096, 256), (65536, 64))
+
+_HEADER = struct.Struct('<8sII')    # 매직, 클래스 수, 잠금 스트라이프 수
+_CLASS = struct.Struct('<II')
+_SLOT = struct.Struct('<BxHIdQQ')    # 상태, 키 길이, 값 길이, 만료(epoch, 0=영구), 접근(ns), 키 해시
+_STAMP = struct.Struct('<Q')
+_STAMP_OFFSET = 16
+_EMPTY, _USED = 0, 1
+
+
+def default_location():
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'techchang-cache')
+
+
+class SharedMemoryCache(BaseCache):
+    """
+    호스트 공유 메모리 캐시
+
+    settings 예시:
+        'BACKEND': 'common.cache_backends.SharedMemoryCache',
+        'LOCATION': '/dev/shm/techchang-cache',
+        'OPTIONS': {'SLOT_CLASSES': [(512, 1024), (4096, 256), (65536, 64)], 'LOCK_STRIPES': 64},
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._path = location or default_location()
+        classes = sorted(tuple(c) for c in options.get('SLOT_CLASSES', DEFAULT_SLOT_CLASSES))
+        self._stripes = options.get('LOCK_STRIPES', LOCK_STRIPES)
+        misaligned = [c for c in classes if c[1] % self._stripes]
+        if misaligned:
+            raise ImproperlyConfigured(
+                f'SharedMemoryCache SLOT_CLASSES set counts must be multiples of LOCK_STRIPES '
+                f'({self._stripes}): {misaligned}'
+            )
+        self._classes = []   # (시작 오프셋, 슬롯 크기, 집합 수)
+        offset = HEADER_SIZE
+        for slot_size, sets in classes:
+            self._classes.append((offset, slot_size, sets))
+            offset += slot_size * sets * WAYS
+        self._size = offset
+        self._max_item = classes[-1][0] - _SLOT.size
+        self._layout = _HEADER.pack(MAGIC, len(classes), self._stripes) + b''.join(_CLASS.pack(*c) for c in classes)
+        self._mm = None
+        self._fd = None
+        self._pid = None
+        self._open_lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    #  파일·잠금
+    # ------------------------------------------------------------------ #
+    def _open(self):
+        """처음 쓸 때 매핑 (레이아웃이 다르면 — 설정 변경 — 새 파일로 교체)"""
+        with self._open_lock:
+            if self._mm is not None:
+                return
+            if fcntl is not None:
+                try:
+                    fd = self._open_current()
+                    try:
+                        self._mm = mmap.mmap(fd, self._size)
+                    except OSError:
+                        os.close(fd)
+                        raise
+                    self._fd = fd
+                except OSError:
+                    logger.warning(f'Shared cache {self._path} unavailable, using process-local memory', exc_info=True)
+            if self._mm is None:
+                self._mm = mmap.mmap(-1, self._size)
+            self._reset_locks()
+
+    def _open_current(self):
+        """레이아웃이 맞는 현재 파일의 fd (flock 을 기다리는 동안 다른 프로세스가 교체했으면 다시 엶)"""
+        while True:
+            fd = os.open(self._path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+            try:
+                self._check_owner(fd)
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                st = os.fstat(fd)
+                if st.st_ino != os.stat(self._path, follow_symlinks=False).st_ino:
+                    os.close(fd)  # 이미 교체된 옛 파일
+                    continue
+                if st.st_size == self._size and os.pread(fd, len(self._layout), 0) == self._layout:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                    return fd
+                self._replace_file()
+                os.close(fd)  # 옛 파일의 flock 도 함께 풀림 — 기다리던 프로세스는 교체를 보고 다시 엶
+            except OSError:
+                os.close(fd)
+                raise
+
+    def _replace_file(self):
+        """새 레이아웃 파일을 임시 이름으로 만든 뒤 원자적으로 바꿔 끼움 (옛 파일은 건드리지 않음)"""
+        directory, name = os.path.split(self._path)
+        tmp_fd, tmp_path = tempfile.mkstemp(prefix=f'.{name}.', dir=directory)
+        try:
+            os.ftruncate(tmp_fd, self._size)
+            os.pwrite(tmp_fd, self._layout, 0)
+            os.replace(tmp_path, self._path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+        finally:
+            os.close(tmp_fd)
+
+    def _check_owner(self, fd):
+        """다른 사용자가 미리 만들어 둔 파일(세션·값을 읽거나 바꿀 수 있음)은 쓰지 않음"""
+        st = os.fstat(fd)
+        if st.st_uid != os.geteuid() or stat.S_IMODE(st.st_mode) != 0o600:
+            raise PermissionError(
+                f'{self._path} must be owned by uid {os.geteuid()} with mode 0600 '
+                f'(uid {st.st_uid}, mode {stat.S_IMODE(st.st_mode):o})'
+            )
+
+    def _reset_locks(self):
+        self._locks = [threading.Lock() for _ in range(self._stripes)]
+        self._pid = os.getpid()
+
+    @contextmanager
+    def _locked(self, stripe):
+        if self._mm is None:
+            self._open()
+        if self._pid != os.getpid():  # fork 된 워커: 부모가 잡고 있던 스레드 락을 물려받지 않게
+            self._reset_locks()
+        with self._locks[stripe]:
+            if self._fd is None:
+                yield
+                return
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, stripe)
+
+    # ------------------------------------------------------------------ #
+    #  슬롯
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _hash(key_bytes):
+        return int.from_bytes(hashlib.blake2b(key_bytes, digest_size=8).digest(), 'little')
+
+    def _bucket(self, cls, h):
+        base, slot_size, sets = cls
+        start = base + (h % sets) * WAYS * slot_size
+        return [start + way * slot_size for way in range(WAYS)]
+
+    def _find(self, h, key_bytes, now):
+        """
+        키가 든 슬롯 (오프셋, 값 길이) — 만료된 슬롯은 비우고 None
+
+        h % LOCK_STRIPES 스트라이프 잠금 안에서 호출. 집합 수가 스트라이프 수의 배수라
+        여기서 훑는 각 클래스의 집합이 모두 그 스트라이프에 속한다.
+        """
+        mm = self._mm
+        for cls in self._classes:
+            for off in self._bucket(cls, h):
+                state, klen, vlen, expires, _, kh = _SLOT.unpack_from(mm, off)
+                if state != _USED or kh != h or mm[off + _SLOT.size:off + _SLOT.size + klen] != key_bytes:
+                    continue
+                if expires and expires <= now:
+                    mm[off] = _EMPTY
+                    return None
+                return off, klen, vlen
+        return None
+
+    def _read(self, off, klen, vlen):
+        start = off + _SLOT.size + klen
+        _STAMP.pack_into(self._mm, off + _STAMP_OFFSET, time.monotonic_ns())
+        return self._mm[start:start + vlen]
+
+    def _victim(self, cls, h, now):
+        oldest = oldest_stamp = None
+        for off in self._bucket(cls, h):
+            state, _, _, expires, stamp, _ = _SLOT.unpack_from(self._mm, off)
+            if state != _USED or (expires and expires <= now):
+                return off
+            if oldest is None or stamp < oldest_stamp:
+                oldest, oldest_stamp = off, stamp
+        return oldest
+
+    def _write(self, h, key_bytes, payload, expires, now):
+        """잠금 안에서 호출. 크기에 맞는 클래스에 쓰고 다른 클래스의 옛 값은 지움"""
+        need = _SLOT.size + len(key_bytes) + len(payload)
+        found = self._find(h, key_bytes, now)
+        cls = next((c for c in self._classes if c[1] >= need), None)
+        if found and (cls is None or not self._in_class(found[0], cls)):
+            self._mm[found[0]] = _EMPTY
+            found = None
+        if cls is None:
+            return False
+        off = found[0] if found else self._victim(cls, h, now)
+        start = off + _SLOT.size
+        self._mm[start:start + len(key_bytes)] = key_bytes
+        self._mm[start + len(key_bytes):start + len(key_bytes) + len(payload)] = payload
+        _SLOT.pack_into(self._mm, off, _USED, len(key_bytes), len(payload), expires, time.monotonic_ns(), h)
+        return True
+
+    @staticmethod
+    def _in_class(off, cls):
+        base, slot_size, sets = cls
+        return base <= off < base + slot_size * sets * WAYS
+
+    def _expiry(self, timeout):
+        expiry = self.get_backend_timeout(timeout)
+        return 0.0 if expiry is None else expiry
+
+    def _key(self, key, version):
+        key_bytes = self.make_and_validate_key(key, version=version).encode('utf-8')
+        h = self._hash(key_bytes)
+        return key_bytes, h, h % self._stripes
+
+    def _record(self, hits, misses):
+        """hit/miss 집계 훅 (InstrumentedSharedMemoryCache 에서 지표 기록)"""
+
+    # ------------------------------------------------------------------ #
+    #  캐시 API
+    # ------------------------------------------------------------------ #
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key_bytes, h, stripe = self._key(key, version)
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._locked(stripe):
+            now = time.time()
+            if self._find(h, key_bytes, now):
+                return False
+            return self._write(h, key_bytes, payload, self._expiry(timeout), now)
+
+    def get(self, key, default=None, version=None):
+        key_bytes, h, stripe = self._key(key, version)
+        with self._locked(stripe):
+            found = self._find(h, key_bytes, time.time())
+            payload = self._read(*found) if found else None
+        self._record(1 if found else 0, 0 if found else 1)
+        return default if payload is None else pickle.loads(payload)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key_bytes, h, stripe = self._key(key, version)
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(key_bytes) + len(payload) > self._max_item:
+            self.delete(key, version=version)
+            return
+        with self._locked(stripe):
+            self._write(h, key_bytes, payload, self._expiry(timeout), time.time())
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key_bytes, h, stripe = self._key(key, version)
+        with self._locked(stripe):
+            found = self._find(h, key_bytes, time.time())
+            if not found:
+                return False
+            struct.pack_into('<d', self._mm, found[0] + 8, self._expiry(timeout))
+            return True
+
+    def delete(self, key, version=None):
+        key_bytes, h, stripe = self._key(key, version)
+        with self._locked(stripe):
+            found = self._find(h, key_bytes, time.time())
+            if found:
+                self._mm[found[0]] = _EMPTY
+            return bool(found)
+
+    def has_key(self, key, version=None):
+        key_bytes, h, stripe = self._key(key, version)
+        with self._locked(stripe):
+            return self._find(h, key_bytes, time.time()) is not None
+
+    def incr(self, key, delta=1, version=None):
+        """원자적 증가 (값을 읽고 쓰는 동안 같은 스트라이프 잠금 유지, 남은 TTL 유지)"""
+        key_bytes, h, stripe = self._key(key, version)
+        with self._locked(stripe):
+            now = time.time()
+            found = self._find(h, key_bytes, now)
+            if not found:
+                raise ValueError(f"Key '{key}' not found")
+            expires = struct.unpack_from('<d', self._mm, found[0] + 8)[0]
+            value = pickle.loads(self._read(*found)) + delta
+            self._write(h, key_bytes, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires, now)
+        return value
+
+    def _grouped(self, keys, version):
+        """키들을 스트라이프별로 묶음 → 스트라이프마다 잠금 한 번"""
+        groups = {}
+        for key in keys:
+            key_bytes, h, stripe = self._key(key, version)
+            groups.setdefault(stripe, []).append((key, key_bytes, h))
+        return groups
+
+    def get_many(self, keys, version=None):
+        payloads = {}
+        for stripe, items in self._grouped(keys, version).items():
+            with self._locked(stripe):
+                now = time.time()
+                for key, key_bytes, h in items:
+                    found = self._find(h, key_bytes, now)
+                    if found:
+                        payloads[key] = self._read(*found)
+        self._record(len(payloads), len(keys) - len(payloads))
+        return {key: pickle.loads(payload) for key, payload in payloads.items()}
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self._expiry(timeout)
+        payloads = {key: pickle.dumps(value, pickle.HIGHEST_PROTOCOL) for key, value in data.items()}
+        failed = []
+        for stripe, items in self._grouped(list(data), version).items():
+            with self._locked(stripe):
+                now = time.time()
+                for key, key_bytes, h in items:
+                    if not self._write(h, key_bytes, payloads[key], expires, now):
+                        found = self._find(h, key_bytes, now)
+                        if found:
+                            self._mm[found[0]] = _EMPTY
+                        failed.append(key)
+        return failed
+
+    def delete_many(self, keys, version=None):
+        for stripe, items in self._grouped(keys, version).items():
+            with self._locked(stripe):
+                now = time.time()
+                for _, key_bytes, h in items:
+                    found = self._find(h, key_bytes, now)
+                    if found:
+                        self._mm[found[0]] = _EMPTY
+
+    def clear(self):
+        """모든 슬롯 비우기 (전체 스트라이프 잠금)"""
+        if self._mm is None:
+            self._open()
+        with self._all_locked():
+            for base, slot_size, sets in self._classes:
+                for off in range(base, base + slot_size * sets * WAYS, slot_size):
+                    self._mm[off] = _EMPTY
+
+    @contextmanager
+    def _all_locked(self, stripe=0):
+        if stripe == self._stripes:
+            yield
+            return
+        with self._locked(stripe), self._all_locked(stripe + 1):
+            yield
+
+    def stats(self):
+        """클래스별 사용 슬롯 수 (벤치마크·점검용)"""
+        if self._mm is None:
+            self._open()
+        now = time.time()
+        result = []
+        for base, slot_size, sets in self._classes:
+            used = 0
+            for off in range(base, base + slot_size * sets * WAYS, slot_size):
+                state, _, _, expires, _, _ = _SLOT.unpack_from(self._mm, off)
+                used += state == _USED and not (expires and expires <= now)
+            result.append({'slot_size': slot_size, 'slots': sets * WAYS, 'used': used})
+        return result
+
+
+class InstrumentedSharedMemoryCache(SharedMemoryCache):
+    """hit/miss 를 세는 SharedMemoryCache (라벨 cache=LOCATION 파일 이름)"""
+
+    def __init__(self, location, params):
+        super().__init__(location, params)
+        self._metrics_name = os.path.basename(self._path)
+
+    def _record(self, hits, misses):
+        if hits:
+            metrics.CACHE_REQUESTS.inc(hits, cache=self._metrics_name, result='hit')
+        if misses:
+            metrics.CACHE_REQUESTS.inc(misses, cache=self._metrics_name, result='miss')
@@ -7,6 +7,10 @@ HRD / 데이터분석 / 프로그래밍 트렌드 칼럼 자동 작성 커맨드
   python manage.py auto_write_columns --topic data      # 데이터분석만
   python manage.py auto_write_columns --topic coding    # 프로그래밍만
   python manage.py auto_write_columns --dry-run         # 실제 게시 없이 콘솔 출력
+  python manage.py auto_write_columns --concurrency 1   # 주제를 하나씩 차례로 생성
+
+여러 주제는 동시에 생성하고(common.services.generation), 완료된 칼럼은 체크포인트에 남겨
+중간에 실패해도 다시 실행하면 실패한 주제만 새로 생성합니다. 게시는 한 트랜잭션으로 일괄 저장.
 
 서버 cron (매주 화/목 오전 10시, 각 1개 주제):
   0 10 * * 2  .../python manage.py auto_write_columns --topic hrd
@@ -21,8 +25,11 @@ from datetime import datetime
 
 from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 
+from common.services import generation
+
 BOT_USERNAME = 'techchang연구팀'
 BOT_DISPLAY_NAME = '테크창 연구팀'
 
@@ -186,9 +193,13 @@ def _recent_subjects(topic_key: str, limit: int = 20) -> list:
     )
 
 
-def _generate_column(topic_key: str, recent_titles: list | None = None) -> dict:
-    """Claude Sonnet API를 호출해 칼럼을 생성하고 {subject, content}를 반환."""
-    from common.services.claude import ClaudeModel, ask
+def _generate_column(topic_key: str, recent_titles: list | None = None, cache: bool = False) -> dict:
+    """
+    Claude Sonnet API를 호출해 칼럼을 생성하고 {subject, content}를 반환.
+
+    cache: 같은 실행에서 칼럼을 2개 이상 만들 때만 True (한 건이면 캐시 쓰기 할증만 붙음)
+    """
+    from common.services.claude import ClaudeModel, ask, system_blocks
 
     topic = TOPICS[topic_key]
     today_str = datetime.now().strftime('%Y년 %m월 %d일')
@@ -203,19 +214,20 @@ def _generate_column(topic_key: str, recent_titles: list | None = None) -> dict:
             f'{joined}\n'
         )
 
+    # 바뀌는 내용(날짜·회피 목록)만 사용자 메시지에 — 고정 지침은 system 접두어로 프롬프트 캐시
     user_prompt = (
         f'오늘 날짜: {today_str}\n'
         f'담당 분야: {topic["topic_hint"]}\n'
         f'독자: {topic["audience"]}\n\n'
         f'위 분야에서 현재 가장 주목받고 있는 트렌드나 이슈 하나를 선정하여 '
-        f'아래 형식에 맞게 전문 칼럼을 작성해 주세요.'
-        f'{avoid_block}\n'
-        f'{COLUMN_STRUCTURE}'
+        f'시스템 지침의 칼럼 구조에 맞게 전문 칼럼을 작성해 주세요.'
+        f'{avoid_block}'
     )
 
     raw_content = ask(
         user_prompt,
-        system=topic['system_prompt'],
+        # 모든 주제가 공유하는 칼럼 구조 → 주제별 역할 순서 (앞 블록은 주제가 달라도 캐시 적중)
+        system=system_blocks(COLUMN_STRUCTURE.strip(), topic['system_prompt'], cache=cache),
         model=ClaudeModel.SONNET,
         max_tokens=3000,
     )
@@ -239,6 +251,12 @@ class Command(BaseCommand):
             action='store_true',
             help='실제 게시 없이 생성된 칼럼을 콘솔에만 출력',
         )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=generation.DEFAULT_CONCURRENCY,
+            help=f'동시에 생성할 주제 수 (기본: {generation.DEFAULT_CONCURRENCY}, 전체 호출 수는 CLAUDE_MAX_CONCURRENCY 로 제한)',
+        )
 
     def handle(self, *args, **options):
         from community.models import Category, Question
@@ -251,57 +269,78 @@ class Command(BaseCommand):
         if dry_run:
             self.stdout.write(self.style.WARNING('[DRY-RUN] 실제 게시는 하지 않습니다.\n'))
 
-        bot_user = None if dry_run else _get_or_create_bot_user()
-
+        categories = {c.name: c for c in Category.objects.filter(
+            name__in=[TOPICS[key]['category_name'] for key in target_keys])}
+        jobs = []
         for key in target_keys:
             topic = TOPICS[key]
-            label = topic['label']
-            self.stdout.write(f'[{datetime.now():%H:%M:%S}] {label} 칼럼 생성 중 (claude-sonnet-4-6)...')
-
+            if not dry_run and topic['category_name'] not in categories:
+                self.stderr.write(
+                    self.style.ERROR(
+                        f"  카테고리 '{topic['category_name']}' 를 DB에서 찾을 수 없습니다. "
+                        'python manage.py loaddata community/fixtures/categories.json 을 실행하세요.'
+                    )
+                )
+                continue
+            # DB 조회는 여기서 끝내고, 작업 스레드는 Claude 호출만 한다
             recent_titles = _recent_subjects(key)
             if recent_titles:
-                self.stdout.write(f'  이미 다룬 주제 {len(recent_titles)}건 회피 적용')
-
-            try:
-                result = _generate_column(key, recent_titles)
-            except Exception as exc:
-                self.stderr.write(self.style.ERROR(f'  오류: {exc}'))
+                self.stdout.write(f'  {topic["label"]}: 이미 다룬 주제 {len(recent_titles)}건 회피 적용')
+            jobs.append((key, (key, recent_titles)))
+
+        self.stdout.write(f'[{datetime.now():%H:%M:%S}] 칼럼 {len(jobs)}개 생성 중 '
+                          f'(claude-sonnet-4-6, 동시 {options["concurrency"]}개)...')
+        checkpoint = None if dry_run else generation.Checkpoint('columns')
+        # 공통 칼럼 구조는 같은 실행의 다른 주제가 캐시에서 읽을 때만 이득 (한 주제만 돌면 캐시 쓰기 할증뿐)
+        cache = len(jobs) > 1
+        results = {}
+        for key, result, error, reused in generation.run(
+            jobs, lambda args: _generate_column(*args, cache=cache),
+            concurrency=options['concurrency'], checkpoint=checkpoint, warm=cache,
+        ):
+            label = TOPICS[key]['label']
+            if error is not None:
+                self.stderr.write(self.style.ERROR(f'  {label} 오류: {error}'))
                 continue
-
-            subject = result['subject']
-            content = result['content']
-
-            self.stdout.write(f'  제목: {subject}')
-            self.stdout.write(f'  분량: {len(content)}자')
-
+            results[key] = result
+            self.stdout.write(f'  {label}{" (체크포인트)" if reused else ""} — 제목: {result["subject"]}, '
+                              f'분량: {len(result["content"])}자')
             if dry_run:
                 sep = '=' * 60
                 self.stdout.write(sep)
-                self.stdout.write(textwrap.shorten(content, width=600, placeholder=' ...'))
+                self.stdout.write(textwrap.shorten(result['content'], width=600, placeholder=' ...'))
                 self.stdout.write(sep + '\n')
-                continue
 
-            try:
-                category = Category.objects.get(name=topic['category_name'])
-            except Category.DoesNotExist:
-                self.stderr.write(
-                    self.style.ERROR(
-                        f"  카테고리 '{topic['category_name']}' 를 DB에서 찾을 수 없습니다. "
-                        'python manage.py loaddata community/fixtures/categories.json 을 실행하세요.'
-                    )
-                )
+        if dry_run or not results:
+            self.stdout.write(self.style.SUCCESS('\n자동 칼럼 작성 완료.'))
+            return
+
+        bot_user = _get_or_create_bot_user()
+        # 게시 직후 체크포인트를 지우기 전에 죽었다면 재실행 때 같은 제목이 이미 있으므로 건너뜀
+        existing = set(Question.objects.filter(
+            author=bot_user, subject__in=[r['subject'] for r in results.values()],
+        ).values_list('category__name', 'subject'))
+        now = timezone.now()
+        rows, published = [], []
+        for key in target_keys:
+            result = results.get(key)
+            if result is None:
                 continue
-
-            question = Question.objects.create(
-                author=bot_user,
-                subject=subject,
-                content=content,
-                create_date=timezone.now(),
-                category=category,
-            )
+            category_name = TOPICS[key]['category_name']
+            if (category_name, result['subject']) not in existing:
+                rows.append(Question(
+                    author=bot_user, subject=result['subject'], content=result['content'],
+                    create_date=now, category=categories[category_name],
+                ))
+            published.append(key)
+        with transaction.atomic():
+            Question.objects.bulk_create(rows)
+        checkpoint.discard(published)
+
+        for question in rows:
             self.stdout.write(
                 self.style.SUCCESS(
-                    f'  게시 완료 [{topic["category_name"]}] {subject} (id={question.pk})'
+                    f'  게시 완료 [{question.category.name}] {question.subject} (id={question.pk})'
                 )
             )
 
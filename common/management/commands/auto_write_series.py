@@ -7,8 +7,13 @@
 사용법:
   python manage.py auto_write_series                    # 다음 미발행 회차 1개 발행
   python manage.py auto_write_series --series django    # 특정 시리즈 지정
-  python manage.py auto_write_series --episode 3        # 특정 회차 강제 (재작성/보충)
+  python manage.py auto_write_series --episode 3        # 특정 회차 강제 (이미 발행된 회차면 새로 써서 교체, 아니면 보충)
   python manage.py auto_write_series --dry-run          # 게시 없이 콘솔 출력
+  python manage.py auto_write_series --count 3          # 다음 미발행 회차 3개를 동시에 생성해 한 번에 발행
+
+여러 회차는 동시에 생성하고(common.services.generation), 완료된 회차는 체크포인트에 남겨
+중간에 실패해도 다시 실행하면 실패한 회차만 새로 생성합니다. 발행은 한 트랜잭션으로 일괄 저장하며,
+앞 회차가 하나라도 실패하면 뒤 회차는 체크포인트에만 두고 발행하지 않습니다 (회차 순서 유지).
 
 서버 cron (격주 월요일 오전 10시 예시 — 홀수 주만 실행하도록 주 번호로 게이팅):
   0 10 * * 1  [ $(( ($(date +\%s) / 604800) \% 2 )) -eq 0 ] && .../python manage.py auto_write_series
@@ -21,8 +26,11 @@ from datetime import datetime
 
 from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 
+from common.services import generation
+
 BOT_USERNAME = 'techchang연구팀'
 
 # ────────────────────────────────────────────────────────────
@@ -149,12 +157,13 @@ TITLE: [회차 제목 - 아래 지정 제목을 그대로 사용하거나 자연
 8. 마지막 구분선 + 서명
    ```
    ---
-   *📚 시리즈: {series_title} · {episode_label}*
+   *📚 시리즈: {series_title} · [회차 표기]*
    *테크창 연구팀 | 인천대학교 창의인재개발학과 전공심화연구모임*
    *본 칼럼은 AI 보조로 작성되었으며, 코드·예시는 학습용입니다.*
    ```
 
 추가 지침:
+- 서명의 [회차 표기]는 사용자 메시지에 주어진 회차 표기로 바꿔 쓸 것
 - 전체 분량: 본문 기준 1,400~1,900자 (단편 칼럼보다 조금 길고 풍부하게)
 - `#` H1 헤더 금지 (제목은 TITLE: 라인에만)
 - 반말 금지, 존댓말 일관. 다만 딱딱하지 않고 친근하게.
@@ -195,15 +204,22 @@ def _parse_output(raw: str) -> tuple:
     return title or '연재 칼럼', body
 
 
-def _previous_summaries(series_obj, limit: int = 4) -> str:
-    """직전 회차들의 제목 + 앞부분을 요약 블록으로 만들어 연속성 컨텍스트 제공."""
-    episodes = list(series_obj.published_episodes)[-limit:]
-    if not episodes:
+def _previous_summaries(series_obj, before: int, pending: list | None = None, limit: int = 4) -> str:
+    """
+    직전 회차들의 제목 + 앞부분을 요약 블록으로 만들어 연속성 컨텍스트 제공.
+    before: 이 번호보다 앞 회차만 (재작성할 회차·그 뒤 회차는 넣지 않음)
+    pending: 같은 배치에서 함께 생성 중인 앞 회차 목차 (본문이 아직 없으므로 핵심 개념으로 대신)
+    """
+    episodes = list(series_obj.published_episodes.filter(episode_number__lt=before))[-limit:]
+    pending = (pending or [])[-limit:]
+    if not episodes and not pending:
         return ''
     parts = []
     for ep in episodes:
         snippet = textwrap.shorten(ep.content.replace('\n', ' '), width=220, placeholder=' …')
         parts.append(f'- {ep.episode_number}편 「{ep.subject}」: {snippet}')
+    for outline in pending:
+        parts.append(f'- {outline["no"]}편 「{outline["title"]}」: {outline["focus"]}')
     return (
         '\n\n**[이전 회차 요약 - 반드시 이어지도록 작성하세요]**\n'
         '아래는 지금까지 발행한 회차입니다. "지난 이야기" 섹션에서 자연스럽게 이어받고, '
@@ -211,28 +227,33 @@ def _previous_summaries(series_obj, limit: int = 4) -> str:
     )
 
 
-def _generate_episode(series_key: str, series_obj, outline: dict) -> dict:
-    from common.services.claude import ClaudeModel, ask
+def _generate_episode(series_key: str, outline: dict, previous: str, cache: bool = False) -> dict:
+    """
+    previous: _previous_summaries() 결과 (작업 스레드에서 DB 를 읽지 않도록 미리 만들어 넘김)
+    cache: 같은 실행에서 회차를 2개 이상 만들 때만 True (한 회차면 캐시 쓰기 할증만 붙음)
+    """
+    from common.services.claude import ClaudeModel, ask, system_blocks
 
     cfg = SERIES[series_key]
     no = outline['no']
     total = len(OUTLINES[series_key]) - 1  # 0편 제외한 본편 최대 번호
     episode_label = '0편 · 오리엔테이션' if no == 0 else f'{no}편 (총 {total}편 중)'
 
-    structure = EPISODE_STRUCTURE.format(series_title=cfg['title'], episode_label=episode_label)
+    # 시리즈마다 고정인 역할·구조는 system 접두어(프롬프트 캐시), 회차별 내용만 사용자 메시지에
+    structure = EPISODE_STRUCTURE.format(series_title=cfg['title']).strip()
+    series_intro = f'시리즈: {cfg["title"]} — {cfg["subtitle"]}\n독자: {cfg["audience"]}'
 
     user_prompt = (
-        f'시리즈: {cfg["title"]} — {cfg["subtitle"]}\n'
-        f'독자: {cfg["audience"]}\n\n'
-        f'이번 회차: {no}편 「{outline["title"]}」\n'
+        f'이번 회차: {no}편 「{outline["title"]}」 (서명의 회차 표기: {episode_label})\n'
         f'이 회차가 통역할 핵심: {outline["focus"]}\n'
         f'출발점이 될 코드 소재: {outline["code_hook"]}\n'
         f'이 사이트에서 확인할 예제: {outline["site_demo"]}\n'
-        f'{_previous_summaries(series_obj)}'
-        f'\n위 내용으로 아래 형식에 맞춰 회차를 작성하세요.\n{structure}'
+        f'{previous}'
+        f'\n위 내용으로 시스템 지침의 회차 구조에 맞춰 회차를 작성하세요.'
     )
 
-    raw = ask(user_prompt, system=cfg['system_prompt'], model=ClaudeModel.SONNET, max_tokens=4000)
+    system = system_blocks(f'{cfg["system_prompt"]}\n\n{series_intro}\n{structure}', cache=cache)
+    raw = ask(user_prompt, system=system, model=ClaudeModel.SONNET, max_tokens=4000)
     subject, body = _parse_output(raw.strip())
     return {'subject': subject, 'content': body}
 
@@ -244,7 +265,11 @@ class Command(BaseCommand):
         parser.add_argument('--series', choices=list(SERIES.keys()), default='django',
                             help='발행할 시리즈 키 (기본: django)')
         parser.add_argument('--episode', type=int, default=None,
-                            help='특정 회차 강제 지정 (기본: 다음 미발행 회차)')
+                            help='특정 회차 강제 지정 — 이미 발행된 회차는 다시 써서 교체 (기본: 다음 미발행 회차)')
+        parser.add_argument('--count', type=int, default=1,
+                            help='이어서 생성·발행할 회차 수 (기본: 1)')
+        parser.add_argument('--concurrency', type=int, default=generation.DEFAULT_CONCURRENCY,
+                            help=f'동시에 생성할 회차 수 (기본: {generation.DEFAULT_CONCURRENCY})')
         parser.add_argument('--dry-run', action='store_true',
                             help='게시 없이 생성 결과만 콘솔 출력')
 
@@ -276,40 +301,85 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(f'시리즈 생성: {series_obj.title}'))
 
         # 발행할 회차 결정
-        target_no = options['episode'] if options['episode'] is not None else series_obj.next_episode_number
-        outline = next((o for o in outlines if o['no'] == target_no), None)
-        if outline is None:
+        start_no = options['episode'] if options['episode'] is not None else series_obj.next_episode_number
+        targets = [o for o in outlines if start_no <= o['no'] < start_no + max(1, options['count'])]
+        if not targets:
             self.stdout.write(self.style.SUCCESS(
-                f'발행할 회차가 없습니다. (요청 회차 {target_no} · 총 {len(outlines)}편 완결)'))
+                f'발행할 회차가 없습니다. (요청 회차 {start_no} · 총 {len(outlines)}편 완결)'))
             return
 
-        self.stdout.write(f'[{datetime.now():%H:%M:%S}] {target_no}편 「{outline["title"]}」 생성 중...')
+        # --episode 로 이미 발행된 회차를 지정하면 새로 써서 기존 글(id·댓글 유지)을 교체
+        published = {q.episode_number: q for q in series_obj.published_episodes.filter(
+            episode_number__in=[o['no'] for o in targets])}
+        for no in sorted(published):
+            self.stdout.write(self.style.WARNING(f'  {no}편은 이미 발행됨 — 새로 작성해 기존 글을 교체합니다.'))
+
+        jobs = [(str(o['no']), o) for o in targets]
+        previous = {
+            o['no']: _previous_summaries(series_obj, start_no, [p for p in targets if p['no'] < o['no']])
+            for o in targets
+        }
+        self.stdout.write(f'[{datetime.now():%H:%M:%S}] '
+                          + ', '.join(f'{o["no"]}편 「{o["title"]}」' for o in targets) + ' 생성 중...')
+
+        checkpoint = None if dry_run else generation.Checkpoint(f'series-{cfg["slug"]}')
+        if checkpoint and published:
+            # 이미 발행된 내용과 같은 체크포인트(게시 직후 죽어 남은 것)를 재사용하면 재작성이 되지 않음
+            saved = checkpoint.load()
+            checkpoint.discard(str(no) for no, question in published.items()
+                               if saved.get(str(no), {}).get('subject') == question.subject)
+        # cron 은 회차 하나씩 돌므로 --count 2 이상일 때만 시스템 접두어를 캐시
+        cache = len(jobs) > 1
+        results = {}
+        for job_key, result, error, reused in generation.run(
+            jobs, lambda o: _generate_episode(key, o, previous[o['no']], cache=cache),
+            concurrency=options['concurrency'], checkpoint=checkpoint, warm=cache,
+        ):
+            if error is not None:
+                self.stderr.write(self.style.ERROR(f'  {job_key}편 오류: {error}'))
+                continue
+            results[int(job_key)] = result
+            self.stdout.write(f'  {job_key}편{" (체크포인트)" if reused else ""} — 제목: {result["subject"]}, '
+                              f'분량: {len(result["content"])}자')
+            if dry_run:
+                sep = '=' * 60
+                self.stdout.write(sep)
+                self.stdout.write(textwrap.shorten(result['content'], width=800, placeholder=' ...'))
+                self.stdout.write(sep + '\n')
 
-        try:
-            result = _generate_episode(key, series_obj, outline)
-        except Exception as exc:
-            self.stderr.write(self.style.ERROR(f'  오류: {exc}'))
+        if dry_run:
             return
 
-        self.stdout.write(f'  제목: {result["subject"]}')
-        self.stdout.write(f'  분량: {len(result["content"])}자')
-
-        if dry_run:
-            sep = '=' * 60
-            self.stdout.write(sep)
-            self.stdout.write(textwrap.shorten(result['content'], width=800, placeholder=' ...'))
-            self.stdout.write(sep + '\n')
+        # 회차 순서대로, 처음 실패한 회차 앞까지만 발행 (뒤 회차는 체크포인트에 남아 재실행 때 발행)
+        ready = []
+        for outline in targets:
+            if outline['no'] not in results:
+                break
+            ready.append(outline['no'])
+        if not ready:
             return
 
         bot_user = _get_or_create_bot_user()
-        question = Question.objects.create(
-            author=bot_user,
-            subject=result['subject'],
-            content=result['content'],
-            create_date=timezone.now(),
-            category=category,
-            series=series_obj,
-            episode_number=target_no,
-        )
-        self.stdout.write(self.style.SUCCESS(
-            f'  발행 완료 [{cfg["title"]}] {target_no}편 (id={question.pk})'))
+        now = timezone.now()
+        rows, rewritten = [], []
+        for no in ready:
+            question = published.get(no)
+            if question is None:
+                rows.append(Question(
+                    author=bot_user, subject=results[no]['subject'], content=results[no]['content'],
+                    create_date=now, category=category, series=series_obj, episode_number=no,
+                ))
+                continue
+            question.subject, question.content = results[no]['subject'], results[no]['content']
+            question.modify_date = now
+            rewritten.append(question)
+        with transaction.atomic():
+            Question.objects.bulk_create(rows)
+            Question.objects.bulk_update(rewritten, ['subject', 'content', 'modify_date'])
+        checkpoint.discard(str(no) for no in ready)
+        for question in rows:
+            self.stdout.write(self.style.SUCCESS(
+                f'  발행 완료 [{cfg["title"]}] {question.episode_number}편 (id={question.pk})'))
+        for question in rewritten:
+            self.stdout.write(self.style.SUCCESS(
+                f'  재작성 완료 [{cfg["title"]}] {question.episode_number}편 (id={question.pk})'))
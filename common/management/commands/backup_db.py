@@ -6,22 +6,27 @@ SQLite/MySQL DB 자동 백업 명령어
   python manage.py backup_db --keep 4                 # 최근 4개 보관
   python manage.py backup_db --dest /backups          # 저장 경로 지정
   python manage.py backup_db --email admin@example.com  # 백업 파일 이메일 전송
+  python manage.py backup_db --format gz              # SQLite: 조각 저장 대신 단일 .sqlite3.gz
+  python manage.py backup_db --restore backups/db_20250101_030000.manifest.json  # 조각 백업 복원
+
+SQLite 는 sqlite3 backup API 로 운영 중에도 일관된 스냅샷을 떠서 무결성 검사 후 저장한다
+(common.services.db_backup). 기본 chunks 형식은 바뀐 조각만 새로 저장하므로
+매일 백업을 여러 개 보관해도 디스크는 변경분만큼만 늘어난다.
 
 cron 예시:
   0 3 * * *   ... backup_db --keep 7          # 매일 로컬 백업
   0 3 * * 1   ... backup_db --keep 4 --email admin@example.com  # 주간 + 이메일
 """
-import gzip
-import os
-import shutil
 import subprocess
+import tempfile
 from datetime import datetime
 from pathlib import Path
 
 from django.conf import settings
-from django.core.mail import EmailMessage
 from django.core.management.base import BaseCommand
 
+from common.services import db_backup, mail_queue
+
 
 class Command(BaseCommand):
     help = 'DB를 타임스탬프 파일로 백업하고 오래된 백업을 삭제합니다.'
@@ -39,10 +44,22 @@ class Command(BaseCommand):
             '--email', type=str, default='',
             help='백업 파일을 이메일로 전송할 주소'
         )
+        parser.add_argument(
+            '--format', choices=['chunks', 'gz'], default='chunks',
+            help='SQLite 백업 형식 (chunks: 조각 중복 제거, gz: 단일 압축 파일)'
+        )
+        parser.add_argument(
+            '--restore', type=str, default='',
+            help='복원할 manifest 경로 (같은 폴더에 restored_<이름>.sqlite3 생성)'
+        )
 
     def handle(self, *args, **options):
+        if options['restore']:
+            return self._restore(Path(options['restore']))
+
         keep = options['keep']
         email_to = options['email']
+        self.format = options['format']
 
         # 백업 디렉토리
         backup_dir = Path(options['dest']) if options['dest'] else Path(settings.BASE_DIR) / 'backups'
@@ -61,9 +78,11 @@ class Command(BaseCommand):
             return
 
         size_kb = backup_file.stat().st_size // 1024
+        chunked = pattern.endswith(db_backup.MANIFEST_SUFFIX)
         self.stdout.write(
             self.style.SUCCESS(
-                f'[{datetime.now():%Y-%m-%d %H:%M}] 백업 완료: {backup_file.name} ({size_kb} KB)'
+                f'[{datetime.now():%Y-%m-%d %H:%M}] 백업 완료: {backup_file.name}'
+                + ('' if chunked else f' ({size_kb} KB)')
             )
         )
 
@@ -76,15 +95,28 @@ class Command(BaseCommand):
 
         if removed:
             self.stdout.write(f'오래된 백업 {removed}개 삭제 (최근 {keep}개 보관)')
+        if chunked:
+            pruned, freed = db_backup.prune_chunks(backup_dir)
+            self.stdout.write(
+                f'조각 저장소: {db_backup.store_size(backup_dir) // 1024} KB'
+                + (f' (미사용 조각 {pruned}개·{freed // 1024} KB 정리)' if pruned else '')
+            )
 
         self.stdout.write(f'현재 백업 수: {min(len(backups), keep)}개 → {backup_dir}')
 
-        # 이메일 전송
+        # 이메일 전송 (조각 백업은 첨부용 단일 압축 파일을 발송 큐 스풀에 만들고 발송 후 삭제)
         if email_to:
-            self._send_email(email_to, backup_file, size_kb)
+            if chunked:
+                with tempfile.TemporaryDirectory() as tmp:
+                    snapshot = db_backup.restore_chunks(backup_file, Path(tmp) / 'db.sqlite3')
+                    attachment = db_backup.compress_file(
+                        snapshot, mail_queue.spool_dir() / f'db_{timestamp}.sqlite3.gz')
+                self._send_email(email_to, attachment, attachment.stat().st_size // 1024, delete=True)
+            else:
+                self._send_email(email_to, backup_file, size_kb)
 
     def _backup_mysql(self, db_config, backup_dir, timestamp):
-        """mysqldump로 MySQL 백업 (gzip 압축)"""
+        """mysqldump 출력을 gzip 으로 스트리밍 저장 (덤프 전체를 메모리에 올리지 않음)"""
         backup_file = backup_dir / f'db_{timestamp}.sql.gz'
         name = db_config.get('NAME', '')
         user = db_config.get('USER', '')
@@ -105,32 +137,67 @@ class Command(BaseCommand):
         ]
 
         try:
-            result = subprocess.run(dump_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            if result.returncode != 0:
-                self.stderr.write(self.style.ERROR(f'mysqldump 오류: {result.stderr.decode()}'))
-                return None, None
-
-            with gzip.open(backup_file, 'wb') as f_out:
-                f_out.write(result.stdout)
+            # stderr 는 파일로 받아 파이프가 차서 멈추는 일을 막는다
+            with tempfile.TemporaryFile() as err:
+                proc = subprocess.Popen(dump_cmd, stdout=subprocess.PIPE, stderr=err)
+                try:
+                    db_backup.compress_stream(proc.stdout, backup_file)
+                finally:
+                    proc.stdout.close()
+                    returncode = proc.wait()
+                if returncode != 0:
+                    backup_file.unlink(missing_ok=True)
+                    err.seek(0)
+                    self.stderr.write(self.style.ERROR(f'mysqldump 오류: {err.read().decode(errors="replace")}'))
+                    return None, None
 
             return backup_file, 'db_*.sql.gz'
         except Exception as e:
+            backup_file.unlink(missing_ok=True)
             self.stderr.write(self.style.ERROR(f'MySQL 백업 실패: {e}'))
             return None, None
 
     def _backup_sqlite(self, db_config, backup_dir, timestamp):
-        """SQLite 파일 복사"""
+        """backup API 스냅샷 → 무결성 검사 → 조각 저장(기본) 또는 단일 gzip"""
         db_path = db_config.get('NAME', '')
         if not db_path or not Path(db_path).exists():
             self.stderr.write(self.style.ERROR(f'DB 파일을 찾을 수 없습니다: {db_path}'))
             return None, None
 
-        backup_file = backup_dir / f'db_{timestamp}.sqlite3'
-        shutil.copy2(db_path, backup_file)
-        return backup_file, 'db_*.sqlite3'
+        snapshot = backup_dir / f'.db_{timestamp}.snapshot'
+        try:
+            db_backup.snapshot_sqlite(db_path, snapshot)
+            if self.format == 'gz':
+                backup_file = db_backup.compress_file(snapshot, backup_dir / f'db_{timestamp}.sqlite3.gz')
+                return backup_file, 'db_*.sqlite3.gz'
+
+            backup_file, stats = db_backup.store_chunks(snapshot, backup_dir, f'db_{timestamp}')
+            self.stdout.write(
+                f'스냅샷 {stats["size"] // 1024} KB → 조각 {stats["chunks"]}개 중 '
+                f'새 조각 {stats["new"]}개 ({stats["new_bytes"] // 1024} KB) 저장'
+            )
+            return backup_file, f'db_*{db_backup.MANIFEST_SUFFIX}'
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f'SQLite 백업 실패: {e}'))
+            return None, None
+        finally:
+            snapshot.unlink(missing_ok=True)
+
+    def _restore(self, manifest):
+        """조각 백업 복원 (운영 DB 는 건드리지 않고 옆에 새 파일로 만든다)"""
+        if not manifest.exists():
+            self.stderr.write(self.style.ERROR(f'manifest 를 찾을 수 없습니다: {manifest}'))
+            return
+        dest = manifest.with_name('restored_' + manifest.name[:-len(db_backup.MANIFEST_SUFFIX)] + '.sqlite3')
+        try:
+            db_backup.restore_chunks(manifest, dest)
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f'복원 실패: {e}'))
+            return
+        self.stdout.write(self.style.SUCCESS(f'복원 완료 (무결성 ok): {dest}'))
 
-    def _send_email(self, email_to, backup_file, size_kb):
-        """백업 파일을 이메일로 전송"""
+    def _send_email(self, email_to, backup_file, size_kb, delete=False):
+        """백업 파일을 첨부한 메일을 발송 큐에 등록 (delete: 발송 후 첨부 파일 삭제)"""
         now = datetime.now()
         subject = f'[TechChang] DB 주간 백업 - {now:%Y-%m-%d}'
         body = (
@@ -140,14 +207,5 @@ class Command(BaseCommand):
             f'- 크기: {size_kb} KB\n\n'
             f'이 메일은 자동으로 발송되었습니다.'
         )
-        try:
-            msg = EmailMessage(
-                subject=subject,
-                body=body,
-                to=[email_to],
-            )
-            msg.attach_file(str(backup_file))
-            msg.send()
-            self.stdout.write(self.style.SUCCESS(f'이메일 전송 완료 → {email_to}'))
-        except Exception as e:
-            self.stderr.write(self.style.ERROR(f'이메일 전송 실패: {e}'))
+        mail_queue.enqueue(subject, body, [email_to], attachments=[{'path': str(backup_file), 'delete': delete}])
+        self.stdout.write(self.style.SUCCESS(f'이메일 발송 대기열 등록 → {email_to}'))
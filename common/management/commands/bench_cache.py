@@ -0,0 +1,96 @@
+"""
+캐시 백엔드 벤치마크 (여러 워커 프로세스)
+
+gunicorn 워커처럼 여러 프로세스가 같은 키 공간을 읽고(없으면 채우고) 쓸 때
+LocMemCache(워커별, MAX_ENTRIES 1000)·FileBasedCache·SharedMemoryCache 의
+처리량과 적중률을 비교합니다. LocMem 은 워커마다 따로 채워야 해 적중률이 떨어집니다.
+
+사용법:
+  python manage.py bench_cache                         # 워커 8개, 키 5000개, 백엔드당 5초
+  python manage.py bench_cache --workers 16 --keys 20000 --seconds 10
+"""
+import multiprocessing
+import random
+import shutil
+import tempfile
+import time
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+
+from common.cache_backends import SharedMemoryCache
+
+VALUE = {'question_id': 1, 'subject': '캐시 벤치마크' * 8, 'view_count': 123, 'tags': list(range(20))}
+
+
+def _backend(kind, location):
+    if kind == 'locmem':
+        return LocMemCache('bench', {'OPTIONS': {'MAX_ENTRIES': 1000}})
+    if kind == 'file':
+        return FileBasedCache(location, {})
+    return SharedMemoryCache(location, {})
+
+
+def _worker(kind, location, keys, seconds, write_ratio, results):
+    """읽기(없으면 채움) + write_ratio 비율의 덮어쓰기"""
+    cache = _backend(kind, location)
+    ops = hits = gets = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        key = f'bench:{random.randrange(keys)}'
+        if random.random() < write_ratio:
+            cache.set(key, VALUE, 300)
+        else:
+            gets += 1
+            if cache.get(key) is None:
+                cache.set(key, VALUE, 300)
+            else:
+                hits += 1
+        ops += 1
+    results.put((ops, hits, gets))
+
+
+class Command(BaseCommand):
+    help = 'LocMem·파일·공유 메모리 캐시의 멀티 프로세스 처리량과 적중률을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='동시 프로세스 수 (기본: 8)')
+        parser.add_argument('--keys', type=int, default=5000, help='키 공간 크기 (기본: 5000)')
+        parser.add_argument('--seconds', type=float, default=5, help='백엔드당 실행 시간(초) (기본: 5)')
+        parser.add_argument('--write-ratio', type=float, default=0.1, help='덮어쓰기 비율 (기본: 0.1)')
+
+    def handle(self, *args, **options):
+        workdir = tempfile.mkdtemp(prefix='bench_cache_')
+        self.stdout.write(
+            f'워커 {options["workers"]}개, 키 {options["keys"]}개, 백엔드당 {options["seconds"]:g}초'
+        )
+        try:
+            for kind, label, location in (
+                ('locmem', 'LocMem', ''),
+                ('file', 'FileBased', f'{workdir}/file'),
+                ('shm', 'SharedMemory', f'{workdir}/shm.cache'),
+            ):
+                ops, hits, gets = self._run(kind, location, options)
+                self.stdout.write(
+                    f'  {label:<13} {ops / options["seconds"]:10.0f} ops/s  적중률 {hits / gets * 100 if gets else 0:5.1f}%'
+                )
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def _run(self, kind, location, options):
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=_worker, args=(
+                kind, location, options['keys'], options['seconds'], options['write_ratio'], results))
+            for _ in range(options['workers'])
+        ]
+        for proc in procs:
+            proc.start()
+        totals = [0, 0, 0]
+        for _ in procs:
+            for i, value in enumerate(results.get()):
+                totals[i] += value
+        for proc in procs:
+            proc.join()
+        return totals
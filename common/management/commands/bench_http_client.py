@@ -0,0 +1,144 @@
+"""
+외부 HTTP 호출 벤치마크 (스텁 서버, 외부망 불필요)
+
+common.services.http_stub 스텁을 띄우고 끝말잇기 사전 검증·카카오 로그인(토큰 → 사용자 정보 → 로그아웃)
+호출을 여러 스레드로 반복해, 호출마다 새 연결을 맺는 requests.get/post 와
+common.services.http_client(연결 풀)의 처리량·지연·새 연결 수를 비교합니다.
+마지막으로 상대가 타임아웃보다 느릴 때 워커가 묶이는 시간을 서킷 브레이커 유무로 비교합니다.
+
+스텁은 평문 HTTP 라 TLS 핸드셰이크 비용은 빠져 있습니다 (실제 절감 폭은 더 큼).
+
+사용법:
+  python manage.py bench_http_client                         # 스레드 8개, 시나리오당 3초
+  python manage.py bench_http_client --threads 16 --seconds 5 --latency 0.02
+"""
+import threading
+import time
+
+import requests
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from common.services import http_client
+from common.services.http_stub import StubServer
+
+KRDICT = 'https://krdict.korean.go.kr/api/search'
+KAKAO_TOKEN = 'https://kauth.kakao.com/oauth/token'
+KAKAO_ME = 'https://kapi.kakao.com/v2/user/me'
+KAKAO_LOGOUT = 'https://kapi.kakao.com/v1/user/logout'
+
+
+def _bare(stub):
+    rewrite = lambda url: f'{stub.url}/{url.split("://", 1)[1]}'  # noqa: E731
+
+    def dictionary(i):
+        requests.get(rewrite(KRDICT), params={'q': f'단어{i}', 'key': 'stub'}, timeout=5)
+
+    def kakao(i):
+        token = requests.post(rewrite(KAKAO_TOKEN), data={'code': f'c{i}'}, timeout=5).json()['access_token']
+        headers = {'Authorization': f'Bearer {token}'}
+        requests.get(rewrite(KAKAO_ME), headers=headers, timeout=5).json()
+        requests.post(rewrite(KAKAO_LOGOUT), headers=headers, timeout=5)
+
+    return dictionary, kakao
+
+
+def _pooled():
+    def dictionary(i):
+        http_client.get('krdict', KRDICT, params={'q': f'단어{i}', 'key': 'stub'})
+
+    def kakao(i):
+        token = http_client.post('kakao', KAKAO_TOKEN, data={'code': f'c{i}'}).json()['access_token']
+        headers = {'Authorization': f'Bearer {token}'}
+        http_client.get('kakao', KAKAO_ME, headers=headers).json()
+        http_client.post('kakao', KAKAO_LOGOUT, headers=headers)
+
+    return dictionary, kakao
+
+
+class Command(BaseCommand):
+    help = '스텁 서버로 requests 직접 호출과 http_client(연결 풀·서킷 브레이커)를 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='동시 스레드 수 (기본: 8)')
+        parser.add_argument('--seconds', type=float, default=3, help='시나리오당 실행 시간(초) (기본: 3)')
+        parser.add_argument('--latency', type=float, default=0.005, help='스텁 응답 지연(초) (기본: 0.005)')
+
+    def handle(self, *args, **options):
+        pools = {name: {'pool': options['threads']} for name in ('krdict', 'kakao')}  # 스레드마다 연결 하나
+        with StubServer(latency=options['latency']) as stub, \
+                override_settings(HTTP_CLIENT_STUB_URL=stub.url, HTTP_CLIENT_SERVICES=pools):
+            http_client.reset()
+            self.stdout.write(f'스레드 {options["threads"]}개, 시나리오당 {options["seconds"]:g}초, '
+                              f'스텁 지연 {options["latency"] * 1000:g}ms')
+            bare, pooled = _bare(stub), _pooled()
+            for index, label in ((0, '사전 검증'), (1, '카카오 로그인')):
+                for mode, calls in (('requests', bare), ('http_client', pooled)):
+                    stub.reset_stats()
+                    ops, latencies = self._run(calls[index], options['threads'], options['seconds'])
+                    latencies.sort()
+                    p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0
+                    p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0
+                    self.stdout.write(
+                        f'  {label:<8} {mode:<12} {ops / options["seconds"]:8.0f} 회/s  '
+                        f'p50 {p50:6.1f}ms  p99 {p99:6.1f}ms  새 연결 {stub.connections}'
+                    )
+            http_client.reset()
+        self._slow_upstream()
+
+    def _run(self, call, threads, seconds):
+        deadline = time.monotonic() + seconds
+        lock = threading.Lock()
+        latencies = []
+        counter = [0]
+
+        def work(offset):
+            local = []
+            i = offset
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                call(i)
+                local.append(time.perf_counter() - started)
+                i += threads
+            with lock:
+                latencies.extend(local)
+                counter[0] += len(local)
+
+        workers = [threading.Thread(target=work, args=(n,)) for n in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return counter[0], latencies
+
+    def _slow_upstream(self):
+        """상대가 읽기 타임아웃(0.5초)보다 느릴 때 요청 20건이 워커를 묶는 총 시간"""
+        calls = 20
+        self.stdout.write(f'느린 상대 (응답 2초, 읽기 타임아웃 0.5초) 요청 {calls}건:')
+        with StubServer(latency=2.0) as stub, override_settings(
+            HTTP_CLIENT_STUB_URL=stub.url,
+            HTTP_CLIENT_SERVICES={'krdict': {'timeout': (1, 0.5), 'retries': 0}},
+            HTTP_CLIENT_BREAKER_FAILURES=3, HTTP_CLIENT_BREAKER_RESET=60,
+        ):
+            started = time.perf_counter()
+            for i in range(calls):
+                try:
+                    requests.get(f'{stub.url}/krdict.korean.go.kr/api/search', params={'q': i}, timeout=(1, 0.5))
+                except requests.RequestException:
+                    pass
+            bare = time.perf_counter() - started
+
+            http_client.reset()
+            started = time.perf_counter()
+            rejected = 0
+            for i in range(calls):
+                try:
+                    http_client.get('krdict', KRDICT, params={'q': i})
+                except http_client.CircuitOpen:
+                    rejected += 1
+                except requests.RequestException:
+                    pass
+            pooled = time.perf_counter() - started
+            http_client.reset()
+        self.stdout.write(f'  requests     {bare:6.2f}s (모든 요청이 타임아웃까지 대기)')
+        self.stdout.write(f'  http_client  {pooled:6.2f}s (브레이커가 {rejected}건을 즉시 거절)')
@@ -0,0 +1,112 @@
+"""
+nginx 액세스 로그 리더 벤치마크
+
+합성 액세스 로그(기본 2GB, 최근 30일 분량)를 만들어
+처음부터 모든 줄을 파싱하는 기존 방식과 역방향 블록 리더(common.services.nginx_access)를 비교합니다.
+
+사용법:
+  python manage.py bench_nginx_reader                      # 2GB 합성 로그, 최근 1시간 조회
+  python manage.py bench_nginx_reader --size-mb 4096 --hours 24
+  python manage.py bench_nginx_reader --path /tmp/access.log --keep   # 생성 파일 유지/재사용
+"""
+import os
+import re
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+
+from common.services import nginx_access
+from common.services.log_index import parse_request_line
+
+_PATHS = ['/', '/question/list/', '/question/detail/12/', '/static/css/app.css', '/wp-login.php', '/api/health/']
+_CODES = [200, 200, 200, 200, 304, 301, 404, 404, 403, 500]
+
+
+class Command(BaseCommand):
+    help = 'nginx 액세스 로그 전체 스캔과 역방향 블록 리더의 조회 시간을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size-mb', type=int, default=2048, help='합성 로그 크기(MB) (기본: 2048)')
+        parser.add_argument('--days', type=int, default=30, help='합성 로그가 덮는 기간(일) (기본: 30)')
+        parser.add_argument('--hours', type=int, default=1, help='조회 범위(시간) (기본: 1)')
+        parser.add_argument('--path', type=str, default='', help='합성 로그 경로 (기본: 임시 파일)')
+        parser.add_argument('--keep', action='store_true', help='벤치마크 후 합성 로그를 지우지 않음')
+
+    def handle(self, *args, **options):
+        path = options['path'] or os.path.join(tempfile.gettempdir(), 'bench_nginx_access.log')
+        target = options['size_mb'] * 1024 * 1024
+
+        if not os.path.exists(path) or os.path.getsize(path) < target:
+            self.stdout.write(f'합성 로그 생성 중: {path} ({options["size_mb"]}MB, {options["days"]}일)')
+            started = time.perf_counter()
+            self._generate(path, target, options['days'])
+            self.stdout.write(f'  생성 {time.perf_counter() - started:.1f}s')
+
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        hours = options['hours']
+
+        started = time.perf_counter()
+        legacy = self._legacy_scan(path, hours)
+        legacy_sec = time.perf_counter() - started
+
+        started = time.perf_counter()
+        stats = nginx_access.scan_access_log(hours, candidates=[path])
+        reverse_sec = time.perf_counter() - started
+
+        self.stdout.write(f'파일 {size_mb:.0f}MB, 최근 {hours}시간')
+        self.stdout.write(f'  전체 스캔    {legacy_sec:8.3f}s  요청 {legacy}')
+        self.stdout.write(f'  역방향 리더  {reverse_sec:8.3f}s  요청 {stats["request_count"]}')
+        if reverse_sec:
+            self.stdout.write(self.style.SUCCESS(f'  {legacy_sec / reverse_sec:.0f}배 빠름'))
+
+        if not options['keep'] and not options['path']:
+            os.remove(path)
+
+    def _generate(self, path, target, days):
+        """최근 days 일을 균등하게 덮는 시간순 합성 로그"""
+        end = datetime.now(dt_timezone.utc)
+        start = end - timedelta(days=days)
+        line_len = len(self._line(123, end))  # IP·경로 길이가 평균적인 줄 기준
+        total_lines = max(1, target // line_len)
+        step = (end - start).total_seconds() / total_lines
+
+        with open(path, 'w') as f:
+            buf = []
+            for i in range(total_lines):
+                buf.append(self._line(i, start + timedelta(seconds=i * step)))
+                if len(buf) >= 10000:
+                    f.write(''.join(buf))
+                    buf = []
+            f.write(''.join(buf))
+
+    @staticmethod
+    def _line(i, ts):
+        return (
+            f'203.0.113.{i % 250} - - [{ts:%d/%b/%Y:%H:%M:%S} +0000] '
+            f'"GET {_PATHS[i % len(_PATHS)]} HTTP/1.1" {_CODES[i % len(_CODES)]} 512 "-" "bench/1.0"\n'
+        )
+
+    def _legacy_scan(self, path, hours):
+        """기존 _collect_nginx_access 방식: 처음부터 모든 줄의 날짜를 직접 분해"""
+        cutoff = datetime.now(dt_timezone.utc).replace(tzinfo=None) - timedelta(hours=hours)
+        date_pat = re.compile(r'\[(\d{2}/\w+/\d{4}:\d{2}:\d{2}:\d{2})')
+        month_map = {
+            'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+            'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+        }
+        count = 0
+        with open(path, 'r', errors='replace') as f:
+            for line in f:
+                dm = date_pat.search(line)
+                if dm:
+                    parts = dm.group(1).split('/')
+                    rest = parts[2].split(':')
+                    log_dt = datetime(int(rest[0]), month_map.get(parts[1], 0), int(parts[0]),
+                                      int(rest[1]), int(rest[2]), int(rest[3]))
+                    if log_dt < cutoff:
+                        continue
+                if parse_request_line(line):
+                    count += 1
+        return count
@@ -0,0 +1,133 @@
+"""
+SQLite 동시 쓰기 벤치마크
+
+여러 프로세스가 조회수 증가·세션 저장처럼 "읽고 나서 쓰는" 작은 트랜잭션을 동시에 실행할 때
+기존 기본 설정과 운영 프로필(common.services.sqlite_profile)의 처리량과 잠금 오류율을 비교합니다.
+
+- 기존: 요청마다 새 연결, 롤백 저널, synchronous=FULL, DEFERRED 트랜잭션, 대기 5초 (Django 기본값)
+- 운영: 연결 재사용, settings.SQLITE_PRAGMAS (WAL 등), IMMEDIATE 트랜잭션, 대기 SQLITE_BUSY_TIMEOUT
+
+사용법:
+  python manage.py bench_sqlite_writes                    # 워커 8개, 프로필당 5초
+  python manage.py bench_sqlite_writes --workers 16 --seconds 10 --busy-timeout 1
+"""
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from common.services import sqlite_profile
+
+ROWS = 200
+
+
+def _setup(path):
+    for suffix in ('', '-wal', '-shm', '-journal'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE question (id INTEGER PRIMARY KEY, view_count INTEGER NOT NULL DEFAULT 0)')
+    conn.execute('CREATE TABLE session (key TEXT PRIMARY KEY, data TEXT, expire REAL)')
+    conn.executemany('INSERT INTO question (id) VALUES (?)', [(i,) for i in range(1, ROWS + 1)])
+    conn.commit()
+    conn.close()
+
+
+def _connect(path, profile, timeout):
+    conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+    if profile == 'tuned':
+        for statement in sqlite_profile.pragma_statements():
+            conn.execute(statement)
+    return conn
+
+
+def _worker(path, profile, timeout, seconds, results):
+    """한 요청 = 세션 읽기 → 조회수 증가 → 세션 저장 (한 트랜잭션)"""
+    ok = locked = 0
+    latencies = []
+    conn = None
+    begin = 'BEGIN IMMEDIATE' if profile == 'tuned' else 'BEGIN'
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        if conn is None:
+            conn = _connect(path, profile, timeout)
+        key = f'k{os.getpid()}-{random.randrange(50)}'
+        try:
+            conn.execute(begin)
+            conn.execute('SELECT data FROM session WHERE key = ?', (key,)).fetchone()
+            conn.execute('UPDATE question SET view_count = view_count + 1 WHERE id = ?', (random.randint(1, ROWS),))
+            conn.execute('INSERT OR REPLACE INTO session (key, data, expire) VALUES (?, ?, ?)',
+                         (key, 'x' * 200, time.time()))
+            conn.execute('COMMIT')
+            ok += 1
+            latencies.append(time.perf_counter() - started)
+        except sqlite3.OperationalError as e:
+            if 'locked' not in str(e) and 'busy' not in str(e):
+                raise
+            locked += 1
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+        if profile == 'legacy':  # 요청마다 연결을 닫는 CONN_MAX_AGE=0
+            conn.close()
+            conn = None
+    if conn is not None:
+        conn.close()
+    results.put((ok, locked, latencies))
+
+
+class Command(BaseCommand):
+    help = 'SQLite 기본 설정과 운영 프로필의 동시 쓰기 처리량·잠금 오류율을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='동시 프로세스 수 (기본: 8)')
+        parser.add_argument('--seconds', type=float, default=5, help='프로필당 실행 시간(초) (기본: 5)')
+        parser.add_argument('--busy-timeout', type=float, default=None,
+                            help='운영 프로필 잠금 대기(초) (기본: DATABASES OPTIONS timeout)')
+        parser.add_argument('--path', type=str, default='', help='벤치마크 DB 경로 (기본: 임시 파일)')
+
+    def handle(self, *args, **options):
+        path = options['path'] or os.path.join(tempfile.gettempdir(), 'bench_sqlite_writes.sqlite3')
+        tuned_timeout = options['busy_timeout']
+        if tuned_timeout is None:
+            tuned_timeout = settings.DATABASES['default'].get('OPTIONS', {}).get('timeout', 20)
+
+        self.stdout.write(f'워커 {options["workers"]}개, 프로필당 {options["seconds"]:g}초')
+        for profile, label, timeout in (('legacy', '기존', 5), ('tuned', '운영 프로필', tuned_timeout)):
+            _setup(path)
+            ok, locked, latencies = self._run(path, profile, timeout, options['workers'], options['seconds'])
+            total = ok + locked
+            latencies.sort()
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0
+            self.stdout.write(
+                f'  {label:<8} {ok / options["seconds"]:8.0f} tx/s  잠금 오류 {locked}/{total} '
+                f'({locked / total * 100 if total else 0:.1f}%)  p99 {p99:.1f}ms'
+            )
+
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            if not options['path'] and os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    def _run(self, path, profile, timeout, workers, seconds):
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=_worker, args=(path, profile, timeout, seconds, results))
+            for _ in range(workers)
+        ]
+        for proc in procs:
+            proc.start()
+        ok = locked = 0
+        latencies = []
+        for _ in procs:
+            w_ok, w_locked, w_lat = results.get()
+            ok += w_ok
+            locked += w_locked
+            latencies.extend(w_lat)
+        for proc in procs:
+            proc.join()
+        return ok, locked, latencies
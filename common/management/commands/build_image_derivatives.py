@@ -0,0 +1,73 @@
+"""
+업로드 이미지 반응형 파생본 생성 워커 (common.services.image_derivatives)
+
+저장 직후 스레드 풀이 만들지 못한 것(IMAGE_DERIVATIVE_THREADS=0, 재시작 중 유실, 기존 업로드)을
+채웁니다. 매니페스트가 있는 이미지는 건너뜁니다.
+
+사용법:
+  python manage.py build_image_derivatives                  # 빠진 파생본을 모두 만들고 종료 (cron 용)
+  python manage.py build_image_derivatives --loop           # 상주 워커 (IMAGE_DERIVATIVE_INTERVAL 초마다 확인)
+  python manage.py build_image_derivatives --force          # IMAGE_DERIVATIVE_WIDTHS 를 바꾼 뒤 전부 다시 생성
+  python manage.py build_image_derivatives --stats          # 원본·파생본 현황만 출력
+
+cron 예시 (상주 워커 대신):
+  */10 * * * *   ... build_image_derivatives
+"""
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from common.services import image_derivatives
+
+
+class Command(BaseCommand):
+    help = '업로드 이미지의 너비별 WebP/JPEG 파생본과 매니페스트를 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='종료하지 않고 주기적으로 확인')
+        parser.add_argument('--interval', type=float, default=None,
+                            help='--loop 확인 간격(초) (기본: IMAGE_DERIVATIVE_INTERVAL)')
+        parser.add_argument('--workers', type=int, default=2, help='동시 변환 스레드 수 (기본: 2)')
+        parser.add_argument('--force', action='store_true', help='매니페스트가 있어도 다시 생성')
+        parser.add_argument('--stats', action='store_true', help='현황만 출력')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            names = image_derivatives.source_names()
+            pending = image_derivatives.missing(names)
+            self.stdout.write(f'원본 {len(names)}개 · 파생본 완료 {len(names) - len(pending)}개 · 대기 {len(pending)}개')
+            return
+        if options['loop']:
+            return self._loop(options)
+        built, failed = self._run_once(options['workers'], options['force'])
+        self.stdout.write(self.style.SUCCESS(f'파생본 생성 {built}개, 실패 {failed}개'))
+
+    def _run_once(self, workers, force=False):
+        names = image_derivatives.source_names()
+        if not force:
+            names = image_derivatives.missing(names)
+        if not names:
+            return 0, 0
+        # Pillow 의 디코딩·리사이즈·인코딩은 GIL 을 놓으므로 스레드로 나눠도 CPU 를 씀
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='image-derivatives') as pool:
+            results = list(pool.map(lambda name: image_derivatives.build(name, force=force), names))
+        failed = results.count(None)
+        return len(results) - failed, failed
+
+    def _loop(self, options):
+        interval = options['interval'] or getattr(settings, 'IMAGE_DERIVATIVE_INTERVAL', 60)
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+        self.stdout.write(f'이미지 파생본 워커 시작 ({interval:g}초 간격)')
+        while not stopping:
+            close_old_connections()
+            built, failed = self._run_once(options['workers'])
+            if built or failed:
+                self.stdout.write(f'[{timezone.localtime():%Y-%m-%d %H:%M:%S}] 생성 {built}개, 실패 {failed}개')
+            time.sleep(interval)
+        self.stdout.write('이미지 파생본 워커 종료')
@@ -10,13 +10,9 @@ from datetime import datetime, timedelta
 from collections import Counter, defaultdict
 
 from django.core.management.base import BaseCommand
-from django.core.mail import send_mail
 from django.conf import settings
-from django.contrib.auth.models import User
-from django.utils import timezone
 
-# 자동 칼럼 작성 봇 계정 (auto_write_columns 와 동일)
-COLUMN_BOT_USERNAME = 'techchang연구팀'
+from common.services import dashboard_stats, log_index, mail_queue, nginx_access, system_metrics
 
 
 class Command(BaseCommand):
@@ -60,15 +56,8 @@ class Command(BaseCommand):
             self.stdout.write('=' * 60)
         else:
             subject = f'[테크창] 서버 리포트 {datetime.now():%Y-%m-%d %H:%M} ({hours}h)'
-            send_mail(
-                subject=subject,
-                message=report['text'],
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[recipient],
-                html_message=report['html'],
-                fail_silently=False,
-            )
-            self.stdout.write(self.style.SUCCESS(f'리포트 발송 완료 → {recipient}'))
+            mail_queue.enqueue(subject, report['text'], [recipient], html_body=report['html'])
+            self.stdout.write(self.style.SUCCESS(f'리포트 발송 대기열 등록 → {recipient}'))
 
     # ------------------------------------------------------------------ #
     def _build_report(self, hours):
@@ -91,6 +80,7 @@ class Command(BaseCommand):
         리포트 발송 자체는 막지 않는다.
         """
         top_errors = journal.get('top_errors', [])
+        templates   = journal.get('error_templates', [])
         error_count = journal.get('error_count', 0)
         status_5xx  = journal.get('status_5xx', 0)
 
@@ -101,9 +91,19 @@ class Command(BaseCommand):
         try:
             from common.services.claude import ask_json, ClaudeModel
 
-            error_block = '\n'.join(
-                f'{i}. {e}' for i, e in enumerate(top_errors, 1)
-            ) or '(개별 에러 라인은 수집되지 않았으나 5xx 응답이 발생함)'
+            # 같은 템플릿(가변값만 다른 줄)은 횟수·시각 범위·예시 한 줄로 묶어 보낸다
+            if templates:
+                error_block = '\n'.join(
+                    f'T{i}. [{t["level"]} ×{t["count"]} · {t["first_seen"] or "?"} ~ {t["last_seen"] or "?"}] '
+                    f'{t["template"][:300]}\n    예: {t["exemplar"][:200]}'
+                    for i, t in enumerate(templates, 1)
+                )
+                sample_title = '[에러·경고 로그 템플릿] (가변값은 <NUM>·<IP>·<HEX>·<*> 로 치환)'
+            else:
+                error_block = '\n'.join(
+                    f'{i}. {e}' for i, e in enumerate(top_errors, 1)
+                ) or '(개별 에러 라인은 수집되지 않았으나 5xx 응답이 발생함)'
+                sample_title = '[에러 로그 샘플]'
 
             system = (
                 '당신은 테크창(Django 5.1 / Gunicorn / Nginx / Ubuntu 24.04, SQLite) 서비스의 '
@@ -118,14 +118,15 @@ class Command(BaseCommand):
                 f'- 4xx 에러 응답: {journal.get("status_4xx", 0)}건\n'
                 f'- Error/Exception 라인: {error_count}건\n'
                 f'- Warning 라인: {journal.get("warning_count", 0)}건\n\n'
-                f'[에러 로그 샘플]\n{error_block}\n\n'
+                f'{sample_title}\n{error_block}\n\n'
                 '치명적인 문제 위주로 분석해 아래 JSON 형식으로만 응답하세요.\n'
                 '```json\n'
                 '{\n'
                 '  "severity": "심각 | 주의 | 정보 중 하나",\n'
                 '  "overview": "전체 상황을 한두 문장으로 요약한 총평",\n'
                 '  "findings": [\n'
-                '    {"title": "문제 제목", "cause": "추정 원인", "action": "권장 조치"}\n'
+                '    {"title": "문제 제목", "cause": "추정 원인", "action": "권장 조치", '
+                '"template": "근거 템플릿 번호 (예: T1, 템플릿이 없으면 빈 문자열)"}\n'
                 '  ]\n'
                 '}\n'
                 '```\n'
@@ -141,11 +142,21 @@ class Command(BaseCommand):
                 system=system,
                 model=model,
                 max_tokens=1500,
+                cache=True,  # 같은 로그 요약으로 다시 실행(재발송·cron 중복)하면 API 를 다시 부르지 않음
             )
 
             findings = data.get('findings', [])
             if isinstance(findings, dict):
                 findings = [findings]
+            # 'T3' 같은 번호를 템플릿 원문으로 바꿔 LogFinding 지문에 쓴다
+            for f in findings:
+                if not isinstance(f, dict):
+                    continue
+                ref = str(f.get('template') or '').strip().upper().lstrip('T')
+                f['template'] = (
+                    templates[int(ref) - 1]['template']
+                    if ref.isdigit() and 0 < int(ref) <= len(templates) else ''
+                )
 
             return {
                 'available': True,
@@ -214,14 +225,21 @@ class Command(BaseCommand):
             lines = lines[-tail:]
         return lines
 
+    def _file_window_stats(self, hours):
+        """
+        logs/django.log 의 최근 N시간 집계 (common.services.log_index).
+        파일 전체를 다시 읽지 않고, 지난번 읽은 위치 이후의 새 줄만 분 단위 집계에
+        반영한 뒤 집계 행을 합산한다. 파일이 없으면 None.
+        """
+        if not os.path.exists(self._app_log_path()):
+            return None
+        log_index.update_index()
+        return log_index.window_stats(hours)
+
     @staticmethod
     def _classify_level(line):
-        lower = line.lower()
-        if 'error' in lower or 'exception' in lower or 'traceback' in lower or '" 5' in line:
-            return 'error'
-        if 'warning' in lower or 'warn' in lower or '" 4' in line:
-            return 'warn'
-        return 'info'
+        from common.services.log_stream import classify_level
+        return classify_level(line)
 
     # ------------------------------------------------------------------ #
     def _tail_logs(self, lines=120):
@@ -263,126 +281,11 @@ class Command(BaseCommand):
 
     # ------------------------------------------------------------------ #
     def _collect_db_stats(self):
-        from community.models import Question, Answer, Comment
-        from common.models import Profile
-
-        now   = timezone.now()
-        today = now.date()
-
-        stats = {}
+        """DB 지표 — 서버 모니터·관리자 대시보드와 공유하는 캐시 스냅샷"""
         try:
-            stats['total_users']      = User.objects.count()
-            stats['new_users_today']  = User.objects.filter(date_joined__date=today).count()
-            stats['active_users_7d']  = User.objects.filter(
-                last_login__date__gte=today - timedelta(days=7)
-            ).count()
-            stats['active_users_30d'] = User.objects.filter(
-                last_login__date__gte=today - timedelta(days=30)
-            ).count()
-
-            stats['total_questions'] = Question.objects.filter(is_deleted=False).count()
-            stats['new_questions']   = Question.objects.filter(
-                is_deleted=False, create_date__date=today
-            ).count()
-            stats['total_answers']   = Answer.objects.filter(is_deleted=False).count()
-            stats['new_answers']     = Answer.objects.filter(
-                is_deleted=False, create_date__date=today
-            ).count()
-            stats['total_comments']     = Comment.objects.count()
-            stats['new_comments_today'] = Comment.objects.filter(create_date__date=today).count()
-
-            # 방문자 수
-            try:
-                from community.models import DailyVisitor
-                vc  = DailyVisitor.objects.filter(date=today).first()
-                yvc = DailyVisitor.objects.filter(date=today - timedelta(days=1)).first()
-                stats['visitors_today']     = vc.visitor_count  if vc  else 0
-                stats['visitors_yesterday'] = yvc.visitor_count if yvc else 0
-            except Exception:
-                stats['visitors_today']     = '-'
-                stats['visitors_yesterday'] = '-'
-
-            # 게임 플레이 수 (오늘)
-            try:
-                from community.models import NumberBaseballGame, Game2048, MinesweeperGame, TicTacToeGame
-                b = NumberBaseballGame.objects.filter(create_date__date=today).count()
-                g = Game2048.objects.filter(create_date__date=today).count()
-                m = MinesweeperGame.objects.filter(create_date__date=today).count()
-                t = TicTacToeGame.objects.filter(create_date__date=today).count()
-                stats['game_plays_today'] = b + g + m + t
-                stats['game_detail'] = {'숫자야구': b, '2048': g, '지뢰찾기': m, '틱택토': t}
-            except Exception:
-                stats['game_plays_today'] = '-'
-                stats['game_detail'] = {}
-
-            # 인기 질문 Top 5
-            try:
-                stats['top_questions'] = list(
-                    Question.objects.filter(is_deleted=False)
-                    .order_by('-view_count')[:5]
-                    .values('subject', 'view_count')
-                )
-            except Exception:
-                stats['top_questions'] = []
-
-            # 자동 칼럼 작성 내역 (테크창 연구팀 봇)
-            try:
-                week_ago = today - timedelta(days=7)
-                bot_cols = Question.objects.filter(
-                    is_deleted=False, author__username=COLUMN_BOT_USERNAME
-                ).select_related('category')
-                stats['column_total'] = bot_cols.count()
-                stats['column_today'] = bot_cols.filter(create_date__date=today).count()
-                stats['column_week']  = bot_cols.filter(create_date__date__gte=week_ago).count()
-                stats['recent_columns'] = [
-                    {
-                        'subject': c.subject,
-                        'category': c.category.name if c.category else '-',
-                        'date': c.create_date,
-                    }
-                    for c in bot_cols.order_by('-create_date')[:8]
-                ]
-            except Exception:
-                stats['column_total'] = stats['column_today'] = stats['column_week'] = 0
-                stats['recent_columns'] = []
-
+            return dashboard_stats.get_dashboard_stats()
         except Exception as e:
-            stats['error'] = str(e)
-
-        return stats
-
-    # ------------------------------------------------------------------ #
-    #  로그 파싱 헬퍼 (요청 라인 / Warning 패턴 정규화)
-    # ------------------------------------------------------------------ #
-    # 액세스 라인에서 메서드·경로·상태코드 추출 (gunicorn/nginx 공통 "%(r)s" %(s)s)
-    _REQUEST_RE = re.compile(r'"([A-Z]+) (\S+?)(?: HTTP/[^"]*)?" (\d{3})')
-
-    def _parse_request_line(self, line):
-        m = self._REQUEST_RE.search(line)
-        if not m:
-            return None
-        try:
-            code = int(m.group(3))
-        except ValueError:
-            return None
-        path = m.group(2).split('?', 1)[0]  # 쿼리스트링 제거
-        return m.group(1), path, code
-
-    def _warn_key(self, line):
-        """Warning 라인을 패턴 집계용 키로 정규화.
-
-        로그 접두(asctime+module)와 가변값(IP·경로·숫자)을 제거/치환해
-        동일 메시지 템플릿끼리 묶이도록 한다. 표시는 원문(가변값 포함)을 쓴다.
-        """
-        idx = line.lower().find('warning')
-        msg = (line[idx + 7:] if idx >= 0 else line)
-        # 'WARNING <YYYY-MM-DD HH:MM:SS,ms> <module> ' 접두 제거 (file/journal 공통)
-        msg = re.sub(r'^[\s:.\-]*\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}[,.\d]*\s+\S+\s+', '', msg)
-        msg = msg.strip().lstrip(':- ').strip()
-        norm = re.sub(r'\b\d{1,3}(?:\.\d{1,3}){3}\b', '#IP', msg)  # IP 주소
-        norm = re.sub(r'/\S+', '/#', norm)                        # 경로 값
-        norm = re.sub(r'\d+', '#', norm)                          # 잔여 숫자
-        return norm[:80], msg[:100]
+            return {'error': str(e)}
 
     # ------------------------------------------------------------------ #
     def _collect_journal(self, hours):
@@ -402,7 +305,7 @@ class Command(BaseCommand):
             'source': None,
         }
 
-        raw_lines = None
+        line_stats = None
         # 1) journalctl (systemd)
         try:
             result = subprocess.run(
@@ -411,71 +314,22 @@ class Command(BaseCommand):
                 capture_output=True, text=True, timeout=15
             )
             if result.returncode == 0:
-                raw_lines = result.stdout.splitlines()
+                line_stats = log_index.LineStats()
+                for line in result.stdout.splitlines():
+                    line_stats.add(line)
                 stats['source'] = 'journal'
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
 
-        # 2) 폴백: Django 파일 로그
-        if raw_lines is None:
-            file_lines = self._read_log_file(hours=hours)
-            if file_lines is not None:
-                raw_lines = file_lines
+        # 2) 폴백: Django 파일 로그 — 새 줄만 분 단위 집계에 반영한 뒤 집계 합산으로 응답
+        if line_stats is None:
+            line_stats = self._file_window_stats(hours)
+            if line_stats is not None:
                 stats['source'] = 'file'
 
-        if raw_lines is not None:
+        if line_stats is not None:
             stats['available'] = True
-            errors = []
-            err_samples = []          # 에러 라인이 없을 때 5xx 요청을 대체 샘플로
-            warn_counter = Counter()
-            warn_repr = {}
-            path_404 = Counter()
-
-            for line in raw_lines:
-                lower = line.lower()
-                if 'error' in lower or 'exception' in lower or 'traceback' in lower:
-                    stats['error_count'] += 1
-                    errors.append(line[-120:])
-                elif 'warning' in lower or 'warn' in lower:
-                    stats['warning_count'] += 1
-                    key, rep = self._warn_key(line)
-                    warn_counter[key] += 1
-                    warn_repr.setdefault(key, rep)
-
-                pr = self._parse_request_line(line)
-                if pr:
-                    method, path, code = pr
-                    stats['request_count'] += 1
-                    if 500 <= code < 600:
-                        stats['status_5xx'] += 1
-                        if len(err_samples) < 5:
-                            err_samples.append(f'{code} {method} {path}')
-                    elif 400 <= code < 500:
-                        stats['status_4xx'] += 1
-                        if code == 404:
-                            stats['status_404'] += 1
-                            path_404[path] += 1
-                        elif code == 403:
-                            stats['status_403'] += 1
-                        elif code == 401:
-                            stats['status_401'] += 1
-
-            seen = set()
-            for e in errors:
-                key = e[-60:]
-                if key not in seen:
-                    seen.add(key)
-                    stats['top_errors'].append(e)
-                    if len(stats['top_errors']) >= 5:
-                        break
-            # 에러 라인 샘플이 없으면 5xx 요청 라인으로 대체 (수집 공백 보완)
-            if not stats['top_errors'] and err_samples:
-                stats['top_errors'] = err_samples
-
-            stats['top_404'] = [{'path': p, 'count': c} for p, c in path_404.most_common(5)]
-            stats['top_warnings'] = [
-                {'msg': warn_repr[k], 'count': c} for k, c in warn_counter.most_common(5)
-            ]
+            stats.update(line_stats.journal_stats())
 
         # 요청/상태 코드는 보통 nginx 액세스 로그에 있다 (저널/파일에 없을 때 보완)
         if stats['available'] and stats['request_count'] == 0:
@@ -485,72 +339,25 @@ class Command(BaseCommand):
 
     # ------------------------------------------------------------------ #
     def _collect_nginx_access(self, hours, existing_stats):
-        from datetime import timezone as tz
-
-        candidates = [
-            '/var/log/nginx/techchang_access.log',
-            '/var/log/nginx/mysite_access.log',
-            '/var/log/nginx/access.log',
-        ]
-
-        cutoff = datetime.now(tz.utc).replace(tzinfo=None) - timedelta(hours=hours)
-        date_pat = re.compile(r'\[(\d{2}/\w+/\d{4}:\d{2}:\d{2}:\d{2})')
-        month_map = {
-            'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-            'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+        """
+        nginx 액세스 로그의 최근 N시간 요청 통계.
+        파일 끝에서부터 거꾸로 읽다가 cutoff 를 지나면 멈추고, 필요하면 회전된
+        .1/.gz 세대까지 이어 읽는다 (common.services.nginx_access).
+        """
+        scanned = nginx_access.scan_access_log(hours) or {
+            'request_count': 0, 'status_5xx': 0, 'status_4xx': 0, 'status_404': 0,
+            'status_403': 0, 'status_401': 0, 'path_404': Counter(), 'samples_5xx': [],
         }
-
-        req_count = s5 = s4 = s404 = s403 = s401 = 0
-        path_404 = Counter()
-        samples_5xx = []
-
-        for log_path in candidates:
-            if not os.path.exists(log_path):
-                continue
-            try:
-                with open(log_path, 'r', errors='replace') as f:
-                    for line in f:
-                        dm = date_pat.search(line)
-                        if dm:
-                            raw   = dm.group(1)
-                            parts = raw.split('/')
-                            day   = int(parts[0])
-                            mon   = month_map.get(parts[1], 0)
-                            rest  = parts[2].split(':')
-                            year  = int(rest[0])
-                            h, mi, s = int(rest[1]), int(rest[2]), int(rest[3])
-                            log_dt = datetime(year, mon, day, h, mi, s)
-                            if log_dt < cutoff:
-                                continue
-
-                        pr = self._parse_request_line(line)
-                        if pr:
-                            method, path, code = pr
-                            req_count += 1
-                            if 500 <= code < 600:
-                                s5 += 1
-                                if len(samples_5xx) < 5:
-                                    samples_5xx.append(f'{code} {method} {path}')
-                            elif 400 <= code < 500:
-                                s4 += 1
-                                if code == 404:
-                                    s404 += 1
-                                    path_404[path] += 1
-                                elif code == 403:
-                                    s403 += 1
-                                elif code == 401:
-                                    s401 += 1
-            except OSError:
-                continue
-            break
+        path_404 = scanned['path_404']
+        samples_5xx = scanned['samples_5xx']
 
         result = {
-            'request_count': req_count,
-            'status_5xx': existing_stats.get('status_5xx', 0) + s5,
-            'status_4xx': existing_stats.get('status_4xx', 0) + s4,
-            'status_404': existing_stats.get('status_404', 0) + s404,
-            'status_403': existing_stats.get('status_403', 0) + s403,
-            'status_401': existing_stats.get('status_401', 0) + s401,
+            'request_count': scanned['request_count'],
+            'status_5xx': existing_stats.get('status_5xx', 0) + scanned['status_5xx'],
+            'status_4xx': existing_stats.get('status_4xx', 0) + scanned['status_4xx'],
+            'status_404': existing_stats.get('status_404', 0) + scanned['status_404'],
+            'status_403': existing_stats.get('status_403', 0) + scanned['status_403'],
+            'status_401': existing_stats.get('status_401', 0) + scanned['status_401'],
             'top_404': existing_stats.get('top_404') or [
                 {'path': p, 'count': c} for p, c in path_404.most_common(5)
             ],
@@ -570,7 +377,7 @@ class Command(BaseCommand):
             'source': None,
         }
 
-        raw_lines = None
+        line_stats = None
         # 1) journalctl --grep (systemd). 매칭이 없으면 returncode 1 → 파일 폴백으로 진행.
         try:
             result = subprocess.run(
@@ -580,71 +387,29 @@ class Command(BaseCommand):
                 capture_output=True, text=True, timeout=15
             )
             if result.returncode == 0:
-                raw_lines = result.stdout.splitlines()
+                line_stats = log_index.LineStats()
+                for line in result.stdout.splitlines():
+                    line_stats.add(line)
                 stats['source'] = 'journal'
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
 
         # 2) 폴백: Django 파일 로그 (보안 미들웨어 로그가 logs/django.log에 기록됨)
-        if raw_lines is None:
-            file_lines = self._read_log_file(hours=hours)
-            if file_lines is not None:
-                raw_lines = file_lines
+        if line_stats is None:
+            line_stats = self._file_window_stats(hours)
+            if line_stats is not None:
                 stats['source'] = 'file'
 
-        if raw_lines is not None:
+        if line_stats is not None:
             stats['available'] = True
-            for line in raw_lines:
-                lower = line.lower()
-                if 'blocked' in lower:
-                    stats['blocked_ips'] += 1
-                if 'rate limit' in lower:
-                    stats['rate_limit_hits'] += 1
-                if 'ddos' in lower:
-                    stats['ddos_detected'] += 1
+            stats.update(line_stats.security_stats())
 
         return stats
 
     # ------------------------------------------------------------------ #
     def _collect_system_stats(self):
-        stats = {}
-        try:
-            mem = subprocess.run(['free', '-m'], capture_output=True, text=True, timeout=5)
-            for line in mem.stdout.splitlines():
-                if line.startswith('Mem:'):
-                    parts = line.split()
-                    total, used = int(parts[1]), int(parts[2])
-                    stats['mem_total_mb'] = total
-                    stats['mem_used_mb']  = used
-                    stats['mem_pct']      = round(used / total * 100, 1)
-                    break
-
-            df = subprocess.run(['df', '-h', '/'], capture_output=True, text=True, timeout=5)
-            for line in df.stdout.splitlines()[1:]:
-                parts = line.split()
-                if len(parts) >= 5:
-                    stats['disk_total'] = parts[1]
-                    stats['disk_used']  = parts[2]
-                    stats['disk_pct']   = parts[4]
-                    break
-
-            uptime = subprocess.run(['uptime'], capture_output=True, text=True, timeout=5)
-            m = re.search(r'load average[s]?:\s+([\d.]+)', uptime.stdout)
-            if m:
-                stats['load_avg'] = m.group(1)
-
-            svc = subprocess.run(['systemctl', 'is-active', 'mysite'],
-                                 capture_output=True, text=True, timeout=5)
-            stats['mysite_status'] = svc.stdout.strip()
-
-            nginx = subprocess.run(['systemctl', 'is-active', 'nginx'],
-                                   capture_output=True, text=True, timeout=5)
-            stats['nginx_status'] = nginx.stdout.strip()
-
-        except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
-            pass
-
-        return stats
+        """메모리·디스크·부하·서비스 상태 — 외부 명령 없이 /proc·statvfs 로 측정"""
+        return system_metrics.snapshot()
 
     # ------------------------------------------------------------------ #
     def _ok(self, ok=True):
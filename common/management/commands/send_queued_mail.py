@@ -0,0 +1,89 @@
+"""
+메일 발송 큐 워커 (common.services.mail_queue)
+
+뷰·명령어가 mail_queue.enqueue() 로 넣은 메일을 SMTP 연결 하나에 묶어 발송합니다.
+워커가 둘 이상 떠도 파일 잠금으로 한 번에 하나만 발송합니다.
+
+사용법:
+  python manage.py send_queued_mail                 # 대기 메일을 모두 보내고 종료 (cron 용)
+  python manage.py send_queued_mail --loop          # 상주 워커 (EMAIL_QUEUE_INTERVAL 초마다 확인)
+  python manage.py send_queued_mail --stats         # 큐 상태만 출력
+  python manage.py send_queued_mail --retry-dead    # dead 메일을 다시 대기열로 (본문을 지운 민감 메일 제외)
+
+cron 예시 (상주 워커 대신):
+  * * * * *   ... send_queued_mail
+"""
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from common.models import OutboundEmail
+from common.services import file_lock, mail_queue
+
+
+class Command(BaseCommand):
+    help = '발송 대기 메일(OutboundEmail)을 SMTP 연결 하나로 묶어 발송합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='종료하지 않고 주기적으로 발송')
+        parser.add_argument('--interval', type=float, default=None,
+                            help='--loop 확인 간격(초) (기본: EMAIL_QUEUE_INTERVAL)')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='SMTP 연결 하나로 보낼 최대 메일 수 (기본: EMAIL_QUEUE_BATCH_SIZE)')
+        parser.add_argument('--stats', action='store_true', help='큐 상태만 출력')
+        parser.add_argument('--retry-dead', action='store_true', help='dead 메일을 대기 상태로 되돌림')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            return self._print_stats()
+        if options['retry_dead']:
+            # 본문을 지운 민감 메일(만료된 인증 코드 등)은 되살리지 않음
+            count = OutboundEmail.objects.filter(status=OutboundEmail.STATUS_DEAD, sensitive=False).update(
+                status=OutboundEmail.STATUS_PENDING, attempts=0, next_attempt_at=timezone.now())
+            self.stdout.write(self.style.SUCCESS(f'dead 메일 {count}통을 다시 대기열에 넣었습니다.'))
+            return
+
+        lock = file_lock.try_lock('mail_queue.lock')
+        if lock is None:
+            self.stdout.write('다른 워커가 발송 중이라 건너뜁니다.')
+            return
+        try:
+            if options['loop']:
+                self._loop(options)
+            else:
+                self._run_once(options['batch_size'])
+        finally:
+            lock.close()
+
+    def _run_once(self, batch_size):
+        sent, failed = mail_queue.drain(batch_size)
+        if sent or failed:
+            self.stdout.write(f'[{timezone.localtime():%Y-%m-%d %H:%M:%S}] 발송 {sent}통, 실패 {failed}통')
+        return sent, failed
+
+    def _loop(self, options):
+        interval = options['interval'] or getattr(settings, 'EMAIL_QUEUE_INTERVAL', 5)
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+        self.stdout.write(f'메일 큐 워커 시작 ({interval:g}초 간격)')
+        last_purge = 0
+        while not stopping:
+            close_old_connections()
+            self._run_once(options['batch_size'])
+            if time.monotonic() - last_purge > 3600:
+                mail_queue.purge_sent()
+                last_purge = time.monotonic()
+            time.sleep(interval)
+        self.stdout.write('메일 큐 워커 종료')
+
+    def _print_stats(self):
+        row = mail_queue.stats()
+        age = f'{row["oldest_age_s"]}초' if row['oldest_age_s'] is not None else '-'
+        self.stdout.write(
+            f'대기 {row["pending"]} · 재시도 대기 {row["retrying"]} · dead {row["dead"]} '
+            f'(가장 오래된 대기 메일 {age})'
+        )
@@ -17,9 +17,10 @@ from collections import OrderedDict
 from datetime import date, datetime, timedelta
 
 from django.conf import settings
-from django.core.mail import send_mail
 from django.core.management.base import BaseCommand
 
+from common.services import dashboard_stats, http_client, mail_queue
+
 WEEKDAY_KR = ['월', '화', '수', '목', '금', '토', '일']
 LAUNCH_DATE = date(2025, 10, 1)  # 서비스 런칭일 (base_views와 동일)
 
@@ -67,15 +68,8 @@ class Command(BaseCommand):
         label = '주간' if period == 'weekly' else '월간'
         subject = (f'[테크창] 📊 방문자 {label} 리포트 '
                    f'{data["range_start"]:%Y-%m-%d} ~ {data["range_end"]:%Y-%m-%d}')
-        send_mail(
-            subject=subject,
-            message=text,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[recipient],
-            html_message=html,
-            fail_silently=False,
-        )
-        self.stdout.write(self.style.SUCCESS(f'방문자 리포트 발송 완료 → {recipient}'))
+        mail_queue.enqueue(subject, text, [recipient], html_body=html)
+        self.stdout.write(self.style.SUCCESS(f'방문자 리포트 발송 대기열 등록 → {recipient}'))
 
     # ------------------------------------------------------------------ #
     #  방문자 데이터 집계 (DailyVisitor)
@@ -88,8 +82,7 @@ class Command(BaseCommand):
 
         # 전체 행을 dict(date -> count)로 적재 (최근 ~120일이면 충분)
         oldest_needed = today - timedelta(days=120)
-        rows = DailyVisitor.objects.filter(date__gte=oldest_needed).values_list('date', 'visitor_count')
-        counts = {d: c for d, c in rows}
+        counts = dashboard_stats.visitor_counts(oldest_needed)
 
         def total(start, end):
             """start~end (양끝 포함) 일별 합계와 집계된 일수."""
@@ -186,7 +179,7 @@ class Command(BaseCommand):
                 from google.auth.transport.requests import Request
                 creds = Credentials.from_authorized_user_file(oauth_path, self.GSC_SCOPES)
                 if not creds.valid and creds.expired and creds.refresh_token:
-                    creds.refresh(Request())
+                    creds.refresh(Request(session=http_client.session('google')))
                     with open(oauth_path, 'w', encoding='utf-8') as f:
                         f.write(creds.to_json())  # 갱신된 access token 보존
                 return creds, None
@@ -0,0 +1,37 @@
+"""
+외부 API 스텁 서버 실행 (common.services.http_stub)
+
+카카오 로그인·끝말잇기 사전 검증을 외부망 없이 부하 테스트할 때 씁니다.
+사이트는 HTTP_CLIENT_STUB_URL 을 이 주소로 두고 실행합니다 (운영 서버에서는 쓰지 말 것).
+
+사용법:
+  python manage.py stub_upstreams                          # 127.0.0.1:8765
+  python manage.py stub_upstreams --latency 0.2 --fail-rate 0.1   # 느리고 불안정한 상대 재현
+  HTTP_CLIENT_STUB_URL=http://127.0.0.1:8765 KOREAN_DICT_API_KEY=stub python manage.py runserver
+"""
+from django.core.management.base import BaseCommand
+
+from common.services.http_stub import StubServer
+
+
+class Command(BaseCommand):
+    help = '카카오 OAuth·국립국어원 사전·GitHub 응답을 흉내 내는 스텁 서버를 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', type=str, default='127.0.0.1', help='바인드 주소 (기본: 127.0.0.1)')
+        parser.add_argument('--port', type=int, default=8765, help='포트 (기본: 8765)')
+        parser.add_argument('--latency', type=float, default=0.0, help='응답 지연(초) (기본: 0)')
+        parser.add_argument('--fail-rate', type=float, default=0.0, help='503 응답 비율 (기본: 0)')
+        parser.add_argument('--unknown', nargs='*', default=[], help='사전에 없는 단어로 응답할 단어들')
+
+    def handle(self, *args, **options):
+        stub = StubServer(options['host'], options['port'], options['latency'], options['fail_rate'],
+                          options['unknown'])
+        self.stdout.write(f'스텁 서버 {stub.url} (HTTP_CLIENT_STUB_URL={stub.url}) — Ctrl+C 로 종료')
+        try:
+            stub.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stub.stop()
+            self.stdout.write(f'요청 {stub.requests}건, 연결 {stub.connections}개')
@@ -12,7 +12,9 @@ from django.conf import settings
 from django.utils import timezone
 from common.admin_security import is_trusted_admin_request
 import logging
+import random
 import re
+import time
 logger = logging.getLogger(__name__)
 
 class SecurityMiddleware:
@@ -308,6 +310,85 @@ class RequestLoggingMiddleware:
         return False
 
 
+class MetricsMiddleware:
+    """요청 지표 수집 (URL 이름별 응답 시간 히스토그램·상태 코드 카운터·게임 수 카운터)
+
+    세션·인증·보안 미들웨어보다 바깥쪽에 두어 그 처리 시간까지 포함한다. URL 해석 전에
+    응답한 요청(차단·레이트 리밋 등)은 view="(unresolved)" 로 집계된다.
+    """
+
+    # 게임 한 수(手)로 셀 뷰 → game 라벨
+    GAME_MOVE_VIEWS = {
+        'community:baseball_guess': 'baseball',
+        'community:game2048_move': '2048',
+        'community:minesweeper_reveal': 'minesweeper',
+        'community:minesweeper_flag': 'minesweeper',
+        'community:tictactoe_move': 'tictactoe',
+        'community:wordchain_add_word': 'wordchain',
+    }
+    # method 라벨 값 — 클라이언트가 임의의 메서드를 보내도 시계열이 늘지 않게 나머지는 'other'
+    METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from common.services import metrics
+
+        start = time.perf_counter()
+        metrics.HTTP_IN_PROGRESS.inc()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.HTTP_IN_PROGRESS.dec()
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else '(unresolved)'
+        metrics.HTTP_LATENCY.observe(elapsed, view=view)
+        method = request.method if request.method in self.METHODS else 'other'
+        metrics.HTTP_REQUESTS.inc(view=view, method=method, status=response.status_code)
+        game = self.GAME_MOVE_VIEWS.get(view)
+        if game and response.status_code < 400:
+            metrics.GAME_MOVES.inc(game=game)
+        return response
+
+
+class SQLProfilerMiddleware:
+    """표본 요청의 SQL 쿼리 수·DB 시간·반복 문장(N+1 의심)을 기록 (SQL_PROFILER_SAMPLE_RATE)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = getattr(settings, 'SQL_PROFILER_SAMPLE_RATE', 0)
+        if rate <= 0 or random.random() >= rate:
+            return self.get_response(request)
+
+        from contextlib import ExitStack
+        from django.db import connections
+        from common.services import sql_profiler
+
+        profiler = sql_profiler.QueryProfiler()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(profiler))
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else '(unresolved)'
+        report = profiler.report()
+        request.sql_profile = report
+        sql_profiler.record(view, report)
+
+        logger.info(f"SQL profile - Path: {request.path}, View: {view}, "
+                    f"Queries: {report['queries']}, DB: {report['db_ms']}ms")
+        for item in report['repeated']:
+            logger.warning(f"N+1 suspected - View: {view}, Count: {item['count']}, "
+                           f"Time: {item['ms']}ms, SQL: {item['statement'][:200]}")
+        return response
+
+
 class EmailVerificationRequiredMiddleware:
     """비카카오·미인증 사용자에게 이메일 인증을 강제하는 게이트.
 
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0013_logfinding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogIndexCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=30, unique=True, verbose_name='로그 소스')),
+                ('inode', models.BigIntegerField(default=0, verbose_name='파일 inode')),
+                ('offset', models.BigIntegerField(default=0, verbose_name='읽은 위치(바이트)')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='갱신 시각')),
+            ],
+            options={
+                'verbose_name': '로그 인덱스 커서',
+                'verbose_name_plural': '로그 인덱스 커서 목록',
+            },
+        ),
+        migrations.CreateModel(
+            name='LogMinuteStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=30, verbose_name='로그 소스')),
+                ('minute', models.DateTimeField(verbose_name='분')),
+                ('counts', models.JSONField(default=dict, verbose_name='카운터')),
+                ('paths_404', models.JSONField(default=dict, verbose_name='404 경로')),
+                ('warnings', models.JSONField(default=dict, verbose_name='Warning 패턴')),
+                ('errors', models.JSONField(default=list, verbose_name='에러 샘플')),
+                ('samples_5xx', models.JSONField(default=list, verbose_name='5xx 샘플')),
+            ],
+            options={
+                'verbose_name': '로그 분 단위 집계',
+                'verbose_name_plural': '로그 분 단위 집계 목록',
+                'constraints': [models.UniqueConstraint(fields=('source', 'minute'), name='log_minute_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0014_log_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logminutestat',
+            name='templates',
+            field=models.JSONField(default=list, verbose_name='에러·경고 템플릿'),
+        ),
+    ]
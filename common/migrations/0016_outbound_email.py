@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0015_log_minute_templates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboundEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=300, verbose_name='제목')),
+                ('body', models.TextField(verbose_name='본문')),
+                ('html_body', models.TextField(blank=True, verbose_name='HTML 본문')),
+                ('from_email', models.CharField(blank=True, max_length=254, verbose_name='보내는 사람')),
+                ('to', models.JSONField(default=list, verbose_name='받는 사람')),
+                ('attachments', models.JSONField(blank=True, default=list, verbose_name='첨부 파일')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('sent', '발송'), ('dead', '발송 포기')], default='pending', max_length=10, verbose_name='상태')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='다음 시도 시각')),
+                ('last_error', models.TextField(blank=True, verbose_name='마지막 오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='등록 시각')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='발송 시각')),
+            ],
+            options={
+                'verbose_name': '발송 대기 메일',
+                'verbose_name_plural': '발송 대기 메일 목록',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='outbound_email_due_idx')],
+            },
+        ),
+    ]
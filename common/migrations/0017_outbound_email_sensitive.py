@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:57
+
+from django.db import migrations, models
+from django.db.models import Q
+
+REDACTED_BODY = '(발송 후 본문 삭제됨)'
+SENSITIVE_SUBJECTS = ('인증 코드', '임시 비밀번호')
+
+
+def redact_existing(apps, schema_editor):
+    """이미 쌓인 행: 인증 코드·임시 비밀번호 메일을 sensitive 로 표시하고, 발송·폐기된 본문 삭제"""
+    OutboundEmail = apps.get_model('common', 'OutboundEmail')
+    subjects = Q()
+    for word in SENSITIVE_SUBJECTS:
+        subjects |= Q(subject__contains=word)
+    OutboundEmail.objects.filter(subjects).update(sensitive=True)
+    OutboundEmail.objects.filter(Q(status='sent') | Q(status='dead', sensitive=True)).update(
+        body=REDACTED_BODY, html_body='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0016_outbound_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboundemail',
+            name='sensitive',
+            field=models.BooleanField(default=False, verbose_name='민감 정보 포함'),
+        ),
+        migrations.RunPython(redact_existing, migrations.RunPython.noop),
+    ]
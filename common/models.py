@@ -308,15 +308,21 @@ class LogFinding(models.Model):
         return f"[{self.get_status_display()}] {self.title}"
 
     @staticmethod
-    def make_fingerprint(title: str, cause: str = '') -> str:
+    def make_fingerprint(title: str, cause: str = '', template: str = '') -> str:
         """오류 '종류' 기반 안정 시그니처. AI가 문구를 바꿔 써도 같은 종류는 같은 지문.
 
-        제목을 우선순위로 분류해 하나의 버킷에 매핑한다(500/4xx/Warning/스캔/기타).
+        근거 로그 템플릿(common.services.log_templates)이 있으면 템플릿 지문을 쓴다
+        (템플릿이 <*> 로 더 일반화돼도 같은 지문 — log_templates.signature).
+        없으면 제목을 우선순위로 분류해 하나의 버킷에 매핑한다(500/4xx/Warning/스캔/기타).
         500 은 경로(숫자→:id 정규화)까지 포함해 서로 다른 깨진 URL 을 구분한다.
         """
         import hashlib
         import re
 
+        if template:
+            from common.services.log_templates import template_fingerprint
+            return template_fingerprint(template)
+
         t = (title or '').lower()
         blob = f"{title or ''} {cause or ''}"
 
@@ -337,7 +343,7 @@ class LogFinding(models.Model):
 
     @classmethod
     def record(cls, finding: dict, severity: str = '', overview: str = ''):
-        """분석 결과 finding({title,cause,action}) 1건을 저장(upsert)한다.
+        """분석 결과 finding({title,cause,action[,template]}) 1건을 저장(upsert)한다.
 
         - 같은 fingerprint 가 이미 있으면 새로 만들지 않는다(이미 결정된 건도 보존).
         - 신규일 때만 (obj, True) 를 반환, 기존이면 (obj, False).
@@ -347,7 +353,7 @@ class LogFinding(models.Model):
         if not title:
             return None, False
         cause = (finding.get('cause') or '').strip()
-        fp = cls.make_fingerprint(title, cause)
+        fp = cls.make_fingerprint(title, cause, (finding.get('template') or '').strip())
         obj, created = cls.objects.get_or_create(
             fingerprint=fp,
             defaults={
@@ -359,3 +365,94 @@ class LogFinding(models.Model):
             },
         )
         return obj, created
+
+
+class LogIndexCursor(models.Model):
+    """로그 인덱서가 마지막으로 읽은 위치 (common.services.log_index).
+
+    inode 로 RotatingFileHandler 회전을 감지하고, offset 부터 이어서 읽는다.
+    """
+    source = models.CharField(max_length=30, unique=True, verbose_name='로그 소스')
+    inode = models.BigIntegerField(default=0, verbose_name='파일 inode')
+    offset = models.BigIntegerField(default=0, verbose_name='읽은 위치(바이트)')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='갱신 시각')
+
+    class Meta:
+        verbose_name = '로그 인덱스 커서'
+        verbose_name_plural = '로그 인덱스 커서 목록'
+
+    def __str__(self):
+        return f"{self.source} @ {self.offset}"
+
+
+class LogMinuteStat(models.Model):
+    """로그 1분 단위 집계 — 서버 모니터는 원본 대신 이 행들을 합산한다.
+
+    counts: 레벨/상태코드/보안 이벤트 카운터, paths_404: 404 경로별 횟수,
+    warnings: Warning 패턴 키별 [횟수, 대표 문구], errors/samples_5xx: 샘플 라인.
+    templates: 에러·경고 줄의 Drain 템플릿 (common.services.log_templates).
+    """
+    source = models.CharField(max_length=30, verbose_name='로그 소스')
+    minute = models.DateTimeField(verbose_name='분')
+    counts = models.JSONField(default=dict, verbose_name='카운터')
+    paths_404 = models.JSONField(default=dict, verbose_name='404 경로')
+    warnings = models.JSONField(default=dict, verbose_name='Warning 패턴')
+    errors = models.JSONField(default=list, verbose_name='에러 샘플')
+    samples_5xx = models.JSONField(default=list, verbose_name='5xx 샘플')
+    templates = models.JSONField(default=list, verbose_name='에러·경고 템플릿')
+
+    class Meta:
+        verbose_name = '로그 분 단위 집계'
+        verbose_name_plural = '로그 분 단위 집계 목록'
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'minute'], name='log_minute_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.source} {self.minute:%Y-%m-%d %H:%M}"
+
+
+class OutboundEmail(models.Model):
+    """발송 대기 메일 (common.services.mail_queue).
+
+    요청 처리 중에는 이 테이블에 넣기만 하고, send_queued_mail 워커가
+    SMTP 연결 하나로 여러 통을 묶어 보낸다. 실패하면 next_attempt_at 을 늦춰
+    재시도하고, 최대 횟수를 넘기거나 영구 오류면 dead 로 남긴다.
+    attachments: [{'path': 파일 경로, 'delete': 발송·폐기 후 삭제 여부}]
+    본문은 발송하면 지우고(REDACTED_BODY), sensitive(인증 코드·임시 비밀번호·OTP) 메일은 dead 가 돼도 지운다.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_DEAD = 'dead'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '대기'),
+        (STATUS_SENT, '발송'),
+        (STATUS_DEAD, '발송 포기'),
+    ]
+    REDACTED_BODY = '(발송 후 본문 삭제됨)'
+
+    subject = models.CharField(max_length=300, verbose_name='제목')
+    body = models.TextField(verbose_name='본문')
+    html_body = models.TextField(blank=True, verbose_name='HTML 본문')
+    from_email = models.CharField(max_length=254, blank=True, verbose_name='보내는 사람')
+    to = models.JSONField(default=list, verbose_name='받는 사람')
+    attachments = models.JSONField(default=list, blank=True, verbose_name='첨부 파일')
+    sensitive = models.BooleanField(default=False, verbose_name='민감 정보 포함')
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name='상태')
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name='다음 시도 시각')
+    last_error = models.TextField(blank=True, verbose_name='마지막 오류')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='등록 시각')
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name='발송 시각')
+
+    class Meta:
+        verbose_name = '발송 대기 메일'
+        verbose_name_plural = '발송 대기 메일 목록'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbound_email_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"[{self.get_status_display()}] {self.subject}"
@@ -19,14 +19,28 @@
     # 스트리밍 (제너레이터)
     for chunk in ask_stream("긴 칼럼을 작성해줘"):
         print(chunk, end="", flush=True)
+
+    # 프롬프트 캐싱: 매번 같은 긴 지침은 system_blocks() 로 앞에 두고, 바뀌는 내용은 prompt 로
+    reply = ask(오늘의_요청, system=system_blocks(역할_지침, 작성_형식))
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import logging
 import os
+import random
+import threading
+import time
+from collections import OrderedDict
 from enum import Enum
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
 
 
 class ClaudeModel(str, Enum):
@@ -41,42 +55,349 @@ class ClaudeModel(str, Enum):
 
 DEFAULT_MODEL = ClaudeModel.SONNET
 
+# 1M 토큰당 USD (입력, 출력) — 모델 ID 접두어로 찾음, settings.CLAUDE_PRICING 으로 덮어쓰기
+PRICING = {
+    'claude-haiku': (1.0, 5.0),
+    'claude-sonnet': (3.0, 15.0),
+    'claude-opus': (5.0, 25.0),
+}
+
+# 프롬프트 캐시 입력 토큰 단가 배율 (기본 입력 단가 기준: 5분 캐시 쓰기 1.25배, 읽기 0.1배)
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
+# 다시 보내면 성공할 수 있는 상태 코드 (429 속도 제한, 5xx·529 과부하)
+RETRY_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+MAX_RETRY_DELAY = 30.0
+
+_client = None
+_client_key = None
+_client_lock = threading.Lock()
+_cache = None
+_cache_key = None
+_budget = None
+_budget_key = None
+
+
+def _price(model):
+    table = {**PRICING, **getattr(settings, 'CLAUDE_PRICING', {})}
+    for prefix, price in sorted(table.items(), key=lambda item: -len(item[0])):
+        if model.startswith(prefix):
+            return price
+    return 0.0, 0.0
+
+
+def _usage_tokens(usage):
+    """usage → {'input', 'output', 'cache_read', 'cache_write'} (input 은 캐시를 거치지 않은 입력만)"""
+    return {
+        'input': getattr(usage, 'input_tokens', 0) or 0,
+        'output': getattr(usage, 'output_tokens', 0) or 0,
+        'cache_read': getattr(usage, 'cache_read_input_tokens', 0) or 0,
+        'cache_write': getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+    }
+
+
+def call_cost(model, usage):
+    """usage → USD (가격표에 없는 모델은 0, 캐시 읽기·쓰기는 입력 단가에 배율 적용)"""
+    if usage is None:
+        return 0.0
+    input_price, output_price = _price(model)
+    tokens = _usage_tokens(usage)
+    return (
+        (tokens['input'] + tokens['cache_write'] * CACHE_WRITE_MULTIPLIER
+         + tokens['cache_read'] * CACHE_READ_MULTIPLIER) * input_price
+        + tokens['output'] * output_price
+    ) / 1_000_000
+
+
+def _record_call(model, mode, started, result, usage=None):
+    """호출 지표 기록 (응답 시간·성공 여부·토큰 사용량·비용 → common.services.metrics)"""
+    from common.services import metrics
+
+    elapsed = time.perf_counter() - started
+    metrics.CLAUDE_LATENCY.observe(elapsed, model=model, mode=mode)
+    metrics.CLAUDE_REQUESTS.inc(model=model, result=result)
+    if usage is not None:
+        tokens = _usage_tokens(usage)
+        cost = call_cost(model, usage)
+        for kind, count in tokens.items():
+            if count:
+                metrics.CLAUDE_TOKENS.inc(count, model=model, kind=kind)
+        metrics.CLAUDE_COST.inc(cost, model=model)
+        logger.info(
+            f'Claude {mode} {model}: {elapsed:.2f}s, in={tokens["input"]} '
+            f'(cache read={tokens["cache_read"]} write={tokens["cache_write"]}) out={tokens["output"]}, ${cost:.4f}'
+        )
+
 
 def _get_client():
-    """Anthropic 클라이언트를 반환. API 키가 없으면 RuntimeError."""
+    """
+    프로세스 공용 Anthropic 클라이언트 (연결 풀 재사용). API 키가 없으면 RuntimeError.
+
+    CLAUDE_BACKEND=fake 면 common.services.claude_fake.FakeAnthropic.
+    fork 된 워커나 키가 바뀐 경우에만 새로 만든다. SDK 자체 재시도는 끄고 _with_retries 가 맡는다.
+    """
+    global _client, _client_key
+    backend = getattr(settings, 'CLAUDE_BACKEND', 'anthropic')
+    api_key = getattr(settings, 'ANTHROPIC_API_KEY', '') or os.environ.get('ANTHROPIC_API_KEY', '')
+    key = (os.getpid(), backend, api_key)
+    if _client is not None and _client_key == key:
+        return _client
+
+    with _client_lock:
+        if _client is not None and _client_key == key:
+            return _client
+        if backend == 'fake':
+            from common.services.claude_fake import FakeAnthropic
+            client = FakeAnthropic()
+        else:
+            try:
+                import anthropic
+            except ImportError:
+                raise RuntimeError(
+                    'anthropic 패키지가 설치되어 있지 않습니다.\n'
+                    'pip install "anthropic>=0.40.0" 를 실행하세요.'
+                )
+            if not api_key:
+                raise RuntimeError(
+                    'ANTHROPIC_API_KEY가 설정되지 않았습니다.\n'
+                    '.env 파일에 ANTHROPIC_API_KEY=sk-ant-... 를 추가하세요.'
+                )
+            client = anthropic.Anthropic(
+                api_key=api_key,
+                max_retries=0,
+                timeout=getattr(settings, 'CLAUDE_TIMEOUT', 120),
+            )
+        _client, _client_key = client, key
+        return client
+
+
+def warm_up():
+    """SDK import(~1초)·클라이언트 생성을 미리 해 둠 (ASGI 프로세스 시작 시 — 첫 스트리밍 요청의 첫 토큰 지연 방지)"""
+    try:
+        _get_client()
+    except RuntimeError as exc:
+        logger.info(f'Claude warm-up skipped: {exc}')
+
+
+def fake_client():
+    """CLAUDE_BACKEND=fake 일 때 현재 대역 객체 (테스트에서 fail_next·calls 확인용)"""
+    from common.services.claude_fake import FakeAnthropic
+
+    client = _get_client()
+    if not isinstance(client, FakeAnthropic):
+        raise RuntimeError('CLAUDE_BACKEND=fake 가 아닙니다.')
+    return client
+
+
+def reset_client():
+    """공용 클라이언트·응답 캐시·호출 예산을 버림 (설정을 바꾼 테스트·벤치마크용)"""
+    global _client, _client_key, _cache, _cache_key, _budget, _budget_key
+    with _client_lock:
+        _client = _client_key = None
+        _cache = _cache_key = None
+        _budget = _budget_key = None
+
+
+class CallBudget:
+    """
+    프로세스 공용 호출 예산: 동시에 API 를 기다리는 요청 concurrency 개,
+    요청 간격 60/per_minute 초 (0 이면 제한 없음). 배치 생성 스레드들이 함께 나눠 쓴다.
+    """
+
+    def __init__(self, concurrency, per_minute):
+        self._slots = threading.BoundedSemaphore(concurrency) if concurrency else None
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        if self.interval:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._next_at - now
+                self._next_at = max(now, self._next_at) + self.interval
+            if wait > 0:
+                time.sleep(wait)
+        if self._slots:
+            self._slots.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        if self._slots:
+            self._slots.release()
+
+
+def call_budget():
+    """settings.CLAUDE_MAX_CONCURRENCY · CLAUDE_REQUESTS_PER_MINUTE 에 맞는 공용 예산"""
+    global _budget, _budget_key
+    key = (getattr(settings, 'CLAUDE_MAX_CONCURRENCY', 4), getattr(settings, 'CLAUDE_REQUESTS_PER_MINUTE', 0))
+    if _budget is None or _budget_key != key:
+        with _client_lock:
+            if _budget is None or _budget_key != key:
+                _budget, _budget_key = CallBudget(*key), key
+    return _budget
+
+
+def _retry_delay(exc, attempt):
+    """retry-after 헤더가 있으면 그 값, 없으면 full jitter 지수 백오프"""
+    response = getattr(exc, 'response', None)
+    header = response.headers.get('retry-after') if response is not None else None
+    if header:
+        try:
+            return min(float(header), MAX_RETRY_DELAY)
+        except ValueError:
+            pass
+    base = getattr(settings, 'CLAUDE_RETRY_BASE', 1.0)
+    return random.uniform(0, min(base * 2 ** attempt, MAX_RETRY_DELAY))
+
+
+def _retryable(exc):
+    status = getattr(exc, 'status_code', None)
+    if status is not None:
+        return status in RETRY_STATUSES
     try:
         import anthropic
     except ImportError:
-        raise RuntimeError(
-            'anthropic 패키지가 설치되어 있지 않습니다.\n'
-            'pip install "anthropic>=0.40.0" 를 실행하세요.'
-        )
+        return False
+    return isinstance(exc, (anthropic.APIConnectionError, anthropic.APITimeoutError))
+
+
+def _with_retries(model, call):
+    """call() 을 과부하·속도 제한·연결 오류일 때 CLAUDE_MAX_RETRIES 번까지 다시 시도"""
+    from common.services import metrics
+
+    retries = getattr(settings, 'CLAUDE_MAX_RETRIES', 3)
+    attempt = 0
+    while True:
+        try:
+            # 재시도 대기 중에는 예산을 잡지 않는다 (다른 스레드가 그 사이 호출)
+            with call_budget():
+                return call()
+        except Exception as exc:
+            if attempt >= retries or not _retryable(exc):
+                raise
+            delay = _retry_delay(exc, attempt)
+            attempt += 1
+            metrics.CLAUDE_REQUESTS.inc(model=model, result='retry')
+            logger.warning(f'Claude {model} {type(exc).__name__}, retry {attempt}/{retries} in {delay:.1f}s')
+            time.sleep(delay)
+
+
+# ---------------------------------------------------------------------- #
+#  응답 캐시 (같은 model·system·prompt·max_tokens 이면 API 를 다시 부르지 않음)
+# ---------------------------------------------------------------------- #
+class MemoryResponseCache:
+    """프로세스 메모리 LRU (max_entries 개, ttl 초)"""
+
+    def __init__(self, ttl, max_entries, max_bytes):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if len(value.encode('utf-8')) > self.max_bytes:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+
+class DjangoResponseCache:
+    """Django 기본 캐시 (DJANGO_CACHE_BACKEND=shm 이면 워커 간 공유, 개수 제한은 캐시 백엔드 몫)"""
+
+    def __init__(self, ttl, max_entries, max_bytes):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    def get(self, key):
+        from django.core.cache import cache
+        return cache.get(f'claude:response:{key}')
+
+    def set(self, key, value):
+        from django.core.cache import cache
+        if len(value.encode('utf-8')) <= self.max_bytes:
+            cache.set(f'claude:response:{key}', value, self.ttl)
+
+
+RESPONSE_CACHES = {'memory': MemoryResponseCache, 'django': DjangoResponseCache}
+
+
+def response_cache():
+    """settings.CLAUDE_RESPONSE_CACHE ('memory' | 'django' | 클래스 경로 | '' 끔) 에 맞는 캐시"""
+    global _cache, _cache_key
+    name = getattr(settings, 'CLAUDE_RESPONSE_CACHE', 'django')
+    options = (
+        getattr(settings, 'CLAUDE_CACHE_TTL', 3600),
+        getattr(settings, 'CLAUDE_CACHE_MAX_ENTRIES', 256),
+        getattr(settings, 'CLAUDE_CACHE_MAX_BYTES', 64 * 1024),
+    )
+    if not name:
+        return None
+    if _cache is None or _cache_key != (name, options):
+        cls = RESPONSE_CACHES.get(name) or import_string(name)
+        _cache, _cache_key = cls(*options), (name, options)
+    return _cache
+
+
+def system_blocks(*parts: str, ttl: str = '', cache: bool = True) -> list[dict]:
+    """
+    시스템 프롬프트 조각들 → 텍스트 블록 목록. 각 조각 끝에 cache_control 중단점을 둔다.
+
+    조각은 '여러 호출이 공유하는 것 → 호출마다 같은 것' 순서로 넘기고, 호출마다 바뀌는 내용은
+    prompt 에 넣는다. 앞 조각까지가 같으면 다른 호출도 그 접두어를 캐시에서 읽는다.
+    (중단점은 요청당 최대 4개, 모델별 최소 길이보다 짧은 접두어는 캐시되지 않음)
+    ttl: '' 면 5분, '1h' 면 1시간 (쓰기 단가 2배)
+    cache: False 면 중단점 없이 블록만 — 캐시 쓰기는 입력 단가의 1.25배라, TTL 안에 같은 접두어로
+           다시 부르지 않는 일회성 호출(cron 한 번에 한 건)은 캐시하면 오히려 비쌈
+    """
+    if not cache:
+        return [{'type': 'text', 'text': part} for part in parts if part]
+    cache_control = {'type': 'ephemeral', **({'ttl': ttl} if ttl else {})}
+    blocks = [{'type': 'text', 'text': part} for part in parts if part]
+    for block in blocks[-4:]:
+        block['cache_control'] = dict(cache_control)
+    return blocks
 
-    api_key = getattr(settings, 'ANTHROPIC_API_KEY', '') or os.environ.get('ANTHROPIC_API_KEY', '')
-    if not api_key:
-        raise RuntimeError(
-            'ANTHROPIC_API_KEY가 설정되지 않았습니다.\n'
-            '.env 파일에 ANTHROPIC_API_KEY=sk-ant-... 를 추가하세요.'
-        )
 
-    return anthropic.Anthropic(api_key=api_key)
+def cache_key(model, system, prompt, max_tokens):
+    raw = json.dumps([str(model), system, prompt, max_tokens], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
 
 
 def ask(
-    prompt: str,
+    prompt: str | list[dict],
     *,
-    system: str = '',
+    system: str | list[dict] = '',
     model: ClaudeModel | str = DEFAULT_MODEL,
     max_tokens: int = 2048,
+    cache: bool = False,
 ) -> str:
     """
     Claude에게 단일 질문을 보내고 응답 문자열을 반환합니다.
 
     Args:
         prompt:     사용자 메시지
-        system:     시스템 프롬프트 (선택)
+        system:     시스템 프롬프트 (선택, 문자열 또는 system_blocks() 블록 목록)
         model:      ClaudeModel 열거형 또는 모델 ID 문자열
         max_tokens: 최대 출력 토큰 수
+        cache:      True 면 같은 (model, system, prompt, max_tokens) 응답을 캐시에서 재사용
 
     Returns:
         Claude의 응답 텍스트
@@ -84,6 +405,15 @@ def ask(
     Raises:
         RuntimeError: API 키 미설정 또는 anthropic 패키지 없음
     """
+    store = response_cache() if cache else None
+    key = cache_key(model, system, prompt, max_tokens) if store else None
+    if store:
+        cached = store.get(key)
+        if cached is not None:
+            from common.services import metrics
+            metrics.CLAUDE_REQUESTS.inc(model=str(model), result='cache_hit')
+            return cached
+
     client = _get_client()
 
     kwargs = dict(
@@ -94,14 +424,51 @@ def ask(
     if system:
         kwargs['system'] = system
 
-    response = client.messages.create(**kwargs)
-    return response.content[0].text
+    started = time.perf_counter()
+    try:
+        response = _with_retries(str(model), lambda: client.messages.create(**kwargs))
+    except Exception:
+        _record_call(str(model), 'create', started, 'error')
+        raise
+    _record_call(str(model), 'create', started, 'ok', getattr(response, 'usage', None))
+    text = response.content[0].text
+    if store:
+        store.set(key, text)
+    return text
+
+
+class _OpenedStream:
+    """첫 조각까지 받아 둔 스트림 (with 로 닫음)"""
+
+    def __init__(self, manager, context, iterator, first):
+        self.manager = manager
+        self._context = context
+        self.rest = iterator
+        self.first = first
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return self._context.__exit__(*exc)
+
+
+def _open_stream(client, kwargs):
+    context = client.messages.stream(**kwargs)
+    manager = context.__enter__()
+    try:
+        iterator = iter(manager.text_stream)
+        first = next(iterator, None)
+    except BaseException as exc:
+        context.__exit__(type(exc), exc, exc.__traceback__)
+        raise
+    return _OpenedStream(manager, context, iterator, first)
 
 
 def ask_stream(
-    prompt: str,
+    prompt: str | list[dict],
     *,
-    system: str = '',
+    system: str | list[dict] = '',
     model: ClaudeModel | str = DEFAULT_MODEL,
     max_tokens: int = 2048,
 ) -> Generator[str, None, None]:
@@ -128,17 +495,78 @@ def ask_stream(
     if system:
         kwargs['system'] = system
 
-    with client.messages.stream(**kwargs) as stream:
-        for text in stream.text_stream:
-            yield text
+    started = time.perf_counter()
+    result, usage = 'error', None
+    try:
+        # 첫 조각을 받기 전의 실패만 재시도 (이미 보낸 조각은 되돌릴 수 없음)
+        stream = _with_retries(str(model), lambda: _open_stream(client, kwargs))
+        with stream:
+            if stream.first is not None:
+                from common.services import metrics
+                metrics.CLAUDE_TTFT.observe(time.perf_counter() - started, model=str(model))
+                yield stream.first
+            for text in stream.rest:
+                yield text
+            usage = getattr(stream.manager.get_final_message(), 'usage', None)
+            result = 'ok'
+    finally:
+        # 클라이언트가 중간에 끊어도(GeneratorExit) 지표는 남긴다
+        _record_call(str(model), 'stream', started, result, usage)
+
+
+async def ask_astream(prompt: str | list[dict], **kwargs) -> AsyncGenerator[str, None]:
+    """
+    ask_stream 의 async 버전 (ASGI 뷰용). 인자는 ask_stream 과 같습니다.
+
+    SDK 호출·재시도·지표는 ask_stream 을 그대로 쓰고, 별도 스레드에서 받은 조각을
+    이벤트 루프로 넘깁니다 — 기다리는 동안 루프(다른 요청)를 막지 않습니다.
+    소비를 멈추면(클라이언트 연결 끊김) 스레드도 다음 조각에서 스트림을 닫습니다.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    stopped = threading.Event()
+
+    def put(item):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            stopped.set()  # 이벤트 루프가 이미 닫힘
+
+    def pump():
+        try:
+            stream = ask_stream(prompt, **kwargs)
+            try:
+                for text in stream:
+                    if stopped.is_set():
+                        break
+                    put(('text', text))
+            finally:
+                stream.close()
+            put(('end', None))
+        except Exception as exc:
+            put(('error', exc))
+
+    threading.Thread(target=pump, name='claude-astream', daemon=True).start()
+    try:
+        while True:
+            kind, value = await queue.get()
+            if kind == 'text':
+                yield value
+            elif kind == 'end':
+                return
+            else:
+                raise value
+    finally:
+        stopped.set()
 
 
 def ask_json(
-    prompt: str,
+    prompt: str | list[dict],
     *,
-    system: str = '',
+    system: str | list[dict] = '',
     model: ClaudeModel | str = DEFAULT_MODEL,
     max_tokens: int = 2048,
+    cache: bool = False,
 ) -> dict:
     """
     JSON 응답을 기대하는 요청에 사용합니다.
@@ -147,10 +575,9 @@ def ask_json(
     Raises:
         ValueError: JSON 파싱 실패 시
     """
-    import json
     import re
 
-    raw = ask(prompt, system=system, model=model, max_tokens=max_tokens)
+    raw = ask(prompt, system=system, model=model, max_tokens=max_tokens, cache=cache)
 
     # ```json ... ``` 블록 추출
     match = re.search(r'```(?:json)?\s*([\s\S]+?)```', raw)
@@ -0,0 +1,180 @@
+"""
+오프라인 Claude 대역 (CLAUDE_BACKEND=fake)
+
+anthropic.Anthropic 중 이 프로젝트가 쓰는 부분(messages.create / messages.stream)만
+같은 모양으로 흉내 냅니다. 같은 입력이면 항상 같은 응답과 토큰 수를 돌려주므로
+테스트·벤치마크를 API 키·네트워크 없이 돌릴 수 있습니다.
+
+- 응답: 시스템·프롬프트에 'json' 이 있으면 ```json {...}``` 블록, 아니면 입력 요약 문장
+- usage: 입력 글자 수 / 4, 출력 글자 수 / 4 (토큰 근사)
+- 프롬프트 캐싱: cache_control 블록까지의 접두어를 기억해, 같은 접두어가 다시 오면
+  cache_read_input_tokens, 처음이면 cache_creation_input_tokens 로 나눠 보고 (TTL 5분,
+  min_cache_tokens 보다 짧은 접두어는 실제 API 처럼 캐시하지 않음)
+- latency: 호출마다 지연(초), stream 은 첫 조각 전에 first_token_latency 만큼 대기
+- fail_next(n, status): 다음 n 번 호출을 anthropic 상태 오류로 실패 (재시도 테스트용)
+- calls: 받은 요청 kwargs 목록
+
+사용 예시:
+    from common.services import claude
+
+    with override_settings(CLAUDE_BACKEND='fake'):
+        claude.ask('안녕')                      # '[fake claude-sonnet-4-6] ...'
+        claude.fake_client().fail_next(2, 529)  # 과부하 두 번 후 성공
+"""
+import hashlib
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import anthropic
+
+API_URL = 'https://api.anthropic.com/v1/messages'
+
+
+def _text_of(content):
+    """system/content 가 문자열이든 블록 목록이든 텍스트만 이어 붙임"""
+    if isinstance(content, str):
+        return content
+    return '\n'.join(block.get('text', '') for block in content or [] if isinstance(block, dict))
+
+
+def _estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def _blocks(content):
+    if isinstance(content, str):
+        return [{'type': 'text', 'text': content}] if content else []
+    return [block for block in content or [] if isinstance(block, dict)]
+
+
+def _breakpoints(kwargs):
+    """system → messages 순서로 cache_control 블록마다 (그때까지의 접두어 글자 수, 해시)"""
+    digest = hashlib.sha256(kwargs['model'].encode())
+    length, points = 0, []
+    blocks = _blocks(kwargs.get('system', ''))
+    for message in kwargs.get('messages', []):
+        blocks += _blocks(message['content'])
+    for block in blocks:
+        text = block.get('text', '')
+        digest.update(text.encode())
+        length += len(text)
+        if block.get('cache_control'):
+            points.append((length, digest.hexdigest()))
+    return points
+
+
+class _Stream:
+    def __init__(self, client, message, chunks):
+        self._client = client
+        self._message = message
+        self._chunks = chunks
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        if self._client.first_token_latency:
+            time.sleep(self._client.first_token_latency)
+        for chunk in self._chunks:
+            if self._client.token_latency:
+                time.sleep(self._client.token_latency)
+            yield chunk
+
+    def get_final_message(self):
+        return self._message
+
+
+class _Messages:
+    def __init__(self, client):
+        self._client = client
+
+    def create(self, **kwargs):
+        return self._client._respond(kwargs)
+
+    def stream(self, **kwargs):
+        message = self._client._respond(kwargs, streaming=True)
+        text = message.content[0].text
+        chunks = [text[i:i + 8] for i in range(0, len(text), 8)]
+        return _Stream(self._client, message, chunks)
+
+
+class FakeAnthropic:
+    def __init__(self, latency=0.0, first_token_latency=0.0, token_latency=0.0):
+        self.latency = latency
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.calls = []
+        self.responder = None  # (kwargs) -> str 로 응답 문구를 바꿔 끼울 수 있음
+        self.min_cache_tokens = 0   # 모델별 최소 캐시 길이 흉내 (Sonnet 1024 등)
+        self.cache_ttl = 300.0
+        self._prefixes = {}         # 접두어 해시 → 만료 시각
+        self._failures = []
+        self._lock = threading.Lock()
+        self.messages = _Messages(self)
+
+    def fail_next(self, count, status=529):
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def _error(self, status):
+        # SDK 예외가 읽는 속성(request·status_code·headers)만 갖춘 응답 (SDK 버전마다 다른 httpx 에 묶이지 않게)
+        request = SimpleNamespace(method='POST', url=API_URL)
+        response = SimpleNamespace(status_code=status, request=request, headers={'retry-after': '0'})
+        if status == 429:
+            return anthropic.RateLimitError('fake rate limit', response=response, body=None)
+        if status >= 500:
+            return anthropic.InternalServerError('fake overloaded', response=response, body=None)
+        return anthropic.BadRequestError('fake bad request', response=response, body=None)
+
+    def _reply(self, kwargs, system, prompt):
+        if self.responder is not None:
+            return self.responder(kwargs)
+        digest = hashlib.sha256(f'{kwargs["model"]}\0{system}\0{prompt}'.encode()).hexdigest()[:12]
+        if 'json' in f'{system}{prompt}'.lower():
+            payload = {'fake': True, 'model': kwargs['model'], 'digest': digest}
+            return f'```json\n{json.dumps(payload, ensure_ascii=False)}\n```'
+        return f'[fake {kwargs["model"]}] {digest} — {prompt[:80]}'
+
+    def _respond(self, kwargs, streaming=False):
+        with self._lock:
+            self.calls.append(kwargs)
+            status = self._failures.pop(0) if self._failures else None
+        if self.latency and not streaming:
+            time.sleep(self.latency)
+        if status is not None:
+            raise self._error(status)
+
+        system = _text_of(kwargs.get('system', ''))
+        prompt = '\n'.join(_text_of(m['content']) for m in kwargs.get('messages', []))
+        text = self._reply(kwargs, system, prompt)[:kwargs.get('max_tokens', 4096) * 4]
+        total = _estimate_tokens(system + prompt)
+        read, written = self._prompt_cache(kwargs)
+        usage = SimpleNamespace(
+            input_tokens=max(0, total - read - written),
+            output_tokens=_estimate_tokens(text),
+            cache_creation_input_tokens=written,
+            cache_read_input_tokens=read,
+        )
+        return SimpleNamespace(
+            id=f'msg_fake_{len(self.calls)}', model=kwargs['model'], role='assistant',
+            content=[SimpleNamespace(type='text', text=text)], stop_reason='end_turn', usage=usage,
+        )
+
+    def _prompt_cache(self, kwargs):
+        """→ (캐시에서 읽은 토큰, 캐시에 새로 쓴 토큰)"""
+        points = [(length // 4, key) for length, key in _breakpoints(kwargs)
+                  if length // 4 >= max(1, self.min_cache_tokens)]
+        if not points:
+            return 0, 0
+        now = time.monotonic()
+        with self._lock:
+            read = max((tokens for tokens, key in points if self._prefixes.get(key, 0) > now), default=0)
+            for _tokens, key in points:
+                self._prefixes[key] = now + self.cache_ttl
+        return read, points[-1][0] - read
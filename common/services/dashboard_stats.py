@@ -0,0 +1,159 @@
+"""
+관리자 대시보드 지표 집계
+
+서버 모니터·관리자 대시보드·이메일 리포트가 각자 COUNT 를 15~30번씩 날리던 것을
+테이블당 한 번의 조건부 집계(COUNT + COUNT FILTER)와 날짜별 GROUP BY 로 바꾸고,
+결과 스냅샷을 짧은 TTL 로 캐시해 세 화면이 같은 숫자를 봅니다.
+
+- 사용자·질문·답변·댓글: 테이블당 aggregate() 한 번 (전체/오늘/최근 N일)
+- 회원 등급·이메일 인증: Profile GROUP BY rank 한 번
+- 최근 7일 방문자·질문 추이: 각각 한 번 (방문자는 date 범위, 질문은 TruncDate GROUP BY)
+- 게임 수는 게임센터 캐시(community.services.game_stats)를 재사용
+- 캐시는 TTL 만료로만 갱신 (대시보드 숫자는 최대 DASHBOARD_STATS_TTL 초 늦을 수 있음)
+
+사용 예시:
+    from common.services import dashboard_stats
+
+    stats = dashboard_stats.get_dashboard_stats()
+    stats['total_users'], stats['visitor_trend']
+"""
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+DASHBOARD_STATS_CACHE_KEY = 'dashboard_stats_snapshot'
+DASHBOARD_STATS_TTL = 60  # 초
+TREND_DAYS = 7
+COLUMN_BOT_USERNAME = 'techchang연구팀'
+
+# game_stats 라벨 → 리포트 표시 이름
+GAME_LABELS = {'baseball': '숫자야구', 'game2048': '2048', 'minesweeper': '지뢰찾기'}
+
+
+def _day_start(day):
+    """로컬 날짜 0시 (aware) — __date 조회 대신 인덱스를 타는 범위 조건에 사용"""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def visitor_counts(since):
+    """since 이후 일별 방문자 수 {date: count} (쿼리 한 번)"""
+    from community.models import DailyVisitor
+    return dict(DailyVisitor.objects.filter(date__gte=since).values_list('date', 'visitor_count'))
+
+
+def daily_counts(queryset, since, field='create_date'):
+    """since 이후 field 의 로컬 날짜별 행 수 {date: count} (GROUP BY 한 번)"""
+    rows = (
+        queryset.filter(**{f'{field}__gte': _day_start(since)})
+        .annotate(day=TruncDate(field))
+        .values('day')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    return {row['day']: row['n'] for row in rows}
+
+
+def _counts(queryset, today_start, **extra):
+    """전체·오늘 COUNT (+ 추가 조건부 COUNT) 한 번에"""
+    return queryset.aggregate(
+        total=Count('id'),
+        today=Count('id', filter=Q(create_date__gte=today_start)),
+        **extra,
+    )
+
+
+def _trend(counts, days):
+    return [{'date': d.strftime('%m/%d'), 'count': counts.get(d, 0)} for d in days]
+
+
+def compute_dashboard_stats():
+    """캐시를 거치지 않고 지표를 새로 계산 (send_log_report._collect_db_stats 형식 + 대시보드 추가 항목)"""
+    from community.models import Answer, Comment, Question, TicTacToeGame
+    from community.services.game_stats import get_game_stats
+    from common.models import Profile
+
+    today = timezone.localdate()
+    today_start = _day_start(today)
+    week_start = _day_start(today - timedelta(days=7))
+    days = [today - timedelta(days=i) for i in range(TREND_DAYS - 1, -1, -1)]
+
+    users = User.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        today=Count('id', filter=Q(date_joined__gte=today_start)),
+        active_7d=Count('id', filter=Q(last_login__gte=week_start)),
+        active_30d=Count('id', filter=Q(last_login__gte=_day_start(today - timedelta(days=30)))),
+    )
+
+    rank_stats = list(
+        Profile.objects.order_by('rank').values('rank')
+        .annotate(count=Count('id'), verified=Count('id', filter=Q(is_email_verified=True)))
+    )
+
+    is_column = Q(author__username=COLUMN_BOT_USERNAME)
+    live_questions = Question.objects.filter(is_deleted=False)
+    questions = _counts(
+        live_questions, today_start,
+        column_total=Count('id', filter=is_column),
+        column_week=Count('id', filter=is_column & Q(create_date__gte=week_start)),
+        column_today=Count('id', filter=is_column & Q(create_date__gte=today_start)),
+    )
+    answers = _counts(Answer.objects.filter(is_deleted=False), today_start)
+    comments = _counts(Comment.objects.order_by(), today_start)
+
+    visitors = visitor_counts(days[0])
+    question_days = daily_counts(live_questions, days[0])
+
+    games = get_game_stats()
+    game_detail = {GAME_LABELS.get(label, label): stat['today'] for label, stat in games['games'].items()}
+    game_detail['틱택토'] = TicTacToeGame.objects.filter(create_date__gte=today_start).count()
+
+    return {
+        'total_users': users['total'],
+        'active_users': users['active'],
+        'inactive_users': users['total'] - users['active'],
+        'new_users_today': users['today'],
+        'active_users_7d': users['active_7d'],
+        'active_users_30d': users['active_30d'],
+        'email_verified_users': sum(row['verified'] for row in rank_stats),
+        'rank_stats': [{'rank': row['rank'], 'count': row['count']} for row in rank_stats],
+
+        'total_questions': questions['total'],
+        'new_questions': questions['today'],
+        'total_answers': answers['total'],
+        'new_answers': answers['today'],
+        'total_comments': comments['total'],
+        'new_comments_today': comments['today'],
+
+        'visitors_today': visitors.get(today, 0),
+        'visitors_yesterday': visitors.get(today - timedelta(days=1), 0),
+        'visitor_trend': _trend(visitors, days),
+        'question_trend': _trend(question_days, days),
+
+        'game_plays_today': sum(game_detail.values()),
+        'game_detail': game_detail,
+
+        'top_questions': list(live_questions.order_by('-view_count').values('subject', 'view_count')[:5]),
+
+        'column_total': questions['column_total'],
+        'column_week': questions['column_week'],
+        'column_today': questions['column_today'],
+        'recent_columns': [
+            {'id': q.id, 'subject': q.subject, 'category': q.category.name if q.category else '-', 'date': q.create_date}
+            for q in live_questions.filter(is_column).select_related('category').order_by('-create_date')[:10]
+        ],
+        'computed_at': timezone.now(),
+    }
+
+
+def get_dashboard_stats():
+    """캐시된 스냅샷 (없으면 계산 후 DASHBOARD_STATS_TTL 동안 캐시) — 반환값은 수정하지 말 것"""
+    stats = cache.get(DASHBOARD_STATS_CACHE_KEY)
+    if stats is None:
+        stats = compute_dashboard_stats()
+        cache.set(DASHBOARD_STATS_CACHE_KEY, stats, DASHBOARD_STATS_TTL)
+    return stats
@@ -0,0 +1,195 @@
+"""
+SQLite 온라인 백업 엔진 (backup_db 명령어용)
+
+운영 중인 db.sqlite3 를 shutil.copy2 로 복사하면 쓰기 도중의 찢어진 파일이 나오거나
+-wal 파일에 있는 최근 커밋이 빠질 수 있습니다. 여기서는
+
+1. sqlite3 backup API 로 PAGES_PER_STEP 페이지씩 복사 (단계 사이에 잠금을 풀어 쓰기를 오래 막지 않음,
+   WAL 까지 반영된 일관된 스냅샷)
+2. 결과 파일에 PRAGMA integrity_check
+3. 저장은 두 가지
+   - gz: 스냅샷 전체를 gzip 으로 스트리밍 압축한 단일 파일 (이메일 첨부용)
+   - chunks: 페이지 경계에 맞춘 CHUNK_SIZE 조각을 sha256 으로 이름 붙여 chunks/ 에 한 번만 저장하고
+     백업마다 조각 목록(manifest)만 남김 — 백업 API 는 페이지 번호를 그대로 유지하므로
+     하루 사이 바뀌지 않은 조각은 이전 백업과 공유되어 보관 비용이 변경분 수준으로 줄어듦
+
+사용 예시:
+    snapshot = db_backup.snapshot_sqlite(db_path, backup_dir / 'db.tmp')
+    manifest, stats = db_backup.store_chunks(snapshot, backup_dir, 'db_20250101_030000')
+    db_backup.prune_chunks(backup_dir)
+    db_backup.restore_chunks(manifest, backup_dir / 'restored.sqlite3')
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+from pathlib import Path
+
+PAGES_PER_STEP = 256          # backup 단계당 복사 페이지 수
+STEP_SLEEP = 0.005            # 단계 사이 쉬는 시간(초) — 이 동안 다른 연결이 쓸 수 있음
+CHUNK_SIZE = 256 * 1024       # SQLite 페이지 크기(최대 64KiB)의 배수 → 조각이 항상 페이지 경계에서 나뉨
+COPY_BUFFER = 1024 * 1024
+CHUNK_DIR = 'chunks'
+MANIFEST_SUFFIX = '.manifest.json'
+
+
+def integrity_check(path):
+    """PRAGMA integrity_check 결과 ('ok' 이면 정상)"""
+    conn = sqlite3.connect(str(path))
+    try:
+        rows = conn.execute('PRAGMA integrity_check').fetchall()
+    finally:
+        conn.close()
+    return '\n'.join(row[0] for row in rows)
+
+
+def snapshot_sqlite(db_path, dest, pages=PAGES_PER_STEP, sleep=STEP_SLEEP):
+    """
+    운영 중인 DB 의 일관된 스냅샷을 dest 에 만들고 무결성 검사
+
+    Raises:
+        RuntimeError: 무결성 검사 실패 (dest 는 삭제됨)
+    """
+    dest = Path(dest)
+    dest.unlink(missing_ok=True)
+    source = sqlite3.connect(str(db_path), timeout=30)
+    target = sqlite3.connect(str(dest))
+    try:
+        source.backup(target, pages=pages, sleep=sleep)
+    finally:
+        target.close()
+        source.close()
+
+    result = integrity_check(dest)
+    if result != 'ok':
+        dest.unlink(missing_ok=True)
+        raise RuntimeError(f'백업 무결성 검사 실패: {result[:500]}')
+    return dest
+
+
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(COPY_BUFFER), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _atomic_gzip(dest, write):
+    """임시 파일에 gzip 으로 쓴 뒤 rename (중간에 실패해도 반쪽 파일이 남지 않음)"""
+    dest = Path(dest)
+    tmp = dest.with_name(dest.name + '.part')
+    try:
+        with gzip.open(tmp, 'wb') as out:
+            write(out)
+        os.replace(tmp, dest)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return dest
+
+
+def compress_file(path, dest):
+    """파일 전체를 gzip 으로 스트리밍 압축"""
+    def write(out):
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, out, COPY_BUFFER)
+    return _atomic_gzip(dest, write)
+
+
+def compress_stream(stream, dest):
+    """파이프(예: mysqldump stdout)를 메모리에 모으지 않고 gzip 으로 저장"""
+    return _atomic_gzip(dest, lambda out: shutil.copyfileobj(stream, out, COPY_BUFFER))
+
+
+# ---------------------------------------------------------------------- #
+#  조각(content-addressed) 저장소
+# ---------------------------------------------------------------------- #
+def _chunk_path(backup_dir, digest):
+    return Path(backup_dir) / CHUNK_DIR / digest[:2] / f'{digest}.gz'
+
+
+def store_chunks(snapshot, backup_dir, name, chunk_size=CHUNK_SIZE):
+    """
+    스냅샷을 조각으로 나눠 새 조각만 저장하고 manifest 작성
+
+    Returns:
+        tuple: (manifest 경로, {'chunks', 'new', 'new_bytes', 'size'})
+    """
+    backup_dir = Path(backup_dir)
+    digests = []
+    new = new_bytes = 0
+    whole = hashlib.sha256()
+    with open(snapshot, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            whole.update(block)
+            digest = hashlib.sha256(block).hexdigest()
+            digests.append(digest)
+            path = _chunk_path(backup_dir, digest)
+            if path.exists():
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_gzip(path, lambda out: out.write(block))
+            new += 1
+            new_bytes += path.stat().st_size
+
+    size = Path(snapshot).stat().st_size
+    manifest = backup_dir / f'{name}{MANIFEST_SUFFIX}'
+    tmp = manifest.with_name(manifest.name + '.part')
+    tmp.write_text(json.dumps({
+        'name': name, 'size': size, 'sha256': whole.hexdigest(),
+        'chunk_size': chunk_size, 'chunks': digests,
+    }), encoding='utf-8')
+    os.replace(tmp, manifest)
+    return manifest, {'chunks': len(digests), 'new': new, 'new_bytes': new_bytes, 'size': size}
+
+
+def restore_chunks(manifest, dest):
+    """
+    manifest 의 조각을 이어 붙여 DB 파일 복원 (sha256·무결성 검사 포함)
+
+    Raises:
+        RuntimeError: 조각 누락·체크섬 불일치·무결성 검사 실패
+    """
+    manifest = Path(manifest)
+    info = json.loads(manifest.read_text(encoding='utf-8'))
+    dest = Path(dest)
+    whole = hashlib.sha256()
+    with open(dest, 'wb') as out:
+        for digest in info['chunks']:
+            path = _chunk_path(manifest.parent, digest)
+            if not path.exists():
+                raise RuntimeError(f'조각 누락: {digest}')
+            with gzip.open(path, 'rb') as f:
+                block = f.read()
+            whole.update(block)
+            out.write(block)
+    if whole.hexdigest() != info['sha256']:
+        dest.unlink(missing_ok=True)
+        raise RuntimeError('복원 체크섬 불일치')
+    result = integrity_check(dest)
+    if result != 'ok':
+        raise RuntimeError(f'복원 DB 무결성 검사 실패: {result[:500]}')
+    return dest
+
+
+def prune_chunks(backup_dir):
+    """어느 manifest 도 참조하지 않는 조각 삭제 → (삭제 수, 확보 바이트)"""
+    backup_dir = Path(backup_dir)
+    referenced = set()
+    for manifest in backup_dir.glob(f'*{MANIFEST_SUFFIX}'):
+        referenced.update(json.loads(manifest.read_text(encoding='utf-8'))['chunks'])
+
+    removed = freed = 0
+    for path in (backup_dir / CHUNK_DIR).glob('*/*.gz'):
+        if path.name[:-3] not in referenced:
+            freed += path.stat().st_size
+            path.unlink()
+            removed += 1
+    return removed, freed
+
+
+def store_size(backup_dir):
+    """조각 저장소 전체 크기 (바이트)"""
+    return sum(p.stat().st_size for p in (Path(backup_dir) / CHUNK_DIR).glob('*/*.gz'))
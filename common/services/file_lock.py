@@ -0,0 +1,75 @@
+"""
+프로세스 간 파일 잠금 (fcntl.flock)
+
+여러 gunicorn 워커·관리 명령이 같은 주기 작업을 동시에 돌리지 않도록 LOGS_DIR 의
+잠금 파일을 잡습니다. 잠금은 열린 파일에 묶여 있어 close() 하거나 프로세스가 끝나면
+풀립니다.
+
+- try_lock(name): 기다리지 않는 배타 잠금 — 다른 프로세스가 가졌으면 None
+- locked(name): 잠금을 얻을 때까지 기다리는 with 블록
+- fcntl 이 없는 환경(Windows 개발 환경)에서는 잠그지 않고 통과시킨다
+
+사용 예시:
+    from common.services import file_lock
+
+    handle = file_lock.try_lock('game_reaper.lock')
+    if handle is None:
+        return              # 다른 프로세스가 실행 중
+    ...
+    handle.close()
+
+    with file_lock.locked('sqlite-write-queue.lock'):
+        ...
+"""
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경 (잠금 없이 통과)
+    fcntl = None
+
+
+def _path(name, directory=None):
+    return Path(directory or settings.LOGS_DIR) / name
+
+
+def try_lock(name, directory=None):
+    """
+    name 잠금 파일에 기다리지 않는 배타 잠금
+
+    Args:
+        name (str): 잠금 파일 이름
+        directory: 잠금 파일 디렉터리 (기본: LOGS_DIR)
+
+    Returns:
+        file | None: 잠금을 쥔 파일 (close() 로 해제), 다른 프로세스가 가졌으면 None
+
+    Raises:
+        OSError: 잠금 파일을 열 수 없을 때
+    """
+    handle = open(_path(name, directory), 'a')
+    if fcntl is None:
+        return handle
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+@contextmanager
+def locked(name, directory=None):
+    """name 잠금 파일의 배타 잠금을 얻을 때까지 기다렸다가 블록이 끝나면 해제"""
+    with open(_path(name, directory), 'a') as handle:
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
@@ -0,0 +1,116 @@
+"""
+Claude 배치 생성 (auto_write_columns · auto_write_series 공용)
+
+주제·회차마다 3~4천 토큰짜리 요청을 하나씩 기다리면 cron 한 번이 수 분 걸리고,
+중간에 실패하면 앞에서 받은 결과까지 버리게 됩니다.
+
+- 작업을 스레드 풀(concurrency 개)로 동시에 보냄 — API 호출 수·간격은
+  common.services.claude.call_budget()(CLAUDE_MAX_CONCURRENCY · CLAUDE_REQUESTS_PER_MINUTE)이 전체로 제한
+- 완료된 항목은 LOGS_DIR/generation/<이름>.json 체크포인트에 바로 기록 → 재실행하면
+  max_age 안의 결과를 다시 쓰고 실패한 항목만 새로 생성
+- 작업 함수(generate)는 Claude 만 부르고 DB 는 건드리지 않음 (DB 조회·저장은 호출한 스레드에서)
+- 게시가 끝나면 호출한 쪽이 checkpoint.discard(keys) 로 지움
+- warm=True: 첫 항목을 먼저 끝낸 뒤 나머지를 동시에 보냄 — 공통 시스템 프롬프트
+  (claude.system_blocks)가 프롬프트 캐시에 올라간 뒤라 나머지는 캐시 읽기 단가로 처리됨
+
+사용 예시:
+    from common.services import generation
+
+    checkpoint = generation.Checkpoint('columns')
+    for key, result, error, reused in generation.run(jobs, _generate, checkpoint=checkpoint):
+        ...
+    checkpoint.discard(published_keys)
+"""
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 3
+CHECKPOINT_MAX_AGE = 24 * 3600
+
+
+class Checkpoint:
+    """항목별 생성 결과 {key: {'saved_at', 'result'}} 를 JSON 파일 하나에 원자적으로 기록"""
+
+    def __init__(self, name, max_age=CHECKPOINT_MAX_AGE):
+        directory = Path(settings.LOGS_DIR) / 'generation'
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / f'{name}.json'
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, items):
+        if not items:
+            self.path.unlink(missing_ok=True)
+            return
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(items, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, self.path)
+
+    def load(self):
+        """max_age 안에 저장된 결과 {key: result}"""
+        cutoff = time.time() - self.max_age
+        return {key: item['result'] for key, item in self._read().items() if item['saved_at'] >= cutoff}
+
+    def save(self, key, result):
+        with self._lock:
+            items = self._read()
+            items[key] = {'saved_at': time.time(), 'result': result}
+            self._write(items)
+
+    def discard(self, keys):
+        with self._lock:
+            items = self._read()
+            for key in keys:
+                items.pop(key, None)
+            self._write(items)
+
+
+def run(jobs, generate, *, concurrency=DEFAULT_CONCURRENCY, checkpoint=None, warm=False):
+    """
+    jobs: [(key, payload)] → generate(payload) 를 동시에 실행해 끝나는 순서대로
+    (key, result, error, reused) 를 돌려주는 제너레이터 (호출한 스레드에서 소비).
+
+    reused=True 는 체크포인트에 있던 결과라 API 를 부르지 않은 항목.
+    warm=True 면 첫 항목을 혼자 먼저 실행 (프롬프트 캐시 채우기).
+    """
+    saved = checkpoint.load() if checkpoint else {}
+    pending = []
+    for key, payload in jobs:
+        if key in saved:
+            yield key, saved[key], None, True
+        else:
+            pending.append((key, payload))
+    if not pending:
+        return
+
+    waves = [pending[:1], pending[1:]] if warm and len(pending) > 1 else [pending]
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(pending))),
+                            thread_name_prefix='generation') as pool:
+        for wave in waves:
+            futures = {pool.submit(generate, payload): key for key, payload in wave}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    logger.warning(f'Generation {key} failed: {exc}')
+                    yield key, None, exc, False
+                    continue
+                if checkpoint:
+                    checkpoint.save(key, result)
+                yield key, result, None, False
@@ -0,0 +1,246 @@
+"""
+외부 HTTP 호출 공통 계층 (카카오 OAuth, 국립국어원 사전, GitHub, Google)
+
+뷰에서 requests.get/post 를 바로 부르면 호출마다 새 TCP·TLS 연결을 맺고,
+상대 서버가 느려지면 sync gunicorn 워커가 타임아웃 내내 묶입니다.
+
+- 서비스별 requests.Session (호스트별 keep-alive 연결 풀, 프로세스마다 따로 — fork 후 새로 만듦)
+- 서비스별 (연결, 읽기) 타임아웃과 재시도 횟수 (SERVICES, settings.HTTP_CLIENT_SERVICES 로 덮어쓰기)
+- 서킷 브레이커: 연속 실패 HTTP_CLIENT_BREAKER_FAILURES 번이면 HTTP_CLIENT_BREAKER_RESET 초 동안
+  호출하지 않고 CircuitOpen 을 던짐 → 이후 한 요청만 시험(half-open)으로 보내 성공하면 닫힘
+- 재시도 예산: 요청마다 RETRY_BUDGET_RATIO 만큼 적립, 재시도마다 1 차감 — 장애 때 재시도가 부하를 키우지 않게
+- 재시도는 GET/HEAD 의 연결 오류·타임아웃·5xx·429, 그 밖의 메서드는 연결 전 실패(ConnectTimeout)만
+- 지표: upstream_requests_total{service,result}, upstream_request_duration_seconds{service}
+- HTTP_CLIENT_STUB_URL 이 있으면 https://<host>/<path> → <stub>/<host>/<path> (오프라인 부하 테스트,
+  common.services.http_stub)
+
+사용 예시:
+    from common.services import http_client
+
+    resp = http_client.post('kakao', 'https://kauth.kakao.com/oauth/token', data=token_data)
+    resp = http_client.get('krdict', 'https://krdict.korean.go.kr/api/search', params=params)
+    http_client.session('google')       # google-auth Request(session=...) 등에 넘길 풀 세션
+    http_client.status()                # 서비스별 브레이커 상태 (서버 모니터)
+"""
+import logging
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from common.services import metrics
+
+logger = logging.getLogger(__name__)
+
+# timeout: (연결, 읽기) 초, retries: 첫 시도 외 재시도 횟수, pool: 호스트당 유지할 연결 수
+SERVICES = {
+    'kakao': {'timeout': (3, 5), 'retries': 1, 'pool': 4},
+    'krdict': {'timeout': (2, 3), 'retries': 1, 'pool': 4},
+    'github': {'timeout': (3, 10), 'retries': 0, 'pool': 2},
+    'google': {'timeout': (3, 10), 'retries': 1, 'pool': 2},
+}
+DEFAULT_SERVICE = {'timeout': (3, 10), 'retries': 0, 'pool': 2}
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_BUDGET_RATIO = 0.2   # 요청 5번에 재시도 1번까지
+RETRY_BUDGET_MAX = 10.0
+BACKOFF_BASE = 0.1
+
+
+class CircuitOpen(requests.RequestException):
+    """브레이커가 열려 있어 호출하지 않음 (requests 예외 처리에 그대로 걸리도록 RequestException)"""
+
+
+class CircuitBreaker:
+    """closed → (연속 실패) → open → (reset 초 경과) → half-open 시험 1건 → closed / open"""
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failures, reset):
+        self.threshold = failures
+        self.reset = reset
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        """→ 이번 실패로 브레이커가 열렸는지"""
+        with self._lock:
+            self._probing = False
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                opened = self.state != self.OPEN
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                return opened
+            return False
+
+
+class RetryBudget:
+    """요청마다 ratio 적립, 재시도마다 1 차감 (최대 max_tokens)"""
+
+    def __init__(self, ratio=RETRY_BUDGET_RATIO, max_tokens=RETRY_BUDGET_MAX):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class Service:
+    def __init__(self, name, config):
+        self.name = name
+        self.timeout = tuple(config['timeout'])
+        self.retries = config['retries']
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=config['pool'], max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.breaker = CircuitBreaker(
+            getattr(settings, 'HTTP_CLIENT_BREAKER_FAILURES', 5),
+            getattr(settings, 'HTTP_CLIENT_BREAKER_RESET', 30),
+        )
+        self.budget = RetryBudget()
+
+    def _retryable(self, method, exc=None, response=None):
+        if exc is not None:
+            if isinstance(exc, requests.ConnectTimeout):
+                return True  # 연결 전이라 요청이 전달되지 않음
+            return method in IDEMPOTENT_METHODS and isinstance(exc, (requests.ConnectionError, requests.Timeout))
+        return method in IDEMPOTENT_METHODS and response.status_code in RETRY_STATUSES
+
+    def request(self, method, url, **kwargs):
+        method = method.upper()
+        kwargs.setdefault('timeout', self.timeout)
+        url = _rewrite(url)
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                metrics.UPSTREAM_REQUESTS.inc(service=self.name, result='circuit_open')
+                raise CircuitOpen(f'{self.name}: circuit open')
+            started = time.perf_counter()
+            exc = response = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                exc = e
+            metrics.UPSTREAM_LATENCY.observe(time.perf_counter() - started, service=self.name)
+
+            failed = exc is not None or response.status_code >= 500
+            if failed:
+                if self.breaker.record_failure():
+                    logger.warning(f'Upstream {self.name} circuit opened after {self.breaker.failures} failures')
+            else:
+                self.breaker.record_success()
+
+            if (failed or response.status_code == 429) and attempt < self.retries \
+                    and self._retryable(method, exc, response) and self.budget.withdraw():
+                attempt += 1
+                metrics.UPSTREAM_REQUESTS.inc(service=self.name, result='retry')
+                time.sleep(BACKOFF_BASE * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+                continue
+
+            if exc is not None:
+                result = 'timeout' if isinstance(exc, requests.Timeout) else 'error'
+                metrics.UPSTREAM_REQUESTS.inc(service=self.name, result=result)
+                raise exc
+            metrics.UPSTREAM_REQUESTS.inc(service=self.name, result=f'{response.status_code // 100}xx')
+            return response
+
+
+_services = {}
+_services_pid = None
+_services_lock = threading.Lock()
+
+
+def service(name):
+    """현재 프로세스의 서비스 객체 (gunicorn preload 후 fork 된 워커는 소켓을 공유하지 않도록 새로 만듦)"""
+    global _services_pid
+    with _services_lock:
+        if _services_pid != os.getpid():
+            _services.clear()
+            _services_pid = os.getpid()
+        svc = _services.get(name)
+        if svc is None:
+            config = {**DEFAULT_SERVICE, **SERVICES.get(name, {}),
+                      **getattr(settings, 'HTTP_CLIENT_SERVICES', {}).get(name, {})}
+            svc = _services[name] = Service(name, config)
+        return svc
+
+
+def reset():
+    """모든 서비스의 연결 풀·브레이커 초기화 (테스트·벤치마크용)"""
+    with _services_lock:
+        for svc in _services.values():
+            svc.session.close()
+        _services.clear()
+
+
+def _rewrite(url):
+    stub = getattr(settings, 'HTTP_CLIENT_STUB_URL', '')
+    if not stub:
+        return url
+    parts = urlsplit(url)
+    rewritten = f'{stub.rstrip("/")}/{parts.netloc}{parts.path}'
+    return f'{rewritten}?{parts.query}' if parts.query else rewritten
+
+
+def request(name, method, url, **kwargs):
+    return service(name).request(method, url, **kwargs)
+
+
+def get(name, url, **kwargs):
+    return request(name, 'GET', url, **kwargs)
+
+
+def post(name, url, **kwargs):
+    return request(name, 'POST', url, **kwargs)
+
+
+def session(name):
+    return service(name).session
+
+
+def status():
+    """서비스별 브레이커 상태 (현재 프로세스 기준)"""
+    with _services_lock:
+        services = dict(_services) if _services_pid == os.getpid() else {}
+    return [
+        {'service': name, 'state': svc.breaker.state, 'failures': svc.breaker.failures}
+        for name, svc in sorted(services.items())
+    ]
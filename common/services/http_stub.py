@@ -0,0 +1,154 @@
+"""
+외부 API 스텁 서버 (오프라인 부하 테스트·테스트용)
+
+카카오 OAuth(kauth/kapi), 국립국어원 사전(krdict), GitHub dispatch 의 응답을 흉내 내는
+keep-alive HTTP/1.1 서버입니다. HTTP_CLIENT_STUB_URL 을 이 서버 주소로 두면
+common.services.http_client 가 https://<host>/<path> 를 <stub>/<host>/<path> 로 보냅니다.
+
+- 카카오: code 마다 고정된 사용자(id = code 의 해시)를 돌려줌
+- 사전: unknown_words 에 든 단어만 total=0 (나머지는 등재된 단어)
+- latency(초)만큼 늦게, fail_rate 비율로 503 응답 — 느린·불안정한 상대 재현
+- requests / connections: 받은 요청 수와 새 TCP 연결 수 (연결 재사용 확인)
+
+사용 예시:
+    from common.services.http_stub import StubServer
+
+    with StubServer(latency=0.05) as stub:
+        with override_settings(HTTP_CLIENT_STUB_URL=stub.url):
+            ...
+
+    python manage.py stub_upstreams --port 8765   # 별도 프로세스로 실행
+"""
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+def kakao_user_id(code):
+    return int(hashlib.sha1(code.encode()).hexdigest()[:12], 16)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # 헤더·본문을 따로 쓰므로 Nagle 을 끄지 않으면 재사용 연결에서 지연 ACK(40ms)에 걸림 (nginx tcp_nodelay 와 같음)
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.stats_lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b'', content_type='application/json'):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        form = parse_qs(self.rfile.read(length).decode()) if length else {}
+        with self.server.stats_lock:
+            self.server.requests += 1
+        stub = self.server.stub
+        if stub.latency:
+            time.sleep(stub.latency)
+        if stub.fail_rate and random.random() < stub.fail_rate:
+            return self._send(503, {'error': 'stub_unavailable'})
+
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        route = parts.path
+        if route == '/kauth.kakao.com/oauth/token':
+            code = form.get('code', [''])[0]
+            if not code:
+                return self._send(400, {'error': 'invalid_grant', 'error_description': 'code missing'})
+            return self._send(200, {'access_token': f'stub-{code}', 'refresh_token': f'refresh-{code}',
+                                    'expires_in': 21600, 'token_type': 'bearer'})
+        if route == '/kapi.kakao.com/v2/user/me':
+            code = self.headers.get('Authorization', '').removeprefix('Bearer stub-')
+            user_id = kakao_user_id(code)
+            return self._send(200, {'id': user_id, 'kakao_account': {
+                'email': f'{user_id}@stub.kakao',
+                'profile': {'nickname': f'스텁{user_id % 10000}', 'profile_image_url': '',
+                            'thumbnail_image_url': ''},
+            }})
+        if route == '/kapi.kakao.com/v1/user/logout':
+            return self._send(200, {'id': 0})
+        if route == '/krdict.korean.go.kr/api/search':
+            word = query.get('q', [''])[0]
+            total = 0 if word in stub.unknown_words else 1
+            body = f'<?xml version="1.0" encoding="UTF-8"?><channel><total>{total}</total></channel>'
+            return self._send(200, body.encode(), 'text/xml; charset=utf-8')
+        if route.startswith('/api.github.com/repos/') and route.endswith('/dispatches'):
+            return self._send(204)
+        return self._send(404, {'error': 'no stub route', 'path': route})
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # 타임아웃으로 먼저 끊은 클라이언트 (BrokenPipe) 등은 조용히 무시
+
+
+class StubServer:
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, fail_rate=0.0, unknown_words=()):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.unknown_words = set(unknown_words)
+        self._server = _Server((host, port), _Handler)
+        self._server.stub = self
+        self._server.stats_lock = threading.Lock()
+        self._server.requests = 0
+        self._server.connections = 0
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def requests(self):
+        return self._server.requests
+
+    @property
+    def connections(self):
+        return self._server.connections
+
+    def reset_stats(self):
+        with self._server.stats_lock:
+            self._server.requests = 0
+            self._server.connections = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='http-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,321 @@
+"""
+업로드 이미지 파생본 (반응형 WebP / JPEG·PNG)
+
+질문·답변·댓글 첨부, 프로필·포트폴리오 이미지는 올린 원본 그대로(수 MB, EXIF 포함) 내려가서
+목록·아바타처럼 작게 보이는 곳에서도 원본을 받습니다. 요청 경로 밖에서 너비별 파생본을 만들어 두고
+템플릿이 srcset 으로 알맞은 크기를 고르게 합니다.
+
+- 파생본: MEDIA_ROOT/derivatives/<원본 경로>/<너비>.webp · <너비>.jpg(투명도가 있으면 .png)
+  너비는 IMAGE_DERIVATIVE_WIDTHS 중 원본보다 작은 것 + 원본 너비(가장 큰 버킷 이하일 때)
+- EXIF 회전을 픽셀에 반영하고 EXIF·XMP 메타데이터는 버림 (위치 정보 노출 방지, ICC 색 프로필만 유지)
+- 매니페스트: 같은 디렉터리의 manifest.json — 모든 파생본을 쓴 뒤 마지막에 기록하므로
+  매니페스트가 있으면 파생본이 모두 있는 것. 없으면 템플릿은 원본으로 대체
+- 생성 시점: 저장 커밋 후 프로세스 스레드 풀(IMAGE_DERIVATIVE_THREADS, 0이면 끔)
+  + build_image_derivatives 명령어(--loop 상주 워커 또는 cron)가 빠진 것을 채움
+- 애니메이션 GIF 등 변환하지 않는 이미지는 variants 가 빈 매니페스트만 남김 (다시 시도하지 않음)
+- 원본을 지우는 곳은 delete(name) 도 함께 호출 (파생본은 원본과 별도 경로라 그대로 공개되어 남음)
+
+사용 예시:
+    {% load common_tags %}
+    {% responsive_image question.image alt="첨부 이미지" sizes="(max-width: 768px) 100vw, 720px" %}
+    <div style="background-image: url('{{ portfolio.hero_background_image|image_variant:1920 }}')">
+"""
+import io
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_DIR = 'derivatives'
+MANIFEST_NAME = 'manifest.json'
+DEFAULT_WIDTHS = (320, 640, 1280, 1920)
+
+# 파생본을 만드는 이미지 필드 (앱.모델, 필드)
+SOURCES = [
+    ('community.Question', 'image'),
+    ('community.QuestionImage', 'image'),
+    ('community.Answer', 'image'),
+    ('community.Comment', 'image'),
+    ('community.Portfolio', 'profile_image'),
+    ('community.Portfolio', 'hero_background_image'),
+    ('community.Project', 'image'),
+    ('community.PortfolioCollection', 'profile_image'),
+    ('community.PortfolioCollection', 'hero_background_image'),
+    ('community.CollectionProject', 'image'),
+    ('common.Profile', 'profile_image'),
+]
+
+# 매니페스트 조회 캐시 (프로세스별): 있는 것은 계속, 없는 것은 MISSING_TTL 초 동안 기억
+MANIFEST_CACHE_SIZE = 4096
+MISSING_TTL = 30.0
+
+_manifests = OrderedDict()
+_manifests_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+_scheduled = set()
+_fields_by_model = {}  # 모델 → 이미지 필드 이름들 (connect_signals)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def widths():
+    return sorted(set(_setting('IMAGE_DERIVATIVE_WIDTHS', DEFAULT_WIDTHS)))
+
+
+def manifest_path(name):
+    return f'{DERIVATIVE_DIR}/{name}/{MANIFEST_NAME}'
+
+
+def _target_widths(source_width):
+    buckets = widths()
+    targets = [width for width in buckets if width < source_width]
+    if source_width <= buckets[-1]:
+        targets.append(source_width)
+    return targets
+
+
+def _encode(image, fmt, icc_profile, quality):
+    options = {'icc_profile': icc_profile} if icc_profile else {}
+    if fmt == 'WEBP':
+        options.update(quality=quality, method=4)
+    elif fmt == 'JPEG':
+        options.update(quality=quality, optimize=True, progressive=True)
+    else:
+        options.update(optimize=True)
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def _replace(storage, path, data):
+    # 같은 이름이 있으면 storage.save 가 이름을 바꾸므로 지우고 씀
+    if storage.exists(path):
+        storage.delete(path)
+    return storage.save(path, ContentFile(data))
+
+
+def _write_variants(image, name, storage):
+    """EXIF 회전 반영·메타데이터 제거 후 너비별 WebP + JPEG(투명하면 PNG) 저장 → (너비, 높이, variants)"""
+    icc_profile = image.info.get('icc_profile')
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    image.info = {}  # EXIF·XMP 등 원본 메타데이터를 파생본에 옮기지 않음
+    fallback_ext, fallback_fmt = ('png', 'PNG') if has_alpha else ('jpg', 'JPEG')
+    quality = _setting('IMAGE_DERIVATIVE_QUALITY', 80)
+    directory = f'{DERIVATIVE_DIR}/{name}'
+
+    variants = []
+    for width in _target_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        variants.append({
+            'width': width,
+            'height': height,
+            'webp': _replace(storage, f'{directory}/{width}.webp', _encode(resized, 'WEBP', icc_profile, quality)),
+            'fallback': _replace(storage, f'{directory}/{width}.{fallback_ext}',
+                                 _encode(resized, fallback_fmt, icc_profile, quality)),
+        })
+    return image.width, image.height, variants
+
+
+def build(name, storage=None, force=False):
+    """
+    원본 name(스토리지 상대 경로)의 파생본과 매니페스트를 만든다 → 매니페스트 dict.
+    이미 매니페스트가 있으면 force=True 가 아닌 한 그대로 돌려줌. 원본 파일이 없으면 None.
+    """
+    storage = storage or default_storage
+    if not force:
+        existing = _read_manifest(name, storage)
+        if existing is not None:
+            return existing
+
+    manifest = {'source': name, 'width': 0, 'height': 0, 'variants': []}
+    try:
+        with storage.open(name, 'rb') as source:
+            image = Image.open(source)
+            image.load()
+    except FileNotFoundError:
+        logger.warning(f'Image derivatives for {name} skipped: source missing')
+        return None
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        # 다시 시도해도 같으므로 빈 매니페스트로 남김 (템플릿은 원본 사용)
+        logger.warning(f'Image derivatives for {name} skipped: {exc}')
+        manifest['skipped'] = 'unreadable'
+        image = None
+
+    if image is not None and getattr(image, 'is_animated', False):
+        manifest.update(width=image.width, height=image.height, skipped='animated')
+    elif image is not None:
+        manifest['width'], manifest['height'], manifest['variants'] = _write_variants(image, name, storage)
+
+    manifest['built_at'] = time.time()
+    _replace(storage, manifest_path(name), json.dumps(manifest).encode())
+    _remember(name, manifest)
+    return manifest
+
+
+def delete(name, storage=None):
+    """원본 name 의 파생본 디렉터리(너비별 파일·매니페스트)를 지운다 → 지운 파일 수"""
+    if not name:
+        return 0
+    storage = storage or default_storage
+    directory = f'{DERIVATIVE_DIR}/{name}'
+    try:
+        files = storage.listdir(directory)[1]
+    except (FileNotFoundError, NotADirectoryError):
+        files = []
+    # 매니페스트부터 지움 — 도중에 실패해도 템플릿이 이미 지운 파생본 URL 을 내지 않음
+    for filename in sorted(files, key=lambda f: f != MANIFEST_NAME):
+        storage.delete(f'{directory}/{filename}')
+    try:
+        os.rmdir(storage.path(directory))
+    except (NotImplementedError, OSError):
+        pass  # 디렉터리 개념이 없는 스토리지(S3 등)이거나 이미 없음
+    with _manifests_lock:
+        _manifests.pop(name, None)
+    return len(files)
+
+
+def _read_manifest(name, storage):
+    try:
+        with storage.open(manifest_path(name), 'rb') as handle:
+            return json.loads(handle.read())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _remember(name, manifest):
+    with _manifests_lock:
+        _manifests[name] = (manifest, None if manifest is not None else time.monotonic() + MISSING_TTL)
+        _manifests.move_to_end(name)
+        while len(_manifests) > MANIFEST_CACHE_SIZE:
+            _manifests.popitem(last=False)
+
+
+def manifest(name):
+    """템플릿용 매니페스트 조회 (없으면 None, 파일 읽기는 프로세스 캐시로 줄임)"""
+    if not name:
+        return None
+    with _manifests_lock:
+        cached = _manifests.get(name)
+    if cached is not None:
+        value, expires = cached
+        if expires is None or expires > time.monotonic():
+            return value
+    value = _read_manifest(name, default_storage)
+    _remember(name, value)
+    return value
+
+
+def clear_cache():
+    with _manifests_lock:
+        _manifests.clear()
+
+
+def srcset(name, key='webp'):
+    """'url 320w, url 640w' — 파생본이 아직 없으면 빈 문자열"""
+    data = manifest(name)
+    if not data:
+        return ''
+    return ', '.join(f'{default_storage.url(v[key])} {v["width"]}w' for v in data['variants'])
+
+
+def variant_url(name, width):
+    """width 이상인 가장 작은 WebP 파생본 URL (원본이 더 작으면 원본 크기 WebP, 파생본이 없으면 원본)"""
+    data = manifest(name)
+    variants = data['variants'] if data else []
+    fitting = [v for v in variants if v['width'] >= min(width, data['width'])] if variants else []
+    if not fitting:
+        return default_storage.url(name)
+    return default_storage.url(fitting[0]['webp'])
+
+
+def source_names():
+    """SOURCES 의 모든 업로드 이미지 경로 (중복 제거, 저장 순서)"""
+    names = {}
+    for model_label, field in SOURCES:
+        model = apps.get_model(model_label)
+        queryset = model.objects.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''})
+        for name in queryset.values_list(field, flat=True).iterator():
+            names[name] = None
+    return list(names)
+
+
+def missing(names=None):
+    """원본 파일은 있는데 매니페스트가 없는 경로"""
+    names = source_names() if names is None else names
+    return [name for name in names
+            if not default_storage.exists(manifest_path(name)) and default_storage.exists(name)]
+
+
+def _pool():
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():  # fork 된 워커는 새 풀
+        with _manifests_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(
+                    max_workers=_setting('IMAGE_DERIVATIVE_THREADS', 1), thread_name_prefix='image-derivatives',
+                )
+                _executor_pid = os.getpid()
+                _scheduled.clear()
+    return _executor
+
+
+def _build_in_background(name):
+    try:
+        build(name)
+    except Exception:
+        logger.exception(f'Image derivatives for {name} failed')
+    finally:
+        with _manifests_lock:
+            _scheduled.discard(name)
+
+
+def schedule(name):
+    """저장 트랜잭션이 커밋된 뒤 스레드 풀에서 build(name) (IMAGE_DERIVATIVE_THREADS=0 이면 워커 명령어에 맡김)"""
+    if not name or _setting('IMAGE_DERIVATIVE_THREADS', 1) <= 0:
+        return
+
+    def submit():
+        pool = _pool()
+        with _manifests_lock:
+            if name in _scheduled:
+                return
+            _scheduled.add(name)
+        pool.submit(_build_in_background, name)
+
+    transaction.on_commit(submit)
+
+
+def _on_save(sender, instance, **kwargs):
+    for field in _fields_by_model.get(sender, ()):
+        name = getattr(instance, field).name
+        if name and manifest(name) is None:
+            schedule(name)
+
+
+def connect_signals():
+    """SOURCES 모델의 post_save 에 연결 (common.signals 에서 호출)"""
+    from django.db.models.signals import post_save
+
+    _fields_by_model.clear()
+    for model_label, field in SOURCES:
+        _fields_by_model.setdefault(apps.get_model(model_label), []).append(field)
+    for model in _fields_by_model:
+        post_save.connect(_on_save, sender=model, dispatch_uid=f'image_derivatives:{model._meta.label}')
@@ -0,0 +1,379 @@
+"""
+앱 로그 증분 인덱서 (서버 모니터 / send_log_report 용)
+
+대시보드는 60초마다 새로고침되는데, 매번 logs/django.log 를 수 MB 씩 다시 읽고
+모든 라인에 정규식·strptime 을 돌리면 비용이 큽니다.
+이 모듈은 로그 파일을 마지막으로 읽은 바이트 위치(LogIndexCursor)부터 새 줄만 읽어
+1분 단위 집계(LogMinuteStat)로 쌓아 두고, 임의의 hours 범위는 집계 행 합산으로 답합니다.
+
+- RotatingFileHandler 회전(django.log → django.log.1) 은 inode 변화로 감지해
+  회전된 파일의 남은 부분을 마저 읽은 뒤 새 파일을 처음부터 읽는다
+- 여러 gunicorn 워커가 동시에 갱신하지 않도록 LOGS_DIR 의 파일 잠금을 사용
+- journalctl 라인도 같은 LineStats 로 집계해 파일/저널 결과의 형식이 같다
+
+사용 예시:
+    from common.services import log_index
+
+    log_index.update_index()
+    stats = log_index.window_stats(hours=24)
+    journal = stats.journal_stats()
+"""
+import logging
+import os
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import file_lock
+from .log_templates import TemplateMiner
+
+logger = logging.getLogger(__name__)
+
+# 소스 이름: LOGS_DIR 기준 파일명 (LOGGING 의 RotatingFileHandler 와 동일).
+# security.log 는 'security' 로거가 django.log 에도 같은 줄을 남기고 보안 미들웨어는
+# django.log 에만 기록하므로 따로 색인하지 않는다 (보안 통계도 django 집계에서 계산).
+SOURCES = {
+    'django': 'django.log',
+}
+
+RETENTION_HOURS = 24 * 8          # 집계 보관 기간 (최대 조회 범위 7일 + 여유)
+READ_CHUNK = 1024 * 1024          # 한 번에 읽는 바이트
+MAX_SAMPLES = 5                   # 분 단위 에러/5xx 샘플 수
+MAX_404_PATHS = 20                # 분 단위 404 경로 보관 수
+MAX_WARN_KEYS = 20                # 분 단위 Warning 패턴 보관 수
+MAX_TEMPLATES = 20                # 분 단위 에러·경고 템플릿 보관 수
+MAX_PROMPT_TEMPLATES = 15         # AI 에러 분석에 보낼 템플릿 수
+
+# '{levelname} {asctime} ...' 포맷: 'INFO 2025-01-01 12:34:56,789 module msg'
+_TS_RE = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}):\d{2}')
+
+# 액세스 라인에서 메서드·경로·상태코드 추출 (gunicorn/nginx 공통 "%(r)s" %(s)s)
+_REQUEST_RE = re.compile(r'"([A-Z]+) (\S+?)(?: HTTP/[^"]*)?" (\d{3})')
+
+
+def parse_request_line(line):
+    """액세스 라인 → (method, path, code) 또는 None"""
+    m = _REQUEST_RE.search(line)
+    if not m:
+        return None
+    try:
+        code = int(m.group(3))
+    except ValueError:
+        return None
+    path = m.group(2).split('?', 1)[0]  # 쿼리스트링 제거
+    return m.group(1), path, code
+
+
+def warn_key(line):
+    """Warning 라인을 패턴 집계용 키로 정규화.
+
+    로그 접두(asctime+module)와 가변값(IP·경로·숫자)을 제거/치환해
+    동일 메시지 템플릿끼리 묶이도록 한다. 표시는 원문(가변값 포함)을 쓴다.
+    """
+    idx = line.lower().find('warning')
+    msg = (line[idx + 7:] if idx >= 0 else line)
+    # 'WARNING <YYYY-MM-DD HH:MM:SS,ms> <module> ' 접두 제거 (file/journal 공통)
+    msg = re.sub(r'^[\s:.\-]*\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}[,.\d]*\s+\S+\s+', '', msg)
+    msg = msg.strip().lstrip(':- ').strip()
+    norm = re.sub(r'\b\d{1,3}(?:\.\d{1,3}){3}\b', '#IP', msg)  # IP 주소
+    norm = re.sub(r'/\S+', '/#', norm)                        # 경로 값
+    norm = re.sub(r'\d+', '#', norm)                          # 잔여 숫자
+    return norm[:80], msg[:100]
+
+
+class LineStats:
+    """로그 라인 집계기 — 분 단위 저장 형식과 대시보드 통계 형식을 오간다."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.paths_404 = Counter()
+        self.warn_counts = Counter()
+        self.warn_repr = {}
+        self.errors = []
+        self._error_keys = set()
+        self.samples_5xx = []
+        self.templates = TemplateMiner()
+
+    def add(self, line):
+        """원본 로그 라인 1줄 반영 (분류 기준은 기존 send_log_report 와 동일)"""
+        self.counts['lines'] += 1
+        lower = line.lower()
+        if 'error' in lower or 'exception' in lower or 'traceback' in lower:
+            self.counts['error_count'] += 1
+            self._add_error(line[-120:])
+            self.templates.add(line, 'error')
+        elif 'warning' in lower or 'warn' in lower:
+            self.counts['warning_count'] += 1
+            self.templates.add(line, 'warn')
+            key, rep = warn_key(line)
+            self.warn_counts[key] += 1
+            self.warn_repr.setdefault(key, rep)
+
+        if 'blocked' in lower:
+            self.counts['blocked_ips'] += 1
+        if 'rate limit' in lower:
+            self.counts['rate_limit_hits'] += 1
+        if 'ddos' in lower:
+            self.counts['ddos_detected'] += 1
+
+        pr = parse_request_line(line)
+        if pr:
+            method, path, code = pr
+            self.counts['request_count'] += 1
+            if 500 <= code < 600:
+                self.counts['status_5xx'] += 1
+                if len(self.samples_5xx) < MAX_SAMPLES:
+                    self.samples_5xx.append(f'{code} {method} {path}')
+            elif 400 <= code < 500:
+                self.counts['status_4xx'] += 1
+                if code == 404:
+                    self.counts['status_404'] += 1
+                    self.paths_404[path] += 1
+                elif code == 403:
+                    self.counts['status_403'] += 1
+                elif code == 401:
+                    self.counts['status_401'] += 1
+
+    def _add_error(self, sample):
+        key = sample[-60:]
+        if key not in self._error_keys and len(self.errors) < MAX_SAMPLES:
+            self._error_keys.add(key)
+            self.errors.append(sample)
+
+    def merge_row(self, row):
+        """LogMinuteStat 행(또는 같은 형식의 dict)을 합산"""
+        self.counts.update(row['counts'])
+        self.paths_404.update(row['paths_404'])
+        for key, (count, rep) in row['warnings'].items():
+            self.warn_counts[key] += count
+            self.warn_repr.setdefault(key, rep)
+        for sample in row['errors']:
+            self._add_error(sample)
+        for sample in row['samples_5xx']:
+            if len(self.samples_5xx) < MAX_SAMPLES:
+                self.samples_5xx.append(sample)
+        for item in row.get('templates') or []:
+            self.templates.merge(item)
+
+    def to_row(self):
+        """LogMinuteStat 저장 형식 (상위 항목만 남겨 행 크기 제한)"""
+        return {
+            'counts': {k: v for k, v in self.counts.items() if v},
+            'paths_404': dict(self.paths_404.most_common(MAX_404_PATHS)),
+            'warnings': {
+                k: [c, self.warn_repr[k]] for k, c in self.warn_counts.most_common(MAX_WARN_KEYS)
+            },
+            'errors': self.errors,
+            'samples_5xx': self.samples_5xx,
+            'templates': self.templates.summary(MAX_TEMPLATES),
+        }
+
+    def journal_stats(self):
+        """send_log_report._collect_journal 과 같은 형식의 통계"""
+        stats = {key: self.counts[key] for key in (
+            'error_count', 'warning_count', 'request_count',
+            'status_5xx', 'status_4xx', 'status_404', 'status_403', 'status_401',
+        )}
+        # 에러 라인 샘플이 없으면 5xx 요청 라인으로 대체 (수집 공백 보완)
+        stats['top_errors'] = list(self.errors) or list(self.samples_5xx)
+        stats['error_templates'] = self.templates.summary(MAX_PROMPT_TEMPLATES)
+        stats['top_404'] = [{'path': p, 'count': c} for p, c in self.paths_404.most_common(5)]
+        stats['top_warnings'] = [
+            {'msg': self.warn_repr[k], 'count': c} for k, c in self.warn_counts.most_common(5)
+        ]
+        return stats
+
+    def security_stats(self):
+        """send_log_report._collect_security_logs 와 같은 형식의 통계"""
+        return {key: self.counts[key] for key in ('blocked_ips', 'rate_limit_hits', 'ddos_detected')}
+
+
+# ---------------------------------------------------------------------- #
+#  증분 인덱싱
+# ---------------------------------------------------------------------- #
+def _log_path(source):
+    return os.path.join(str(settings.LOGS_DIR), SOURCES[source])
+
+
+class _MinuteRollup:
+    """읽은 라인을 분 단위 LineStats 로 분배 (타임스탬프 없는 줄은 직전 줄의 분에 포함)"""
+
+    def __init__(self):
+        self.buckets = {}
+        self.current = None
+        self._minute_cache = {}
+
+    def feed(self, line):
+        m = _TS_RE.search(line, 0, 40)
+        if m:
+            text = m.group(1)
+            minute = self._minute_cache.get(text)
+            if minute is None:
+                try:
+                    naive = datetime(
+                        int(text[0:4]), int(text[5:7]), int(text[8:10]),
+                        int(text[11:13]), int(text[14:16]),
+                    )
+                except ValueError:
+                    naive = None
+                minute = timezone.make_aware(naive) if naive else self.current
+                self._minute_cache[text] = minute
+            self.current = minute
+        if self.current is None:
+            return
+        bucket = self.buckets.get(self.current)
+        if bucket is None:
+            bucket = self.buckets[self.current] = LineStats()
+        bucket.add(line)
+
+
+def _read_from(path, offset, rollup):
+    """path 의 offset 부터 마지막 완결된 줄까지 읽어 rollup 에 넣고 새 offset 반환"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        pending = b''
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                break
+            data = pending + chunk
+            cut = data.rfind(b'\n')
+            if cut < 0:
+                pending = data
+                continue
+            for raw in data[:cut].split(b'\n'):
+                rollup.feed(raw.decode('utf-8', 'replace').rstrip('\r'))
+            offset += cut + 1
+            pending = data[cut + 1:]
+    # 아직 줄바꿈이 없는 마지막 줄은 다음 실행에서 읽는다
+    return offset
+
+
+def _index_source(source, rollup):
+    """소스 하나를 커서 위치부터 읽고 커서 갱신 값 (inode, offset) 반환"""
+    from common.models import LogIndexCursor
+
+    path = _log_path(source)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    cursor, _ = LogIndexCursor.objects.get_or_create(source=source)
+    inode, offset = cursor.inode, cursor.offset
+
+    if inode and inode != st.st_ino:
+        # 회전됨: 이전 파일(.1)의 남은 부분을 먼저 읽는다
+        rotated = f'{path}.1'
+        try:
+            if os.stat(rotated).st_ino == inode:
+                _read_from(rotated, offset, rollup)
+        except OSError:
+            pass
+        offset = 0
+    elif st.st_size < offset:
+        # 잘림(truncate) → 처음부터
+        offset = 0
+
+    offset = _read_from(path, offset, rollup)
+    cursor.inode = st.st_ino
+    cursor.offset = offset
+    return cursor
+
+
+def _store(source, rollup):
+    """분 단위 집계를 기존 행과 합쳐 저장"""
+    from common.models import LogMinuteStat
+
+    if not rollup.buckets:
+        return
+    existing = {
+        row.minute: row
+        for row in LogMinuteStat.objects.filter(source=source, minute__in=list(rollup.buckets))
+    }
+    creates = []
+    for minute, bucket in rollup.buckets.items():
+        row = existing.get(minute)
+        if row is None:
+            creates.append(LogMinuteStat(source=source, minute=minute, **bucket.to_row()))
+            continue
+        merged = LineStats()
+        merged.merge_row({
+            'counts': row.counts, 'paths_404': row.paths_404, 'warnings': row.warnings,
+            'errors': row.errors, 'samples_5xx': row.samples_5xx, 'templates': row.templates,
+        })
+        merged.merge_row(bucket.to_row())
+        for field, value in merged.to_row().items():
+            setattr(row, field, value)
+        row.save()
+    LogMinuteStat.objects.bulk_create(creates)
+
+
+def update_index(sources=None):
+    """
+    로그 파일의 새 줄을 분 단위 집계에 반영
+
+    다른 프로세스가 갱신 중이면 기다리지 않고 건너뛴다 (곧 그쪽 결과가 반영됨).
+
+    Args:
+        sources (list): 갱신할 소스 이름 (기본: 전체)
+
+    Returns:
+        int: 새로 반영한 라인 수 (건너뛰었으면 0)
+    """
+    from common.models import LogMinuteStat
+
+    try:
+        lock = file_lock.try_lock('log_index.lock')
+    except OSError:
+        return 0
+    if lock is None:
+        return 0
+    try:
+        indexed = 0
+        for source in sources or SOURCES:
+            rollup = _MinuteRollup()
+            try:
+                cursor = _index_source(source, rollup)
+            except OSError as e:
+                logger.warning(f"Log index read failed for {source}: {e}")
+                continue
+            if cursor is None:
+                continue
+            with transaction.atomic():
+                _store(source, rollup)
+                cursor.save()
+            indexed += sum(b.counts['lines'] for b in rollup.buckets.values())
+
+        LogMinuteStat.objects.filter(
+            minute__lt=timezone.now() - timedelta(hours=RETENTION_HOURS)
+        ).delete()
+        return indexed
+    finally:
+        lock.close()
+
+
+def window_stats(hours, source='django', now=None):
+    """
+    최근 hours 시간의 분 단위 집계 합산
+
+    Returns:
+        LineStats: journal_stats() / security_stats() 로 대시보드 형식 변환
+    """
+    from common.models import LogMinuteStat
+
+    now = now or timezone.now()
+    cutoff = (now - timedelta(hours=hours)).replace(second=0, microsecond=0)
+    stats = LineStats()
+    rows = (
+        LogMinuteStat.objects.filter(source=source, minute__gte=cutoff)
+        .order_by('minute')
+        .values('counts', 'paths_404', 'warnings', 'errors', 'samples_5xx', 'templates')
+    )
+    for row in rows:
+        stats.merge_row(row)
+    return stats
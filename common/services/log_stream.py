@@ -0,0 +1,356 @@
+"""
+실시간 로그 스트리밍 (서버 로그 뷰어 SSE)
+
+뷰어가 5초마다 폴링할 때마다 journalctl -n 120 을 띄우고 변하지 않은 120줄을
+다시 보내던 방식 대신, 로그 소스별 팔로워 스레드 하나가 새 줄만 읽어 링 버퍼에 쌓고
+연결된 관리자 클라이언트들에게 나눠 줍니다.
+
+- 소스: journald (journalctl -f -o json) 우선, 없으면 logs/django.log 를 tail -F 처럼 추적
+- 커서: journald 는 __CURSOR, 파일은 '<inode>:<줄 끝 오프셋>' — 워커가 달라도 의미가 같아
+  재연결 시 Last-Event-ID 로 이어 받기 가능 (버퍼 밖이면 gap 이벤트 후 최근 줄부터)
+- 레벨 필터(info/warn/error)는 서버에서 적용해 필요한 줄만 전송
+- 구독자가 없으면 IDLE_STOP_SECONDS 뒤 팔로워(및 journalctl 프로세스) 종료
+- SSE 는 async 뷰(common:server_log_stream)가 내보내고 운영에서는 nginx 가 이 경로를
+  daphne(mysite-asgi.service, 프로세스 하나)로 보낸다 — 연결이 워커를 잡지 않고,
+  모든 관리자 화면이 그 프로세스의 소스별 팔로워 하나를 함께 구독한다
+
+사용 예시:
+    follower = await sync_to_async(log_stream.get_follower)()
+    async for chunk in log_stream.sse_events(follower, cursor=None, level='warn'):
+        ...
+"""
+import asyncio
+import json
+import logging
+import os
+import select
+import subprocess
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+BUFFER_LINES = 1000       # 팔로워 링 버퍼 (재연결 이어 받기 범위)
+PRIME_LINES = 300         # 팔로워 시작 시 미리 읽어 둘 최근 줄 수
+POLL_INTERVAL = 0.5       # 파일 소스 새 줄 확인 간격(초)
+IDLE_STOP_SECONDS = 60    # 구독자가 없을 때 팔로워 유지 시간
+STREAM_SECONDS = 300      # 한 SSE 응답 유지 시간 (이후 브라우저가 재연결하며 권한·OTP 재확인)
+HEARTBEAT_SECONDS = 15    # nginx proxy_read_timeout(60초) 안에 빈 주석이라도 보냄
+READ_SIZE = 64 * 1024
+
+LEVELS = {'info': 0, 'warn': 1, 'error': 2}
+JOURNAL_UNIT = 'mysite'
+
+
+def classify_level(line):
+    """로그 줄 → info | warn | error"""
+    lower = line.lower()
+    if 'error' in lower or 'exception' in lower or 'traceback' in lower or '" 5' in line:
+        return 'error'
+    if 'warning' in lower or 'warn' in lower or '" 4' in line:
+        return 'warn'
+    return 'info'
+
+
+# ---------------------------------------------------------------------- #
+#  소스
+# ---------------------------------------------------------------------- #
+def journal_available():
+    try:
+        result = subprocess.run(
+            ['journalctl', '-u', JOURNAL_UNIT, '-n', '1', '--no-pager', '-o', 'cat'],
+            capture_output=True, timeout=10,
+        )
+        return result.returncode == 0
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return False
+
+
+def _journal_text(entry):
+    """journalctl -o json 항목 → short-iso 형식 한 줄"""
+    try:
+        ts = datetime.fromtimestamp(int(entry.get('__REALTIME_TIMESTAMP', 0)) / 1_000_000)
+        stamp = ts.astimezone().isoformat(timespec='seconds')
+    except (TypeError, ValueError, OverflowError):
+        stamp = ''
+    message = entry.get('MESSAGE', '')
+    if isinstance(message, list):  # 바이너리 메시지는 바이트 배열로 온다
+        message = bytes(message).decode('utf-8', 'replace')
+    ident = entry.get('SYSLOG_IDENTIFIER', JOURNAL_UNIT)
+    return f"{stamp} {ident}[{entry.get('_PID', '')}]: {message}"
+
+
+def follow_journal(stop):
+    """journalctl -f 출력 (커서, 줄) 순회 — stop() 이 참이면 프로세스 종료"""
+    proc = subprocess.Popen(
+        ['journalctl', '-u', JOURNAL_UNIT, '-f', '-n', str(PRIME_LINES), '-o', 'json', '--no-pager'],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0,
+    )
+    # select 뒤에 버퍼 있는 readline() 을 쓰면 파이썬 버퍼에 남은 줄을 select 가 보지 못해
+    # 다음 출력이 올 때까지 멈추므로, 파일 기술자에서 직접 읽고 줄을 나눈다
+    fd = proc.stdout.fileno()
+    pending = b''
+    try:
+        while not stop():
+            ready, _, _ = select.select([fd], [], [], 1.0)
+            if not ready:
+                continue
+            chunk = os.read(fd, READ_SIZE)
+            if not chunk:
+                break
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            for raw in lines:
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    continue
+                yield entry.get('__CURSOR', ''), _journal_text(entry)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def app_log_path():
+    return Path(settings.LOGS_DIR) / 'django.log'
+
+
+def follow_file(stop, path=None, prime_bytes=64 * 1024):
+    """
+    로그 파일 추적 (커서, 줄) 순회 — 회전(inode 변경·크기 감소)되면 새 파일 처음부터
+
+    처음에는 끝에서 prime_bytes 만큼 앞에서 시작해 최근 줄을 채운다.
+    """
+    path = str(path or app_log_path())
+    handle = inode = None
+    offset = 0
+    pending = b''
+    while not stop():
+        try:
+            st = os.stat(path)
+        except OSError:
+            time.sleep(POLL_INTERVAL)
+            continue
+        if handle is None or st.st_ino != inode or st.st_size < offset:
+            if handle is not None:
+                handle.close()
+                offset = 0  # 회전된 새 파일은 처음부터
+            else:
+                offset = max(0, st.st_size - prime_bytes)
+            handle = open(path, 'rb')
+            inode = st.st_ino
+            handle.seek(offset)
+            if offset:
+                skipped = handle.readline()  # 잘린 첫 줄 버림
+                offset += len(skipped)
+            pending = b''
+
+        chunk = handle.read()
+        if not chunk:
+            time.sleep(POLL_INTERVAL)
+            continue
+        data = pending + chunk
+        lines = data.split(b'\n')
+        pending = lines.pop()
+        pos = offset
+        for line in lines:
+            pos += len(line) + 1
+            yield f'{inode}:{pos}', line.decode('utf-8', 'replace')
+        offset = pos
+    if handle is not None:
+        handle.close()
+
+
+# ---------------------------------------------------------------------- #
+#  공유 팔로워
+# ---------------------------------------------------------------------- #
+class LogFollower:
+    """
+    소스 하나를 따라가며 새 줄을 링 버퍼에 쌓고 대기 중인 구독자를 깨운다
+
+    팔로워는 스레드에서 읽고 구독자는 이벤트 루프에서 기다리므로, 새 줄이 오면
+    구독자마다 자기 루프에 call_soon_threadsafe 로 asyncio.Event 를 세운다.
+    """
+
+    def __init__(self, source, follow):
+        self.source = source
+        self._follow = follow
+        self._lines = deque(maxlen=BUFFER_LINES)   # {'seq', 'cursor', 'text', 'level'}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._waiters = set()                      # (이벤트 루프, asyncio.Event)
+        self._subscribers = 0
+        self._idle_since = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name=f'log-follower-{source}', daemon=True)
+        self._thread.start()
+
+    @property
+    def alive(self):
+        return self._thread.is_alive()
+
+    def _should_stop(self):
+        with self._lock:
+            return self._subscribers == 0 and time.monotonic() - self._idle_since > IDLE_STOP_SECONDS
+
+    def _wake(self):
+        """대기 중인 구독자를 깨움 (self._lock 를 쥔 상태에서 호출)"""
+        for loop, event in self._waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # 이미 닫힌 루프 (연결이 끊긴 요청)
+                pass
+
+    def _run(self):
+        try:
+            for cursor, text in self._follow(self._should_stop):
+                with self._lock:
+                    self._seq += 1
+                    self._lines.append({
+                        'seq': self._seq, 'cursor': cursor,
+                        'text': text, 'level': classify_level(text),
+                    })
+                    self._wake()
+        except Exception:
+            logger.exception(f'Log follower for {self.source} stopped')
+        finally:
+            with self._lock:
+                self._wake()
+
+    @contextmanager
+    def subscribe(self):
+        with self._lock:
+            self._subscribers += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._subscribers -= 1
+                self._idle_since = time.monotonic()
+
+    def since(self, cursor, initial):
+        """
+        재연결 시작점
+
+        Returns:
+            tuple: (줄 목록, 마지막 seq, gap 여부) — 커서가 버퍼에 없으면 최근 initial 줄과 gap=True
+        """
+        with self._lock:
+            lines = list(self._lines)
+            seq = self._seq
+        if cursor:
+            for index, item in enumerate(lines):
+                if item['cursor'] == cursor:
+                    return lines[index + 1:], seq, False
+        return lines[-initial:] if initial else [], seq, bool(cursor)
+
+    async def wait(self, after_seq, timeout):
+        """after_seq 이후 줄이 생길 때까지 최대 timeout 초 대기 → (새 줄, 마지막 seq)"""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            pending = self._seq <= after_seq and self.alive
+            if pending:
+                self._waiters.add(waiter)
+        if pending:
+            try:
+                await asyncio.wait_for(waiter[1].wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._lock:
+                    self._waiters.discard(waiter)
+        with self._lock:
+            seq = self._seq
+            if seq <= after_seq:
+                return [], seq
+            fresh = [item for item in self._lines if item['seq'] > after_seq]
+        return fresh, seq
+
+
+_followers = {}
+_followers_lock = threading.Lock()
+
+
+def get_follower():
+    """
+    현재 프로세스의 공유 팔로워 (journald 가능하면 journal, 아니면 django.log)
+
+    journal_available() 이 journalctl 을 실행하므로 async 뷰에서는 sync_to_async 로 부른다.
+
+    Returns:
+        LogFollower | None: 읽을 로그 소스가 없으면 None
+    """
+    with _followers_lock:
+        for follower in _followers.values():
+            if follower.alive:
+                return follower
+        _followers.clear()
+        if journal_available():
+            source, follow = 'journal', follow_journal
+        elif app_log_path().exists():
+            source, follow = 'file', follow_file
+        else:
+            return None
+        follower = _followers[source] = LogFollower(source, follow)
+        return follower
+
+
+def _event(data, event=None, event_id=None):
+    parts = []
+    if event_id:
+        parts.append(f'id: {event_id}')
+    if event:
+        parts.append(f'event: {event}')
+    parts.append(f'data: {json.dumps(data, ensure_ascii=False)}')
+    return '\n'.join(parts) + '\n\n'
+
+
+async def sse_events(follower, cursor=None, level='info', initial=120, duration=STREAM_SECONDS):
+    """
+    SSE 응답 본문 (async 제너레이터 — 연결이 끊기면 Django 가 닫아 구독이 풀린다)
+
+    Args:
+        follower (LogFollower): get_follower() 결과
+        cursor (str): Last-Event-ID (마지막으로 받은 줄 커서)
+        level (str): 최소 레벨 info | warn | error
+        initial (int): 새 연결(또는 gap)일 때 먼저 보낼 최근 줄 수
+        duration (float): 응답 유지 시간 (초과하면 끝내고 브라우저 재연결에 맡김)
+    """
+    min_level = LEVELS.get(level, 0)
+
+    def batch(items):
+        lines = [
+            {'text': item['text'], 'level': item['level']}
+            for item in items if LEVELS[item['level']] >= min_level
+        ]
+        # 필터에 걸린 줄도 커서는 전진시켜 재연결 때 다시 보내지 않는다
+        return _event({'lines': lines, 'server_time': datetime.now().strftime('%H:%M:%S')},
+                      event_id=items[-1]['cursor'] if items else None)
+
+    with follower.subscribe():
+        yield 'retry: 2000\n\n'
+        yield _event({'source': follower.source}, event='hello')
+
+        items, seq, gap = follower.since(cursor, initial)
+        if gap:
+            yield _event({'reason': 'cursor_expired'}, event='gap')
+        if items or not cursor:
+            yield batch(items)
+
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            items, seq = await follower.wait(seq, min(HEARTBEAT_SECONDS, max(deadline - time.monotonic(), 0)))
+            if items:
+                yield batch(items)
+            elif not follower.alive:
+                break
+            else:
+                yield ': keepalive\n\n'
@@ -0,0 +1,191 @@
+"""
+로그 템플릿 마이닝 (Drain 방식)
+
+id·IP·경로 숫자만 다른 같은 에러가 수십 줄씩 AI 에러 분석 프롬프트에 들어가던 것을
+"템플릿 + 횟수 + 처음/마지막 시각 + 예시 한 줄" 로 묶습니다.
+
+- 가변값 마스킹: UUID → <UUID>, IP → <IP>, 16진수 → <HEX>, 숫자 → <NUM>
+- Drain 파싱 트리: 토큰 수 → 앞쪽 토큰(depth-2개) → 잎의 클러스터 목록에서
+  유사도(같은 토큰 비율)가 SIMILARITY 이상인 템플릿에 합치고, 다른 자리는 <*> 로 일반화
+- 분 단위 집계(LogMinuteStat.templates)에 저장한 템플릿도 같은 트리로 다시 합칠 수 있음
+- 템플릿 지문(template_fingerprint)은 LogFinding 중복 판정·AI 분석 캐시 키에 사용 — Drain 템플릿은
+  새 줄이 합쳐질 때마다 <*> 자리가 늘어나므로 템플릿 전체가 아닌 signature() 로 계산
+
+사용 예시:
+    miner = TemplateMiner()
+    for line in lines:
+        miner.add(line, level='error')
+    miner.summary(15)
+"""
+import hashlib
+import re
+
+WILDCARD = '<*>'
+DEPTH = 4                 # 트리 깊이 (토큰 수 노드 + 앞쪽 토큰 DEPTH-2 개)
+SIMILARITY = 0.4          # 템플릿에 합칠 최소 유사도
+MAX_CHILDREN = 100        # 노드당 자식 수 (넘치면 <*> 자식으로)
+MAX_EXEMPLAR = 300
+SIGNATURE_TOKENS = 6      # signature() 에 쓰는 앞쪽 토큰 수
+
+LEVEL_RANK = {'info': 0, 'warn': 1, 'error': 2}
+
+# 로그 접두: 'ERROR 2025-01-01 12:34:56,789 module ' (파일) / 'Jan 01 12:34:56 host mysite[123]: ' (journal short)
+_FILE_PREFIX = re.compile(r'^\s*[A-Z]+\s+\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}[,.\d]*\s+\S+\s+')
+_JOURNAL_PREFIX = re.compile(r'^[A-Z][a-z]{2}\s+\d{1,2} \d{2}:\d{2}:\d{2} \S+ [^:\s]+(?:\[\d+\])?:\s+')
+_TIMESTAMP = re.compile(r'\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}')
+
+_MASKS = (
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', re.I), '<UUID>'),
+    (re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b'), '<IP>'),
+    (re.compile(r'\b0x[0-9a-f]+\b|\b(?=[0-9a-f]*\d)(?=[0-9a-f]*[a-f])[0-9a-f]{8,}\b', re.I), '<HEX>'),
+    (re.compile(r'\d+'), '<NUM>'),
+)
+
+_EXCEPTION = re.compile(r'\b([A-Z]\w*(?:Error|Exception))\b')
+_LOCATION = re.compile(r'File "([^"]+)", line \S+, in (\w+)')
+
+
+def strip_prefix(line):
+    """레벨·시각·모듈(또는 journald 호스트·유닛) 접두 제거"""
+    line = _JOURNAL_PREFIX.sub('', line, count=1)
+    return _FILE_PREFIX.sub('', line, count=1).strip()
+
+
+def mask(message):
+    for pattern, token in _MASKS:
+        message = pattern.sub(token, message)
+    return message
+
+
+def signature(template):
+    """
+    템플릿이 일반화돼도 바뀌지 않는 근거 문자열
+
+    예외 클래스가 있으면 '예외 클래스|위치(파일:함수)', 없으면 앞쪽 SIGNATURE_TOKENS 개 토큰에서
+    경로·가변값(<…>, '/', '=' 가 든 토큰)을 <*> 로 바꾼 것.
+    예: 'Internal Server Error: /question/<NUM>/ from <IP>' 와 이후 'Internal Server Error: <*> from <IP>'
+    → 둘 다 'Internal Server Error: <*> from <*>'
+    """
+    exception = _EXCEPTION.search(template)
+    if exception:
+        location = _LOCATION.search(template)
+        return f'exc|{exception.group(1)}|' + (f'{location.group(1)}:{location.group(2)}' if location else '')
+    tokens = [
+        WILDCARD if ('<' in token or '/' in token or '=' in token) else token
+        for token in template.split()[:SIGNATURE_TOKENS]
+    ]
+    return 'head|' + ' '.join(tokens)
+
+
+def template_fingerprint(template):
+    """템플릿 문자열 → 안정 지문 (sha256, signature() 기준)"""
+    return hashlib.sha256(f'sig|{signature(template)}'.encode('utf-8')).hexdigest()
+
+
+class TemplateCluster:
+    __slots__ = ('tokens', 'count', 'first_seen', 'last_seen', 'exemplar', 'level')
+
+    def __init__(self, tokens, exemplar, level):
+        self.tokens = tokens
+        self.count = 0
+        self.first_seen = None
+        self.last_seen = None
+        self.exemplar = exemplar[:MAX_EXEMPLAR]
+        self.level = level
+
+    @property
+    def template(self):
+        return ' '.join(self.tokens)
+
+    def absorb(self, count, first_seen, last_seen, level):
+        self.count += count
+        if first_seen and (self.first_seen is None or first_seen < self.first_seen):
+            self.first_seen = first_seen
+        if last_seen and (self.last_seen is None or last_seen > self.last_seen):
+            self.last_seen = last_seen
+        if LEVEL_RANK.get(level, 0) > LEVEL_RANK.get(self.level, 0):
+            self.level = level
+
+    def as_dict(self):
+        return {
+            'template': self.template, 'count': self.count, 'level': self.level,
+            'first_seen': self.first_seen, 'last_seen': self.last_seen, 'exemplar': self.exemplar,
+        }
+
+
+def _similarity(template, tokens):
+    """(같은 토큰 비율, 와일드카드 수) — drain 의 seq_dist"""
+    same = params = 0
+    for a, b in zip(template, tokens):
+        if a == b:
+            same += 1
+        elif a == WILDCARD:
+            params += 1
+    return same / len(template), params
+
+
+class TemplateMiner:
+    """Drain 파싱 트리 기반 템플릿 클러스터러"""
+
+    def __init__(self, depth=DEPTH, similarity=SIMILARITY, max_children=MAX_CHILDREN):
+        self.depth = depth
+        self.similarity = similarity
+        self.max_children = max_children
+        self._root = {}
+        self._clusters = []
+
+    def _leaf(self, tokens):
+        node = self._root.setdefault(len(tokens), {})
+        for token in tokens[:self.depth - 2]:
+            key = WILDCARD if (token == WILDCARD or '<' in token or any(c.isdigit() for c in token)) else token
+            if key not in node and len(node) >= self.max_children:
+                key = WILDCARD
+            node = node.setdefault(key, {})
+        return node.setdefault(None, [])
+
+    def _match(self, tokens, exemplar, level):
+        if not tokens:
+            tokens = ['']
+        leaf = self._leaf(tokens)
+        best, best_key = None, None
+        for cluster in leaf:
+            sim, params = _similarity(cluster.tokens, tokens)
+            if sim >= self.similarity and (best_key is None or (sim, params) > best_key):
+                best, best_key = cluster, (sim, params)
+        if best is None:
+            best = TemplateCluster(list(tokens), exemplar, level)
+            leaf.append(best)
+            self._clusters.append(best)
+        else:
+            best.tokens = [a if a == b else WILDCARD for a, b in zip(best.tokens, tokens)]
+        return best
+
+    def add(self, line, level='error', seen=None):
+        """
+        원본 로그 한 줄 반영
+
+        Args:
+            line (str): 로그 줄
+            level (str): info | warn | error
+            seen (str): 시각 문자열 (없으면 줄에서 'YYYY-MM-DD HH:MM:SS' 를 찾음)
+        """
+        if seen is None:
+            m = _TIMESTAMP.search(line, 0, 60)
+            seen = m.group(0).replace('T', ' ') if m else None
+        message = strip_prefix(line)
+        cluster = self._match(mask(message).split(), message, level)
+        cluster.absorb(1, seen, seen, level)
+        return cluster
+
+    def merge(self, item):
+        """as_dict() 형식 템플릿(다른 집계의 결과)을 합침"""
+        cluster = self._match(item['template'].split(), item.get('exemplar', ''), item.get('level', 'error'))
+        cluster.absorb(item['count'], item.get('first_seen'), item.get('last_seen'), item.get('level', 'error'))
+        return cluster
+
+    def clusters(self):
+        """에러 레벨 우선, 횟수 많은 순"""
+        return sorted(self._clusters, key=lambda c: (-LEVEL_RANK.get(c.level, 0), -c.count))
+
+    def summary(self, top=None):
+        return [cluster.as_dict() for cluster in self.clusters()[:top]]
@@ -0,0 +1,309 @@
+"""
+메일 발송 큐 (OutboundEmail 테이블 + send_queued_mail 워커)
+
+요청 처리 중 send_mail 을 부르면 SMTP 연결·TLS 핸드셰이크·전송이 끝날 때까지
+sync gunicorn 워커 하나가 수 초씩 묶입니다. 뷰와 명령어는 enqueue() 로 행만 넣고,
+워커(python manage.py send_queued_mail --loop)가 발송합니다.
+
+- 배치: 발송 시각이 된 메일을 EMAIL_QUEUE_BATCH_SIZE 통씩 SMTP 연결 하나로 전송
+- 연결이 끊기면(서버 종료·소켓 오류) 다시 연결해 남은 메일을 이어서 전송
+- 재시도: 실패마다 EMAIL_QUEUE_BACKOFF × 2^(시도-1) 초 뒤로 미룸 (최대 1시간)
+- dead-letter: EMAIL_QUEUE_MAX_ATTEMPTS 번 실패하거나 수신자 거부(영구 오류)면 dead 로 보관
+- 즉시 발송: sensitive=True(인증 코드·임시 비밀번호·OTP)는 커밋 직후 백그라운드 스레드가 그 한 통을
+  바로 보냄 — 워커가 죽어 있어도 관리자가 OTP 를 받아 서버 모니터(큐 상태)에 들어갈 수 있고,
+  비밀번호가 테이블에 평문으로 머무는 시간이 짧음. 실패하면 워커가 재시도(백오프)를 이어받고,
+  즉시 발송과 겹치지 않도록 워커는 SEND_NOW_LEASE_SECONDS 동안 그 행을 건너뜀
+- 본문 보존: 발송한 메일은 본문을 지우고 제목·수신자·상태만 남김. sensitive=True(인증 코드·
+  임시 비밀번호·OTP)는 dead 가 돼도 지움 — 코드는 몇 분 뒤 만료되므로 다시 보낼 이유가 없음
+- 지표: email_sent_total{result}, email_send_duration_seconds, email_delivery_seconds,
+  대기 건수는 stats() (DB 조회)
+
+사용 예시:
+    from common.services import mail_queue
+
+    mail_queue.enqueue('[테크창] 이메일 인증 코드', body, [email], sensitive=True)
+    mail_queue.enqueue(subject, text, [admin], html_body=html,
+                       attachments=[{'path': str(gz_path), 'delete': True}])
+
+    mail_queue.send_pending()           # 워커: 한 배치 발송 → (발송, 실패)
+    mail_queue.send_pending(ids=[pk])   # 즉시 발송: 리스 중인 첫 시도만
+    mail_queue.stats()                  # {'pending', 'retrying', 'dead', 'oldest_age_s', ...}
+"""
+import logging
+import os
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import close_old_connections, transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from common.models import OutboundEmail
+from common.services import metrics
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_SECONDS = 3600
+SEND_NOW_LEASE_SECONDS = 60   # 즉시 발송 중인 sensitive 메일을 워커가 건너뛰는 시간
+
+# 다시 보내도 같은 결과인 오류 → 재시도 없이 dead
+PERMANENT_ERRORS = (smtplib.SMTPRecipientsRefused, FileNotFoundError)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def spool_dir():
+    """발송 후 지울 첨부 파일을 두는 곳 (워커가 읽을 수 있어야 하므로 임시 디렉터리 대신)"""
+    path = Path(settings.LOGS_DIR) / 'outbox'
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def enqueue(subject, body, to, html_body='', from_email=None, attachments=(), sensitive=False):
+    """
+    메일 한 통을 발송 큐에 등록 (SMTP 는 건드리지 않음)
+
+    Args:
+        to (list): 받는 사람 주소 목록
+        html_body (str): 있으면 text/html 대체 본문으로 첨부
+        attachments (list): 파일 경로 또는 {'path': ..., 'delete': True}
+            (delete 면 발송·폐기 후 파일 삭제)
+        sensitive (bool): 인증 코드·비밀번호가 든 메일 — 커밋 직후 바로 보내고, dead 가 돼도 본문을 지움
+
+    Returns:
+        OutboundEmail
+    """
+    files = [
+        {'path': str(item), 'delete': False} if isinstance(item, (str, os.PathLike)) else dict(item)
+        for item in attachments
+    ]
+    send_now = sensitive and _setting('EMAIL_QUEUE_SEND_SENSITIVE_NOW', True)
+    email = OutboundEmail.objects.create(
+        subject=subject[:300],
+        body=body,
+        html_body=html_body or '',
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+        attachments=files,
+        sensitive=sensitive,
+        next_attempt_at=timezone.now() + timedelta(seconds=SEND_NOW_LEASE_SECONDS if send_now else 0),
+    )
+    if send_now:
+        schedule_send(email.pk)
+    return email
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _pool():
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():  # fork 된 워커는 새 풀
+        with _executor_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mail-send-now')
+                _executor_pid = os.getpid()
+    return _executor
+
+
+def _send_in_background(pk):
+    try:
+        send_pending(ids=[pk])
+    except Exception:
+        logger.exception(f'Immediate send of outbound email #{pk} failed')
+    finally:
+        close_old_connections()
+
+
+def schedule_send(pk):
+    """트랜잭션이 커밋된 뒤 스레드에서 메일 pk 한 통을 발송 (실패하면 리스가 끝난 뒤 워커가 재시도)"""
+    transaction.on_commit(lambda: _pool().submit(_send_in_background, pk))
+
+
+def _build_message(email, connection):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=email.to,
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+    for item in email.attachments:
+        message.attach_file(item['path'])
+    return message
+
+
+def _cleanup_attachments(email):
+    for item in email.attachments:
+        if item.get('delete'):
+            try:
+                os.remove(item['path'])
+            except OSError:
+                pass
+
+
+def backoff(attempts):
+    """attempts 번째 실패 후 다음 시도까지 기다릴 시간(초)"""
+    base = _setting('EMAIL_QUEUE_BACKOFF', 30)
+    return min(base * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS)
+
+
+def _redact(email):
+    email.body = OutboundEmail.REDACTED_BODY
+    email.html_body = ''
+    return ['body', 'html_body']
+
+
+def _mark_sent(email, now):
+    email.status = OutboundEmail.STATUS_SENT
+    email.sent_at = now
+    email.last_error = ''
+    email.save(update_fields=['status', 'sent_at', 'attempts', 'last_error', *_redact(email)])
+    _cleanup_attachments(email)
+    metrics.EMAIL_SENT.inc(result='sent')
+    metrics.EMAIL_DELIVERY_LATENCY.observe((now - email.created_at).total_seconds())
+
+
+def _mark_failed(email, exc):
+    email.last_error = f'{type(exc).__name__}: {exc}'[:2000]
+    redacted = []
+    if isinstance(exc, PERMANENT_ERRORS) or email.attempts >= _setting('EMAIL_QUEUE_MAX_ATTEMPTS', 6):
+        email.status = OutboundEmail.STATUS_DEAD
+        if email.sensitive:
+            redacted = _redact(email)
+        _cleanup_attachments(email)
+        metrics.EMAIL_SENT.inc(result='dead')
+        logger.error(f'Outbound email #{email.pk} dead after {email.attempts} attempts: {email.last_error}')
+    else:
+        email.next_attempt_at = timezone.now() + timedelta(seconds=backoff(email.attempts))
+        metrics.EMAIL_SENT.inc(result='retry')
+        logger.warning(f'Outbound email #{email.pk} failed (attempt {email.attempts}), retrying: {email.last_error}')
+    email.save(update_fields=['status', 'attempts', 'next_attempt_at', 'last_error', *redacted])
+
+
+def _connection_lost(exc):
+    """연결을 다시 맺어야 하는 오류 (SMTPException 도 OSError 이므로 메시지 단위 오류는 제외)"""
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True
+    return isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
+
+
+def send_pending(batch_size=None, connection=None, ids=None):
+    """
+    발송 시각이 된 메일을 최대 batch_size 통 SMTP 연결 하나로 발송
+
+    Args:
+        ids (list): 지정하면 발송 시각과 상관없이 이 메일들의 첫 시도만 (schedule_send 의 즉시 발송)
+
+    Returns:
+        tuple: (발송 성공 수, 실패 수)
+    """
+    batch_size = batch_size or _setting('EMAIL_QUEUE_BATCH_SIZE', 50)
+    rows = OutboundEmail.objects.filter(status=OutboundEmail.STATUS_PENDING)
+    if ids is None:
+        rows = rows.filter(next_attempt_at__lte=timezone.now())
+    else:
+        rows = rows.filter(pk__in=ids, attempts=0)
+    due = list(rows.order_by('next_attempt_at', 'id')[:batch_size])
+    if not due:
+        return 0, 0
+
+    connection = connection or get_connection()
+    try:
+        connection.open()  # 먼저 열어 두어야 send_messages 가 호출마다 닫지 않고 재사용
+    except Exception as e:
+        logger.warning(f'SMTP connect failed, {len(due)} emails wait for next interval: {e}')
+        return 0, 0
+    sent = failed = 0
+    try:
+        for email in due:
+            email.attempts += 1
+            try:
+                message = _build_message(email, connection)
+            except OSError as e:  # 첨부 파일이 사라짐
+                failed += 1
+                _mark_failed(email, e)
+                continue
+            started = time.monotonic()
+            try:
+                connection.send_messages([message])
+            except Exception as e:
+                failed += 1
+                _mark_failed(email, e)
+                if _connection_lost(e):
+                    connection.close()
+                    try:
+                        connection.open()
+                    except Exception:
+                        break  # 다시 연결되지 않으면 남은 메일은 다음 주기에
+                continue
+            metrics.EMAIL_SEND_LATENCY.observe(time.monotonic() - started)
+            _mark_sent(email, timezone.now())
+            sent += 1
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def drain(batch_size=None, max_batches=None):
+    """대기 중인 메일이 없을 때까지 배치 반복 → (발송, 실패)"""
+    sent = failed = batches = 0
+    while max_batches is None or batches < max_batches:
+        batch_sent, batch_failed = send_pending(batch_size)
+        if not batch_sent and not batch_failed:
+            break
+        sent += batch_sent
+        failed += batch_failed
+        batches += 1
+        if not batch_sent:
+            break  # 전부 실패 (SMTP 장애) → 다음 주기에 재시도
+    return sent, failed
+
+
+def purge_sent(days=None):
+    """발송 완료 후 days 일 지난 행 삭제 → 삭제 수 (dead 는 확인용으로 남김)"""
+    days = _setting('EMAIL_QUEUE_KEEP_DAYS', 14) if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = OutboundEmail.objects.filter(status=OutboundEmail.STATUS_SENT, sent_at__lt=cutoff).delete()
+    return deleted
+
+
+def stats():
+    """큐 상태 — 대기(첫 시도 전)·재시도 대기·dead 건수, 가장 오래된 대기 메일의 나이(초)"""
+    pending = Q(status=OutboundEmail.STATUS_PENDING)
+    row = OutboundEmail.objects.aggregate(
+        pending=Count('id', filter=pending & Q(attempts=0)),
+        retrying=Count('id', filter=pending & Q(attempts__gt=0)),
+        dead=Count('id', filter=Q(status=OutboundEmail.STATUS_DEAD)),
+        oldest=Min('created_at', filter=pending),
+    )
+    oldest = row.pop('oldest')
+    row['depth'] = row['pending'] + row['retrying']
+    row['oldest_age_s'] = int((timezone.now() - oldest).total_seconds()) if oldest else None
+    return row
+
+
+def render_text():
+    """Prometheus 형식 큐 깊이 (DB 기준이라 워커 프로세스 지표 파일과 별도로 노출)"""
+    row = stats()
+    lines = ['# HELP email_queue_depth 발송 대기 메일 수', '# TYPE email_queue_depth gauge']
+    for status in ('pending', 'retrying', 'dead'):
+        lines.append(f'email_queue_depth{{status="{status}"}} {row[status]}')
+    lines += [
+        '# HELP email_queue_oldest_age_seconds 가장 오래된 대기 메일의 나이(초)',
+        '# TYPE email_queue_oldest_age_seconds gauge',
+        f'email_queue_oldest_age_seconds {row["oldest_age_s"] or 0}',
+    ]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,620 @@
+"""
+프로세스 간 합산되는 지표 레지스트리 (Prometheus 텍스트 형식)
+
+gunicorn 워커는 메모리를 공유하지 않으므로 프로세스마다 METRICS_DIR 아래에
+자기 전용 mmap 파일(counter_<pid>.db, gauge_<pid>.db)을 두고 값을 쓰고,
+조회할 때 모든 파일을 읽어 합산합니다 (prometheus_client 멀티프로세스 모드와 같은 방식).
+
+- Counter: 누적 값 (종료된 프로세스 파일은 compact() 가 counter_archive.json 하나로 합치고 삭제)
+- Gauge: 현재 값 (종료된 프로세스 파일은 compact() 가 삭제)
+- compact(): gunicorn child_exit 훅과 시스템 지표 샘플러가 호출 — max_requests 로 워커가 계속
+  교체돼도 디렉터리 파일 수는 살아 있는 프로세스 수 + 1 로 유지
+- Histogram: 고정 버킷 분포 (버킷별 개수 + _sum + _count, 출력 시 누적)
+- 서버 시작(on_starting)마다 디렉터리를 비워 카운터를 0부터 다시 센다
+- 파일을 만들 수 없는 환경에서는 프로세스 메모리에만 기록
+
+사용 예시:
+    from common.services import metrics
+
+    metrics.HTTP_REQUESTS.inc(view='community:index', method='GET', status='200')
+    metrics.HTTP_LATENCY.observe(0.042, view='community:index')
+
+    text = metrics.render_text()        # /common/admin/monitor/metrics/
+    summary = metrics.dashboard_summary()
+"""
+import glob
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+from . import file_lock
+
+logger = logging.getLogger(__name__)
+
+_INITIAL_FILE_SIZE = 64 * 1024
+_HEADER_SIZE = 8
+ARCHIVE_FILE = 'counter_archive.json'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CLAUDE_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+EMAIL_DELIVERY_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 900.0, 3600.0)
+
+REGISTRY = {}
+
+
+# ---------------------------------------------------------------------- #
+#  저장소 (프로세스별 mmap 파일)
+# ---------------------------------------------------------------------- #
+def _encode_entry(key):
+    """[키 길이 int32][키 + 8바이트 정렬 패딩][float64 값]"""
+    encoded = key.encode('utf-8')
+    padded = encoded + b' ' * (8 - (len(encoded) + 4) % 8)
+    return struct.pack(f'i{len(padded)}sd', len(encoded), padded, 0.0)
+
+
+def _read_entries(data):
+    """mmap 파일 내용 → (키, 값) 순회 (헤더의 사용 길이까지만)"""
+    used = struct.unpack_from('i', data, 0)[0] if len(data) >= _HEADER_SIZE else 0
+    pos = _HEADER_SIZE
+    while pos < used:
+        key_len = struct.unpack_from('i', data, pos)[0]
+        pos += 4
+        key = bytes(data[pos:pos + key_len]).decode('utf-8')
+        pos += key_len + (8 - (key_len + 4) % 8)
+        yield key, pos, struct.unpack_from('d', data, pos)[0]
+        pos += 8
+
+
+class _MmapStore:
+    """한 프로세스 전용 키 → float 파일 (다른 프로세스는 읽기만 한다)"""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._file = open(path, 'a+b')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _INITIAL_FILE_SIZE:
+            self._file.truncate(_INITIAL_FILE_SIZE)
+            size = _INITIAL_FILE_SIZE
+        self._capacity = size
+        self._map = mmap.mmap(self._file.fileno(), self._capacity)
+        self._positions = {key: pos for key, pos, _value in _read_entries(self._map)}
+        self._used = struct.unpack_from('i', self._map, 0)[0]
+        if not self._used:
+            self._used = _HEADER_SIZE
+            struct.pack_into('i', self._map, 0, self._used)
+
+    def _position(self, key):
+        pos = self._positions.get(key)
+        if pos is not None:
+            return pos
+        entry = _encode_entry(key)
+        while self._used + len(entry) > self._capacity:
+            self._capacity *= 2
+            self._file.truncate(self._capacity)
+            self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), self._capacity)
+        self._map[self._used:self._used + len(entry)] = entry
+        self._used += len(entry)
+        # 값까지 쓴 뒤에 사용 길이를 늘려 읽는 쪽이 반쯤 쓴 항목을 보지 않게 한다
+        struct.pack_into('i', self._map, 0, self._used)
+        pos = self._positions[key] = self._used - 8
+        return pos
+
+    def inc(self, key, amount):
+        with self._lock:
+            pos = self._position(key)
+            struct.pack_into('d', self._map, pos, struct.unpack_from('d', self._map, pos)[0] + amount)
+
+    def set(self, key, value):
+        with self._lock:
+            struct.pack_into('d', self._map, self._position(key), value)
+
+    def items(self):
+        with self._lock:
+            return [(key, value) for key, _pos, value in _read_entries(self._map)]
+
+
+class _MemoryStore:
+    """METRICS_DIR 을 쓸 수 없을 때의 대체 저장소 (현재 프로세스 값만 집계)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, key, amount):
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set(self, key, value):
+        with self._lock:
+            self._values[key] = value
+
+    def items(self):
+        with self._lock:
+            return list(self._values.items())
+
+
+_stores = {}
+_stores_owner = None
+_stores_lock = threading.Lock()
+
+
+def metrics_dir():
+    return Path(getattr(settings, 'METRICS_DIR', '') or Path(settings.LOGS_DIR) / 'metrics')
+
+
+def _store(kind):
+    """현재 프로세스의 저장소 (fork 후에는 부모 파일을 건드리지 않도록 새로 연다)"""
+    global _stores_owner
+    directory = metrics_dir()
+    owner = (os.getpid(), str(directory))
+    with _stores_lock:
+        if _stores_owner != owner:
+            _stores.clear()
+            _stores_owner = owner
+        store = _stores.get(kind)
+        if store is None:
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+                store = _MmapStore(directory / f'{kind}_{os.getpid()}.db')
+            except OSError:
+                logger.warning(f'Metrics dir {directory} unavailable, keeping {kind} metrics in memory')
+                store = _MemoryStore()
+            _stores[kind] = store
+        return store
+
+
+def reset_directory():
+    """모든 프로세스 파일과 보관 파일 삭제 (gunicorn on_starting 훅)"""
+    directory = metrics_dir()
+    for path in [*glob.glob(str(directory / '*.db')), str(directory / ARCHIVE_FILE)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _file_pid(path):
+    """'counter_123.db' → 123 (형식이 다르면 None)"""
+    try:
+        return int(Path(path).stem.rsplit('_', 1)[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def _alive(pid):
+    if os.name != 'posix':
+        return True  # Windows 의 os.kill 은 신호 0 이어도 프로세스를 종료시킴
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # 다른 사용자의 프로세스
+    return True
+
+
+def _read_archive(directory):
+    """{'generation': 바뀔 때마다 증가, 'pids': 합쳤지만 아직 지우지 못한 파일의 pid, 'values': {키: 값}}"""
+    try:
+        with open(directory / ARCHIVE_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'generation': 0, 'pids': [], 'values': {}}
+
+
+def _write_archive(directory, generation, pids, values):
+    tmp = directory / f'{ARCHIVE_FILE}.{os.getpid()}.tmp'
+    tmp.write_text(json.dumps({'generation': generation, 'pids': pids, 'values': values}, ensure_ascii=False),
+                   encoding='utf-8')
+    os.replace(tmp, directory / ARCHIVE_FILE)
+
+
+def compact(dead_pids=()):
+    """
+    종료된 프로세스의 카운터 파일을 보관 파일에 합치고 게이지 파일과 함께 삭제
+
+    dead_pids 는 종료가 확실한 pid (gunicorn child_exit), 그 외는 프로세스 존재 여부로 판단.
+
+    Returns:
+        int: 합친 카운터 파일 수
+    """
+    directory = metrics_dir()
+    if not directory.is_dir():
+        return 0
+    dead_pids = {int(pid) for pid in dead_pids}
+
+    def dead(path):
+        pid = _file_pid(path)
+        return pid is not None and pid != os.getpid() and (pid in dead_pids or not _alive(pid))
+
+    with file_lock.locked('compact.lock', directory):
+        archive = _read_archive(directory)
+        values = archive['values']
+        pids = list(archive['pids'])
+        merged = []
+        for path in glob.glob(str(directory / 'counter_*.db')):
+            if not dead(path):
+                continue
+            if _file_pid(path) not in pids:  # 이미 합쳤는데 지우지 못한 파일은 삭제만 다시 시도
+                for key, value in _read_file(path):
+                    values[key] = values.get(key, 0.0) + value
+                pids.append(_file_pid(path))
+            merged.append(path)
+
+        if merged:
+            # 합친 pid 를 적은 보관 파일로 바꾼 뒤에 원본을 지워야 collect() 가 두 번 세거나 빠뜨리지 않는다
+            _write_archive(directory, archive['generation'] + 1, pids, values)
+
+        for path in merged + [p for p in glob.glob(str(directory / 'gauge_*.db')) if dead(p)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+        if merged:
+            # 지워진 pid 는 목록에서 뺀다 (같은 pid 로 새로 뜬 프로세스의 파일을 건너뛰지 않도록)
+            pids = [pid for pid in pids if (directory / f'counter_{pid}.db').exists()]
+            _write_archive(directory, archive['generation'] + 2, pids, values)
+    return len(merged)
+
+
+def mark_process_dead(pid):
+    """종료된 워커 파일 정리 (gunicorn child_exit 훅)"""
+    try:
+        compact(dead_pids=[pid])
+    except OSError:
+        logger.exception(f'Metrics compaction for pid {pid} failed')
+
+
+# ---------------------------------------------------------------------- #
+#  지표 종류
+# ---------------------------------------------------------------------- #
+def _key(name, labels):
+    return json.dumps([name, sorted(labels.items())], ensure_ascii=False)
+
+
+class _Metric:
+    kind = ''
+    store = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY[name] = self
+
+    def _labels(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name}: labels {sorted(labels)} != {sorted(self.labelnames)}')
+        return {k: str(v) for k, v in labels.items()}
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        _store(self.store).inc(_key(self.name, self._labels(labels)), amount)
+
+
+class Gauge(_Metric):
+    """워커별 현재 값 (조회 시 살아 있는 워커 값의 합)"""
+    kind = 'gauge'
+    store = 'gauge'
+
+    def set(self, value, **labels):
+        _store(self.store).set(_key(self.name, self._labels(labels)), value)
+
+    def inc(self, amount=1, **labels):
+        _store(self.store).inc(_key(self.name, self._labels(labels)), amount)
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """고정 버킷 히스토그램 — 관측마다 해당 버킷 하나와 _sum, _count 만 갱신"""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        labels = self._labels(labels)
+        le = next((b for b in self.buckets if value <= b), None)
+        store = _store(self.store)
+        store.inc(_key(f'{self.name}_bucket', {**labels, 'le': _format_le(le)}), 1)
+        store.inc(_key(f'{self.name}_sum', labels), value)
+        store.inc(_key(f'{self.name}_count', labels), 1)
+
+
+def _format_le(bound):
+    return '+Inf' if bound is None else repr(float(bound))
+
+
+HTTP_REQUESTS = Counter(
+    'http_requests_total', 'HTTP 요청 수', ('view', 'method', 'status'))
+HTTP_LATENCY = Histogram(
+    'http_request_duration_seconds', 'URL 이름별 응답 시간(초)', ('view',))
+HTTP_IN_PROGRESS = Gauge(
+    'http_requests_in_progress', '처리 중인 HTTP 요청 수')
+GAME_MOVES = Counter(
+    'game_moves_total', '게임 수(手) 요청 수', ('game',))
+CACHE_REQUESTS = Counter(
+    'cache_requests_total', '캐시 조회 수 (hit/miss)', ('cache', 'result'))
+CLAUDE_LATENCY = Histogram(
+    'claude_request_duration_seconds', 'Claude API 응답 시간(초)', ('model', 'mode'), buckets=CLAUDE_BUCKETS)
+CLAUDE_REQUESTS = Counter(
+    'claude_requests_total', 'Claude API 호출 수 (ok/error/retry/cache_hit)', ('model', 'result'))
+CLAUDE_TOKENS = Counter(
+    'claude_tokens_total', 'Claude API 토큰 사용량 (input/output/cache_read/cache_write)', ('model', 'kind'))
+CLAUDE_TTFT = Histogram(
+    'claude_time_to_first_token_seconds', 'Claude 스트리밍 첫 조각까지 걸린 시간(초)', ('model',))
+CLAUDE_COST = Counter(
+    'claude_cost_usd_total', 'Claude API 추정 비용(USD)', ('model',))
+UPSTREAM_REQUESTS = Counter(
+    'upstream_requests_total', '외부 API 호출 수 (상태 코드 그룹/timeout/error/retry/circuit_open)', ('service', 'result'))
+UPSTREAM_LATENCY = Histogram(
+    'upstream_request_duration_seconds', '외부 API 응답 시간(초)', ('service',))
+EMAIL_SENT = Counter(
+    'email_sent_total', '메일 큐 발송 시도 수 (sent/retry/dead)', ('result',))
+EMAIL_SEND_LATENCY = Histogram(
+    'email_send_duration_seconds', '메일 한 통의 SMTP 전송 시간(초)')
+EMAIL_DELIVERY_LATENCY = Histogram(
+    'email_delivery_seconds', '메일 큐 등록부터 발송까지 걸린 시간(초)', buckets=EMAIL_DELIVERY_BUCKETS)
+SQL_PROFILED = Counter(
+    'sql_profiled_requests_total', 'SQL 프로파일러 표본 요청 수', ('view',))
+SQL_QUERIES = Counter(
+    'sql_queries_total', '표본 요청의 SQL 쿼리 수', ('view',))
+SQL_TIME = Counter(
+    'sql_query_seconds_total', '표본 요청의 DB 시간(초)', ('view',))
+SQL_REPEATED = Counter(
+    'sql_repeated_statements_total', 'N+1 의심 문장이 탐지된 표본 요청 수', ('view', 'statement'))
+
+
+# ---------------------------------------------------------------------- #
+#  집계·출력
+# ---------------------------------------------------------------------- #
+def _read_file(path):
+    try:
+        with open(path, 'rb') as f:
+            return list((key, value) for key, _pos, value in _read_entries(f.read()))
+    except (OSError, struct.error, UnicodeDecodeError):
+        return []
+
+
+def collect():
+    """
+    모든 프로세스 값을 합산
+
+    Returns:
+        dict: {(샘플 이름, ((라벨, 값), ...)): 합계}
+    """
+    with _stores_lock:
+        memory = [s for s in _stores.values() if isinstance(s, _MemoryStore)]
+    directory = metrics_dir()
+    for _attempt in range(3):
+        entries = [item for store in memory for item in store.items()]
+        archive = _read_archive(directory)
+        entries.extend(archive['values'].items())
+        merged = set(archive['pids'])
+        for path in glob.glob(str(directory / '*.db')):
+            if _file_pid(path) not in merged:
+                entries.extend(_read_file(path))
+        # 읽는 도중 compact() 가 보관 파일을 바꿨으면 다시 읽는다
+        if _read_archive(directory)['generation'] == archive['generation']:
+            break
+
+    totals = {}
+    for key, value in entries:
+        name, labels = json.loads(key)
+        sample = (name, tuple(tuple(pair) for pair in labels))
+        totals[sample] = totals.get(sample, 0.0) + value
+    return totals
+
+
+def total(name, samples=None):
+    """한 지표의 모든 라벨 합계 (카운터·게이지)"""
+    samples = collect() if samples is None else samples
+    return sum(value for (sample, _labels), value in samples.items() if sample == name)
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (k, v.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')) for k, v in labels
+    )
+    return '{' + ','.join(f'{k}="{v}"' for k, v in escaped) + '}'
+
+
+def _histogram_series(metric, samples):
+    """히스토그램 라벨 조합별 {'buckets': [(le, 누적 개수)], 'sum', 'count'}"""
+    series = {}
+    for (name, labels), value in samples.items():
+        if name == f'{metric.name}_bucket':
+            base = tuple(pair for pair in labels if pair[0] != 'le')
+            le = dict(labels)['le']
+            series.setdefault(base, {'raw': {}, 'sum': 0.0, 'count': 0.0})['raw'][le] = value
+        elif name in (f'{metric.name}_sum', f'{metric.name}_count'):
+            field = name.rsplit('_', 1)[1]
+            series.setdefault(labels, {'raw': {}, 'sum': 0.0, 'count': 0.0})[field] = value
+
+    for data in series.values():
+        running = 0.0
+        data['buckets'] = []
+        for bound in (*metric.buckets, None):
+            le = _format_le(bound)
+            running += data['raw'].get(le, 0.0)
+            data['buckets'].append((bound, running))
+    return series
+
+
+def render_text(samples=None):
+    """Prometheus 텍스트 노출 형식 (version 0.0.4)"""
+    samples = collect() if samples is None else samples
+    lines = []
+    for metric in REGISTRY.values():
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        if metric.kind == 'histogram':
+            for labels, data in sorted(_histogram_series(metric, samples).items()):
+                for bound, count in data['buckets']:
+                    bucket_labels = labels + (('le', _format_le(bound)),)
+                    lines.append(f'{metric.name}_bucket{_format_labels(bucket_labels)} {_format_value(count)}')
+                lines.append(f'{metric.name}_sum{_format_labels(labels)} {_format_value(data["sum"])}')
+                lines.append(f'{metric.name}_count{_format_labels(labels)} {_format_value(data["count"])}')
+        else:
+            for (name, labels), value in sorted(samples.items()):
+                if name == metric.name:
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def quantile(buckets, q):
+    """누적 버킷 [(le, 개수), ...] 에서 분위수 추정 (버킷 안은 선형 보간, histogram_quantile 과 동일)"""
+    count = buckets[-1][1] if buckets else 0
+    if not count:
+        return None
+    rank = q * count
+    lower, prev_count = 0.0, 0.0
+    for bound, cumulative in buckets:
+        if cumulative >= rank:
+            if bound is None:
+                return lower  # +Inf 버킷이면 마지막 유한 경계
+            in_bucket = cumulative - prev_count
+            return lower + (bound - lower) * ((rank - prev_count) / in_bucket if in_bucket else 1)
+        if bound is not None:
+            lower = bound
+        prev_count = cumulative
+    return lower
+
+
+def dashboard_summary(samples=None, top=8):
+    """서버 모니터 카드용 요약 (요청 상태 분포, 느린 뷰, 캐시 적중률, Claude, 외부 API, 메일 큐, 게임)"""
+    samples = collect() if samples is None else samples
+
+    status_counts = {}
+    for (name, labels), value in samples.items():
+        if name == HTTP_REQUESTS.name:
+            group = dict(labels)['status'][:1] + 'xx'
+            status_counts[group] = status_counts.get(group, 0) + value
+    requests_total = sum(status_counts.values())
+    statuses = [
+        {'label': group, 'count': int(count), 'pct': round(count / requests_total * 100, 1)}
+        for group, count in sorted(status_counts.items())
+    ]
+
+    views = []
+    for labels, data in _histogram_series(HTTP_LATENCY, samples).items():
+        if not data['count']:
+            continue
+        p95 = quantile(data['buckets'], 0.95)
+        views.append({
+            'view': dict(labels)['view'],
+            'count': int(data['count']),
+            'avg_ms': round(data['sum'] / data['count'] * 1000, 1),
+            'p95_ms': round(p95 * 1000, 1) if p95 is not None else None,
+        })
+    views.sort(key=lambda v: (-(v['p95_ms'] or 0), -v['count']))
+
+    hits = misses = 0
+    for (name, labels), value in samples.items():
+        if name == CACHE_REQUESTS.name:
+            if dict(labels)['result'] == 'hit':
+                hits += value
+            else:
+                misses += value
+    cache = {
+        'hits': int(hits), 'misses': int(misses),
+        'ratio': round(hits / (hits + misses) * 100, 1) if hits + misses else None,
+    }
+
+    claude = {'requests': 0, 'errors': 0, 'retries': 0, 'cache_hits': 0, 'input_tokens': 0, 'output_tokens': 0,
+              'cache_read_tokens': 0, 'cache_write_tokens': 0, 'cost_usd': 0.0, 'avg_s': None, 'p95_s': None,
+              'ttft_p95_s': None}
+    for (name, labels), value in samples.items():
+        labels = dict(labels)
+        if name == CLAUDE_REQUESTS.name:
+            if labels['result'] == 'retry':
+                claude['retries'] += int(value)
+                continue
+            claude['requests'] += int(value)
+            if labels['result'] == 'error':
+                claude['errors'] += int(value)
+            elif labels['result'] == 'cache_hit':
+                claude['cache_hits'] += int(value)
+        elif name == CLAUDE_TOKENS.name:
+            claude[f"{labels['kind']}_tokens"] = claude.get(f"{labels['kind']}_tokens", 0) + int(value)
+        elif name == CLAUDE_COST.name:
+            claude['cost_usd'] += value
+    claude['cost_usd'] = round(claude['cost_usd'], 4)
+    latency = _histogram_series(CLAUDE_LATENCY, samples).values()
+    latency_count = sum(d['count'] for d in latency)
+    if latency_count:
+        merged = [(bound, 0.0) for bound in (*CLAUDE_LATENCY.buckets, None)]
+        for data in latency:
+            merged = [(b, c + dc) for (b, c), (_b, dc) in zip(merged, data['buckets'])]
+        claude['avg_s'] = round(sum(d['sum'] for d in latency) / latency_count, 2)
+        claude['p95_s'] = round(quantile(merged, 0.95), 2)
+    ttft = list(_histogram_series(CLAUDE_TTFT, samples).values())
+    if sum(d['count'] for d in ttft):
+        merged = [(bound, 0.0) for bound in (*CLAUDE_TTFT.buckets, None)]
+        for data in ttft:
+            merged = [(b, c + dc) for (b, c), (_b, dc) in zip(merged, data['buckets'])]
+        claude['ttft_p95_s'] = round(quantile(merged, 0.95), 2)
+
+    upstreams = {}
+    for (name, labels), value in samples.items():
+        if name == UPSTREAM_REQUESTS.name:
+            labels = dict(labels)
+            row = upstreams.setdefault(labels['service'], {'service': labels['service'], 'requests': 0, 'errors': 0})
+            if labels['result'] == 'retry':
+                continue
+            row['requests'] += int(value)
+            if labels['result'] in ('5xx', 'timeout', 'error', 'circuit_open'):
+                row['errors'] += int(value)
+    for labels, data in _histogram_series(UPSTREAM_LATENCY, samples).items():
+        row = upstreams.get(dict(labels)['service'])
+        p95 = quantile(data['buckets'], 0.95)
+        if row is not None and p95 is not None:
+            row['p95_ms'] = round(p95 * 1000, 1)
+
+    email = {'sent': 0, 'retry': 0, 'dead': 0, 'send_avg_ms': None, 'delivery_p95_s': None}
+    for (name, labels), value in samples.items():
+        if name == EMAIL_SENT.name:
+            email[dict(labels)['result']] = email.get(dict(labels)['result'], 0) + int(value)
+    for data in _histogram_series(EMAIL_SEND_LATENCY, samples).values():
+        if data['count']:
+            email['send_avg_ms'] = round(data['sum'] / data['count'] * 1000, 1)
+    for data in _histogram_series(EMAIL_DELIVERY_LATENCY, samples).values():
+        p95 = quantile(data['buckets'], 0.95)
+        email['delivery_p95_s'] = round(p95, 1) if p95 is not None else None
+
+    games = sorted(
+        ({'game': dict(labels)['game'], 'moves': int(value)}
+         for (name, labels), value in samples.items() if name == GAME_MOVES.name),
+        key=lambda g: -g['moves'],
+    )
+
+    return {
+        'requests_total': int(requests_total),
+        'statuses': statuses,
+        'views': views[:top],
+        'cache': cache,
+        'claude': claude,
+        'email': email,
+        'upstreams': sorted(upstreams.values(), key=lambda u: u['service']),
+        'games': games,
+    }
@@ -0,0 +1,180 @@
+"""
+nginx 액세스 로그 역방향 리더 (서버 모니터 / send_log_report 용)
+
+액세스 로그는 시간순으로 쌓이므로 최근 N시간만 필요하면 파일 끝에서부터
+큰 블록 단위로 거꾸로 읽다가 cutoff 보다 오래된 줄을 만나면 멈추면 됩니다.
+처음부터 모든 줄을 파싱하던 방식과 달리 비용이 파일 크기가 아니라 조회 범위에 비례합니다.
+
+- 타임스탬프는 '[10/Oct/2025:13:55:36 +0900]' 에서 월 테이블·시간 단위 캐시로 계산
+- 현재 파일에서 cutoff 에 닿지 않으면 회전된 세대(.1, .2.gz, ...)로 이어서 읽음
+  (gzip 세대는 뒤로 탐색할 수 없어 앞에서부터 스트리밍하며 범위 밖 줄만 건너뜀)
+
+사용 예시:
+    from common.services import nginx_access
+
+    stats = nginx_access.scan_access_log(hours=1)
+"""
+import gzip
+import os
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from .log_index import parse_request_line
+
+CANDIDATES = [
+    '/var/log/nginx/techchang_access.log',
+    '/var/log/nginx/mysite_access.log',
+    '/var/log/nginx/access.log',
+]
+
+BLOCK_SIZE = 1024 * 1024
+MAX_GENERATIONS = 14  # logrotate 기본(daily, rotate 14)
+
+_MONTHS = {
+    b'Jan': 1, b'Feb': 2, b'Mar': 3, b'Apr': 4, b'May': 5, b'Jun': 6,
+    b'Jul': 7, b'Aug': 8, b'Sep': 9, b'Oct': 10, b'Nov': 11, b'Dec': 12,
+}
+
+
+class _TimestampParser:
+    """'[dd/Mon/yyyy:HH:MM:SS +zzzz]' → epoch 초 (같은 시간대의 시 단위 계산은 캐시)"""
+
+    def __init__(self):
+        self._hour_cache = {}
+
+    def __call__(self, line):
+        start = line.find(b'[')
+        if start < 0 or len(line) < start + 27:
+            return None
+        raw = line[start + 1:start + 27]  # dd/Mon/yyyy:HH:MM:SS +zzzz
+        hour_key = raw[:14] + raw[20:26]
+        base = self._hour_cache.get(hour_key)
+        if base is None:
+            try:
+                tz = raw[21:26]
+                offset = (int(tz[1:3]) * 60 + int(tz[3:5])) * 60
+                if tz[:1] == b'-':
+                    offset = -offset
+                naive = datetime(int(raw[7:11]), _MONTHS[raw[3:6]], int(raw[0:2]), int(raw[12:14]))
+            except (KeyError, ValueError):
+                return None
+            base = naive.replace(tzinfo=dt_timezone.utc).timestamp() - offset
+            self._hour_cache[hour_key] = base
+        try:
+            return base + int(raw[15:17]) * 60 + int(raw[18:20])
+        except ValueError:
+            return None
+
+
+def iter_lines_reverse(path, block_size=BLOCK_SIZE):
+    """파일 끝에서부터 줄 단위(bytes, 개행 제외)로 거꾸로 순회"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b''
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step) + tail
+            lines = block.split(b'\n')
+            # 첫 조각은 앞 블록과 이어질 수 있으므로 다음 블록으로 넘긴다
+            tail = lines[0]
+            for line in reversed(lines[1:]):
+                if line:
+                    yield line
+        if tail:
+            yield tail
+
+
+def _iter_gzip(path):
+    with gzip.open(path, 'rb') as f:
+        for line in f:
+            yield line.rstrip(b'\n')
+
+
+def generations(path, max_generations=MAX_GENERATIONS):
+    """현재 파일부터 오래된 순으로 존재하는 회전 세대 경로 목록"""
+    found = [path] if os.path.exists(path) else []
+    for n in range(1, max_generations + 1):
+        for candidate in (f'{path}.{n}', f'{path}.{n}.gz'):
+            if os.path.exists(candidate):
+                found.append(candidate)
+                break
+        else:
+            break
+    return found
+
+
+def iter_recent_lines(path, cutoff_ts):
+    """
+    cutoff 이후의 액세스 로그 줄 (bytes) 순회
+
+    평문 세대는 뒤에서부터 읽다가 cutoff 이전 줄을 만나면 멈추고,
+    그 세대에서 멈췄다면 더 오래된 세대는 열지 않는다.
+    """
+    parse = _TimestampParser()
+    for generation in generations(path):
+        reached_cutoff = False
+        if generation.endswith('.gz'):
+            for line in _iter_gzip(generation):
+                ts = parse(line)
+                if ts is not None and ts < cutoff_ts:
+                    reached_cutoff = True
+                    continue
+                yield line
+        else:
+            for line in iter_lines_reverse(generation):
+                ts = parse(line)
+                if ts is not None and ts < cutoff_ts:
+                    reached_cutoff = True
+                    break
+                yield line
+        if reached_cutoff:
+            return
+
+
+def scan_access_log(hours, candidates=None, now=None):
+    """
+    최근 hours 시간의 nginx 요청 통계
+
+    Returns:
+        dict | None: request_count, status_5xx/4xx/404/403/401, path_404(Counter),
+                     samples_5xx (액세스 로그가 없으면 None)
+    """
+    now = now if now is not None else time.time()
+    cutoff_ts = now - timedelta(hours=hours).total_seconds()
+
+    for log_path in candidates or CANDIDATES:
+        if not os.path.exists(log_path):
+            continue
+        stats = {
+            'request_count': 0, 'status_5xx': 0, 'status_4xx': 0,
+            'status_404': 0, 'status_403': 0, 'status_401': 0,
+            'path_404': Counter(), 'samples_5xx': [],
+        }
+        try:
+            for raw in iter_recent_lines(log_path, cutoff_ts):
+                pr = parse_request_line(raw.decode('utf-8', 'replace'))
+                if not pr:
+                    continue
+                method, path, code = pr
+                stats['request_count'] += 1
+                if 500 <= code < 600:
+                    stats['status_5xx'] += 1
+                    if len(stats['samples_5xx']) < 5:
+                        stats['samples_5xx'].append(f'{code} {method} {path}')
+                elif 400 <= code < 500:
+                    stats['status_4xx'] += 1
+                    if code == 404:
+                        stats['status_404'] += 1
+                        stats['path_404'][path] += 1
+                    elif code == 403:
+                        stats['status_403'] += 1
+                    elif code == 401:
+                        stats['status_401'] += 1
+        except OSError:
+            continue
+        return stats
+    return None
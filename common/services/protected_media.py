@@ -0,0 +1,126 @@
+"""
+권한 검사를 거치는 업로드 파일 전송 (community:download_file 등)
+
+뷰가 권한(잠긴 글·문의 게시판 등)을 확인한 뒤 serve() 로 응답을 만듭니다.
+전송 방식은 PROTECTED_MEDIA_BACKEND 로 고릅니다.
+
+- nginx: 본문 없이 X-Accel-Redirect 헤더만 돌려주고 실제 전송은 nginx 내부 위치
+  (PROTECTED_MEDIA_INTERNAL_URL, nginx.conf 의 location /protected/ { internal; })가 맡음
+  → 느린 클라이언트가 100MB 를 받는 동안에도 gunicorn 워커는 바로 풀리고, Range(이어받기)는 nginx 가 처리
+- django: 개발·테스트용 — 워커가 파일을 직접 읽어 보냄. 단일 구간 Range 요청은 206 으로 응답
+- 클래스 경로: serve(request, file, filename, content_type) 를 가진 클래스
+
+파일명은 RFC 6266 Content-Disposition(filename*=utf-8'') 으로 보내 한글 이름이 깨지지 않습니다.
+
+사용 예시:
+    from common.services import protected_media
+
+    return protected_media.serve(request, question.file)
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header, http_date
+from django.utils.module_loading import import_string
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _headers(response, filename, content_type, as_attachment):
+    response['Content-Type'] = content_type
+    response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    response['Cache-Control'] = 'private'
+    return response
+
+
+class NginxDelivery:
+    """X-Accel-Redirect 로 nginx 내부 위치에 전송을 넘김"""
+
+    def serve(self, request, file, filename, content_type, as_attachment=True):
+        internal = getattr(settings, 'PROTECTED_MEDIA_INTERNAL_URL', '/protected/')
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = internal.rstrip('/') + '/' + quote(file.name)
+        return _headers(response, filename, content_type, as_attachment)
+
+
+def parse_range(header, size):
+    """'bytes=a-b' 단일 구간 → (start, end) 포함 구간 | None(무시하고 전체) | False(범위 밖, 416)"""
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None  # 형식이 다르거나 여러 구간이면 전체 전송 (RFC 9110 허용)
+    first, last = match.groups()
+    if first == '':
+        start, end = max(0, size - int(last)), size - 1  # 마지막 N 바이트
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _read(handle, length):
+    try:
+        while length > 0:
+            chunk = handle.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        handle.close()
+
+
+class DjangoDelivery:
+    """워커가 직접 읽어 보냄 (개발용, Range 지원)"""
+
+    def serve(self, request, file, filename, content_type, as_attachment=True):
+        size = file.size
+        byte_range = parse_range(request.headers.get('Range'), size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        handle = file.storage.open(file.name, 'rb')
+        if byte_range is None:
+            start, end, status = 0, size - 1, 200
+        else:
+            (start, end), status = byte_range, 206
+            handle.seek(start)
+        response = StreamingHttpResponse(_read(handle, end - start + 1), status=status)
+        response['Content-Length'] = str(end - start + 1)
+        response['Accept-Ranges'] = 'bytes'
+        if status == 206:
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        try:
+            response['Last-Modified'] = http_date(file.storage.get_modified_time(file.name).timestamp())
+        except (NotImplementedError, OSError):
+            pass
+        return _headers(response, filename, content_type, as_attachment)
+
+
+DELIVERIES = {'nginx': NginxDelivery, 'django': DjangoDelivery}
+
+
+def delivery():
+    """settings.PROTECTED_MEDIA_BACKEND ('nginx' | 'django' | 클래스 경로) 에 맞는 전송 방식"""
+    name = getattr(settings, 'PROTECTED_MEDIA_BACKEND', 'django')
+    return (DELIVERIES.get(name) or import_string(name))()
+
+
+def serve(request, file, filename=None, content_type=None, as_attachment=True):
+    """
+    권한 검사를 마친 FieldFile 을 내려보내는 응답. 파일이 없으면 FileNotFoundError.
+
+    filename 을 주지 않으면 저장된 파일 이름, content_type 은 확장자로 추정.
+    """
+    if not file.storage.exists(file.name):
+        raise FileNotFoundError(file.name)
+    filename = filename or os.path.basename(file.name)
+    content_type = content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    return delivery().serve(request, file, filename, content_type, as_attachment)
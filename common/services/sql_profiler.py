@@ -0,0 +1,123 @@
+"""
+요청 단위 SQL 프로파일러 (N+1 탐지)
+
+connection.execute_wrapper 로 표본 추출된 요청의 쿼리를 감싸 쿼리 수·DB 시간을 재고,
+리터럴·자리표시자를 지운 정규화 SQL(지문)별로 묶어 같은 문장이 반복되면
+N+1 의심으로 보고합니다. 결과는 요청 로그(django.log)에 남기고 common.services.metrics
+카운터로 워커 간 합산해 서버 모니터의 "쿼리가 많은 뷰" 표에 보여줍니다.
+
+- SQL_PROFILER_SAMPLE_RATE (기본 0 = 끔, 운영 권장 0.01)
+- 표본이 아닌 요청은 난수 한 번 외에 비용 없음
+
+사용 예시:
+    profiler = QueryProfiler()
+    with connection.execute_wrapper(profiler):
+        ...
+    report = profiler.report()
+"""
+import re
+import time
+
+from . import metrics
+
+REPEAT_THRESHOLD = 5          # 한 요청에서 같은 지문이 이 횟수 이상이면 N+1 의심
+STATEMENT_LABEL_LENGTH = 160  # 지표 라벨로 남길 정규화 SQL 길이
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_SPACE = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    """SQL → 지문 (문자열·숫자·자리표시자는 ?, IN 목록은 IN (...))"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+class QueryProfiler:
+    """execute_wrapper 콜러블: 쿼리 수·시간과 지문별 반복 횟수 누적"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = {}  # 지문 → [횟수, 누적 시간]
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            entry = self.statements.setdefault(normalize_sql(sql), [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def report(self, threshold=REPEAT_THRESHOLD):
+        """
+        Returns:
+            dict: queries, db_ms, repeated([{'statement', 'count', 'ms'}], 횟수 많은 순)
+        """
+        repeated = [
+            {'statement': statement, 'count': count, 'ms': round(duration * 1000, 1)}
+            for statement, (count, duration) in self.statements.items()
+            if count >= threshold
+        ]
+        repeated.sort(key=lambda r: -r['count'])
+        return {
+            'queries': self.count,
+            'db_ms': round(self.duration * 1000, 1),
+            'repeated': repeated,
+        }
+
+
+def record(view, report):
+    """프로파일 결과를 워커 공유 지표에 기록"""
+    metrics.SQL_PROFILED.inc(view=view)
+    metrics.SQL_QUERIES.inc(report['queries'], view=view)
+    metrics.SQL_TIME.inc(report['db_ms'] / 1000, view=view)
+    for item in report['repeated']:
+        metrics.SQL_REPEATED.inc(view=view, statement=item['statement'][:STATEMENT_LABEL_LENGTH])
+
+
+def summary(samples=None, top=8):
+    """
+    서버 모니터용 요약
+
+    Returns:
+        dict: views(요청당 평균 쿼리 수 많은 순), repeated(N+1 의심 문장, 탐지 요청 수 많은 순)
+    """
+    samples = metrics.collect() if samples is None else samples
+    per_view = {}
+    repeated = []
+    for (name, labels), value in samples.items():
+        labels = dict(labels)
+        if name == metrics.SQL_REPEATED.name:
+            repeated.append({'view': labels['view'], 'statement': labels['statement'], 'requests': int(value)})
+            continue
+        field = {
+            metrics.SQL_PROFILED.name: 'requests',
+            metrics.SQL_QUERIES.name: 'queries',
+            metrics.SQL_TIME.name: 'seconds',
+        }.get(name)
+        if field:
+            per_view.setdefault(labels['view'], {'requests': 0, 'queries': 0, 'seconds': 0.0})[field] += value
+
+    views = [
+        {
+            'view': view,
+            'requests': int(data['requests']),
+            'avg_queries': round(data['queries'] / data['requests'], 1),
+            'avg_db_ms': round(data['seconds'] / data['requests'] * 1000, 1),
+        }
+        for view, data in per_view.items() if data['requests']
+    ]
+    views.sort(key=lambda v: (-v['avg_queries'], -v['avg_db_ms']))
+    repeated.sort(key=lambda r: -r['requests'])
+    return {'views': views[:top], 'repeated': repeated[:top]}
@@ -0,0 +1,62 @@
+"""
+SQLite 운영 프로필 (연결 초기화 PRAGMA)
+
+기본 SQLite 연결은 롤백 저널·synchronous=FULL·작은 페이지 캐시라서
+여러 gunicorn 워커가 조회수·세션·게임 수를 동시에 쓰면 'database is locked' 가 납니다.
+connection_created 시그널에서 새 연결마다 settings.SQLITE_PRAGMAS 를 적용합니다.
+
+- journal_mode=WAL: 읽기는 쓰기를 기다리지 않고, 쓰기는 fsync 없이 WAL 에 덧붙임
+- synchronous=NORMAL, mmap_size, cache_size, temp_store=MEMORY
+- 잠금 대기(timeout)·IMMEDIATE 트랜잭션·연결 재사용은 DATABASES 설정이 담당
+
+사용 예시:
+    sqlite_profile.configure(connection)       # common.signals 에서 호출
+    sqlite_profile.current_pragmas(connection)  # {'journal_mode': 'wal', ...}
+"""
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -32 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+def pragmas():
+    return getattr(settings, 'SQLITE_PRAGMAS', DEFAULT_PRAGMAS)
+
+
+def pragma_statements(values=None):
+    return [f'PRAGMA {name}={value}' for name, value in (values or pragmas()).items()]
+
+
+def configure(connection):
+    """SQLite 연결이면 PRAGMA 적용 (다른 DB 는 무시)"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for statement in pragma_statements():
+            try:
+                cursor.execute(statement)
+            except Exception:
+                # 읽기 전용 파일 등에서 WAL 전환이 실패해도 연결 자체는 쓸 수 있게 둔다
+                logger.warning(f'SQLite pragma failed: {statement}', exc_info=True)
+
+
+def current_pragmas(connection):
+    """현재 연결에 실제로 적용된 값"""
+    if connection.vendor != 'sqlite':
+        return {}
+    with connection.cursor() as cursor:
+        values = {}
+        for name in pragmas():
+            cursor.execute(f'PRAGMA {name}')
+            row = cursor.fetchone()
+            values[name] = row[0] if row else None
+        return values
@@ -0,0 +1,391 @@
+"""
+/proc 기반 시스템 지표 샘플러 (서버 모니터 / send_log_report 용)
+
+대시보드를 열 때마다 free·df·uptime·systemctl 을 프로세스로 띄우는 대신
+/proc/meminfo, /proc/loadavg, /proc/stat, /proc/<pid>/status·stat 과 os.statvfs 를
+직접 읽습니다. 백그라운드 스레드가 일정 간격으로 샘플을 고정 크기 링 버퍼에 쌓아
+CPU·부하·메모리·디스크·워커별 RSS 추이를 차트로 보여줄 수 있습니다.
+
+- gunicorn post_fork 훅에서 start_sampler() 호출 — 파일 잠금(LOGS_DIR/system_metrics.lock)을 잡은
+  워커 하나만 샘플링 (방치 게임 정리와 같은 방식). 잠금을 가진 워커가 재시작되면 다음에 포크된 워커가 이어받음
+- 링 버퍼는 METRICS_DIR/system_samples.json 에 매 샘플마다 기록 → 어느 워커가 대시보드 요청을 받아도
+  같은 추이를 보고, 샘플러 워커가 재시작돼도 버퍼가 이어짐
+- 샘플마다 metrics.compact() 로 종료된 프로세스의 지표 파일을 보관 파일로 합침
+- 샘플러가 돌지 않는 프로세스(send_log_report 크론 등)는 snapshot() 으로 즉시 측정
+- /proc 이 없는 환경(macOS·Windows 개발)에서는 빈 값 반환
+
+사용 예시:
+    from common.services import system_metrics
+
+    sys_stats = system_metrics.snapshot()
+    charts = system_metrics.chart_series()
+"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+from . import file_lock
+
+logger = logging.getLogger(__name__)
+
+PROC = '/proc'
+APP_PROCESS_NAMES = ('gunicorn', 'daphne')
+DISK_PATH = '/'
+
+SAMPLES_FILE = 'system_samples.json'
+INTERPRETERS = ('python', 'python3')
+
+_samples = None           # 샘플러 프로세스의 링 버퍼 (다른 프로세스는 파일에서 읽음)
+_sampler_thread = None
+_sampler_file_lock = None
+_sampler_lock = threading.Lock()
+_last_cpu = None          # (total, idle) — 직전 /proc/stat 값
+_last_proc_cpu = {}       # pid → (process ticks, total ticks)
+
+
+# ---------------------------------------------------------------------- #
+#  /proc 읽기
+# ---------------------------------------------------------------------- #
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read().decode('utf-8', 'replace')
+
+
+def read_meminfo():
+    """메모리 (MB) — MemTotal, MemAvailable 기준 사용량 (free -m 의 used 와 같은 기준)"""
+    info = {}
+    for line in _read(f'{PROC}/meminfo').splitlines():
+        key, _, rest = line.partition(':')
+        if key in ('MemTotal', 'MemAvailable'):
+            info[key] = int(rest.split()[0]) // 1024
+    total = info.get('MemTotal', 0)
+    used = total - info.get('MemAvailable', total)
+    return {
+        'mem_total_mb': total,
+        'mem_used_mb': used,
+        'mem_pct': round(used / total * 100, 1) if total else 0,
+    }
+
+
+def read_loadavg():
+    return float(_read(f'{PROC}/loadavg').split()[0])
+
+
+def read_cpu_times():
+    """(전체 tick, idle+iowait tick) — /proc/stat 첫 줄"""
+    fields = [int(v) for v in _read(f'{PROC}/stat').splitlines()[0].split()[1:]]
+    idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+    return sum(fields), idle
+
+
+def read_disk(path=DISK_PATH):
+    st = os.statvfs(path)
+    total = st.f_blocks * st.f_frsize
+    free = st.f_bavail * st.f_frsize
+    used = total - st.f_bfree * st.f_frsize
+    # df 와 같이 일반 사용자 기준 (used / (used + avail), 올림)
+    pct = math.ceil(used / (used + free) * 100) if used + free else 0
+    return {'total': total, 'used': used, 'pct': pct}
+
+
+def _human(num):
+    """df -h 형식 용량 문자열 (예: 9.8G, 512M)"""
+    for unit in ('B', 'K', 'M', 'G', 'T'):
+        if num < 1024 or unit == 'T':
+            return f'{num:.1f}{unit}' if num < 10 and unit != 'B' else f'{num:.0f}{unit}'
+        num /= 1024
+
+
+def executable_names(pid):
+    """
+    프로세스 실행 파일 이름 후보 — comm, argv[0](setproctitle 로 바꾼 'nginx: master …' 포함)과
+    인터프리터로 실행한 스크립트(python …/gunicorn, python -m daphne)의 basename
+    """
+    names = {_read(f'{PROC}/{pid}/comm').strip()}
+    args = [arg for arg in _read(f'{PROC}/{pid}/cmdline').split('\0') if arg]
+    if args:
+        names.add(os.path.basename(args[0].split(':', 1)[0].split(' ', 1)[0]))
+        script = args[2] if len(args) > 2 and args[1] == '-m' else (args[1] if len(args) > 1 else '')
+        if os.path.basename(args[0]).startswith(INTERPRETERS) and script:
+            names.add(os.path.basename(script))
+    return names
+
+
+def find_processes(names=APP_PROCESS_NAMES):
+    """실행 파일 이름이 names 중 하나인 프로세스 {pid: 이름} (인자에 이름이 들어간 tail 등은 제외)"""
+    found = {}
+    for entry in os.listdir(PROC):
+        if not entry.isdigit():
+            continue
+        try:
+            candidates = executable_names(entry)
+        except OSError:
+            continue
+        for name in names:
+            if name in candidates:
+                found[int(entry)] = name
+                break
+    return found
+
+
+def read_process(pid):
+    """프로세스 RSS(MB)·누적 CPU tick (utime+stime)"""
+    rss_kb = 0
+    for line in _read(f'{PROC}/{pid}/status').splitlines():
+        if line.startswith('VmRSS:'):
+            rss_kb = int(line.split()[1])
+            break
+    stat = _read(f'{PROC}/{pid}/stat')
+    fields = stat[stat.rindex(')') + 2:].split()
+    ticks = int(fields[11]) + int(fields[12])
+    return round(rss_kb / 1024, 1), ticks
+
+
+# ---------------------------------------------------------------------- #
+#  샘플링
+# ---------------------------------------------------------------------- #
+def available():
+    return os.path.exists(f'{PROC}/meminfo')
+
+
+def take_sample():
+    """지표 1회 측정 (CPU 사용률은 직전 측정 대비 tick 차이로 계산)"""
+    global _last_cpu
+    sample = {'ts': time.time()}
+    sample.update(read_meminfo())
+    sample['load'] = read_loadavg()
+
+    disk = read_disk()
+    sample['disk_pct'] = disk['pct']
+    sample['disk_used'] = disk['used']
+    sample['disk_total'] = disk['total']
+
+    total, idle = read_cpu_times()
+    cpu_pct = None
+    if _last_cpu is not None and total > _last_cpu[0]:
+        busy = (total - _last_cpu[0]) - (idle - _last_cpu[1])
+        cpu_pct = round(busy / (total - _last_cpu[0]) * 100, 1)
+    _last_cpu = (total, idle)
+    sample['cpu_pct'] = cpu_pct
+
+    workers = {}
+    for pid, name in find_processes().items():
+        try:
+            rss_mb, ticks = read_process(pid)
+        except (OSError, ValueError, IndexError):
+            continue  # 측정 중 종료된 프로세스
+        prev = _last_proc_cpu.get(pid)
+        proc_cpu = None
+        if prev is not None and total > prev[1]:
+            proc_cpu = round((ticks - prev[0]) / (total - prev[1]) * 100 * (os.cpu_count() or 1), 1)
+        _last_proc_cpu[pid] = (ticks, total)
+        workers[pid] = {'name': name, 'rss_mb': rss_mb, 'cpu_pct': proc_cpu}
+    for pid in list(_last_proc_cpu):
+        if pid not in workers:
+            del _last_proc_cpu[pid]
+    sample['workers'] = workers
+
+    # 요청·게임 수 누적 카운터 (전 워커 합계) — 차트에서 초당 비율로 변환
+    from . import metrics
+    counters = metrics.collect()
+    sample['http_requests'] = metrics.total(metrics.HTTP_REQUESTS.name, counters)
+    sample['game_moves'] = metrics.total(metrics.GAME_MOVES.name, counters)
+    return sample
+
+
+def _samples_path():
+    from .metrics import metrics_dir
+    return metrics_dir() / SAMPLES_FILE
+
+
+def _load_shared():
+    """공유 파일의 샘플 목록 (JSON 이 문자열로 바꾼 워커 pid 키를 정수로 되돌림)"""
+    try:
+        data = json.loads(_samples_path().read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return []
+    for sample in data:
+        sample['workers'] = {int(pid): info for pid, info in sample.get('workers', {}).items()}
+    return data
+
+
+def _save_shared(data):
+    path = _samples_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(data), encoding='utf-8')
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f'System metrics samples not shared: {e}')
+
+
+def _buffer():
+    global _samples
+    if _samples is None:
+        # 이전 샘플러(재시작된 워커)가 남긴 버퍼에서 이어감
+        _samples = deque(_load_shared(), maxlen=getattr(settings, 'SYSTEM_METRICS_CAPACITY', 240))
+    return _samples
+
+
+def record_sample():
+    """측정해서 링 버퍼에 추가하고 공유 파일에 기록 (샘플러 프로세스용)"""
+    with _sampler_lock:
+        sample = take_sample()
+        buffer = _buffer()
+        buffer.append(sample)
+        _save_shared(list(buffer))
+    return sample
+
+
+def samples():
+    """링 버퍼의 샘플 목록 (오래된 순) — 샘플러가 아닌 프로세스는 공유 파일에서 읽음"""
+    with _sampler_lock:
+        if _samples is not None:
+            return list(_samples)
+    return _load_shared()
+
+
+def start_sampler(interval=None):
+    """
+    백그라운드 샘플러 시작 (gunicorn post_fork 훅에서 호출)
+
+    SYSTEM_METRICS_INTERVAL 이 0이거나 /proc 이 없거나 다른 워커가 잠금을 가졌으면 시작하지 않는다.
+
+    Returns:
+        bool: 이 프로세스에서 샘플러가 시작되었는지 여부
+    """
+    global _sampler_thread, _sampler_file_lock
+    if interval is None:
+        interval = getattr(settings, 'SYSTEM_METRICS_INTERVAL', 15)
+    if interval <= 0 or _sampler_thread is not None or not available():
+        return False
+
+    # 호스트당 한 프로세스만 샘플링한다
+    _sampler_file_lock = file_lock.try_lock('system_metrics.lock')
+    if _sampler_file_lock is None:
+        return False
+
+    def run():
+        from . import metrics
+
+        while True:
+            try:
+                record_sample()
+                metrics.compact()  # gunicorn 밖에서 끝난 프로세스(daphne·관리 명령어)의 지표 파일 정리
+            except Exception:
+                logger.exception('System metrics sampling failed')
+            time.sleep(interval)
+
+    _sampler_thread = threading.Thread(target=run, name='system-metrics', daemon=True)
+    _sampler_thread.start()
+    return True
+
+
+# ---------------------------------------------------------------------- #
+#  조회
+# ---------------------------------------------------------------------- #
+def snapshot():
+    """
+    현재 시스템 상태 (send_log_report._collect_system_stats 형식)
+
+    샘플러가 돌고 있으면 마지막 샘플을, 아니면 즉시 측정한 값을 쓴다.
+    서비스 상태는 systemctl 대신 프로세스 존재 여부로 판단한다.
+    """
+    if not available():
+        return {}
+    try:
+        latest = samples()[-1:] or [take_sample()]
+        sample = latest[0]
+        nginx = find_processes(('nginx',))
+    except (OSError, ValueError, IndexError):
+        logger.exception('System metrics snapshot failed')
+        return {}
+
+    return {
+        'mem_total_mb': sample['mem_total_mb'],
+        'mem_used_mb': sample['mem_used_mb'],
+        'mem_pct': sample['mem_pct'],
+        'disk_total': _human(sample['disk_total']),
+        'disk_used': _human(sample['disk_used']),
+        'disk_pct': f"{sample['disk_pct']}%",
+        'load_avg': f"{sample['load']:.2f}",
+        'mysite_status': 'active' if sample['workers'] else 'inactive',
+        'nginx_status': 'active' if nginx else 'inactive',
+    }
+
+
+def sparkline(values, width=240, height=40):
+    """값 목록 → SVG polyline points 문자열 (None 은 건너뜀)"""
+    points = [(i, v) for i, v in enumerate(values) if v is not None]
+    if len(points) < 2:
+        return ''
+    low = min(v for _, v in points)
+    high = max(v for _, v in points)
+    span = (high - low) or 1
+    step = width / max(len(values) - 1, 1)
+    return ' '.join(
+        f'{i * step:.1f},{height - (v - low) / span * (height - 4) - 2:.1f}' for i, v in points
+    )
+
+
+def _rates(data, key):
+    """누적 카운터 → 샘플 간 초당 증가율 (첫 샘플·카운터 초기화 구간은 None)"""
+    rates = [None]
+    for prev, cur in zip(data, data[1:]):
+        a, b = prev.get(key), cur.get(key)
+        elapsed = cur['ts'] - prev['ts']
+        if a is None or b is None or b < a or elapsed <= 0:
+            rates.append(None)
+        else:
+            rates.append(round((b - a) / elapsed, 2))
+    return rates
+
+
+def chart_series():
+    """대시보드 추이 차트용 데이터 (샘플이 2개 미만이면 빈 dict)"""
+    data = samples()
+    if len(data) < 2:
+        return {}
+
+    metrics = []
+    for key, label, unit in (
+        ('cpu_pct', 'CPU', '%'),
+        ('load', '부하', ''),
+        ('mem_pct', '메모리', '%'),
+        ('disk_pct', '디스크', '%'),
+    ):
+        values = [s.get(key) for s in data]
+        current = next((v for v in reversed(values) if v is not None), None)
+        metrics.append({
+            'label': label, 'unit': unit, 'current': current,
+            'points': sparkline(values),
+        })
+    for key, label in (('http_requests', '요청'), ('game_moves', '게임 수')):
+        values = _rates(data, key)
+        current = next((v for v in reversed(values) if v is not None), None)
+        metrics.append({
+            'label': label, 'unit': '/s', 'current': current,
+            'points': sparkline(values),
+        })
+
+    workers = []
+    for pid, info in data[-1]['workers'].items():
+        values = [s['workers'].get(pid, {}).get('rss_mb') for s in data]
+        workers.append({
+            'pid': pid, 'name': info['name'], 'rss_mb': info['rss_mb'],
+            'cpu_pct': info['cpu_pct'], 'points': sparkline(values, height=24),
+        })
+    workers.sort(key=lambda w: -w['rss_mb'])
+
+    return {
+        'minutes': round((data[-1]['ts'] - data[0]['ts']) / 60),
+        'metrics': metrics,
+        'workers': workers,
+    }
@@ -0,0 +1,134 @@
+"""
+작은 증가 쓰기 직렬화 큐 (SQLite 쓰기 경합 완화)
+
+조회수처럼 "행 하나에 +1" 하는 쓰기는 요청마다 쓰기 트랜잭션을 열어
+워커 수만큼 SQLite 쓰기 잠금을 다툽니다. SQLITE_WRITE_QUEUE 를 켜면
+워커마다 (모델, pk, 필드) 별 증가량을 메모리에 모아 두고 백그라운드 스레드가
+SQLITE_WRITE_QUEUE_INTERVAL 초마다 한 트랜잭션으로 반영합니다.
+
+- 같은 행의 증가는 합쳐짐 (+1 × 30 → +30 한 번)
+- 반영은 워커 간 파일 잠금(flock)으로 한 번에 한 워커씩 — SQLite 바쁜 대기 대신 순서대로
+- 반영 실패 시 증가량을 되돌려 다음 주기에 재시도, 프로세스 종료(atexit) 시 남은 것 반영
+- 꺼져 있으면(기본) increment() 가 즉시 UPDATE ... SET f = f + n 실행
+- defer(key, func): 설정과 무관하게 다음 주기에 func() 한 번 실행, 같은 key 는 마지막 것만
+  (세션 write-behind 처럼 "최신 상태만 저장하면 되는" 쓰기용)
+
+사용 예시:
+    from common.services import write_queue
+
+    write_queue.increment(Question, question_id, 'view_count')
+    write_queue.defer(('session', session_key), partial(persist_session, session_key))
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+from . import file_lock
+
+logger = logging.getLogger(__name__)
+
+_pending = Counter()       # (모델 label, pk, 필드) → 증가량
+_deferred = {}             # key → 호출 (같은 key 는 마지막 것만)
+_lock = threading.Lock()
+_flusher = None
+_flusher_pid = None
+
+
+def enabled():
+    return getattr(settings, 'SQLITE_WRITE_QUEUE', False)
+
+
+def _apply(model, pk, field, amount):
+    return model.objects.filter(pk=pk).update(**{field: F(field) + amount})
+
+
+def increment(model, pk, field, amount=1):
+    """model(pk).field += amount — 큐가 켜져 있으면 다음 반영 주기에, 아니면 즉시"""
+    if not enabled():
+        _apply(model, pk, field, amount)
+        return
+    with _lock:
+        _pending[(model._meta.label, pk, field)] += amount
+    _ensure_flusher()
+
+
+def defer(key, func):
+    """func() 을 다음 반영 주기에 한 번 실행 (같은 key 로 다시 부르면 앞의 것을 대체)"""
+    with _lock:
+        _deferred[key] = func
+    _ensure_flusher()
+
+
+def pending():
+    with _lock:
+        return dict(_pending)
+
+
+def deferred():
+    with _lock:
+        return dict(_deferred)
+
+
+def flush():
+    """모인 증가량과 지연 쓰기를 한 트랜잭션으로 반영 → 반영한 항목 수"""
+    with _lock:
+        batch = dict(_pending)
+        calls = dict(_deferred)
+        _pending.clear()
+        _deferred.clear()
+    if not batch and not calls:
+        return 0
+    failed = {}
+    try:
+        # 워커 간 반영 순서를 맞춘다
+        with file_lock.locked('sqlite-write-queue.lock'), transaction.atomic():
+            for (label, pk, field), amount in batch.items():
+                _apply(apps.get_model(label), pk, field, amount)
+            for key, func in calls.items():
+                try:
+                    with transaction.atomic():  # 하나가 실패해도 나머지는 커밋 (savepoint)
+                        func()
+                except Exception:
+                    logger.exception(f'Deferred write {key!r} failed, retrying next interval')
+                    failed[key] = func
+    except Exception:
+        logger.exception(f'Write queue flush failed ({len(batch) + len(calls)} items), retrying next interval')
+        with _lock:
+            _pending.update(batch)
+            for key, func in calls.items():
+                _deferred.setdefault(key, func)
+        return 0
+    with _lock:
+        for key, func in failed.items():
+            _deferred.setdefault(key, func)  # 그 사이 더 새 호출이 들어왔으면 그것을 유지
+    return len(batch) + len(calls) - len(failed)
+
+
+def _ensure_flusher():
+    """현재 프로세스의 반영 스레드 시작 (fork 된 워커에서는 새로 시작)"""
+    global _flusher, _flusher_pid
+    if _flusher is not None and _flusher_pid == os.getpid():
+        return
+    with _lock:
+        if _flusher is not None and _flusher_pid == os.getpid():
+            return
+        interval = getattr(settings, 'SQLITE_WRITE_QUEUE_INTERVAL', 1.0)
+
+        def run():
+            while True:
+                time.sleep(interval)
+                close_old_connections()  # CONN_MAX_AGE 가 지난 스레드 연결 정리
+                flush()
+
+        _flusher = threading.Thread(target=run, name='sqlite-write-queue', daemon=True)
+        _flusher_pid = os.getpid()
+        _flusher.start()
+        atexit.register(flush)
@@ -0,0 +1,105 @@
+"""
+캐시 우선 세션 엔진 (write-behind)
+
+DB 세션은 상세 페이지의 viewed_question_<id>, 첫 화면의 visited_<날짜>, 2048 이동마다의
+보드 상태처럼 요청 대부분을 세션 UPDATE 로 만들어 SQLite 쓰기 잠금을 다툽니다.
+이 엔진(SESSION_ENGINE = 'common.session_backends')은
+
+- 읽기: 공유 캐시(SharedMemoryCache) → 없으면 DB (cached_db 와 같음)
+- 저장: 값이 실제로 바뀌었을 때만 (modified 만 켜지고 내용이 같으면 아무것도 쓰지 않음)
+- 바뀐 세션은 캐시에 즉시 쓰고, DB 반영은 write_queue 로 미뤄 세션마다 주기당 한 번만
+- 로그인·로그아웃처럼 인증 키(SESSION_DURABLE_KEYS)가 바뀌거나 새 세션을 만들 때는 DB 에 즉시 기록
+  → 프로세스가 죽어도 로그인 상태는 잃지 않고, 그 밖의 값은 최대 한 주기만큼 잃을 수 있음
+- SESSION_VOLATILE_PREFIXES 로 시작하는 키(조회 중복 방지 표시 등)는 DB 에 아예 저장하지 않음
+  — 이 키만 바뀐 저장은 캐시만 갱신하고 DB 반영을 예약하지 않음
+
+워커 사이에 캐시가 공유되어야 하므로 DJANGO_CACHE_BACKEND=shm 일 때만 사용합니다.
+"""
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.sessions.backends.base import UpdateError
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+
+from common.services import write_queue
+
+KEY_PREFIX = 'common.session_backends'
+DEFAULT_DURABLE_KEYS = (SESSION_KEY, BACKEND_SESSION_KEY, HASH_SESSION_KEY, '_session_expiry')
+DEFAULT_VOLATILE_PREFIXES = ('viewed_question_', 'visited_')
+
+
+def _durable_keys():
+    return getattr(settings, 'SESSION_DURABLE_KEYS', DEFAULT_DURABLE_KEYS)
+
+
+def _volatile_prefixes():
+    return tuple(getattr(settings, 'SESSION_VOLATILE_PREFIXES', DEFAULT_VOLATILE_PREFIXES))
+
+
+class SessionStore(CachedDBStore):
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._saved_snapshot = None
+        self._saved_persistent = None
+        self._saved_durable = None
+
+    def _snapshot(self, data):
+        return self.serializer().dumps(data)
+
+    @staticmethod
+    def _persistent(data):
+        """DB 에 저장하는 값 (휘발성 키 제외)"""
+        prefixes = _volatile_prefixes()
+        return {key: value for key, value in data.items() if not key.startswith(prefixes)}
+
+    @staticmethod
+    def _durable(data):
+        return {key: data.get(key) for key in _durable_keys()}
+
+    def load(self):
+        data = super().load()
+        self._saved_snapshot = self._snapshot(data)
+        self._saved_persistent = self._snapshot(self._persistent(data))
+        self._saved_durable = self._durable(data)
+        return data
+
+    def create_model_instance(self, data):
+        """DB 에는 휘발성 키를 뺀 값만 저장"""
+        return super().create_model_instance(self._persistent(data))
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        data = self._get_session(no_load=must_create)
+        snapshot = self._snapshot(data)
+        if not must_create and snapshot == self._saved_snapshot:
+            return  # 내용이 그대로면 캐시·DB 모두 건너뜀
+        persistent = self._snapshot(self._persistent(data))
+        durable = self._durable(data)
+        if must_create or durable != self._saved_durable:
+            super().save(must_create)  # 새 세션·인증 키 변경: DB 즉시 + 캐시
+        else:
+            self._cache.set(self.cache_key, data, self.get_expiry_age())
+            if persistent != self._saved_persistent:  # 휘발성 키만 바뀌었으면 DB 는 그대로
+                write_queue.defer(('session', self.session_key), partial(persist_session, self.session_key))
+        self._saved_snapshot = snapshot
+        self._saved_persistent = persistent
+        self._saved_durable = durable
+
+
+def persist_session(session_key):
+    """write-behind: 캐시에 있는 최신 세션을 DB 에 반영 (캐시에 없으면 — 로그아웃·만료 — 건너뜀)"""
+    store = SessionStore(session_key)
+    data = store._cache.get(store.cache_key)
+    if data is None:
+        return False
+    store._session_cache = data
+    try:
+        DBStore.save(store)
+    except UpdateError:
+        return False  # 그 사이 DB 에서 지워진 세션 (clearsessions 등)
+    return True
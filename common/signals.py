@@ -1,8 +1,10 @@
+from django.db.backends.signals import connection_created
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 
 from .models import Profile
+from .services import image_derivatives, sqlite_profile
 
 User = get_user_model()
 
@@ -10,3 +12,13 @@ User = get_user_model()
 def create_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.get_or_create(user=instance)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """새 SQLite 연결에 WAL·synchronous 등 운영 PRAGMA 적용"""
+    sqlite_profile.configure(connection)
+
+
+# 업로드 이미지가 저장되면 커밋 후 반응형 파생본 생성 (common.services.image_derivatives)
+image_derivatives.connect_signals()
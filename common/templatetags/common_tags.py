@@ -1,5 +1,8 @@
 from django import template
+from django.utils.html import format_html, format_html_join
+
 from common.models import Profile
+from common.services import image_derivatives
 
 register = template.Library()
 
@@ -33,4 +36,32 @@ def split_skills(value):
         return []
     if isinstance(value, (list, tuple)):
         return [str(s).strip() for s in value if str(s).strip()]
-    return [s.strip() for s in str(value).split(',') if s.strip()]
\ No newline at end of file
+    return [s.strip() for s in str(value).split(',') if s.strip()]
+
+
+@register.simple_tag
+def responsive_image(image, alt='', sizes='100vw', **attrs):
+    """업로드 이미지를 <picture>(WebP + JPEG/PNG srcset)로 출력.
+
+    파생본(common.services.image_derivatives)이 아직 없으면 원본 <img> 만 출력한다.
+    나머지 키워드는 <img> 속성 (class="...", loading="lazy" 등).
+    """
+    if not image:
+        return ''
+    extra = format_html_join('', ' {}="{}"', attrs.items())
+    webp = image_derivatives.srcset(image.name)
+    if not webp:
+        return format_html('<img src="{}" alt="{}"{}>', image.url, alt, extra)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}"{}></picture>',
+        webp, sizes, image.url, image_derivatives.srcset(image.name, 'fallback'), sizes, alt, extra,
+    )
+
+
+@register.filter
+def image_variant(image, width):
+    """width(px) 이상인 가장 작은 WebP 파생본 URL — 아바타·CSS 배경처럼 srcset 을 못 쓰는 곳용 (없으면 원본)"""
+    if not image:
+        return ''
+    return image_derivatives.variant_url(image.name, int(width))
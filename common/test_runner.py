@@ -0,0 +1,24 @@
+"""
+테스트 러너 (settings.TEST_RUNNER)
+
+요청마다 MetricsMiddleware 가 지표 파일을 쓰므로 테스트 동안 METRICS_DIR 을 임시 디렉터리로 바꿔
+저장소의 logs/metrics 에 실행마다 counter_<pid>.db 가 쌓이지 않게 합니다.
+"""
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._metrics_dir = tempfile.mkdtemp(prefix='metrics-test-')
+        self._original_metrics_dir = settings.METRICS_DIR
+        settings.METRICS_DIR = self._metrics_dir
+
+    def teardown_test_environment(self, **kwargs):
+        settings.METRICS_DIR = self._original_metrics_dir
+        shutil.rmtree(self._metrics_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -21,12 +21,22 @@ class EmailVerificationTests(TestCase):
         )
 
     def test_send_verification_email_creates_record_and_sends_mail(self):
-        response = self._post_json('common:send_verification_email', {'email': 'user@example.com'})
+        from common.models import OutboundEmail
+        from common.services import mail_queue
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self._post_json('common:send_verification_email', {'email': 'user@example.com'})
 
         self.assertEqual(response.status_code, 200)
         self.assertTrue(response.json()['success'])
         self.assertEqual(EmailVerification.objects.filter(email='user@example.com').count(), 1)
+        self.assertEqual(len(mail.outbox), 0)  # 요청 안에서는 큐에 넣기만 함
+        self.assertEqual(len(callbacks), 1)    # 커밋 후 즉시 발송 예약
+        self.assertEqual(mail_queue.send_pending(), (0, 0))  # 즉시 발송 리스 중에는 워커가 건너뜀
+        email = OutboundEmail.objects.get()
+        self.assertEqual(mail_queue.send_pending(ids=[email.pk]), (1, 0))
         self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail_queue.send_pending(ids=[email.pk]), (0, 0))  # 한 번만
 
     def test_verify_email_code_success_flow(self):
         self._post_json('common:send_verification_email', {'email': 'user@example.com'})
@@ -75,3 +85,1016 @@ class EmailVerificationTests(TestCase):
 
         third = self._post_json('common:send_verification_email', {'email': 'user@example.com'})
         self.assertEqual(third.status_code, 200)
+
+
+class FileLockTests(TestCase):
+    """파일 잠금: 한 잠금 파일은 한 번에 하나만 쥐고, close() 하면 다시 잡을 수 있다."""
+
+    def test_try_lock_is_exclusive_until_closed(self):
+        import tempfile
+        from common.services import file_lock
+
+        with tempfile.TemporaryDirectory() as logs_dir, override_settings(LOGS_DIR=logs_dir):
+            handle = file_lock.try_lock('job.lock')
+            self.assertIsNotNone(handle)
+            self.assertIsNone(file_lock.try_lock('job.lock'))
+            other = file_lock.try_lock('other.lock')
+            self.assertIsNotNone(other)
+            other.close()
+            handle.close()
+
+            with file_lock.locked('job.lock'):
+                self.assertIsNone(file_lock.try_lock('job.lock'))
+            file_lock.try_lock('job.lock').close()
+
+
+class LogIndexTests(TestCase):
+    """로그 인덱서: 새 줄만 분 단위 집계에 반영하고 회전된 파일의 남은 줄도 읽는다."""
+
+    def test_incremental_index_survives_rotation(self):
+        import os
+        import tempfile
+        from datetime import datetime
+        from common.services import log_index
+
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with tempfile.TemporaryDirectory() as logs_dir, override_settings(LOGS_DIR=logs_dir):
+            path = os.path.join(logs_dir, 'django.log')
+            with open(path, 'w') as f:
+                f.write(f'ERROR {now},001 views boom\n')
+                f.write(f'INFO {now},002 basehttp "GET /missing HTTP/1.1" 404 10\n')
+            self.assertEqual(log_index.update_index(['django']), 2)
+            self.assertEqual(log_index.update_index(['django']), 0)
+
+            with open(path, 'a') as f:
+                f.write(f'WARNING {now},003 middleware Rate limit exceeded for IP: 1.2.3.4\n')
+            os.rename(path, path + '.1')
+            with open(path, 'w') as f:
+                f.write(f'INFO {now},004 basehttp "GET /missing HTTP/1.1" 404 10\n')
+                f.write('partial line without newline')
+            self.assertEqual(log_index.update_index(['django']), 2)
+
+            stats = log_index.window_stats(hours=1)
+            journal = stats.journal_stats()
+            self.assertEqual(journal['error_count'], 1)
+            self.assertEqual(journal['warning_count'], 1)
+            self.assertEqual(journal['top_404'], [{'path': '/missing', 'count': 2}])
+            self.assertEqual(stats.security_stats()['rate_limit_hits'], 1)
+
+
+class NginxAccessReaderTests(TestCase):
+    """nginx 역방향 리더: cutoff 에서 멈추고 필요하면 회전된 gzip 세대까지 읽는다."""
+
+    def test_reads_back_into_rotated_generations(self):
+        import gzip
+        import os
+        import tempfile
+        import time
+        from datetime import datetime, timezone as dt_timezone
+        from common.services import nginx_access
+
+        def line(ts, path, code):
+            stamp = datetime.fromtimestamp(ts, dt_timezone.utc).strftime('%d/%b/%Y:%H:%M:%S +0000')
+            return f'1.2.3.4 - - [{stamp}] "GET {path} HTTP/1.1" {code} 10 "-" "ua"\n'
+
+        now = time.time()
+        with tempfile.TemporaryDirectory() as logs_dir:
+            path = os.path.join(logs_dir, 'access.log')
+            with gzip.open(path + '.2.gz', 'wt') as f:
+                f.write(line(now - 7200, '/too-old', 404))
+                f.write(line(now - 2400, '/in-gz', 404))
+            with open(path + '.1', 'w') as f:
+                f.write(line(now - 1800, '/rotated', 500))
+            with open(path, 'w') as f:
+                f.write(line(now - 60, '/current', 200))
+
+            stats = nginx_access.scan_access_log(1, candidates=[path], now=now)
+            self.assertEqual(stats['request_count'], 3)
+            self.assertEqual(dict(stats['path_404']), {'/in-gz': 1})
+            self.assertEqual(stats['samples_5xx'], ['500 GET /rotated'])
+
+            stats = nginx_access.scan_access_log(0.25, candidates=[path], now=now)
+            self.assertEqual(stats['request_count'], 1)
+
+
+class SystemMetricsTests(TestCase):
+    """시스템 지표: 외부 명령 없이 /proc 을 읽어 샘플을 링 버퍼에 쌓는다."""
+
+    def test_samples_fake_proc_into_ring_buffer(self):
+        import os
+        import tempfile
+        from unittest import mock
+        from common.services import system_metrics
+
+        with tempfile.TemporaryDirectory() as proc:
+            def write(rel, text):
+                os.makedirs(os.path.dirname(os.path.join(proc, rel)), exist_ok=True)
+                with open(os.path.join(proc, rel), 'w') as f:
+                    f.write(text)
+
+            write('meminfo', 'MemTotal:  4096000 kB\nMemFree: 100 kB\nMemAvailable:  1024000 kB\n')
+            write('loadavg', '0.50 0.40 0.30 1/100 1234\n')
+            write('stat', 'cpu  100 0 100 800 0 0 0 0 0 0\n')
+            write('42/cmdline', 'gunicorn: worker [mysite]\0')
+            write('42/comm', 'gunicorn\n')
+            write('7/cmdline', 'nginx: master process /usr/sbin/nginx\0')
+            write('7/comm', 'nginx\n')
+            write('8/cmdline', 'tail\0-f\0/var/log/nginx/access.log\0')  # 인자에만 nginx
+            write('8/comm', 'tail\n')
+            write('9/cmdline', '/srv/venv/bin/python3\0/srv/venv/bin/daphne\0config.asgi:application\0')
+            write('9/comm', 'python3\n')
+            write('42/status', 'Name:\tgunicorn\nVmRSS:\t  102400 kB\n')
+            write('42/stat', '42 (gunicorn) S 1 1 1 0 -1 0 0 0 0 0 10 5 0 0\n')
+
+            with mock.patch.object(system_metrics, 'PROC', proc), \
+                    mock.patch.object(system_metrics, '_samples', None), \
+                    mock.patch.object(system_metrics, '_last_cpu', None), \
+                    override_settings(SYSTEM_METRICS_CAPACITY=2, METRICS_DIR=os.path.join(proc, 'metrics')):
+                self.assertEqual(system_metrics.find_processes(('nginx',)), {7: 'nginx'})
+                self.assertEqual(system_metrics.find_processes(), {42: 'gunicorn', 9: 'daphne'})
+                system_metrics.record_sample()
+                write('stat', 'cpu  150 0 150 900 0 0 0 0 0 0\n')
+                system_metrics.record_sample()
+                system_metrics.record_sample()
+
+                data = system_metrics.samples()
+                self.assertEqual(len(data), 2)
+                self.assertEqual(data[0]['cpu_pct'], 50.0)
+                self.assertEqual(data[0]['workers'][42]['rss_mb'], 100.0)
+
+                snap = system_metrics.snapshot()
+                self.assertEqual(snap['mem_used_mb'], 3000)
+                self.assertEqual(snap['load_avg'], '0.50')
+                self.assertEqual(snap['mysite_status'], 'active')
+                self.assertEqual(system_metrics.chart_series()['workers'][0]['pid'], 42)
+
+                # 샘플러가 아닌 워커는 공유 파일에서 같은 버퍼를 읽음
+                with mock.patch.object(system_metrics, '_samples', None):
+                    shared = system_metrics.samples()
+                self.assertEqual([s['ts'] for s in shared], [s['ts'] for s in data])
+                self.assertEqual(shared[-1]['workers'][42]['rss_mb'], 100.0)
+
+
+class MetricsRegistryTests(TestCase):
+    """지표 레지스트리: 워커별 mmap 파일을 합산해 Prometheus 형식으로 노출한다."""
+
+    def test_aggregates_process_files_and_protects_endpoint(self):
+        import os
+        import tempfile
+        from common.services import metrics
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                override_settings(METRICS_DIR=tmp, METRICS_TOKEN='scrape-token'):
+            metrics.GAME_MOVES.inc(game='2048')
+            metrics.HTTP_LATENCY.observe(0.03, view='community:index')
+            metrics.HTTP_LATENCY.observe(0.2, view='community:index')
+
+            # 다른 워커가 남긴 카운터 파일
+            other = metrics._MmapStore(os.path.join(tmp, 'counter_999999.db'))
+            other.inc(metrics._key('game_moves_total', {'game': '2048'}), 2)
+
+            text = metrics.render_text()
+            self.assertIn('game_moves_total{game="2048"} 3', text)
+            self.assertIn('http_request_duration_seconds_bucket{view="community:index",le="0.05"} 1', text)
+            self.assertIn('http_request_duration_seconds_bucket{view="community:index",le="0.25"} 2', text)
+            self.assertIn('http_request_duration_seconds_bucket{view="community:index",le="+Inf"} 2', text)
+            self.assertIn('http_request_duration_seconds_count{view="community:index"} 2', text)
+
+            cache.set('metrics-test', 1)
+            cache.get('metrics-test')
+            cache.get('metrics-test-missing')
+            summary = metrics.dashboard_summary()
+            self.assertGreaterEqual(summary['cache']['hits'], 1)
+            self.assertGreaterEqual(summary['cache']['misses'], 1)
+
+            url = reverse('common:metrics_export')
+            self.assertEqual(self.client.get(url).status_code, 403)
+            response = self.client.get(url, HTTP_AUTHORIZATION='Bearer scrape-token')
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('http_requests_total{method="GET",status="403",view="common:metrics_export"} 1',
+                          response.content.decode())
+
+            # 임의의 메서드는 하나의 'other' 시계열로 모임
+            self.client.generic('FOO1', url)
+            self.client.generic('FOO2', url)
+            text = metrics.render_text()
+            self.assertNotIn('method="FOO1"', text)
+            self.assertIn('http_requests_total{method="other",status="403",view="common:metrics_export"} 2', text)
+
+    def test_compact_merges_dead_process_files_into_archive(self):
+        import os
+        import tempfile
+        from common.services import metrics
+
+        with tempfile.TemporaryDirectory() as tmp, override_settings(METRICS_DIR=tmp):
+            metrics.GAME_MOVES.inc(game='2048')
+            key = metrics._key('game_moves_total', {'game': '2048'})
+            for pid in (999998, 999999):
+                metrics._MmapStore(os.path.join(tmp, f'counter_{pid}.db')).inc(key, 2)
+                metrics._MmapStore(os.path.join(tmp, f'gauge_{pid}.db')).set(
+                    metrics._key('http_requests_in_progress', {}), 1)
+
+            self.assertEqual(metrics.compact(), 2)
+            self.assertEqual(metrics.total('game_moves_total'), 5)
+            self.assertEqual(metrics.total('http_requests_in_progress'), 0)
+            self.assertEqual(sorted(os.listdir(tmp)), sorted([
+                metrics.ARCHIVE_FILE, 'compact.lock', f'counter_{os.getpid()}.db',
+            ]))
+
+            # 재시작 후 다시 쓰인 같은 pid 파일은 보관 파일 값에 더해진다
+            metrics._MmapStore(os.path.join(tmp, 'counter_999999.db')).inc(key, 1)
+            self.assertEqual(metrics.total('game_moves_total'), 6)
+            metrics.mark_process_dead(999999)
+            self.assertEqual(metrics.total('game_moves_total'), 6)
+            self.assertFalse(os.path.exists(os.path.join(tmp, 'counter_999999.db')))
+
+
+class SQLProfilerTests(TestCase):
+    """SQL 프로파일러: 정규화 SQL 지문으로 반복 문장(N+1)을 찾아 뷰별로 집계한다."""
+
+    def test_detects_repeated_statements(self):
+        import tempfile
+        from django.contrib.auth.models import User
+        from django.db import connection
+        from common.services import sql_profiler
+
+        self.assertEqual(
+            sql_profiler.normalize_sql("SELECT * FROM t WHERE id IN (%s, %s) AND name = 'x' LIMIT 21"),
+            'SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?',
+        )
+
+        users = [User.objects.create_user(f'sqlprof{i}', password='pw') for i in range(6)]
+        profiler = sql_profiler.QueryProfiler()
+        with connection.execute_wrapper(profiler):
+            for user in users:
+                User.objects.filter(id=user.id).exists()
+        report = profiler.report()
+        self.assertEqual(report['queries'], 6)
+        self.assertEqual(report['repeated'][0]['count'], 6)
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                override_settings(METRICS_DIR=tmp, SQL_PROFILER_SAMPLE_RATE=1.0):
+            self.client.get(reverse('common:login'))
+            views = sql_profiler.summary()['views']
+            self.assertEqual(views[0]['view'], 'common:login')
+            self.assertEqual(views[0]['requests'], 1)
+
+
+class LogStreamTests(TestCase):
+    """실시간 로그: 공유 팔로워가 새 줄만 push 하고, 커서로 이어 받으며 레벨을 서버에서 거른다."""
+
+    def test_resumes_from_cursor_with_level_filter(self):
+        import os
+        import tempfile
+        import threading
+        from asgiref.sync import async_to_sync
+        from common.services import log_stream
+
+        async def read_body(follower, **kwargs):
+            return ''.join([chunk async for chunk in log_stream.sse_events(follower, **kwargs)])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'django.log')
+            with open(path, 'w') as f:
+                f.write('INFO first\nWARNING second\n')
+
+            done = threading.Event()
+            follower = log_stream.LogFollower(
+                'file', lambda stop: log_stream.follow_file(lambda: stop() or done.is_set(), path))
+            try:
+                with follower.subscribe():
+                    items, seq = [], 0
+                    while len(items) < 2:
+                        fresh, seq = async_to_sync(follower.wait)(seq, 5)
+                        self.assertTrue(fresh)
+                        items += fresh
+                    self.assertEqual(items[1]['level'], 'warn')
+
+                    with open(path, 'a') as f:
+                        f.write('ERROR third\n')
+                    body = async_to_sync(read_body)(
+                        follower, cursor=items[0]['cursor'], level='warn', duration=1.5)
+                self.assertIn('WARNING second', body)
+                self.assertIn('ERROR third', body)
+                self.assertNotIn('INFO first', body)
+                self.assertNotIn('event: gap', body)
+            finally:
+                done.set()
+
+        from django.contrib.auth.models import User
+        User.objects.create_superuser('streamadmin', 'a@example.com', 'pw')
+        self.client.login(username='streamadmin', password='pw')
+        self.assertEqual(self.client.get(reverse('common:server_log_stream')).status_code, 403)
+
+    def test_journal_lines_in_one_read_are_not_held_back(self):
+        import subprocess
+        import time
+        from unittest import mock
+        from common.services import log_stream
+
+        output = '{"__CURSOR": "c1", "MESSAGE": "one"}\\n{"__CURSOR": "c2", "MESSAGE": "two"}\\n'
+        real_popen = subprocess.Popen
+
+        def fake_journalctl(args, **kwargs):
+            # 두 줄을 한 번에 쓰고 오래 조용히 있는 journalctl
+            return real_popen(['sh', '-c', f"printf '{output}'; sleep 10"], **kwargs)
+
+        started = time.monotonic()
+        with mock.patch.object(log_stream.subprocess, 'Popen', side_effect=fake_journalctl):
+            lines = log_stream.follow_journal(lambda: time.monotonic() - started > 5)
+            cursors = [next(lines)[0], next(lines)[0]]
+            lines.close()
+        self.assertEqual(cursors, ['c1', 'c2'])
+        self.assertLess(time.monotonic() - started, 3)
+
+
+class LogTemplateTests(TestCase):
+    """로그 템플릿: 가변값만 다른 에러 줄을 한 템플릿으로 묶고, 지적사항 지문에 쓴다."""
+
+    def test_collapses_lines_and_stabilizes_fingerprint(self):
+        from common.models import LogFinding
+        from common.services import log_index
+
+        stats = log_index.LineStats()
+        for i in range(4):
+            stats.add(f'ERROR 2025-10-10 13:5{i}:00,123 log Internal Server Error: /question/{i + 10}/ from 10.0.0.{i}')
+        stats.add('WARNING 2025-10-10 14:00:00,000 log Not Found: /wp-login.php')
+
+        merged = log_index.LineStats()
+        merged.merge_row(stats.to_row())
+        merged.merge_row(stats.to_row())
+        top = merged.journal_stats()['error_templates'][0]
+        self.assertEqual(top['template'], 'Internal Server Error: /question/<NUM>/ from <IP>')
+        self.assertEqual(top['count'], 8)
+        self.assertEqual((top['first_seen'], top['last_seen']), ('2025-10-10 13:50:00', '2025-10-10 13:53:00'))
+        self.assertEqual(top['exemplar'], 'Internal Server Error: /question/10/ from 10.0.0.0')
+
+        first, created = LogFinding.record({'title': '질문 상세 500 에러', 'template': top['template']})
+        again, created_again = LogFinding.record({'title': '질문 페이지 서버 오류', 'template': top['template']})
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(first.pk, again.pk)
+
+        # 다른 경로의 같은 에러가 합쳐져 템플릿이 더 일반화돼도 같은 지적사항
+        merged.add('ERROR 2025-10-10 14:10:00,000 log Internal Server Error: /answer/modify/3/ from 10.0.0.9')
+        drifted = merged.journal_stats()['error_templates'][0]['template']
+        self.assertEqual(drifted, 'Internal Server Error: <*> from <IP>')
+        _, created_drifted = LogFinding.record({'title': '500 에러', 'template': drifted})
+        self.assertFalse(created_drifted)
+
+
+class DashboardStatsTests(TestCase):
+    """대시보드 지표: 조건부 집계로 모은 스냅샷을 캐시해 여러 화면이 공유한다."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_snapshot_counts_and_cache(self):
+        from datetime import timedelta
+        from django.contrib.auth.models import User
+        from django.utils import timezone
+        from community.models import Category, DailyVisitor, Question
+        from common.services import dashboard_stats
+
+        bot = User.objects.create_user(dashboard_stats.COLUMN_BOT_USERNAME, password='pw')
+        User.objects.create_user('sleeper', password='pw', is_active=False)
+        category = Category.objects.create(name='칼럼')
+        now = timezone.now()
+        for days_ago in (0, 0, 2):
+            Question.objects.create(author=bot, subject=f'q{days_ago}', content='-', category=category,
+                                    create_date=now - timedelta(days=days_ago))
+        Question.objects.create(author=bot, subject='gone', content='-', category=category,
+                                create_date=now, is_deleted=True)
+        today = timezone.localdate()
+        DailyVisitor.objects.create(date=today, visitor_count=7)
+        DailyVisitor.objects.create(date=today - timedelta(days=1), visitor_count=3)
+
+        stats = dashboard_stats.get_dashboard_stats()
+        self.assertEqual((stats['total_users'], stats['inactive_users']), (2, 1))
+        self.assertEqual((stats['total_questions'], stats['new_questions']), (3, 2))
+        self.assertEqual((stats['column_total'], stats['column_week'], stats['column_today']), (3, 3, 2))
+        self.assertEqual((stats['visitors_today'], stats['visitors_yesterday']), (7, 3))
+        self.assertEqual([d['count'] for d in stats['question_trend']], [0, 0, 0, 0, 1, 0, 2])
+        self.assertEqual(stats['visitor_trend'][-1], {'date': today.strftime('%m/%d'), 'count': 7})
+
+        with self.assertNumQueries(0):
+            self.assertIs(dashboard_stats.get_dashboard_stats()['total_users'], stats['total_users'])
+
+
+class DbBackupTests(TestCase):
+    """SQLite 백업: backup API 스냅샷을 조각으로 저장하면 바뀐 조각만 새로 쌓이고 그대로 복원된다."""
+
+    def test_chunk_dedup_prune_and_restore(self):
+        import sqlite3
+        import tempfile
+        from pathlib import Path
+        from common.services import db_backup
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            db = sqlite3.connect(tmp / 'live.sqlite3')
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('CREATE TABLE t (id INTEGER PRIMARY KEY, body TEXT)')
+            db.executemany('INSERT INTO t (body) VALUES (?)', [(f'row {i} ' * 40,) for i in range(3000)])
+            db.commit()  # WAL 에만 있는 커밋도 스냅샷에 포함돼야 한다
+
+            first, stats1 = db_backup.store_chunks(
+                db_backup.snapshot_sqlite(tmp / 'live.sqlite3', tmp / 'snap'), tmp, 'db_1', chunk_size=64 * 1024)
+            db.execute("UPDATE t SET body = 'changed' WHERE id = 5")
+            db.commit()
+            second, stats2 = db_backup.store_chunks(
+                db_backup.snapshot_sqlite(tmp / 'live.sqlite3', tmp / 'snap'), tmp, 'db_2', chunk_size=64 * 1024)
+            db.close()
+
+            self.assertEqual(stats1['new'], stats1['chunks'])
+            self.assertGreater(stats2['chunks'], 4)
+            self.assertLessEqual(stats2['new'], 2)
+
+            first.unlink()
+            removed, _ = db_backup.prune_chunks(tmp)
+            self.assertEqual(removed, stats2['new'])
+
+            restored = sqlite3.connect(db_backup.restore_chunks(second, tmp / 'restored.sqlite3'))
+            self.assertEqual(restored.execute('SELECT count(*), max(body) FROM t WHERE id = 5').fetchone(), (1, 'changed'))
+            self.assertEqual(restored.execute('SELECT count(*) FROM t').fetchone(), (3000,))
+            restored.close()
+
+
+class SqliteProfileTests(TestCase):
+    """SQLite 운영 프로필: 새 연결에 PRAGMA 를 적용하고, 조회수 증가는 큐에서 합쳐 한 번에 반영한다."""
+
+    def test_pragmas_applied(self):
+        from django.db import connection
+        from common.services import sqlite_profile
+
+        values = sqlite_profile.current_pragmas(connection)
+        self.assertEqual(values['synchronous'], 1)  # NORMAL
+        self.assertEqual(values['temp_store'], 2)   # MEMORY
+
+    @override_settings(SQLITE_WRITE_QUEUE=True, SQLITE_WRITE_QUEUE_INTERVAL=3600)
+    def test_write_queue_coalesces_increments(self):
+        from django.contrib.auth.models import User
+        from community.models import Category, Question
+        from common.services import write_queue
+        from django.utils import timezone
+
+        author = User.objects.create_user('writer', password='pw')
+        question = Question.objects.create(author=author, subject='s', content='c', create_date=timezone.now(),
+                                           category=Category.objects.create(name='큐'))
+        for _ in range(30):
+            write_queue.increment(Question, question.pk, 'view_count')
+        question.refresh_from_db()
+        self.assertEqual(question.view_count, 0)
+
+        with self.assertNumQueries(3):  # SAVEPOINT + UPDATE 한 번 + RELEASE
+            self.assertEqual(write_queue.flush(), 1)
+        question.refresh_from_db()
+        self.assertEqual(question.view_count, 30)
+        self.assertEqual(write_queue.pending(), {})
+
+
+class SharedMemoryCacheTests(TestCase):
+    """공유 메모리 캐시: 프로세스 간 같은 값을 보고, incr 은 원자적이며, 집합 단위 LRU 로 퇴출한다."""
+
+    PARAMS = {'OPTIONS': {'SLOT_CLASSES': [(256, 4), (2048, 2)], 'LOCK_STRIPES': 2}}
+
+    def setUp(self):
+        import tempfile
+        from common.cache_backends import SharedMemoryCache
+        self.tmp = tempfile.TemporaryDirectory()
+        self.location = f'{self.tmp.name}/cache'
+        self.cache = SharedMemoryCache(self.location, self.PARAMS)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_basic_operations(self):
+        import time
+        cache = self.cache
+        cache.set('a', {'n': 1})
+        self.assertEqual(cache.get('a'), {'n': 1})
+        self.assertFalse(cache.add('a', 2))
+        self.assertTrue(cache.add('b', 5, timeout=0.2))
+        self.assertEqual(cache.incr('b', 3), 8)
+        with self.assertRaises(ValueError):
+            cache.incr('missing')
+        cache.set('big', 'x' * 1000)  # 큰 클래스로 이동하면서 작은 클래스의 옛 값은 지워진다
+        cache.set('big', 'y' * 10)
+        cache.set('big', 'z' * 1500)
+        self.assertEqual(cache.get('big'), 'z' * 1500)
+        cache.set('huge', 'x' * 5000)
+        self.assertIsNone(cache.get('huge'))
+        self.assertEqual(cache.set_many({'c': 1, 'd': 2}), [])
+        self.assertEqual(cache.get_many(['a', 'c', 'd', 'nope']), {'a': {'n': 1}, 'c': 1, 'd': 2})
+        time.sleep(0.25)
+        self.assertIsNone(cache.get('b'))
+        cache.clear()
+        self.assertIsNone(cache.get('a'))
+
+    def test_lru_eviction_within_set(self):
+        cache = self.cache
+        for i in range(200):
+            cache.set(f'k{i}', i)
+            cache.get('hot')  # miss — 자리를 차지하지 않음
+            if i == 0:
+                cache.set('hot', 'keep')
+            cache.get('hot')
+        self.assertEqual(cache.get('hot'), 'keep')
+        self.assertLessEqual(sum(s['used'] for s in cache.stats()), 4 * 8 + 2 * 8)
+
+    def test_shared_between_processes(self):
+        import multiprocessing
+        from common.cache_backends import SharedMemoryCache
+        self.cache.set('counter', 0)
+
+        def work():
+            other = SharedMemoryCache(self.location, self.PARAMS)
+            for _ in range(200):
+                other.incr('counter')
+
+        procs = [multiprocessing.get_context('fork').Process(target=work) for _ in range(4)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        self.assertEqual(self.cache.get('counter'), 800)
+
+    def test_large_values_in_one_set_stay_intact_across_processes(self):
+        import multiprocessing
+        from django.core.exceptions import ImproperlyConfigured
+        from common.cache_backends import SharedMemoryCache
+        # 큰 클래스의 같은 집합(h % 2 == 0)에 떨어지는 키 16개 — WAYS(8)보다 많아 계속 교체된다
+        keys = [k for k in (f'big{i}' for i in range(200))
+                if self.cache._hash(self.cache.make_and_validate_key(k).encode()) % 2 == 0][:16]
+
+        def payload(key):
+            return (key + ':') * 250  # 2048 바이트 클래스에 들어가는 큰 값
+
+        def work(seed):
+            other = SharedMemoryCache(self.location, self.PARAMS)
+            for n in range(3000):
+                other.set(keys[(seed * 7 + n) % len(keys)], payload(keys[(seed * 7 + n) % len(keys)]))
+                key = keys[(seed + n) % len(keys)]
+                value = other.get(key)  # 다른 프로세스가 반쯤 쓴 슬롯이면 UnpicklingError·다른 값
+                if value is not None and value != payload(key):
+                    raise SystemExit(1)
+
+        procs = [multiprocessing.get_context('fork').Process(target=work, args=(seed,)) for seed in range(4)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        self.assertEqual([proc.exitcode for proc in procs], [0, 0, 0, 0])
+
+        with self.assertRaises(ImproperlyConfigured):
+            SharedMemoryCache(self.location, {'OPTIONS': {'SLOT_CLASSES': [(256, 64), (65536, 16)]}})
+
+    def test_refuses_backing_file_with_loose_permissions(self):
+        import os
+        from common.cache_backends import SharedMemoryCache
+        self.cache.set('a', 1)
+        os.chmod(self.location, 0o644)
+        other = SharedMemoryCache(self.location, self.PARAMS)
+        with self.assertLogs('common.cache_backends', 'WARNING'):
+            self.assertIsNone(other.get('a'))  # 공유 파일 대신 프로세스 전용 메모리
+
+    def test_layout_change_swaps_file_without_breaking_old_mappings(self):
+        import os
+        from common.cache_backends import SharedMemoryCache
+        self.cache.set('a', 'old')
+        old_inode = os.stat(self.location).st_ino
+
+        # 배포로 레이아웃이 바뀜 — 옛 파일을 제자리에서 줄이면 self.cache 의 매핑이 SIGBUS
+        params = {'OPTIONS': {'SLOT_CLASSES': [(512, 4)], 'LOCK_STRIPES': 2}}
+        new = SharedMemoryCache(self.location, params)
+        new.set('b', 'new')
+        self.assertNotEqual(os.stat(self.location).st_ino, old_inode)
+        self.assertEqual(self.cache.get('a'), 'old')  # 옛 프로세스는 재시작 전까지 옛 파일을 계속 씀
+        self.assertEqual(SharedMemoryCache(self.location, params).get('b'), 'new')
+        self.assertEqual(os.listdir(self.tmp.name), ['cache'])  # 임시 파일이 남지 않음
+
+
+@override_settings(SQLITE_WRITE_QUEUE_INTERVAL=3600)
+class SessionWriteBehindTests(TestCase):
+    """세션 엔진: 값이 바뀔 때만 저장하고, 일반 키는 모아서·인증 키는 즉시 DB 에 쓰며, 휘발성 키는 DB 에 두지 않는다."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_write_behind_and_durability(self):
+        from django.contrib.sessions.models import Session
+        from common.services import write_queue
+        from common.session_backends import SessionStore
+
+        def db_data(key):
+            return SessionStore().decode(Session.objects.get(session_key=key).session_data)
+
+        store = SessionStore()
+        store['theme'] = 'dark'
+        store.save()
+        key = store.session_key
+        self.assertEqual(db_data(key), {'theme': 'dark'})
+
+        store = SessionStore(key)
+        store['theme'] = 'dark'  # 같은 값 — modified 만 켜짐
+        with self.assertNumQueries(0):
+            store.save()
+        self.assertEqual(write_queue.deferred(), {})
+
+        store['viewed_question_5'] = 123
+        store['game_2048_1'] = {'board': [[2, 0], [0, 2]]}
+        with self.assertNumQueries(0):
+            store.save()
+        self.assertEqual(SessionStore(key).load()['viewed_question_5'], 123)  # 캐시에는 바로 보임
+        self.assertNotIn('game_2048_1', db_data(key))
+
+        write_queue.flush()
+        self.assertEqual(db_data(key), {'theme': 'dark', 'game_2048_1': {'board': [[2, 0], [0, 2]]}})
+
+        store = SessionStore(key)
+        store['visited_2025-10-10'] = True  # 휘발성 키만 바뀜 — 캐시만 갱신
+        with self.assertNumQueries(0):
+            store.save()
+        self.assertEqual(write_queue.deferred(), {})
+        self.assertTrue(SessionStore(key).load()['visited_2025-10-10'])
+
+        store = SessionStore(key)
+        store['_auth_user_id'] = '7'
+        store.save()
+        self.assertEqual(write_queue.deferred(), {})
+        self.assertEqual(db_data(key)['_auth_user_id'], '7')
+
+
+class _FlakyBackend:
+    """테스트용 SMTP 대역: 연결 수를 세고, fail 에 든 주소는 해당 예외로 실패"""
+    opens = 0
+    fail = {}
+
+    def __init__(self, *args, **kwargs):
+        self.sent = []
+
+    def open(self):
+        type(self).opens += 1
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        for message in messages:
+            error = self.fail.get(message.to[0])
+            if error:
+                raise error
+            mail.outbox.append(message)
+        return len(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND='common.tests._FlakyBackend',
+    EMAIL_QUEUE_BATCH_SIZE=10, EMAIL_QUEUE_MAX_ATTEMPTS=2, EMAIL_QUEUE_BACKOFF=30,
+)
+class MailQueueTests(TestCase):
+    """메일 큐: 연결 하나로 묶어 보내고, 실패는 지수 백오프 후 재시도, 한도를 넘기면 dead."""
+
+    def setUp(self):
+        _FlakyBackend.opens = 0
+        _FlakyBackend.fail = {}
+
+    def test_batches_retries_and_dead_letters(self):
+        import smtplib
+        import tempfile
+        from datetime import timedelta
+        from pathlib import Path
+        from django.utils import timezone
+        from common.models import OutboundEmail
+        from common.services import mail_queue
+
+        for i in range(12):
+            mail_queue.enqueue(f'알림 {i}', '본문', [f'user{i}@example.com'])
+        self.assertEqual(mail_queue.drain(), (12, 0))
+        self.assertEqual(_FlakyBackend.opens, 2)  # 10통 + 2통, 배치마다 연결 1번
+        self.assertEqual(mail_queue.stats()['depth'], 0)
+        self.assertFalse(OutboundEmail.objects.exclude(body=OutboundEmail.REDACTED_BODY).exists())  # 발송 후 본문 삭제
+
+        with tempfile.TemporaryDirectory() as tmp:
+            attachment = Path(tmp) / 'report.gz'
+            attachment.write_bytes(b'gz')
+            _FlakyBackend.fail = {
+                'busy@example.com': smtplib.SMTPDataError(451, 'try later'),
+                'gone@example.com': smtplib.SMTPRecipientsRefused({'gone@example.com': (550, b'no user')}),
+            }
+            busy = mail_queue.enqueue('재시도', '본문', ['busy@example.com'],
+                                      attachments=[{'path': str(attachment), 'delete': True}])
+            gone = mail_queue.enqueue('거부', '본문', ['gone@example.com'])
+            code = mail_queue.enqueue('인증 코드', '인증코드: 123456', ['gone@example.com'], sensitive=True)
+            OutboundEmail.objects.filter(pk=code.pk).update(next_attempt_at=timezone.now())  # 즉시 발송 리스 만료
+            self.assertEqual(mail_queue.send_pending(), (0, 3))
+
+            busy.refresh_from_db()
+            gone.refresh_from_db()
+            code.refresh_from_db()
+            self.assertEqual(gone.status, OutboundEmail.STATUS_DEAD)  # 영구 오류는 바로 dead
+            self.assertEqual(gone.body, '본문')  # --retry-dead 로 다시 보낼 수 있게 유지
+            self.assertEqual((code.status, code.body), (OutboundEmail.STATUS_DEAD, OutboundEmail.REDACTED_BODY))
+            self.assertEqual(busy.status, OutboundEmail.STATUS_PENDING)
+            self.assertGreater(busy.next_attempt_at, timezone.now() + timedelta(seconds=25))
+            self.assertEqual(mail_queue.send_pending(), (0, 0))  # 백오프 중
+            self.assertEqual(mail_queue.stats()['retrying'], 1)
+
+            OutboundEmail.objects.filter(pk=busy.pk).update(next_attempt_at=timezone.now())
+            self.assertEqual(mail_queue.send_pending(), (0, 1))
+            busy.refresh_from_db()
+            self.assertEqual(busy.status, OutboundEmail.STATUS_DEAD)
+            self.assertFalse(attachment.exists())  # 폐기 시 스풀 첨부 삭제
+        self.assertEqual(mail_queue.stats()['dead'], 3)
+
+
+class HttpClientTests(TestCase):
+    """외부 HTTP: 연결을 재사용하고, 연속 실패하면 브레이커가 열렸다가 시험 요청 성공 시 닫힌다."""
+
+    def setUp(self):
+        from common.services import http_client
+        http_client.reset()
+        self.addCleanup(http_client.reset)
+
+    def test_dictionary_and_kakao_flows_reuse_connections(self):
+        from django.contrib.auth.models import User
+        from common.services.http_stub import StubServer, kakao_user_id
+        from community.views.wordchain_views import check_word_exists
+
+        with StubServer(unknown_words={'없는말'}) as stub, override_settings(
+            HTTP_CLIENT_STUB_URL=stub.url, KOREAN_DICT_API_KEY='stub', WORDCHAIN_USE_DICTIONARY_API=True,
+        ):
+            self.assertTrue(check_word_exists('사과나무')[0])
+            self.assertFalse(check_word_exists('없는말')[0])
+
+            session = self.client.session
+            session['kakao_oauth_state'] = 'state-1'
+            session.save()
+            response = self.client.get(reverse('common:kakao_callback'), {'code': 'abc', 'state': 'state-1'})
+            self.assertRedirects(response, reverse('community:index'), fetch_redirect_response=False)
+            self.assertTrue(User.objects.filter(username=f'kakao_{kakao_user_id("abc")}').exists())
+
+            self.assertEqual(stub.requests, 4)
+            self.assertEqual(stub.connections, 2)  # 사전 1개 + 카카오 1개 (kauth·kapi 같은 주소)
+
+    def test_circuit_breaker_opens_and_half_open_probe_closes(self):
+        import time
+        from common.services import http_client
+        from common.services.http_stub import StubServer
+
+        url = 'https://krdict.korean.go.kr/api/search'
+        with StubServer(fail_rate=1.0) as stub, override_settings(
+            HTTP_CLIENT_STUB_URL=stub.url, HTTP_CLIENT_SERVICES={'krdict': {'retries': 0}},
+            HTTP_CLIENT_BREAKER_FAILURES=2, HTTP_CLIENT_BREAKER_RESET=0.2,
+        ):
+            self.assertEqual(http_client.get('krdict', url).status_code, 503)
+            self.assertEqual(http_client.get('krdict', url).status_code, 503)
+            with self.assertRaises(http_client.CircuitOpen):
+                http_client.get('krdict', url)
+            self.assertEqual(stub.requests, 2)
+
+            time.sleep(0.25)
+            stub.fail_rate = 0.0
+            self.assertEqual(http_client.get('krdict', url).status_code, 200)  # half-open 시험 요청
+            self.assertEqual(http_client.status()[0]['state'], 'closed')
+
+
+class FakeClaudeMixin:
+    """Claude 를 가짜 백엔드로 바꾸고 테스트마다 클라이언트(호출 기록)를 새로 만든다."""
+
+    def setUp(self):
+        super().setUp()
+        from common.services import claude, metrics
+        settings = override_settings(CLAUDE_BACKEND='fake')
+        settings.enable()
+        self.addCleanup(settings.disable)
+        claude.reset_client()
+        self.addCleanup(claude.reset_client)
+        self._claude_baseline = metrics.dashboard_summary()['claude']
+
+    def claude_metrics(self, key):
+        """setUp 이후 늘어난 Claude 지표 (METRICS_DIR 는 테스트 실행 전체가 공유 — common.test_runner)"""
+        from common.services import metrics
+        return metrics.dashboard_summary()['claude'][key] - self._claude_baseline[key]
+
+
+@override_settings(CLAUDE_RESPONSE_CACHE='memory', CLAUDE_RETRY_BASE=0)
+class ClaudeServiceTests(FakeClaudeMixin, TestCase):
+    """Claude 호출: 클라이언트를 재사용하고, 과부하는 재시도하며, cache=True 응답은 캐시에서 돌려준다."""
+
+    def test_retry_cache_and_cost_metrics(self):
+        from common.services import claude
+
+        fake = claude.fake_client()
+        self.assertIs(claude._get_client(), fake)
+
+        fake.fail_next(2, status=529)
+        reply = claude.ask('파이썬의 장점', model=claude.ClaudeModel.HAIKU)
+        self.assertIn('파이썬의 장점', reply)
+        self.assertEqual(len(fake.calls), 3)
+
+        data = claude.ask_json('json 으로 요약', cache=True)
+        self.assertEqual(claude.ask_json('json 으로 요약', cache=True), data)
+        self.assertEqual(len(fake.calls), 4)
+
+        self.assertEqual(''.join(claude.ask_stream('스트리밍')), claude.ask('스트리밍'))
+
+        fake.fail_next(1, status=400)
+        with self.assertRaises(Exception):
+            claude.ask('잘못된 요청')
+
+        self.assertEqual(self.claude_metrics('retries'), 2)
+        self.assertEqual(self.claude_metrics('cache_hits'), 1)
+        self.assertEqual(self.claude_metrics('errors'), 1)
+        self.assertGreater(self.claude_metrics('cost_usd'), 0)
+
+
+@override_settings(CLAUDE_REQUESTS_PER_MINUTE=0)
+class BatchGenerationTests(FakeClaudeMixin, TestCase):
+    """배치 생성: 주제·회차를 동시에 만들고, 실패한 항목만 재실행 때 다시 생성한다."""
+
+    def setUp(self):
+        import tempfile
+        from common.services import claude
+        from community.models import Category
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()  # 체크포인트 파일
+        self.addCleanup(tmp.cleanup)
+        settings = override_settings(LOGS_DIR=tmp.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        for name in ('HRD', '데이터분석', '프로그래밍'):
+            Category.objects.create(name=name)
+        self.fake = claude.fake_client()
+        self.failing = set()
+
+        def responder(kwargs):
+            prompt = kwargs['messages'][0]['content']
+            if any(word in prompt for word in self.failing):
+                raise RuntimeError('generation failed')
+            return f'TITLE: {prompt.splitlines()[1][:40]}\n---\n본문'
+        self.fake.responder = responder
+
+    def test_columns_and_series_resume_from_checkpoint(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from community.models import Question
+
+        call_command('auto_write_columns', stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(Question.objects.filter(author__username='techchang연구팀').count(), 3)
+        self.assertEqual(len(self.fake.calls), 3)
+
+        # 0편 실패 → 1편은 체크포인트에만 남고 발행되지 않음
+        self.failing = {'이번 회차: 0편'}
+        call_command('auto_write_series', count=2, stdout=StringIO(), stderr=StringIO())
+        self.assertFalse(Question.objects.filter(series__isnull=False).exists())
+        self.assertEqual(len(self.fake.calls), 5)
+
+        self.failing = set()
+        call_command('auto_write_series', count=2, stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(len(self.fake.calls), 6)  # 0편만 다시 생성
+        self.assertEqual(
+            list(Question.objects.filter(series__isnull=False).order_by('episode_number')
+                 .values_list('episode_number', flat=True)),
+            [0, 1],
+        )
+
+    def test_series_explicit_episode_rewrites_published_episode(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from community.models import Question
+
+        call_command('auto_write_series', count=2, stdout=StringIO(), stderr=StringIO())
+        episode = Question.objects.get(series__isnull=False, episode_number=1)
+        calls = len(self.fake.calls)
+
+        out = StringIO()
+        call_command('auto_write_series', episode=1, stdout=out, stderr=StringIO())
+        self.assertEqual(len(self.fake.calls), calls + 1)
+        self.assertIn('재작성 완료', out.getvalue())
+        # 새 글을 겹쳐 만들지 않고 기존 글(id 유지)을 교체
+        self.assertEqual(Question.objects.filter(series__isnull=False, episode_number=1).count(), 1)
+        episode.refresh_from_db()
+        self.assertIsNotNone(episode.modify_date)
+
+
+class PromptCachingTests(FakeClaudeMixin, TestCase):
+    """프롬프트 캐싱: 고정 지침을 system 접두어로 보내, 첫 회차가 캐시를 채우면 나머지는 캐시에서 읽는다."""
+
+    def test_series_batch_reads_shared_prefix_from_cache(self):
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+        from common.services import claude
+        from community.models import Category
+
+        Category.objects.create(name='프로그래밍')
+        with tempfile.TemporaryDirectory() as tmp, override_settings(LOGS_DIR=tmp):
+            fake = claude.fake_client()
+            fake.responder = lambda kwargs: 'TITLE: 회차\n---\n본문'
+
+            call_command('auto_write_series', count=3, dry_run=True, stdout=StringIO())
+
+            system = fake.calls[0]['system']
+            self.assertEqual([block['cache_control'] for block in system], [{'type': 'ephemeral'}])
+            self.assertNotIn('회차 구조는', fake.calls[0]['messages'][0]['content'])  # 고정 지침은 system 에만
+            prefix = len(system[0]['text']) // 4
+            self.assertEqual(self.claude_metrics('cache_write_tokens'), prefix)
+            self.assertEqual(self.claude_metrics('cache_read_tokens'), prefix * 2)
+
+    def test_single_episode_run_skips_cache_write(self):
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+        from common.services import claude
+        from community.models import Category
+
+        Category.objects.create(name='프로그래밍')
+        with tempfile.TemporaryDirectory() as tmp, override_settings(LOGS_DIR=tmp):
+            fake = claude.fake_client()
+            fake.responder = lambda kwargs: 'TITLE: 회차\n---\n본문'
+
+            call_command('auto_write_series', dry_run=True, stdout=StringIO())
+
+            # cron 의 한 회차 실행은 다시 읽을 호출이 없으므로 1.25배 캐시 쓰기를 하지 않음
+            self.assertNotIn('cache_control', fake.calls[0]['system'][0])
+            self.assertEqual(self.claude_metrics('cache_write_tokens'), 0)
+
+
+class ImageDerivativeTests(TestCase):
+    """업로드 이미지 파생본: 워커가 EXIF 회전·메타데이터를 정리한 WebP/JPEG 를 만들면 템플릿이 srcset 으로 바꾼다."""
+
+    def test_worker_builds_variants_and_tag_falls_back_until_ready(self):
+        import io
+        import tempfile
+        from PIL import Image
+        from django.contrib.auth.models import User
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.core.management import call_command
+        from django.template import Context, Template
+        from common.services import image_derivatives
+
+        exif = Image.Exif()
+        exif[0x0112] = 6  # 시계 방향 90° 회전해서 볼 것
+        exif[0x010F] = 'TestCam'
+        buffer = io.BytesIO()
+        Image.new('RGB', (1000, 400), 'red').save(buffer, 'JPEG', exif=exif.tobytes())
+
+        with tempfile.TemporaryDirectory() as tmp, override_settings(
+            MEDIA_ROOT=tmp, IMAGE_DERIVATIVE_WIDTHS=(320, 640), IMAGE_DERIVATIVE_THREADS=0,
+        ):
+            image_derivatives.clear_cache()
+            self.addCleanup(image_derivatives.clear_cache)
+            profile = User.objects.create_user('photo', password='pw').profile
+            profile.profile_image = SimpleUploadedFile('me.jpg', buffer.getvalue(), content_type='image/jpeg')
+            profile.save()
+
+            template = Template('{% load common_tags %}{% responsive_image image alt="me" class="avatar" %}')
+            html = template.render(Context({'image': profile.profile_image}))
+            self.assertNotIn('<picture>', html)  # 파생본 전에는 원본
+            self.assertIn(profile.profile_image.url, html)
+
+            call_command('build_image_derivatives', stdout=io.StringIO())
+
+            manifest = image_derivatives.manifest(profile.profile_image.name)
+            self.assertEqual((manifest['width'], manifest['height']), (400, 1000))  # 회전 반영
+            self.assertEqual([v['width'] for v in manifest['variants']], [320, 400])
+            with Image.open(f'{tmp}/{manifest["variants"][0]["fallback"]}') as variant:
+                self.assertEqual(variant.size, (320, 800))
+                self.assertEqual(dict(variant.getexif()), {})
+            html = template.render(Context({'image': profile.profile_image}))
+            self.assertIn('<source type="image/webp" srcset="/media/derivatives/', html)
+            self.assertIn('320w', html)
+            self.assertIn('class="avatar"', html)
+
+    def test_account_delete_removes_derivatives_with_original(self):
+        import io
+        import os
+        import tempfile
+        from PIL import Image
+        from django.contrib.auth.models import User
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from common.services import image_derivatives
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (800, 400), 'blue').save(buffer, 'JPEG')
+
+        with tempfile.TemporaryDirectory() as tmp, override_settings(
+            MEDIA_ROOT=tmp, IMAGE_DERIVATIVE_WIDTHS=(320, 640), IMAGE_DERIVATIVE_THREADS=0,
+        ):
+            image_derivatives.clear_cache()
+            self.addCleanup(image_derivatives.clear_cache)
+            user = User.objects.create_user('leaving', password='pw')
+            user.profile.is_email_verified = True
+            user.profile.profile_image = SimpleUploadedFile('me.jpg', buffer.getvalue(), content_type='image/jpeg')
+            user.profile.save()
+            name = user.profile.profile_image.name
+            image_derivatives.build(name)
+            directory = os.path.join(tmp, image_derivatives.DERIVATIVE_DIR, name)
+            self.assertTrue(os.listdir(directory))
+
+            self.client.force_login(user)
+            self.client.post(reverse('common:account_delete'), {'password': 'pw', 'confirm_delete': '회원탈퇴'})
+
+            # 원본과 함께 공개 URL 로 남아 있던 파생본·매니페스트도 사라짐
+            self.assertFalse(os.path.exists(os.path.join(tmp, name)))
+            self.assertFalse(os.path.exists(directory))
+            self.assertIsNone(image_derivatives.manifest(name))
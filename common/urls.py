@@ -35,6 +35,8 @@ urlpatterns = [
     path('admin/monitor/finding/<int:finding_id>/reject/', views.finding_reject, name='finding_reject'),
     path('admin/monitor/logs/', views.server_logs, name='server_logs'),
     path('admin/monitor/live-logs/', views.server_live_logs, name='server_live_logs'),
+    path('admin/monitor/live-logs/stream/', views.server_log_stream, name='server_log_stream'),
+    path('admin/monitor/metrics/', views.metrics_export, name='metrics_export'),
     path('admin/portfolios/', views.admin_portfolio_approval, name='admin_portfolio_approval'),
     path('admin/portfolios/<str:kind>/<int:obj_id>/approve/', views.admin_portfolio_approve, name='admin_portfolio_approve'),
     path('admin/portfolios/<str:kind>/<int:obj_id>/reject/', views.admin_portfolio_reject, name='admin_portfolio_reject'),
@@ -9,16 +9,15 @@ from django.contrib import messages
 from django.conf import settings
 from django.utils import timezone
 from django.utils.http import url_has_allowed_host_and_scheme
-from django.core.mail import send_mail
 from django.core.cache import cache
 import json
 import logging
 import requests
 import secrets
-from datetime import timedelta
 from django.contrib.auth.models import User
 from common.forms import UserForm, ProfileForm
 from .models import Profile, EmailVerification, KakaoUser
+from common.services import http_client, image_derivatives, mail_queue
 from community.utils import award_points, deduct_points
 
 
@@ -118,7 +117,9 @@ def account_delete(request):
             # 프로필 이미지 삭제
             try:
                 if hasattr(user, 'profile') and user.profile.profile_image:
+                    name = user.profile.profile_image.name
                     user.profile.profile_image.delete(save=False)
+                    image_derivatives.delete(name)
             except Exception:
                 pass  # 이미지 삭제 실패해도 계속 진행
             
@@ -188,7 +189,7 @@ def send_verification_email(request):
     EmailVerification.objects.filter(email=email, is_verified=False).delete()
 
     code = EmailVerification.generate_code()
-    verification = EmailVerification.objects.create(email=email, code=code)
+    EmailVerification.objects.create(email=email, code=code)
 
     message_body = f'''
 안녕하세요! 테크창입니다.
@@ -203,30 +204,16 @@ def send_verification_email(request):
 감사합니다.
 '''
 
-    try:
-        send_mail(
-            subject='[테크창] 이메일 인증 코드',
-            message=message_body,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            fail_silently=False,
-        )
-    except Exception as exc:
-        logger.exception("Failed to send verification email to %s", email)
-        verification.delete()
-        if settings.DEBUG:
-            return JsonResponse({'success': True, 'message': f'개발 모드: 인증코드는 {code}입니다.', 'code': code})
-        # 에러 타입과 메시지를 더 자세히 반환 (프로덕션에서 디버깅용)
-        logger.error(f"Email send error - Type: {type(exc).__name__}, Message: {exc}")
-        return JsonResponse({
-            'success': False,
-            'message': '이메일 발송 중 문제가 발생했습니다. 관리자에게 문의해주세요.',
-        }, status=500)
+    mail_queue.enqueue('[테크창] 이메일 인증 코드', message_body, [email], sensitive=True)
 
     cache.set(cooldown_key, True, timeout=EmailVerification.RESEND_COOLDOWN_SECONDS)
     if ip_address:
         cache.set(f"email_verification:cooldown_ip:{ip_address}", True, timeout=EmailVerification.RESEND_COOLDOWN_SECONDS)
 
+    # 개발 모드: 메일 워커 없이도 인증할 수 있도록 코드를 응답에 포함
+    if settings.DEBUG:
+        return JsonResponse({'success': True, 'message': f'개발 모드: 인증코드는 {code}입니다.', 'code': code})
+
     return JsonResponse({'success': True, 'message': f'인증 코드가 {email}로 발송되었습니다.'})
 
 def verify_email_code(request):
@@ -307,7 +294,7 @@ def send_profile_verification_email(request):
     EmailVerification.objects.filter(email=email, is_verified=False).delete()
 
     code = EmailVerification.generate_code()
-    verification = EmailVerification.objects.create(email=email, code=code)
+    EmailVerification.objects.create(email=email, code=code)
 
     # 이메일 변경인지 현재 이메일 인증인지 확인
     is_change = email != request.user.email
@@ -327,32 +314,16 @@ def send_profile_verification_email(request):
 - 테크창
 '''
 
-    try:
-        send_mail(
-            subject=f'[테크창] {action_text} 인증 코드',
-            message=message_body,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            fail_silently=False,
-        )
-    except Exception as exc:
-        logger.exception("Failed to send profile verification email to %s", email)
-        verification.delete()
-        if settings.DEBUG:
-            return JsonResponse({'success': True, 'message': f'개발 모드: 인증코드는 {code}입니다.', 'code': code})
-        error_type = type(exc).__name__
-        error_msg = str(exc)
-        logger.error(f"Email send error - Type: {error_type}, Message: {error_msg}")
-        return JsonResponse({
-            'success': False,
-            'message': f'이메일 발송 중 문제가 발생했습니다. 관리자에게 문의해주세요. (Error: {error_type})',
-            'debug_info': error_msg if settings.DEBUG else None
-        }, status=500)
+    mail_queue.enqueue(f'[테크창] {action_text} 인증 코드', message_body, [email], sensitive=True)
 
     cache.set(cooldown_key, True, timeout=EmailVerification.RESEND_COOLDOWN_SECONDS)
     if ip_address:
         cache.set(f"email_verification:cooldown_ip:{ip_address}", True, timeout=EmailVerification.RESEND_COOLDOWN_SECONDS)
 
+    # 개발 모드: 메일 워커 없이도 인증할 수 있도록 코드를 응답에 포함
+    if settings.DEBUG:
+        return JsonResponse({'success': True, 'message': f'개발 모드: 인증코드는 {code}입니다.', 'code': code})
+
     return JsonResponse({'success': True, 'message': f'인증 코드가 {email}로 발송되었습니다.'})
 
 
@@ -577,7 +548,7 @@ def kakao_callback(request):
     }
 
     try:
-        token_response = requests.post(token_url, data=token_data)
+        token_response = http_client.post('kakao', token_url, data=token_data)
         token_json = token_response.json()
 
         if 'error' in token_json:
@@ -595,7 +566,7 @@ def kakao_callback(request):
             'Content-Type': 'application/x-www-form-urlencoded;charset=utf-8'
         }
 
-        user_info_response = requests.get(user_info_url, headers=headers)
+        user_info_response = http_client.get('kakao', user_info_url, headers=headers)
         user_info = user_info_response.json()
 
         if 'id' not in user_info:
@@ -689,7 +660,7 @@ def kakao_logout(request):
             # 카카오 로그아웃 API 호출
             logout_url = "https://kapi.kakao.com/v1/user/logout"
             headers = {'Authorization': f'Bearer {access_token}'}
-            requests.post(logout_url, headers=headers)
+            http_client.post('kakao', logout_url, headers=headers)
         except Exception as e:
             logger.error(f"카카오 로그아웃 오류: {e}")
 
@@ -709,7 +680,7 @@ def kakao_logout(request):
 
 from functools import wraps
 from django.http import HttpResponseForbidden
-from django.db.models import Q, Count
+from django.db.models import Q
 
 
 def admin_required(view_func):
@@ -842,19 +813,7 @@ def admin_otp(request):
             f'유효시간: {ADMIN_OTP_CODE_TTL_SECONDS // 60}분 · 인증 후 {ADMIN_OTP_WINDOW_SECONDS // 60}분간 유지\n\n'
             '본인이 요청하지 않았다면 코드를 입력하지 말고 즉시 비밀번호를 변경하세요.'
         )
-        try:
-            send_mail(
-                subject='[테크창] 관리자 대시보드 인증 코드',
-                message=body,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[recipient],
-                fail_silently=False,
-            )
-        except Exception:
-            logger.exception('관리자 OTP 이메일 발송 실패')
-            request.session.pop('admin_otp_pending', None)
-            messages.error(request, '인증 코드 발송에 실패했습니다. 잠시 후 다시 시도해주세요.')
-            return 'error'
+        mail_queue.enqueue('[테크창] 관리자 대시보드 인증 코드', body, [recipient], sensitive=True)
         request.session['admin_otp_sent_at'] = time.time()
         logger.warning('관리자 OTP 발송: user=%s ip=%s', request.user.username, ip)
         return 'sent'
@@ -933,32 +892,13 @@ def admin_otp(request):
 @admin_otp_required
 def admin_dashboard(request):
     """관리자 대시보드"""
-    # 통계 정보
-    total_users = User.objects.count()
-    active_users = User.objects.filter(is_active=True).count()
-
-    # 회원 등급별 통계
-    from common.models import Profile
-    rank_stats = Profile.objects.values('rank').annotate(count=Count('rank'))
-
-    # 이메일 인증 통계
-    email_verified_users = Profile.objects.filter(is_email_verified=True).count()
+    # 회원·칼럼 통계 (서버 모니터·이메일 리포트와 같은 캐시 스냅샷)
+    from common.services.dashboard_stats import get_dashboard_stats
+    stats = get_dashboard_stats()
 
     # 최근 가입 사용자
     recent_users = User.objects.select_related('profile').order_by('-date_joined')[:10]
 
-    # 칼럼 자동 작성 내역 (테크창 연구팀 봇)
-    from community.models import Question
-    today = timezone.now().date()
-    week_ago = today - timedelta(days=7)
-    bot_cols = Question.objects.filter(
-        is_deleted=False, author__username='techchang연구팀'
-    ).select_related('category')
-    column_total = bot_cols.count()
-    column_week = bot_cols.filter(create_date__date__gte=week_ago).count()
-    column_today = bot_cols.filter(create_date__date=today).count()
-    recent_columns = bot_cols.order_by('-create_date')[:10]
-
     # 포트폴리오 게시 승인 대기 건수
     from community.models import Portfolio, PortfolioCollection
     portfolio_pending_count = (
@@ -966,18 +906,23 @@ def admin_dashboard(request):
         + Portfolio.objects.filter(approval_status='pending').count()
     )
 
+    # 게임 통계 (게임센터와 같은 캐시 스냅샷)
+    from community.services.game_stats import get_game_stats
+    game_stats = get_game_stats()
+
     context = {
-        'total_users': total_users,
-        'active_users': active_users,
-        'inactive_users': total_users - active_users,
-        'email_verified_users': email_verified_users,
-        'rank_stats': rank_stats,
+        'total_users': stats['total_users'],
+        'active_users': stats['active_users'],
+        'inactive_users': stats['inactive_users'],
+        'email_verified_users': stats['email_verified_users'],
+        'rank_stats': stats['rank_stats'],
         'recent_users': recent_users,
-        'column_total': column_total,
-        'column_week': column_week,
-        'column_today': column_today,
-        'recent_columns': recent_columns,
+        'column_total': stats['column_total'],
+        'column_week': stats['column_week'],
+        'column_today': stats['column_today'],
+        'recent_columns': stats['recent_columns'],
         'portfolio_pending_count': portfolio_pending_count,
+        'game_stats': game_stats,
     }
 
     return render(request, 'common/admin_dashboard.html', context)
@@ -1143,7 +1088,8 @@ def _dispatch_finding_fix(finding):
     model = 'claude-opus-4-8' if (finding.severity or '').strip() == '심각' else 'claude-sonnet-4-6'
 
     try:
-        resp = requests.post(
+        resp = http_client.post(
+            'github',
             f'https://api.github.com/repos/{repo}/dispatches',
             headers={
                 'Authorization': f'Bearer {token}',
@@ -1161,7 +1107,6 @@ def _dispatch_finding_fix(finding):
                     'model': model,
                 },
             },
-            timeout=10,
         )
     except requests.RequestException as e:
         return False, f'GitHub 요청 실패: {e}'
@@ -1685,9 +1630,9 @@ def password_reset(request):
 
         # 이메일 발송
         try:
-            send_mail(
-                subject='[테크창] 임시 비밀번호 안내',
-                message=f'''
+            mail_queue.enqueue(
+                '[테크창] 임시 비밀번호 안내',
+                f'''
 안녕하세요, {username}님!
 
 비밀번호 찾기 요청에 따라 임시 비밀번호를 발송합니다.
@@ -1699,9 +1644,8 @@ def password_reset(request):
 감사합니다.
 - 테크창 운영팀
                 ''',
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[email],
-                fail_silently=False,
+                [email],
+                sensitive=True,
             )
             messages.success(request, f'{email}로 임시 비밀번호가 발송되었습니다. 이메일을 확인해주세요.')
             return redirect('common:login')
@@ -1760,8 +1704,6 @@ def point_ranking(request):
 def server_monitor(request):
     """서버 모니터링 대시보드 (관리자 전용 + 이메일 OTP 2차 인증)"""
     from common.management.commands.send_log_report import Command as ReportCmd
-    from community.models import Question, DailyVisitor
-    from datetime import date
 
     hours = int(request.GET.get('hours', 24))
     cmd = ReportCmd()
@@ -1770,11 +1712,24 @@ def server_monitor(request):
     journal_stats  = cmd._collect_journal(hours)
     security_stats = cmd._collect_security_logs(hours)
     sys_stats      = cmd._collect_system_stats()
+    from common.services import system_metrics
+    sys_charts     = system_metrics.chart_series()
+    from common.services import metrics
+    from common.services import sql_profiler
+    metric_samples = metrics.collect()
+    app_metrics    = metrics.dashboard_summary(metric_samples)
+    app_metrics['email']['queue'] = mail_queue.stats()
+    sql_stats      = sql_profiler.summary(metric_samples)
 
     # AI 에러 분석관 — 대시보드는 60초마다 자동 새로고침되므로 Claude 호출을 캐시한다.
     # (성공/스킵 30분, 호출 실패 5분 캐시) → 새 에러는 최대 30분 내 반영되며 API 비용을 제한.
+    # 캐시 키에 에러 템플릿 지문 집합을 넣어 새 종류의 에러가 나타나면 즉시 다시 분석한다.
+    # (템플릿 문자열은 줄이 합쳐질 때마다 <*> 가 늘어 바뀌므로 일반화에 흔들리지 않는 지문을 씀)
     from django.core.cache import cache
-    ai_key = f'monitor_ai_analysis_{hours}'
+    import hashlib
+    from common.services.log_templates import template_fingerprint
+    fingerprints = sorted({template_fingerprint(t['template']) for t in journal_stats.get('error_templates', [])})
+    ai_key = f'monitor_ai_analysis_{hours}_' + hashlib.sha1('\n'.join(fingerprints).encode('utf-8')).hexdigest()[:12]
     ai_analysis = cache.get(ai_key)
     if ai_analysis is None:
         ai_analysis = cmd._analyze_errors(hours, journal_stats)
@@ -1789,33 +1744,18 @@ def server_monitor(request):
     pending_findings = LogFinding.objects.filter(status=LogFinding.STATUS_PENDING)
     recent_decided = LogFinding.objects.exclude(status=LogFinding.STATUS_PENDING)[:10]
 
-    # 최근 7일 방문자 추이
-    today = date.today()
-    visitor_trend = []
-    for i in range(6, -1, -1):
-        d = today - timedelta(days=i)
-        try:
-            vc = DailyVisitor.objects.filter(date=d).first()
-            visitor_trend.append({'date': d.strftime('%m/%d'), 'count': vc.visitor_count if vc else 0})
-        except Exception:
-            visitor_trend.append({'date': d.strftime('%m/%d'), 'count': 0})
-
-    # 최근 7일 질문 추이
-    question_trend = []
-    for i in range(6, -1, -1):
-        d = today - timedelta(days=i)
-        cnt = Question.objects.filter(is_deleted=False, create_date__date=d).count()
-        question_trend.append({'date': d.strftime('%m/%d'), 'count': cnt})
-
     context = {
         'hours': hours,
         'db': db_stats,
         'journal': journal_stats,
         'security': security_stats,
         'sys': sys_stats,
+        'sys_charts': sys_charts,
+        'app_metrics': app_metrics,
+        'sql_stats': sql_stats,
         'ai': ai_analysis,
-        'visitor_trend': visitor_trend,
-        'question_trend': question_trend,
+        'visitor_trend': db_stats.get('visitor_trend', []),
+        'question_trend': db_stats.get('question_trend', []),
         'pending_findings': pending_findings,
         'recent_decided': recent_decided,
     }
@@ -1852,6 +1792,67 @@ def server_live_logs(request):
     return JsonResponse(data)
 
 
+async def server_log_stream(request):
+    """
+    실시간 로그 SSE 스트림 (관리자 + OTP, 읽기 전용).
+    공유 팔로워가 읽은 새 줄만 push 하며, ?level=warn|error 로 서버에서 필터링한다.
+    async 뷰라 연결이 워커를 잡지 않는다 — 운영에서는 nginx 가 이 경로를 daphne(mysite-asgi.service)로 보낸다.
+    권한·OTP 확인은 연결 시 한 번 — 응답은 STREAM_SECONDS 뒤 끝나고 브라우저가
+    Last-Event-ID 와 함께 재연결하므로 그때 다시 확인된다.
+    """
+    from asgiref.sync import sync_to_async
+    from django.http import HttpResponse, StreamingHttpResponse
+    from common.services import log_stream
+
+    def allowed():
+        # admin_required 는 sync 뷰용 데코레이터라, 같은 확인을 세션 조회와 함께 스레드에서 수행
+        user = request.user
+        return user.is_authenticated and (user.is_staff or user.is_superuser) and _admin_otp_session_ok(request)
+
+    if not await sync_to_async(allowed)():
+        return HttpResponse('reauth_required', status=403, content_type='text/plain; charset=utf-8')
+
+    follower = await sync_to_async(log_stream.get_follower)()
+    if follower is None:
+        return HttpResponse('event: unavailable\ndata: {}\n\n', content_type='text/event-stream')
+
+    try:
+        initial = max(20, min(int(request.GET.get('lines', 120)), 300))
+    except (TypeError, ValueError):
+        initial = 120
+    cursor = request.META.get('HTTP_LAST_EVENT_ID') or request.GET.get('cursor') or None
+    events = log_stream.sse_events(follower, cursor=cursor, level=request.GET.get('level', 'info'), initial=initial)
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx proxy_buffering 우회
+    return response
+
+
+def metrics_export(request):
+    """
+    Prometheus 스크레이프 엔드포인트 (text/plain; version=0.0.4)
+
+    Authorization: Bearer <METRICS_TOKEN> 헤더를 가진 스크레이퍼이거나,
+    OTP 재인증을 마친 관리자 세션만 허용한다 (그 외 403, 리다이렉트 없음).
+    """
+    import hmac
+    from django.http import HttpResponse
+    from common.services import metrics
+
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    auth = request.META.get('HTTP_AUTHORIZATION', '')
+    token_ok = bool(token) and auth.startswith('Bearer ') and hmac.compare_digest(auth[7:].strip(), token)
+    user = request.user
+    admin_ok = (
+        user.is_authenticated and (user.is_staff or user.is_superuser)
+        and _admin_otp_session_ok(request)
+    )
+    if not (token_ok or admin_ok):
+        return HttpResponse('Forbidden', status=403, content_type='text/plain; charset=utf-8')
+
+    return HttpResponse(metrics.render_text() + mail_queue.render_text(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 @require_POST
 @admin_otp_required
 def send_monitor_email(request):
@@ -1859,7 +1860,6 @@ def send_monitor_email(request):
     import os
     from common.management.commands.send_log_report import Command as ReportCmd
     from datetime import datetime as dt
-    from django.core.mail import send_mail as _send_mail
 
     hours = int(request.POST.get('hours', 24))
     recipient = os.environ.get('DJANGO_ADMIN_EMAIL', '')
@@ -1872,15 +1872,13 @@ def send_monitor_email(request):
 
     try:
         report = ReportCmd()._build_report(hours)
-        _send_mail(
-            subject=f'[테크창] 서버 리포트 {dt.now():%Y-%m-%d %H:%M} ({hours}h)',
-            message=report['text'],
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[recipient],
-            html_message=report['html'],
-            fail_silently=False,
+        mail_queue.enqueue(
+            f'[테크창] 서버 리포트 {dt.now():%Y-%m-%d %H:%M} ({hours}h)',
+            report['text'],
+            [recipient],
+            html_body=report['html'],
         )
-        messages.success(request, f'리포트를 {recipient}로 발송했습니다.')
+        messages.success(request, f'리포트를 {recipient}로 발송 대기열에 넣었습니다.')
     except Exception as e:
         messages.error(request, f'발송 실패: {e}')
 
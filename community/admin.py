@@ -3,6 +3,7 @@ from django.contrib import admin
 
 from .models import Question, QuestionImage, Answer, Comment, Category, WordChainGame, WordChainEntry
 from .models import WordChainChatMessage, TicTacToeGame, NumberBaseballGame, NumberBaseballAttempt, GuestBook, Game2048
+from .models import GameArchive
 
 class QuestionImageInline(admin.TabularInline):
     model = QuestionImage
@@ -92,6 +93,14 @@ class Game2048Admin(admin.ModelAdmin):
     search_fields = ('player__username',)
     readonly_fields = ('create_date', 'end_date')
 
+
+class GameArchiveAdmin(admin.ModelAdmin):
+    list_display = ('game_type', 'game_id', 'row_count', 'archived_at')
+    list_filter = ('game_type', 'archived_at')
+    search_fields = ('game_id',)
+    exclude = ('payload',)
+    readonly_fields = ('game_type', 'game_id', 'row_count', 'archived_at')
+
 # Register your models here.
 admin.site.register(Question, QuestionAdmin)
 admin.site.register(Answer, AnswerAdmin)
@@ -104,4 +113,5 @@ admin.site.register(TicTacToeGame, TicTacToeGameAdmin)
 admin.site.register(NumberBaseballGame, NumberBaseballGameAdmin)
 admin.site.register(NumberBaseballAttempt, NumberBaseballAttemptAdmin)
 admin.site.register(GuestBook, GuestBookAdmin)
-admin.site.register(Game2048, Game2048Admin)
\ No newline at end of file
+admin.site.register(Game2048, Game2048Admin)
+admin.site.register(GameArchive, GameArchiveAdmin)
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+종료된 게임 기록 보관 명령어
+
+사용법:
+  python manage.py archive_finished_games              # GAME_ARCHIVE_AFTER_DAYS 기준 보관
+  python manage.py archive_finished_games --days 90    # 종료 후 90일 지난 게임만 보관
+  python manage.py archive_finished_games --dry-run    # 대상 게임 수만 확인
+
+cron 예시:
+  30 4 * * *   ... archive_finished_games
+"""
+from django.core.management.base import BaseCommand
+
+from community.services.game_archive import DEFAULT_CHUNK_SIZE, archive_finished_games
+
+
+class Command(BaseCommand):
+    help = '종료 후 오래된 게임의 단어·채팅·시도 기록을 압축 보관소(GameArchive)로 옮깁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help='종료 후 경과 일수 기준 (기본: GAME_ARCHIVE_AFTER_DAYS)'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help=f'트랜잭션 한 번에 처리할 게임 수 (기본: {DEFAULT_CHUNK_SIZE})'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='변경하지 않고 대상 게임 수만 출력'
+        )
+
+    def handle(self, *args, **options):
+        report = archive_finished_games(
+            days=options['days'],
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+        )
+
+        for label, item in report.items():
+            self.stdout.write(f"  {label:<12} 게임 {item['games']}  기록 {item['rows']}")
+
+        total = sum(item['games'] for item in report.values())
+        if options['dry_run']:
+            self.stdout.write(self.style.NOTICE(f'보관 대상 {total}개 (dry-run, 변경 없음)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'게임 {total}개 기록 보관 완료'))
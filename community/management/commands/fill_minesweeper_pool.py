@@ -0,0 +1,81 @@
+"""
+추측 없이 풀리는 지뢰찾기 보드 풀 채우기 명령어
+
+사용법:
+  python manage.py fill_minesweeper_pool                       # 난이도별 MINESWEEPER_POOL_SIZE 개까지 채우기
+  python manage.py fill_minesweeper_pool --difficulty hard     # 특정 난이도만
+  python manage.py fill_minesweeper_pool --size 200 --workers 4
+
+cron 예시:
+  */5 * * * *   ... fill_minesweeper_pool
+"""
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from community.models import MinesweeperBoard
+from community.services.minesweeper_boards import DIFFICULTY_SETTINGS, generate_boards
+
+# 작업 프로세스 하나가 한 번에 만드는 보드 수
+BATCH_SIZE = 10
+
+
+class Command(BaseCommand):
+    help = '시작 칸부터 추측 없이 풀리는 지뢰찾기 보드를 미리 생성해 난이도별 풀을 채웁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--difficulty', choices=list(DIFFICULTY_SETTINGS), default=None,
+            help='채울 난이도 (기본: 전체)'
+        )
+        parser.add_argument(
+            '--size', type=int, default=None,
+            help='난이도별 목표 보드 수 (기본: MINESWEEPER_POOL_SIZE)'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='생성 프로세스 수 (기본: CPU 수)'
+        )
+
+    def handle(self, *args, **options):
+        size = options['size'] or getattr(settings, 'MINESWEEPER_POOL_SIZE', 50)
+        difficulties = [options['difficulty']] if options['difficulty'] else list(DIFFICULTY_SETTINGS)
+        workers = max(1, options['workers'])
+
+        jobs = []
+        for difficulty in difficulties:
+            missing = size - MinesweeperBoard.objects.filter(difficulty=difficulty).count()
+            for start in range(0, max(missing, 0), BATCH_SIZE):
+                jobs.append((difficulty, min(BATCH_SIZE, missing - start), random.getrandbits(64)))
+
+        if not jobs:
+            self.stdout.write(self.style.SUCCESS('보드 풀이 이미 가득 찼습니다.'))
+            return
+
+        created = dict.fromkeys(difficulties, 0)
+
+        def store(difficulty, boards):
+            MinesweeperBoard.objects.bulk_create([
+                MinesweeperBoard(difficulty=difficulty, mines=board['mines'], start=board['start'])
+                for board in boards
+            ])
+            created[difficulty] += len(boards)
+
+        if workers == 1:
+            for difficulty, count, seed in jobs:
+                store(difficulty, generate_boards(difficulty, count, seed))
+        else:
+            # 포크된 작업 프로세스가 부모의 DB 연결을 물려받지 않도록 먼저 닫는다
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [(job[0], executor.submit(generate_boards, *job)) for job in jobs]
+                for difficulty, future in futures:
+                    store(difficulty, future.result())
+
+        for difficulty, count in created.items():
+            self.stdout.write(f'  {difficulty:<8} +{count}')
+        self.stdout.write(self.style.SUCCESS(f'보드 {sum(created.values())}개 생성 완료'))
@@ -0,0 +1,53 @@
+"""
+방치된 진행 중 게임 일괄 정리 명령어
+
+사용법:
+  python manage.py reap_stale_games                  # STALE_GAME_TIMEOUT 기준 정리
+  python manage.py reap_stale_games --timeout 3600   # 마지막 활동 1시간 경과 게임 정리
+  python manage.py reap_stale_games --dry-run        # 대상 수만 확인
+
+cron 예시:
+  */10 * * * *   ... reap_stale_games
+"""
+from django.core.management.base import BaseCommand
+
+from community.services.game_reaper import DEFAULT_CHUNK_SIZE, MIN_IDLE_SECONDS, reap_stale_games
+
+
+class Command(BaseCommand):
+    help = '마지막 활동 후 오래 방치된 진행 중 게임을 종료 상태로 정리합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--timeout', type=int, default=None,
+            help='마지막 활동 후 경과 시간(초) 기준 (기본: STALE_GAME_TIMEOUT)'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help=f'UPDATE 한 번에 처리할 행 수 (기본: {DEFAULT_CHUNK_SIZE})'
+        )
+        parser.add_argument(
+            '--min-idle', type=int, default=MIN_IDLE_SECONDS,
+            help=f'비활동 제한 게임의 최소 유휴 시간(초) (기본: {MIN_IDLE_SECONDS})'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='변경하지 않고 대상 수만 출력'
+        )
+
+    def handle(self, *args, **options):
+        report = reap_stale_games(
+            timeout=options['timeout'],
+            chunk_size=options['chunk_size'],
+            min_idle=options['min_idle'],
+            dry_run=options['dry_run'],
+        )
+
+        for label, count in report.items():
+            self.stdout.write(f'  {label:<12} {count}')
+
+        total = sum(report.values())
+        if options['dry_run']:
+            self.stdout.write(self.style.NOTICE(f'정리 대상 {total}개 (dry-run, 변경 없음)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'방치 게임 {total}개 정리 완료'))
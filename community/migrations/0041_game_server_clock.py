@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0040_question_episode_number_columnseries_question_series'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='minesweepergame',
+            name='last_activity_time',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='마지막 활동 시간'),
+        ),
+        migrations.AddField(
+            model_name='minesweepergame',
+            name='paused_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='일시정지 시작 시간'),
+        ),
+        migrations.AddField(
+            model_name='minesweepergame',
+            name='paused_seconds',
+            field=models.IntegerField(default=0, verbose_name='누적 일시정지 시간 (초)'),
+        ),
+        migrations.AddField(
+            model_name='minesweepergame',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='첫 입력 시간'),
+        ),
+        migrations.AddField(
+            model_name='numberbaseballgame',
+            name='paused_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='일시정지 시작 시간'),
+        ),
+        migrations.AddField(
+            model_name='numberbaseballgame',
+            name='paused_seconds',
+            field=models.IntegerField(default=0, verbose_name='누적 일시정지 시간 (초)'),
+        ),
+        migrations.AddField(
+            model_name='numberbaseballgame',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='첫 입력 시간'),
+        ),
+    ]
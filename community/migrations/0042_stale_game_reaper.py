@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0041_game_server_clock'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tictactoegame',
+            name='last_activity_time',
+            field=models.DateTimeField(auto_now=True, null=True, verbose_name='마지막 활동 시간'),
+        ),
+        migrations.AddField(
+            model_name='wordchaingame',
+            name='last_activity_time',
+            field=models.DateTimeField(auto_now=True, help_text='마지막 상태 변경 시간 (방치 게임 정리용)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='minesweepergame',
+            name='status',
+            field=models.CharField(choices=[('playing', '진행중'), ('won', '승리'), ('lost', '패배'), ('abandoned', '중단')], db_index=True, default='playing', max_length=10, verbose_name='상태'),
+        ),
+        migrations.AddIndex(
+            model_name='game2048',
+            index=models.Index(fields=['status', 'last_activity_time'], name='g2048_status_activity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='minesweepergame',
+            index=models.Index(fields=['status', 'last_activity_time'], name='ms_status_activity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='numberbaseballgame',
+            index=models.Index(fields=['status', 'last_activity_time'], name='bb_status_activity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tictactoegame',
+            index=models.Index(fields=['status', 'last_activity_time'], name='ttt_status_activity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wordchaingame',
+            index=models.Index(fields=['status', 'last_activity_time'], name='wc_status_activity_idx'),
+        ),
+    ]
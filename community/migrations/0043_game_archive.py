@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0042_stale_game_reaper'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='numberbaseballgame',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='기록 보관 시간'),
+        ),
+        migrations.AddField(
+            model_name='wordchaingame',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, help_text='단어·채팅 기록을 GameArchive 로 옮긴 시간', null=True),
+        ),
+        migrations.CreateModel(
+            name='GameArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_type', models.CharField(choices=[('wordchain', '끝말잇기'), ('baseball', '숫자야구')], max_length=20, verbose_name='게임 종류')),
+                ('game_id', models.PositiveIntegerField(verbose_name='게임 ID')),
+                ('row_count', models.PositiveIntegerField(default=0, verbose_name='보관 행 수')),
+                ('payload', models.BinaryField(verbose_name='압축 기록')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='보관일')),
+            ],
+            options={
+                'verbose_name': '게임 기록 보관',
+                'verbose_name_plural': '게임 기록 보관 목록',
+                'db_table': 'pybo_gamearchive',
+                'constraints': [models.UniqueConstraint(fields=('game_type', 'game_id'), name='game_archive_uniq')],
+            },
+        ),
+    ]
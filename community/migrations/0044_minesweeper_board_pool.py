@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0043_game_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MinesweeperBoard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('difficulty', models.CharField(choices=[('easy', '쉬움 (9x9, 10개)'), ('medium', '보통 (16x16, 40개)'), ('hard', '어려움 (16x30, 99개)')], max_length=10, verbose_name='난이도')),
+                ('mines', models.JSONField(verbose_name='지뢰 좌표')),
+                ('start', models.JSONField(verbose_name='시작 칸')),
+                ('create_date', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+            ],
+            options={
+                'verbose_name': '지뢰찾기 보드 풀',
+                'verbose_name_plural': '지뢰찾기 보드 풀',
+                'db_table': 'pybo_minesweeperboard',
+                'indexes': [models.Index(fields=['difficulty', 'id'], name='ms_board_pool_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:45
+
+import json
+import zlib
+
+from django.db import migrations, models
+
+
+def backfill_archived_counts(apps, schema_editor):
+    """이미 보관된 끝말잇기 게임은 GameArchive payload 에서 단어 수를 채운다."""
+    GameArchive = apps.get_model('community', 'GameArchive')
+    WordChainGame = apps.get_model('community', 'WordChainGame')
+
+    for archive in GameArchive.objects.filter(game_type='wordchain').iterator():
+        data = json.loads(zlib.decompress(bytes(archive.payload)).decode('utf-8'))
+        WordChainGame.objects.filter(id=archive.game_id).update(archived_entry_count=len(data.get('entries', [])))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0044_minesweeper_board_pool'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wordchaingame',
+            name='archived_entry_count',
+            field=models.IntegerField(default=0, help_text='GameArchive 로 옮긴 단어 수 (목록의 단어 수 표시용)'),
+        ),
+        migrations.RunPython(backfill_archived_counts, migrations.RunPython.noop),
+    ]
@@ -179,10 +179,16 @@ class WordChainGame(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='waiting')
     current_turn = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='current_turn_games', help_text="현재 차례인 사용자")
     participant_count = models.IntegerField(default=0)
+    last_activity_time = models.DateTimeField(auto_now=True, null=True, blank=True, help_text="마지막 상태 변경 시간 (방치 게임 정리용)")
+    archived_at = models.DateTimeField(null=True, blank=True, help_text="단어·채팅 기록을 GameArchive 로 옮긴 시간")
+    archived_entry_count = models.IntegerField(default=0, help_text="GameArchive 로 옮긴 단어 수 (목록의 단어 수 표시용)")
     
     class Meta:
         db_table = 'pybo_wordchaingame'
         ordering = ['-create_date']
+        indexes = [
+            models.Index(fields=['status', 'last_activity_time'], name='wc_status_activity_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.get_status_display()}"
@@ -293,6 +299,7 @@ class TicTacToeGame(models.Model):
     create_date = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     start_date = models.DateTimeField(null=True, blank=True, verbose_name='시작일')
     end_date = models.DateTimeField(null=True, blank=True, verbose_name='종료일')
+    last_activity_time = models.DateTimeField(auto_now=True, null=True, blank=True, verbose_name='마지막 활동 시간')
     
     def __str__(self):
         return f"{self.title} ({self.get_status_display()})"
@@ -308,6 +315,9 @@ class TicTacToeGame(models.Model):
         verbose_name = '틱택토 게임'
         verbose_name_plural = '틱택토 게임 목록'
         ordering = ['-create_date']
+        indexes = [
+            models.Index(fields=['status', 'last_activity_time'], name='ttt_status_activity_idx'),
+        ]
 
 
 # ========== 숫자야구 게임 ==========
@@ -335,9 +345,14 @@ class NumberBaseballGame(models.Model):
     consecutive_misses = models.IntegerField(default=0, verbose_name='연속 실패 횟수')  # 하드모드 페널티용
     inactivity_limit = models.IntegerField(default=0, verbose_name='비활동 제한 (초)')  # 0이면 무제한, 하드모드용
     last_activity_time = models.DateTimeField(null=True, blank=True, verbose_name='마지막 활동 시간')
+    # 서버 시계 (community.services.game_clock) - 클라이언트 보고 시간 대신 사용
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='첫 입력 시간')
+    paused_at = models.DateTimeField(null=True, blank=True, verbose_name='일시정지 시작 시간')
+    paused_seconds = models.IntegerField(default=0, verbose_name='누적 일시정지 시간 (초)')
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='playing', verbose_name='상태', db_index=True)
     create_date = models.DateTimeField(auto_now_add=True, verbose_name='생성일', db_index=True)
     end_date = models.DateTimeField(null=True, blank=True, verbose_name='종료일')
+    archived_at = models.DateTimeField(null=True, blank=True, verbose_name='기록 보관 시간')  # 시도 기록을 GameArchive 로 옮긴 시간
 
     def __str__(self):
         return f"{self.player.username}의 숫자야구 게임 ({self.attempts}회 시도)"
@@ -350,6 +365,7 @@ class NumberBaseballGame(models.Model):
         indexes = [
             models.Index(fields=['player', 'status'], name='bb_player_status_idx'),
             models.Index(fields=['player', '-create_date'], name='bb_player_date_idx'),
+            models.Index(fields=['status', 'last_activity_time'], name='bb_status_activity_idx'),
         ]
 
 
@@ -371,6 +387,36 @@ class NumberBaseballAttempt(models.Model):
         ordering = ['create_date']
 
 
+class GameArchive(models.Model):
+    """
+    종료 후 오래된 게임의 하위 기록 보관소
+
+    게임 행(리더보드·통계 집계용)은 그대로 두고, 단어·채팅·시도 기록만
+    게임당 한 행의 zlib 압축 JSON 으로 옮긴다 (community.services.game_archive).
+    """
+    GAME_TYPE_CHOICES = [
+        ('wordchain', '끝말잇기'),
+        ('baseball', '숫자야구'),
+    ]
+
+    game_type = models.CharField(max_length=20, choices=GAME_TYPE_CHOICES, verbose_name='게임 종류')
+    game_id = models.PositiveIntegerField(verbose_name='게임 ID')
+    row_count = models.PositiveIntegerField(default=0, verbose_name='보관 행 수')
+    payload = models.BinaryField(verbose_name='압축 기록')
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name='보관일')
+
+    def __str__(self):
+        return f"{self.get_game_type_display()} #{self.game_id} ({self.row_count}행)"
+
+    class Meta:
+        db_table = 'pybo_gamearchive'
+        verbose_name = '게임 기록 보관'
+        verbose_name_plural = '게임 기록 보관 목록'
+        constraints = [
+            models.UniqueConstraint(fields=['game_type', 'game_id'], name='game_archive_uniq'),
+        ]
+
+
 # ========== 방명록 ==========
 class GuestBook(models.Model):
     """포스트잇 스타일 방명록"""
@@ -461,6 +507,7 @@ class Game2048(models.Model):
             models.Index(fields=['player', 'status'], name='g2048_player_status_idx'),
             models.Index(fields=['player', '-best_score'], name='g2048_player_best_idx'),
             models.Index(fields=['player', '-create_date'], name='g2048_player_date_idx'),
+            models.Index(fields=['status', 'last_activity_time'], name='g2048_status_activity_idx'),
         ]
 
 
@@ -480,11 +527,14 @@ class MinesweeperGame(models.Model):
         ('medium', '보통 (16x16, 40개)'),
         ('hard', '어려움 (16x30, 99개)'),
     ]
+    # 리더보드가 time_elapsed 로 순위를 매기므로 일시정지 불가 (game_clock.can_pause)
+    ranked_by_time = True
 
     STATUS_CHOICES = [
         ('playing', '진행중'),
         ('won', '승리'),
         ('lost', '패배'),
+        ('abandoned', '중단'),  # 방치되어 자동 정리된 게임
     ]
 
     player = models.ForeignKey(User, on_delete=models.CASCADE, related_name='minesweeper_games', verbose_name='플레이어')
@@ -495,6 +545,11 @@ class MinesweeperGame(models.Model):
     board_state = models.JSONField(default=get_default_board_state, verbose_name='보드 상태')  # mines, revealed, flagged
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='playing', verbose_name='상태', db_index=True)
     time_elapsed = models.IntegerField(default=0, verbose_name='소요 시간 (초)')
+    # 서버 시계 (community.services.game_clock) - 클라이언트 보고 시간 대신 사용
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='첫 입력 시간')
+    last_activity_time = models.DateTimeField(null=True, blank=True, verbose_name='마지막 활동 시간')
+    paused_at = models.DateTimeField(null=True, blank=True, verbose_name='일시정지 시작 시간')
+    paused_seconds = models.IntegerField(default=0, verbose_name='누적 일시정지 시간 (초)')
     create_date = models.DateTimeField(auto_now_add=True, verbose_name='생성일', db_index=True)
     end_date = models.DateTimeField(null=True, blank=True, verbose_name='종료일')
 
@@ -522,6 +577,31 @@ class MinesweeperGame(models.Model):
         indexes = [
             models.Index(fields=['player', 'status'], name='ms_player_status_idx'),
             models.Index(fields=['player', 'difficulty', '-time_elapsed'], name='ms_player_diff_time_idx'),
+            models.Index(fields=['status', 'last_activity_time'], name='ms_status_activity_idx'),
+        ]
+
+
+class MinesweeperBoard(models.Model):
+    """
+    미리 검증된 지뢰찾기 보드 풀
+
+    fill_minesweeper_pool 명령어가 시작 칸부터 추측 없이 풀리는 배치만 채워 두고,
+    게임 생성 시 하나씩 꺼내 쓴다 (community.services.minesweeper_boards).
+    """
+    difficulty = models.CharField(max_length=10, choices=MinesweeperGame.DIFFICULTY_CHOICES, verbose_name='난이도')
+    mines = models.JSONField(verbose_name='지뢰 좌표')  # [[r, c], ...]
+    start = models.JSONField(verbose_name='시작 칸')  # [r, c]
+    create_date = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+
+    def __str__(self):
+        return f"{self.get_difficulty_display()} 보드 #{self.id}"
+
+    class Meta:
+        db_table = 'pybo_minesweeperboard'
+        verbose_name = '지뢰찾기 보드 풀'
+        verbose_name_plural = '지뢰찾기 보드 풀'
+        indexes = [
+            models.Index(fields=['difficulty', 'id'], name='ms_board_pool_idx'),
         ]
 
 
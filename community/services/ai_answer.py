@@ -0,0 +1,135 @@
+"""
+AI 답변 초안 스트리밍 (community:answer_ai_stream)
+
+질문 상세에서 'AI 답변 초안' 을 누르면 Claude 응답을 토큰 단위로 SSE(text/event-stream)로
+흘려보내고, 끝까지 받으면 Answer(is_ai=True) 로 저장합니다. async 뷰라 ASGI(daphne)에서는
+생성을 기다리는 동안 워커를 묶지 않습니다 (nginx.conf 의 /answer/ai/ 위치).
+
+- 질문당 생성은 한 번에 하나: 캐시 키 add 로 잠금 (DJANGO_CACHE_BACKEND=shm 이면 워커 간 공유)
+  → 같은 질문의 동시 요청은 409, 이미 저장된 AI 답변이 있으면 생성 없이 그 답변을 돌려줌
+- 사용자당 동시 생성 AI_ANSWER_USER_CONCURRENCY 개 (넘으면 429)
+- 첫 이벤트(start)는 Claude 호출 전에 보내 헤더·연결을 바로 열고, 고정 지침은 프롬프트 캐시 접두어로 둠
+- 클라이언트가 끊으면 생성을 멈추고 저장하지 않음 (잠금은 해제)
+
+SSE 이벤트 (data 는 JSON):
+    start {}  →  token {"text"}  …  →  done {"answer_id", "url"}  |  error {"message"}
+"""
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.shortcuts import resolve_url
+from django.utils import timezone
+
+from common.services import claude
+
+from ..models import Answer
+
+logger = logging.getLogger(__name__)
+
+BOT_USERNAME = 'techchangAI'
+
+SYSTEM_PROMPT = (
+    '당신은 인천대학교 창의인재개발학과 전공심화연구모임 "테크창" 커뮤니티의 답변 도우미입니다. '
+    '게시글(질문)에 대한 답변 초안을 작성합니다. 핵심 답을 첫 문단에 먼저 쓰고, '
+    '필요하면 근거·예시·다음 단계를 짧은 글머리 기호로 덧붙입니다. '
+    '확실하지 않은 내용은 추측이라고 밝히고, 지어낸 출처·URL·수치는 쓰지 않습니다. '
+    '존댓말로 700자 이내, 마크다운 헤더(#)는 쓰지 않습니다.'
+)
+PROMPT_CONTENT_LIMIT = 4000
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'
+
+
+def build_prompt(question):
+    content = question.content[:PROMPT_CONTENT_LIMIT]
+    return f'게시판: {question.category.name}\n제목: {question.subject}\n\n{content}'
+
+
+def _question_key(question_id):
+    return f'ai_answer:question:{question_id}'
+
+
+def _user_key(user_id):
+    return f'ai_answer:user:{user_id}'
+
+
+async def acquire(question_id, user_id):
+    """→ None(성공) | 'busy'(같은 질문 생성 중) | 'limit'(사용자 동시 생성 초과)"""
+    timeout = _setting('AI_ANSWER_LOCK_TIMEOUT', 180)
+    await cache.aadd(_user_key(user_id), 0, timeout)
+    try:
+        running = await cache.aincr(_user_key(user_id))
+    except ValueError:  # 만료와 겹침
+        await cache.aset(_user_key(user_id), 1, timeout)
+        running = 1
+    if running > _setting('AI_ANSWER_USER_CONCURRENCY', 1):
+        await cache.adecr(_user_key(user_id))
+        return 'limit'
+    if not await cache.aadd(_question_key(question_id), user_id, timeout):
+        await cache.adecr(_user_key(user_id))
+        return 'busy'
+    return None
+
+
+async def release(question_id, user_id):
+    await cache.adelete(_question_key(question_id))
+    try:
+        await cache.adecr(_user_key(user_id))
+    except ValueError:
+        pass
+
+
+def _bot_user():
+    user, created = User.objects.get_or_create(
+        username=BOT_USERNAME, defaults={'first_name': 'AI', 'last_name': '테크창', 'is_active': True},
+    )
+    if created:
+        user.set_unusable_password()
+        user.save(update_fields=['password'])
+    return user
+
+
+def answer_url(answer):
+    return '{}#answer_{}'.format(resolve_url('community:detail', question_id=answer.question_id), answer.id)
+
+
+async def stream(question, user_id):
+    """acquire() 가 성공한 뒤 호출 — SSE 문자열을 내보내고 끝나면 잠금을 푼다"""
+    try:
+        yield sse('start', {})
+        parts = []
+        try:
+            async for text in claude.ask_astream(
+                build_prompt(question),
+                system=claude.system_blocks(SYSTEM_PROMPT),
+                model=_setting('AI_ANSWER_MODEL', claude.ClaudeModel.HAIKU),
+                max_tokens=_setting('AI_ANSWER_MAX_TOKENS', 1024),
+            ):
+                parts.append(text)
+                yield sse('token', {'text': text})
+        except Exception as exc:
+            logger.warning(f'AI answer for question {question.pk} failed: {exc}')
+            yield sse('error', {'message': 'AI 답변 생성에 실패했습니다. 잠시 후 다시 시도해주세요.'})
+            return
+
+        content = ''.join(parts).strip()
+        if not content:
+            yield sse('error', {'message': 'AI 답변이 비어 있습니다.'})
+            return
+        answer = await Answer.objects.acreate(
+            author=await sync_to_async(_bot_user)(), question=question, content=content,
+            create_date=timezone.now(), is_ai=True,
+        )
+        yield sse('done', {'answer_id': answer.pk, 'url': answer_url(answer)})
+    finally:
+        await release(question.pk, user_id)
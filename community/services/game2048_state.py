@@ -0,0 +1,84 @@
+"""
+2048 진행 상태 체크포인트
+
+2048은 이동마다 세션만 갱신하고 종료 시에만 DB에 저장하므로, DB의
+last_activity_time 만 보면 한창 플레이 중인 게임도 방치된 것처럼 보입니다.
+이동할 때마다 최신 상태를 캐시에 남기고, CHECKPOINT_INTERVAL 마다 한 번씩
+DB에도 반영해 방치 게임 정리(reap_stale_games)가 DB 조건만으로 판단할 수 있게 합니다.
+"""
+from datetime import datetime
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from ..models import Game2048
+
+# 진행 중 상태를 DB에 반영하는 최소 간격 (초)
+CHECKPOINT_INTERVAL = 60
+# 캐시 스냅샷 보관 시간 (초)
+LIVE_STATE_TIMEOUT = 60 * 60 * 24
+
+
+def live_state_key(game_id):
+    return f'g2048_live_{game_id}'
+
+
+def _parse_ts(value):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _write_to_db(game_id, game_data):
+    """진행 중인 게임에만 세션 상태를 반영 (단일 UPDATE)"""
+    return Game2048.objects.filter(id=game_id, status='playing').update(
+        board_state=game_data['board_state'],
+        score=game_data['score'],
+        moves=game_data['moves'],
+        last_activity_time=_parse_ts(game_data.get('last_activity_time')) or timezone.now(),
+    )
+
+
+def checkpoint(game_id, game_data, force=False):
+    """
+    이동 직후 호출 - 캐시 스냅샷 갱신, 간격이 지났으면 DB에도 반영
+
+    Args:
+        game_id (int): 게임 ID
+        game_data (dict): 세션에 저장되는 게임 상태 (checkpoint_ts 가 기록됨)
+        force (bool): 간격과 무관하게 DB 반영
+    """
+    now = timezone.now()
+    last = _parse_ts(game_data.get('checkpoint_ts'))
+    if force or last is None or (now - last).total_seconds() >= CHECKPOINT_INTERVAL:
+        _write_to_db(game_id, game_data)
+        game_data['checkpoint_ts'] = now.isoformat()
+    cache.set(live_state_key(game_id), game_data, timeout=LIVE_STATE_TIMEOUT)
+
+
+def discard(game_id):
+    """게임 종료 시 캐시 스냅샷 제거"""
+    cache.delete(live_state_key(game_id))
+
+
+def flush(game_ids):
+    """
+    캐시에 남은 스냅샷을 DB에 반영 (정리 작업 직전 호출)
+
+    Returns:
+        int: 반영된 게임 수
+    """
+    keys = {live_state_key(game_id): game_id for game_id in game_ids}
+    snapshots = cache.get_many(list(keys))
+    flushed = 0
+    for key, game_data in snapshots.items():
+        flushed += _write_to_db(keys[key], game_data)
+    if snapshots:
+        cache.delete_many(list(snapshots))
+    return flushed
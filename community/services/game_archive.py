@@ -0,0 +1,191 @@
+"""
+종료 게임 기록 보관 (아카이빙)
+
+끝말잇기 단어·채팅, 숫자야구 시도 기록은 게임이 끝난 뒤에도 무한히 쌓입니다.
+종료 후 GAME_ARCHIVE_AFTER_DAYS 일이 지난 게임의 하위 행을 게임당 한 행의
+압축 JSON(GameArchive)으로 옮기고 원본 행을 지웁니다.
+
+- 게임 행 자체는 남겨 리더보드·게임 통계 집계(시도 횟수, 시간, 승패)는 그대로 유지
+- 청크마다 짧은 트랜잭션으로 처리해 SQLite 쓰기 잠금을 오래 잡지 않음
+- wordchain_entries / wordchain_chats / baseball_attempts 로 보관된 게임도 그대로 조회
+
+사용 예시:
+    python manage.py archive_finished_games
+    python manage.py archive_finished_games --days 90 --dry-run
+"""
+import json
+import logging
+import zlib
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import (
+    GameArchive, NumberBaseballAttempt, NumberBaseballGame,
+    WordChainChatMessage, WordChainEntry, WordChainGame,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 200
+
+# 라벨: (게임 모델, 종료 상태, {payload 키: (하위 모델, 보관 필드)})
+ARCHIVE_SOURCES = {
+    'wordchain': (WordChainGame, ['finished'], {
+        'entries': (WordChainEntry, ['author_id', 'word', 'is_valid', 'create_date']),
+        'chats': (WordChainChatMessage, ['author_id', 'message', 'create_date']),
+    }),
+    'baseball': (NumberBaseballGame, ['won', 'giveup', 'timeout'], {
+        'attempts': (NumberBaseballAttempt, ['guess_number', 'strikes', 'balls', 'create_date']),
+    }),
+}
+
+# 라벨: {게임 행에 남길 개수 필드: payload 키}
+ARCHIVED_COUNTS = {
+    'wordchain': {'archived_entry_count': 'entries'},
+}
+
+
+def _encode(data):
+    return zlib.compress(json.dumps(data, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+def _decode(payload):
+    return json.loads(zlib.decompress(bytes(payload)).decode('utf-8'))
+
+
+def _candidates(model, statuses, cutoff):
+    """보관 대상: 종료 후 cutoff 이전이고 아직 보관되지 않은 게임 (end_date 없는 예전 행은 생성일 기준)"""
+    return model.objects.filter(
+        Q(end_date__lt=cutoff) | Q(end_date__isnull=True, create_date__lt=cutoff),
+        status__in=statuses,
+        archived_at__isnull=True,
+    )
+
+
+def _archive_chunk(label, model, children, game_ids, now):
+    """게임 ID 묶음의 하위 행을 GameArchive 로 옮기고 원본을 삭제 (한 트랜잭션)"""
+    payloads = {game_id: {key: [] for key in children} for game_id in game_ids}
+    for key, (child_model, fields) in children.items():
+        rows = (
+            child_model.objects.filter(game_id__in=game_ids)
+            .order_by('game_id', 'create_date', 'id')
+            .values('game_id', *fields)
+        )
+        for row in rows:
+            payloads[row.pop('game_id')][key].append(row)
+
+    with transaction.atomic():
+        GameArchive.objects.bulk_create([
+            GameArchive(
+                game_type=label,
+                game_id=game_id,
+                row_count=sum(len(rows) for rows in data.values()),
+                payload=_encode(data),
+            )
+            for game_id, data in payloads.items()
+        ], ignore_conflicts=True)
+        for child_model, _fields in children.values():
+            child_model.objects.filter(game_id__in=game_ids).delete()
+        model.objects.filter(id__in=game_ids).update(archived_at=now)
+        for count_field, key in ARCHIVED_COUNTS.get(label, {}).items():
+            # 하위 행을 지운 뒤에도 목록에서 개수를 보여줄 수 있게 게임 행에 남김
+            model.objects.bulk_update(
+                [model(id=game_id, **{count_field: len(data[key])}) for game_id, data in payloads.items()],
+                [count_field],
+            )
+
+    return sum(sum(len(rows) for rows in data.values()) for data in payloads.values())
+
+
+def archive_finished_games(days=None, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False, now=None):
+    """
+    종료 후 오래된 게임의 하위 기록 보관
+
+    Args:
+        days (int): 종료 후 이 일수가 지난 게임을 보관 (기본: GAME_ARCHIVE_AFTER_DAYS)
+        chunk_size (int): 트랜잭션 한 번에 처리할 게임 수
+        dry_run (bool): 대상 게임 수만 세고 변경하지 않음
+
+    Returns:
+        dict: {라벨: {'games': 보관한 게임 수, 'rows': 옮긴 하위 행 수}}
+    """
+    now = now or timezone.now()
+    if days is None:
+        days = getattr(settings, 'GAME_ARCHIVE_AFTER_DAYS', 30)
+    cutoff = now - timedelta(days=days)
+
+    report = {}
+    for label, (model, statuses, children) in ARCHIVE_SOURCES.items():
+        base = _candidates(model, statuses, cutoff)
+        if dry_run:
+            report[label] = {'games': base.count(), 'rows': 0}
+            continue
+
+        games = rows = 0
+        while True:
+            game_ids = list(base.order_by('id').values_list('id', flat=True)[:chunk_size])
+            if not game_ids:
+                break
+            rows += _archive_chunk(label, model, children, game_ids, now)
+            games += len(game_ids)
+            if len(game_ids) < chunk_size:
+                break
+        report[label] = {'games': games, 'rows': rows}
+
+    if not dry_run and any(item['games'] for item in report.values()):
+        logger.info(f"Archived finished games: {report}")
+    return report
+
+
+def load_archive(label, game_id):
+    """보관된 기록 dict 반환 (없으면 None)"""
+    archive = GameArchive.objects.filter(game_type=label, game_id=game_id).only('payload').first()
+    return _decode(archive.payload) if archive else None
+
+
+def _archived_rows(label, game, key):
+    """보관 기록을 템플릿에서 모델처럼 쓸 수 있는 객체 목록으로 변환 (author 는 User 로 복원)"""
+    data = load_archive(label, game.id) or {}
+    rows = data.get(key, [])
+
+    author_ids = {row['author_id'] for row in rows if 'author_id' in row}
+    authors = User.objects.select_related('profile').in_bulk(author_ids) if author_ids else {}
+
+    result = []
+    for row in rows:
+        row['create_date'] = parse_datetime(row['create_date'])
+        if 'author_id' in row:
+            row['author'] = authors.get(row['author_id'])
+            if row['author'] is None:
+                # 탈퇴한 사용자의 기록은 원본과 같이(CASCADE) 표시하지 않음
+                continue
+        result.append(SimpleNamespace(**row))
+    return result
+
+
+def wordchain_entries(game):
+    """끝말잇기 단어 목록 (보관된 게임은 보관소에서 읽음)"""
+    if game.archived_at is None:
+        return list(game.entries.select_related('author', 'author__profile').order_by('create_date'))
+    return _archived_rows('wordchain', game, 'entries')
+
+
+def wordchain_chats(game):
+    """끝말잇기 채팅 목록 (보관된 게임은 보관소에서 읽음)"""
+    if game.archived_at is None:
+        return list(game.chat_messages.select_related('author', 'author__profile').order_by('create_date'))
+    return _archived_rows('wordchain', game, 'chats')
+
+
+def baseball_attempts(game):
+    """숫자야구 시도 기록 (보관된 게임은 보관소에서 읽음)"""
+    if game.archived_at is None:
+        return list(game.attempt_records.order_by('create_date'))
+    return _archived_rows('baseball', game, 'attempts')
@@ -0,0 +1,185 @@
+"""
+게임 서버 시계
+
+숫자야구·지뢰찾기의 경과 시간을 클라이언트가 보고한 값이 아니라
+서버에 기록된 타임스탬프로 계산합니다.
+
+    - started_at         : 첫 입력(추측/칸 공개) 시각. 첫 입력 전에는 경과 시간이 0
+                           (비활동 시간만 create_date 부터 계산)
+    - last_activity_time : 마지막 입력 시각 (비활동 제한 계산용)
+    - paused_at          : 일시정지 중이면 그 시작 시각
+    - paused_seconds     : 지금까지 누적된 일시정지 시간
+
+시간 제한·비활동 제한은 주기적 폴링 없이 다음 요청(입력, 시계 조회) 시점에
+지연 평가합니다. 방치된 게임은 일괄 정리 커맨드가 같은 규칙으로 종료합니다.
+
+사용 예시:
+    from community.services import game_clock
+
+    game_clock.touch(game)                       # 입력 처리 직전
+    reason = game_clock.expired_reason(game)     # 'time_limit' / 'inactivity' / None
+    if reason:
+        game_clock.finish(game, 'timeout')
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+# 시계 관련 필드 (save(update_fields=...) 에 함께 넘긴다)
+CLOCK_FIELDS = ['started_at', 'last_activity_time', 'paused_at', 'paused_seconds']
+
+
+def _now(now):
+    return now or timezone.now()
+
+
+def is_started(game):
+    """첫 입력이 있었는지 여부"""
+    return game.started_at is not None
+
+
+def is_paused(game):
+    """일시정지 중인지 여부"""
+    return game.paused_at is not None
+
+
+def can_pause(game):
+    """
+    일시정지 허용 여부
+
+    시간 제한·비활동 제한이 있는 모드(하드모드)와, 리더보드가 소요 시간으로 순위를 매기는 게임
+    (모델의 ranked_by_time)은 기록 경쟁이므로 허용하지 않는다. 일시정지 구간은 경과 시간에서
+    빠지므로, 허용하면 멈춰 두고 생각한 뒤 재개해 원하는 기록을 남길 수 있다.
+    """
+    if game.status != 'playing' or getattr(game, 'ranked_by_time', False):
+        return False
+    return not getattr(game, 'time_limit', 0) and not getattr(game, 'inactivity_limit', 0)
+
+
+def elapsed_seconds(game, now=None):
+    """
+    서버 기준 경과 시간(초)
+
+    종료된 게임은 end_date, 일시정지 중이면 paused_at 까지를 기준으로 하며
+    누적 일시정지 시간은 제외한다. 첫 입력 전이면 0.
+    """
+    if not is_started(game):
+        return 0
+    if game.end_date:
+        until = game.end_date
+    elif is_paused(game):
+        until = game.paused_at
+    else:
+        until = _now(now)
+    elapsed = (until - game.started_at).total_seconds() - (game.paused_seconds or 0)
+    return max(0, int(elapsed))
+
+
+def inactive_seconds(game, now=None):
+    """마지막 입력 이후 흐른 시간(초). 일시정지 구간은 포함하지 않는다."""
+    last = game.last_activity_time or game.started_at or game.create_date
+    if last is None:
+        return 0
+    until = game.paused_at if is_paused(game) else _now(now)
+    return max(0, int((until - last).total_seconds()))
+
+
+def expired_reason(game, now=None):
+    """
+    진행 중인 게임이 시간 제한을 넘겼는지 지연 평가
+
+    Returns:
+        str | None: 'time_limit', 'inactivity' 또는 None
+    """
+    if game.status != 'playing':
+        return None
+    time_limit = getattr(game, 'time_limit', 0)
+    if time_limit > 0 and elapsed_seconds(game, now) >= time_limit:
+        return 'time_limit'
+    inactivity_limit = getattr(game, 'inactivity_limit', 0)
+    if inactivity_limit > 0 and inactive_seconds(game, now) >= inactivity_limit:
+        return 'inactivity'
+    return None
+
+
+def resume(game, now=None):
+    """
+    일시정지 해제
+
+    일시정지 구간을 누적 시간에 더하고, 비활동 기준 시각도 같은 만큼 뒤로 민다.
+
+    Returns:
+        bool: 상태가 바뀌었는지 여부
+    """
+    if not is_paused(game):
+        return False
+    now = _now(now)
+    paused = max(0, int((now - game.paused_at).total_seconds()))
+    game.paused_seconds = (game.paused_seconds or 0) + paused
+    if game.last_activity_time:
+        game.last_activity_time += timedelta(seconds=paused)
+    game.paused_at = None
+    return True
+
+
+def pause(game, now=None):
+    """
+    일시정지 시작 (첫 입력 전이거나 이미 일시정지 중이면 무시)
+
+    Returns:
+        bool: 상태가 바뀌었는지 여부
+    """
+    if not is_started(game) or is_paused(game) or not can_pause(game):
+        return False
+    game.paused_at = _now(now)
+    return True
+
+
+def touch(game, now=None):
+    """
+    입력(이동) 시각 기록
+
+    첫 입력이면 시계를 시작하고, 일시정지 중이면 자동으로 재개한다.
+    """
+    now = _now(now)
+    resume(game, now)
+    if not is_started(game):
+        game.started_at = now
+    game.last_activity_time = now
+
+
+def finish(game, status, now=None):
+    """
+    게임 종료 처리 (status, end_date, time_elapsed 확정)
+
+    time_elapsed 는 서버 시계 값으로 기록하며, 시간 제한이 있으면 그 값을 넘지 않는다.
+    저장은 호출한 쪽에서 한다.
+    """
+    now = _now(now)
+    resume(game, now)
+    game.status = status
+    game.end_date = now
+    elapsed = elapsed_seconds(game, now)
+    time_limit = getattr(game, 'time_limit', 0)
+    if time_limit > 0:
+        elapsed = min(elapsed, time_limit)
+    game.time_elapsed = elapsed
+
+
+def clock_state(game, now=None):
+    """클라이언트 표시용 시계 상태 (JSON 직렬화 가능)"""
+    now = _now(now)
+    state = {
+        'status': game.status,
+        'started': is_started(game),
+        'paused': is_paused(game),
+        'elapsed': elapsed_seconds(game, now),
+        'can_pause': can_pause(game),
+    }
+    time_limit = getattr(game, 'time_limit', 0)
+    if time_limit > 0:
+        state['time_remaining'] = max(0, time_limit - state['elapsed'])
+    inactivity_limit = getattr(game, 'inactivity_limit', 0)
+    if inactivity_limit > 0:
+        state['inactivity_remaining'] = max(0, inactivity_limit - inactive_seconds(game, now))
+    return state
@@ -0,0 +1,179 @@
+"""
+방치 게임 일괄 정리
+
+플레이어가 탭을 닫으면 게임 행이 playing/waiting/active 상태로 영원히 남아
+게임센터의 '진행 중' 집계와 이어하기 조회를 오염시킵니다.
+게임 종류별로 (status, last_activity_time) 인덱스 조건으로 만료 게임을 찾고,
+청크 단위 set-based UPDATE 로 종료 상태로 바꿉니다.
+
+사용 예시:
+    python manage.py reap_stale_games
+    python manage.py reap_stale_games --timeout 3600 --dry-run
+
+주기 실행은 cron 을 권장하며, STALE_GAME_REAPER_INTERVAL 을 설정하면
+gunicorn 워커 중 하나(파일 잠금 보유)가 같은 작업을 주기적으로 실행합니다.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from common.services import file_lock
+
+from ..models import Game2048, MinesweeperGame, NumberBaseballGame, TicTacToeGame, WordChainGame
+from . import game2048_state
+from .game_stats import invalidate_game_stats
+
+logger = logging.getLogger(__name__)
+
+# (라벨, 모델, 진행 중 상태, 정리 후 상태)
+REAP_TARGETS = [
+    ('game2048', Game2048, ['playing'], 'timeout'),
+    ('baseball', NumberBaseballGame, ['playing'], 'timeout'),
+    ('minesweeper', MinesweeperGame, ['playing'], 'abandoned'),
+    ('wordchain', WordChainGame, ['waiting', 'active'], 'finished'),
+    ('tictactoe', TicTacToeGame, ['waiting', 'playing'], 'finished'),
+]
+
+DEFAULT_CHUNK_SIZE = 500
+# 하드모드 비활동 제한(수십 초)을 그대로 쓰면 2048 체크포인트 간격보다 짧아
+# 플레이 중인 게임을 닫을 수 있으므로, 비활동 기준에는 이 값을 하한으로 둔다.
+MIN_IDLE_SECONDS = 300
+
+
+def _expired_predicates(cutoff):
+    """
+    만료 조건 목록
+
+    OR 로 묶지 않고 두 조건을 따로 실행해 각각 (status, last_activity_time)
+    인덱스 범위 스캔을 타게 한다. last_activity_time 이 없는 예전 행은 생성일 기준.
+    """
+    return [
+        Q(last_activity_time__lt=cutoff),
+        Q(last_activity_time__isnull=True, create_date__lt=cutoff),
+    ]
+
+
+def _close_in_chunks(model, live_statuses, final_status, condition, now, chunk_size, dry_run):
+    """조건에 맞는 진행 중 게임을 chunk_size 씩 끊어 종료 처리 (짧은 트랜잭션 반복)"""
+    base = model.objects.filter(condition, status__in=live_statuses)
+    if dry_run:
+        return base.count()
+
+    total = 0
+    while True:
+        ids = list(base.order_by().values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            break
+        fetched = len(ids)
+        if model is Game2048:
+            # 세션·캐시에만 있던 최신 상태를 먼저 DB에 반영 (갱신된 게임은 조건에서 빠진다)
+            if game2048_state.flush(ids):
+                ids = list(base.filter(id__in=ids).values_list('id', flat=True))
+        if ids:
+            with transaction.atomic():
+                total += model.objects.filter(id__in=ids, status__in=live_statuses).update(
+                    status=final_status, end_date=now
+                )
+        if fetched < chunk_size:
+            break
+    return total
+
+
+def reap_stale_games(timeout=None, chunk_size=DEFAULT_CHUNK_SIZE, min_idle=MIN_IDLE_SECONDS, dry_run=False, now=None):
+    """
+    게임 종류별 방치 게임 정리
+
+    Args:
+        timeout (int): 마지막 활동 후 이 시간(초)이 지나면 정리 (기본: STALE_GAME_TIMEOUT)
+        chunk_size (int): UPDATE 한 번에 처리할 행 수
+        min_idle (int): 비활동 제한이 있는 게임에 적용할 최소 유휴 시간(초)
+        dry_run (bool): 대상 수만 세고 변경하지 않음
+
+    Returns:
+        dict: {라벨: 정리된 게임 수}
+    """
+    now = now or timezone.now()
+    if timeout is None:
+        timeout = getattr(settings, 'STALE_GAME_TIMEOUT', 6 * 60 * 60)
+    cutoff = now - timedelta(seconds=timeout)
+
+    # 비활동 제한 단계에서는 앞 단계(timeout) 대상을 빼서 dry_run 에서 두 번 세지 않게 함
+    not_timed_out = ~Q(last_activity_time__lt=cutoff) & ~Q(last_activity_time__isnull=True, create_date__lt=cutoff)
+
+    report = {}
+    for label, model, live_statuses, final_status in REAP_TARGETS:
+        reaped = 0
+        for condition in _expired_predicates(cutoff):
+            reaped += _close_in_chunks(model, live_statuses, final_status, condition, now, chunk_size, dry_run)
+
+        # 하드모드: 비활동 제한이 있는 게임은 그 제한(하한 min_idle)으로 더 일찍 정리
+        if any(f.name == 'inactivity_limit' for f in model._meta.fields):
+            limits = (
+                model.objects.filter(status__in=live_statuses, inactivity_limit__gt=0)
+                .order_by().values_list('inactivity_limit', flat=True).distinct()
+            )
+            for limit in limits:
+                idle = max(limit, min_idle)
+                if idle >= timeout:
+                    continue
+                limit_cutoff = now - timedelta(seconds=idle)
+                for condition in _expired_predicates(limit_cutoff):
+                    reaped += _close_in_chunks(
+                        model, live_statuses, final_status,
+                        condition & Q(inactivity_limit=limit) & not_timed_out, now, chunk_size, dry_run,
+                    )
+
+        report[label] = reaped
+
+    total = sum(report.values())
+    if total and not dry_run:
+        # set-based UPDATE 는 post_save 시그널을 보내지 않으므로 통계 캐시를 직접 무효화
+        invalidate_game_stats()
+        logger.info(f"Reaped {total} stale games: {report}")
+    return report
+
+
+_reaper_thread = None
+_reaper_lock = None
+
+
+def start_periodic_reaper(interval=None):
+    """
+    프로세스 내 주기 정리 작업 시작 (gunicorn post_fork 훅에서 호출)
+
+    STALE_GAME_REAPER_INTERVAL 이 0이면 아무것도 하지 않는다.
+
+    Returns:
+        bool: 이 프로세스에서 작업이 시작되었는지 여부
+    """
+    global _reaper_thread, _reaper_lock
+    if interval is None:
+        interval = getattr(settings, 'STALE_GAME_REAPER_INTERVAL', 0)
+    if interval <= 0 or _reaper_thread is not None:
+        return False
+
+    # 호스트당 한 프로세스만 주기 작업을 돌린다
+    _reaper_lock = file_lock.try_lock('game_reaper.lock')
+    if _reaper_lock is None:
+        return False
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                reap_stale_games()
+            except Exception:
+                logger.exception('Stale game reaper failed')
+            finally:
+                close_old_connections()
+
+    _reaper_thread = threading.Thread(target=run, name='stale-game-reaper', daemon=True)
+    _reaper_thread.start()
+    logger.info(f"Stale game reaper started (interval: {interval}s)")
+    return True
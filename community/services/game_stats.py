@@ -0,0 +1,79 @@
+"""
+게임센터 통계 집계
+
+게임별 전체/진행 중/오늘 판 수와 플레이어 수를 테이블당 한 번의 조건부 집계
+쿼리로 계산하고, 짧은 TTL 로 캐시합니다. 게임 생성·종료·삭제 시그널이 캐시를
+무효화하므로 게임센터와 관리자 대시보드가 같은 숫자를 봅니다.
+
+사용 예시:
+    from community.services.game_stats import get_game_stats
+
+    stats = get_game_stats()
+    stats['games']['baseball']['active']
+    stats['total_games_played']
+"""
+from datetime import datetime, time
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from ..models import Game2048, MinesweeperGame, NumberBaseballGame
+
+GAME_STATS_CACHE_KEY = 'game_stats_snapshot'
+GAME_STATS_TTL = 60  # 초
+
+# (라벨, 모델) - 게임센터 카드 순서와 동일
+STATS_SOURCES = [
+    ('baseball', NumberBaseballGame),
+    ('game2048', Game2048),
+    ('minesweeper', MinesweeperGame),
+]
+
+
+def _today_start():
+    return timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+
+
+def _aggregate(model, today_start):
+    """테이블 하나를 한 번에 집계 (COUNT + 조건부 COUNT)"""
+    today = Q(create_date__gte=today_start)
+    return model.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(status='playing')),
+        today=Count('id', filter=today),
+        players=Count('player', distinct=True),
+        players_today=Count('player', distinct=True, filter=today),
+    )
+
+
+def compute_game_stats():
+    """캐시를 거치지 않고 통계를 새로 계산"""
+    today_start = _today_start()
+    games = {label: _aggregate(model, today_start) for label, model in STATS_SOURCES}
+
+    # 게임 종류를 가로지르는 순 플레이어 수 (UNION 한 번)
+    player_sets = [model.objects.order_by().values('player') for _, model in STATS_SOURCES]
+    unique_players = player_sets[0].union(*player_sets[1:]).count()
+
+    return {
+        'games': games,
+        'total_games_played': sum(g['total'] for g in games.values()),
+        'active_games': sum(g['active'] for g in games.values()),
+        'games_today': sum(g['today'] for g in games.values()),
+        'unique_players': unique_players,
+        'computed_at': timezone.now(),
+    }
+
+
+def get_game_stats():
+    """캐시된 통계 (없으면 계산 후 GAME_STATS_TTL 동안 캐시)"""
+    stats = cache.get(GAME_STATS_CACHE_KEY)
+    if stats is None:
+        stats = compute_game_stats()
+        cache.set(GAME_STATS_CACHE_KEY, stats, GAME_STATS_TTL)
+    return stats
+
+
+def invalidate_game_stats():
+    cache.delete(GAME_STATS_CACHE_KEY)
@@ -0,0 +1,210 @@
+"""
+추측 없이 풀리는 지뢰찾기 보드 생성 및 보드 풀
+
+무작위 배치는 50/50 추측을 강요하는 보드가 많아 중도 포기(방치 게임)가 늘고
+리더보드 승률을 왜곡합니다. 시작 칸을 열었을 때 제약 전파(단일 칸 규칙 +
+부분집합 규칙 + 남은 지뢰 수 규칙)만으로 끝까지 풀리는 배치만 채택합니다.
+
+풀이 검사는 비싸므로 fill_minesweeper_pool 명령어가 여러 프로세스로 미리 생성해
+MinesweeperBoard 테이블(난이도별 풀)에 쌓아 두고, minesweeper_create 는
+pop_board 로 하나씩 꺼내 씁니다. 풀이 비면 제한된 횟수만큼 동기 생성합니다.
+
+사용 예시:
+    python manage.py fill_minesweeper_pool --size 100 --workers 4
+"""
+import logging
+import random
+
+from django.db import transaction
+
+from ..models import MinesweeperBoard
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTY_SETTINGS = {
+    'easy': {'rows': 9, 'cols': 9, 'mines': 10},
+    'medium': {'rows': 16, 'cols': 16, 'mines': 40},
+    'hard': {'rows': 16, 'cols': 30, 'mines': 99},
+}
+
+# 풀이 비었을 때 요청 안에서 시도할 최대 생성 횟수 (초과 시 시작 영역만 보장하는 보드)
+SYNC_MAX_TRIES = 30
+
+
+def _neighbors(rows, cols, r, c):
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            if dr == 0 and dc == 0:
+                continue
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols:
+                yield nr, nc
+
+
+def random_layout(rows, cols, mines, start, rng=random):
+    """시작 칸과 그 주변 8칸을 비운 무작위 지뢰 배치 (시작 칸은 항상 0 → 연쇄 공개)"""
+    safe_zone = {start, *_neighbors(rows, cols, *start)}
+    cells = [(r, c) for r in range(rows) for c in range(cols) if (r, c) not in safe_zone]
+    return rng.sample(cells, mines)
+
+
+def is_no_guess(rows, cols, mines, start):
+    """
+    시작 칸부터 추측 없이 모든 안전 칸을 열 수 있는지 검사
+
+    Args:
+        rows (int), cols (int): 보드 크기
+        mines (list): 지뢰 좌표 목록 [(r, c), ...]
+        start (tuple): 시작 칸 (r, c)
+
+    Returns:
+        bool: 제약 전파만으로 풀리면 True
+    """
+    mine_set = set(mines)
+    counts = {}
+    for r in range(rows):
+        for c in range(cols):
+            if (r, c) not in mine_set:
+                counts[(r, c)] = sum(1 for n in _neighbors(rows, cols, r, c) if n in mine_set)
+
+    opened = set()
+    flagged = set()
+    safe_total = rows * cols - len(mine_set)
+
+    def open_cell(cell):
+        stack = [cell]
+        while stack:
+            cur = stack.pop()
+            if cur in opened:
+                continue
+            opened.add(cur)
+            if counts[cur] == 0:
+                stack.extend(n for n in _neighbors(rows, cols, *cur) if n not in opened)
+
+    open_cell(start)
+
+    while len(opened) < safe_total:
+        # 경계의 숫자 칸마다 (미확정 이웃 집합, 남은 지뢰 수) 제약을 만든다
+        constraints = []
+        for cell in opened:
+            if counts[cell] == 0:
+                continue
+            unknown = frozenset(
+                n for n in _neighbors(rows, cols, *cell) if n not in opened and n not in flagged
+            )
+            if unknown:
+                remaining = counts[cell] - sum(1 for n in _neighbors(rows, cols, *cell) if n in flagged)
+                constraints.append((unknown, remaining))
+
+        safe, found = set(), set()
+        for unknown, remaining in constraints:
+            if remaining == 0:
+                safe |= unknown
+            elif remaining == len(unknown):
+                found |= unknown
+
+        if not safe and not found:
+            # 부분집합 규칙: A ⊂ B 이면 B - A 에 (B 지뢰 - A 지뢰) 개
+            unique = list({unknown: remaining for unknown, remaining in constraints}.items())
+            for unknown_a, remaining_a in unique:
+                for unknown_b, remaining_b in unique:
+                    if unknown_a is unknown_b or not unknown_a < unknown_b:
+                        continue
+                    rest = unknown_b - unknown_a
+                    diff = remaining_b - remaining_a
+                    if diff == 0:
+                        safe |= rest
+                    elif diff == len(rest):
+                        found |= rest
+
+        if not safe and not found:
+            # 남은 지뢰 수 규칙
+            unknown_all = [
+                (r, c) for r in range(rows) for c in range(cols)
+                if (r, c) not in opened and (r, c) not in flagged
+            ]
+            left = len(mine_set) - len(flagged)
+            if left == 0:
+                safe = set(unknown_all)
+            elif left == len(unknown_all):
+                found = set(unknown_all)
+
+        if not safe and not found:
+            return False
+
+        flagged |= found
+        for cell in safe:
+            open_cell(cell)
+
+    return True
+
+
+def generate_board(difficulty, max_tries=None, rng=random):
+    """
+    추측 없이 풀리는 보드 생성
+
+    Args:
+        difficulty (str): easy | medium | hard
+        max_tries (int): 최대 시도 횟수 (None 이면 성공할 때까지)
+
+    Returns:
+        dict | None: {'mines': [[r, c], ...], 'start': [r, c]} (시도 초과 시 None)
+    """
+    conf = DIFFICULTY_SETTINGS[difficulty]
+    rows, cols = conf['rows'], conf['cols']
+    tries = 0
+    while max_tries is None or tries < max_tries:
+        tries += 1
+        start = (rng.randrange(rows), rng.randrange(cols))
+        mines = random_layout(rows, cols, conf['mines'], start, rng)
+        if is_no_guess(rows, cols, mines, start):
+            return {'mines': [list(m) for m in mines], 'start': list(start)}
+    return None
+
+
+def generate_boards(difficulty, count, seed=None):
+    """배치 명령어의 작업 프로세스용: 보드 count 개 생성 (DB 접근 없음)"""
+    rng = random.Random(seed)
+    return [generate_board(difficulty, rng=rng) for _ in range(count)]
+
+
+def pop_board(difficulty):
+    """
+    풀에서 보드 하나 꺼내기 (가장 오래된 것부터, 동시 요청 시 삭제에 성공한 쪽이 사용)
+
+    Returns:
+        dict | None: {'mines': ..., 'start': ...} (풀이 비었으면 None)
+    """
+    for _ in range(3):
+        board = (
+            MinesweeperBoard.objects.filter(difficulty=difficulty)
+            .order_by('id').values('id', 'mines', 'start').first()
+        )
+        if board is None:
+            return None
+        with transaction.atomic():
+            if MinesweeperBoard.objects.filter(id=board['id']).delete()[0]:
+                return {'mines': board['mines'], 'start': board['start']}
+    return None
+
+
+def new_board(difficulty):
+    """
+    새 게임용 보드 (풀 → 동기 생성 → 시작 영역만 보장하는 무작위 보드 순)
+
+    Returns:
+        dict: {'mines': [[r, c], ...], 'start': [r, c], 'no_guess': bool}
+    """
+    board = pop_board(difficulty)
+    if board is None:
+        board = generate_board(difficulty, max_tries=SYNC_MAX_TRIES)
+        if board is not None:
+            logger.info(f"Minesweeper pool empty for {difficulty}, generated board synchronously")
+    if board is not None:
+        return {**board, 'no_guess': True}
+
+    logger.warning(f"Minesweeper pool empty for {difficulty}, falling back to unverified board")
+    conf = DIFFICULTY_SETTINGS[difficulty]
+    start = (random.randrange(conf['rows']), random.randrange(conf['cols']))
+    mines = random_layout(conf['rows'], conf['cols'], conf['mines'], start)
+    return {'mines': [list(m) for m in mines], 'start': list(start), 'no_guess': False}
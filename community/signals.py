@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Game2048, MinesweeperGame, NumberBaseballGame
+from .services.game_stats import invalidate_game_stats
+
+
+@receiver(post_save, sender=NumberBaseballGame)
+@receiver(post_save, sender=Game2048)
+@receiver(post_save, sender=MinesweeperGame)
+def invalidate_stats_on_game_save(sender, instance, created, **kwargs):
+    # 진행 중 이동(지뢰찾기 칸 공개 등)의 잦은 저장은 통계를 바꾸지 않으므로 무시
+    if created or instance.status != 'playing':
+        invalidate_game_stats()
+
+
+@receiver(post_delete, sender=NumberBaseballGame)
+@receiver(post_delete, sender=Game2048)
+@receiver(post_delete, sender=MinesweeperGame)
+def invalidate_stats_on_game_delete(sender, instance, **kwargs):
+    invalidate_game_stats()
@@ -1,8 +1,10 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 from django.contrib.auth.models import User
 
+from common.tests import FakeClaudeMixin
+
 from .models import Question, Category
 
 
@@ -31,3 +33,364 @@ class InquiryDetailAccessTests(TestCase):
         self.assertNotEqual(response.status_code, 500)
         self.assertEqual(response.status_code, 302)
         self.assertEqual(response.url, reverse('community:index'))
+
+
+class GameClockTests(TestCase):
+    """서버 시계: 클라이언트 보고 없이 타임스탬프로 시간 제한을 판정한다."""
+
+    def setUp(self):
+        from datetime import timedelta
+        from .models import NumberBaseballGame
+
+        self.user = User.objects.create_user('player', password='pw-12345')
+        self.user.profile.is_email_verified = True
+        self.user.profile.save()
+        self.client.force_login(self.user)
+        self.game = NumberBaseballGame.objects.create(
+            player=self.user,
+            difficulty='hard',
+            secret_number='1234',
+            max_attempts=7,
+            time_limit=300,
+            inactivity_limit=30,
+            last_activity_time=timezone.now(),
+        )
+        self.timedelta = timedelta
+
+    def test_time_limit_is_evaluated_lazily_on_next_guess(self):
+        past = timezone.now() - self.timedelta(seconds=400)
+        self.game.started_at = past
+        self.game.last_activity_time = timezone.now()
+        self.game.save()
+
+        response = self.client.post(
+            reverse('community:baseball_guess', args=[self.game.id]), {'guess': '5678'}
+        )
+
+        self.assertTrue(response.json()['game_over'])
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.status, 'timeout')
+        self.assertEqual(self.game.time_elapsed, 300)
+
+    def test_clock_endpoint_reports_server_elapsed_time(self):
+        response = self.client.post(
+            reverse('community:baseball_guess', args=[self.game.id]), {'guess': '5678'}
+        )
+        self.assertTrue(response.json()['success'])
+
+        response = self.client.get(reverse('community:baseball_clock', args=[self.game.id]))
+        clock = response.json()['clock']
+        self.assertTrue(clock['started'])
+        self.assertEqual(clock['time_remaining'], 300 - clock['elapsed'])
+        self.assertFalse(clock['can_pause'])
+
+    def test_time_ranked_game_refuses_pause(self):
+        from .models import MinesweeperGame
+
+        started = timezone.now() - self.timedelta(seconds=60)
+        game = MinesweeperGame.objects.create(player=self.user, started_at=started, last_activity_time=started)
+
+        # 지뢰찾기는 소요 시간으로 순위를 매기므로 일시정지로 기록을 줄일 수 없음
+        response = self.client.post(reverse('community:minesweeper_clock', args=[game.id]), {'action': 'pause'})
+        clock = response.json()['clock']
+        self.assertFalse(clock['paused'])
+        self.assertFalse(clock['can_pause'])
+        game.refresh_from_db()
+        self.assertIsNone(game.paused_at)
+
+
+class StaleGameReaperTests(TestCase):
+    """방치 게임 정리: 오래된 진행 중 게임만 set-based UPDATE 로 종료한다."""
+
+    def test_reaps_only_expired_games(self):
+        from datetime import timedelta
+        from .models import Game2048, MinesweeperGame
+        from .services.game_reaper import reap_stale_games
+
+        user = User.objects.create_user('idle', password='pw-12345')
+        old = timezone.now() - timedelta(hours=7)
+        stale = Game2048.objects.create(player=user, last_activity_time=old)
+        fresh = Game2048.objects.create(player=user, last_activity_time=timezone.now())
+        legacy = MinesweeperGame.objects.create(player=user)
+        MinesweeperGame.objects.filter(id=legacy.id).update(create_date=old)
+
+        report = reap_stale_games(timeout=6 * 60 * 60)
+
+        self.assertEqual(report['game2048'], 1)
+        self.assertEqual(report['minesweeper'], 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        legacy.refresh_from_db()
+        self.assertEqual(stale.status, 'timeout')
+        self.assertEqual(fresh.status, 'playing')
+        self.assertEqual(legacy.status, 'abandoned')
+
+    def test_dry_run_counts_hard_mode_games_once(self):
+        from datetime import timedelta
+        from .models import Game2048
+        from .services.game_reaper import reap_stale_games
+
+        user = User.objects.create_user('idle', password='pw-12345')
+        now = timezone.now()
+        Game2048.objects.create(player=user, inactivity_limit=60, last_activity_time=now - timedelta(hours=7))
+        Game2048.objects.create(player=user, inactivity_limit=60, last_activity_time=now - timedelta(minutes=10))
+
+        self.assertEqual(reap_stale_games(timeout=6 * 60 * 60, dry_run=True)['game2048'], 2)
+        self.assertEqual(reap_stale_games(timeout=6 * 60 * 60)['game2048'], 2)
+
+
+class GameStatsTests(TestCase):
+    """게임 통계: 테이블당 1회 집계 + 캐시, 게임 생성 시 무효화."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_stats_are_cached_and_invalidated_on_new_game(self):
+        from .models import Game2048, NumberBaseballGame
+        from .services.game_stats import get_game_stats
+
+        user = User.objects.create_user('gamer', password='pw-12345')
+        NumberBaseballGame.objects.create(player=user, secret_number='1234')
+
+        with self.assertNumQueries(4):  # 게임 테이블 3개 + 순 플레이어 UNION 1회
+            stats = get_game_stats()
+        with self.assertNumQueries(0):
+            get_game_stats()
+        self.assertEqual(stats['games']['baseball']['active'], 1)
+        self.assertEqual(stats['unique_players'], 1)
+
+        Game2048.objects.create(player=user)
+        stats = get_game_stats()
+        self.assertEqual(stats['total_games_played'], 2)
+        self.assertEqual(stats['games_today'], 2)
+
+
+class GameArchiveTests(TestCase):
+    """기록 보관: 오래된 종료 게임의 하위 행을 압축 보관하고 상세 화면은 보관소에서 읽는다."""
+
+    def test_archives_children_and_reads_through(self):
+        from datetime import timedelta
+        from .models import GameArchive, NumberBaseballAttempt, NumberBaseballGame, WordChainEntry, WordChainGame
+        from .services.game_archive import archive_finished_games, baseball_attempts, wordchain_entries
+
+        user = User.objects.create_user('archiver', password='pw-12345')
+        user.profile.is_email_verified = True
+        user.profile.save()
+        old = timezone.now() - timedelta(days=40)
+
+        baseball = NumberBaseballGame.objects.create(player=user, secret_number='1234', status='won', attempts=1, end_date=old)
+        NumberBaseballAttempt.objects.create(game=baseball, guess_number='1234', strikes=4, balls=0)
+        recent = NumberBaseballGame.objects.create(player=user, secret_number='5678', status='won', end_date=timezone.now())
+        NumberBaseballAttempt.objects.create(game=recent, guess_number='5678', strikes=4, balls=0)
+        wordchain = WordChainGame.objects.create(creator=user, status='finished', end_date=old)
+        WordChainEntry.objects.create(game=wordchain, author=user, word='사과')
+
+        report = archive_finished_games(days=30)
+
+        self.assertEqual(report['baseball'], {'games': 1, 'rows': 1})
+        self.assertEqual(report['wordchain'], {'games': 1, 'rows': 1})
+        self.assertEqual(GameArchive.objects.count(), 2)
+        self.assertFalse(NumberBaseballAttempt.objects.filter(game=baseball).exists())
+        self.assertTrue(NumberBaseballAttempt.objects.filter(game=recent).exists())
+        self.assertEqual(archive_finished_games(days=30)['baseball']['games'], 0)
+
+        baseball.refresh_from_db()
+        wordchain.refresh_from_db()
+        self.assertEqual(baseball.attempts, 1)  # 리더보드 집계용 게임 행은 유지
+        self.assertEqual([a.guess_number for a in baseball_attempts(baseball)], ['1234'])
+        self.assertEqual([(e.word, e.author) for e in wordchain_entries(wordchain)], [('사과', user)])
+
+        self.client.force_login(user)
+        response = self.client.get(reverse('community:baseball_play', args=[baseball.id]))
+        self.assertContains(response, '1234')
+
+        # 보관 후에도 목록의 단어 수 유지 (wordchain_views 는 URL 비활성화 상태라 직접 호출)
+        from unittest import mock
+        from django.test import RequestFactory
+        from .views.wordchain_views import wordchain_list
+        with mock.patch('community.views.wordchain_views.render') as render:
+            wordchain_list(RequestFactory().get('/wordchain/'))
+        self.assertEqual(render.call_args.args[2]['finished_games'][0].entry_count, 1)
+
+
+class MinesweeperBoardPoolTests(TestCase):
+    """지뢰찾기 보드 풀: 추측 없는 보드만 생성하고 게임 생성 시 풀에서 꺼낸다."""
+
+    def test_solver_rejects_forced_guess(self):
+        from .services.minesweeper_boards import is_no_guess
+
+        # 왼쪽 위 2x2 중 대각선 두 칸 중 하나에 지뢰 1개: 어느 쪽인지 알 수 없는 50/50
+        self.assertFalse(is_no_guess(2, 4, [(0, 0)], (0, 3)))
+        self.assertTrue(is_no_guess(3, 3, [(0, 0)], (2, 2)))
+
+    def test_create_pops_board_from_pool(self):
+        from .models import MinesweeperBoard, MinesweeperGame
+        from .services.minesweeper_boards import generate_board
+
+        board = generate_board('easy')
+        MinesweeperBoard.objects.create(difficulty='easy', **board)
+
+        user = User.objects.create_user('sweeper', password='pw-12345')
+        user.profile.is_email_verified = True
+        user.profile.save()
+        self.client.force_login(user)
+        self.client.get(reverse('community:minesweeper_create') + '?difficulty=easy')
+
+        game = MinesweeperGame.objects.get(player=user)
+        self.assertFalse(MinesweeperBoard.objects.exists())
+        self.assertEqual(game.board_state['mines'], board['mines'])
+        self.assertIn(board['start'], game.board_state['revealed'])
+
+
+class AiAnswerStreamTests(FakeClaudeMixin, TestCase):
+    """AI 답변 초안: SSE 로 토큰을 흘려보낸 뒤 저장하고, 같은 질문·같은 사용자의 동시 생성은 거절한다."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('kakao_1', password='pw-12345')
+        self.question = Question.objects.create(
+            author=self.user, subject='장고 비동기 뷰', content='async 뷰는 언제 쓰나요?',
+            create_date=timezone.now(), category=Category.objects.create(name='질문'),
+        )
+        self.url = reverse('community:answer_ai_stream', args=[self.question.pk])
+
+    async def test_streams_tokens_then_saves_answer(self):
+        import re
+        from .models import Answer
+
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.post(self.url)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = ''.join([chunk.decode() async for chunk in response.streaming_content])
+        events = re.findall(r'^event: (\w+)$', body, re.M)
+        self.assertEqual(events[0], 'start')
+        self.assertIn('token', events)
+        self.assertEqual(events[-1], 'done')
+
+        answer = await Answer.objects.aget(question=self.question, is_ai=True)
+        self.assertIn('장고 비동기 뷰', answer.content)
+
+        # 이미 저장된 AI 답변이 있으면 생성하지 않고 그 답변을 돌려줌
+        response = await self.async_client.post(self.url)
+        self.assertEqual(response.json()['answer_id'], answer.pk)
+
+    async def test_concurrent_generation_is_refused(self):
+        from .services import ai_answer
+
+        await self.async_client.aforce_login(self.user)
+        self.assertIsNone(await ai_answer.acquire(self.question.pk, self.user.pk + 1))
+        self.assertEqual((await self.async_client.post(self.url)).status_code, 409)
+        await ai_answer.release(self.question.pk, self.user.pk + 1)
+
+        self.assertIsNone(await ai_answer.acquire(self.question.pk + 1, self.user.pk))
+        self.assertEqual((await self.async_client.post(self.url)).status_code, 429)
+        await ai_answer.release(self.question.pk + 1, self.user.pk)
+
+    async def test_inquiry_is_private_and_finished_answer_is_rechecked(self):
+        from unittest import mock
+        from .models import Answer
+        from .services import ai_answer
+
+        stranger = await User.objects.acreate_user('kakao_2', password='pw-12345')
+        inquiry = await Question.objects.acreate(
+            author=self.user, subject='문의', content='비공개', create_date=timezone.now(),
+            category=await Category.objects.acreate(name='문의'),
+        )
+        await self.async_client.aforce_login(stranger)
+        response = await self.async_client.post(reverse('community:answer_ai_stream', args=[inquiry.pk]))
+        self.assertEqual(response.status_code, 403)
+
+        # 먼저 확인한 뒤 잠금을 잡기 전에 다른 요청이 생성을 끝낸 경우 — 두 번째 AI 답변을 만들지 않음
+        acquire = ai_answer.acquire
+
+        async def finish_elsewhere(question_id, user_id):
+            await Answer.objects.acreate(author=self.user, question=self.question, content='먼저 끝난 답변',
+                                         create_date=timezone.now(), is_ai=True)
+            return await acquire(question_id, user_id)
+
+        with mock.patch.object(ai_answer, 'acquire', finish_elsewhere):
+            response = await self.async_client.post(self.url)
+        finished = await Answer.objects.aget(question=self.question, is_ai=True)
+        self.assertEqual(response.json()['answer_id'], finished.pk)
+        self.assertIsNone(await ai_answer.acquire(self.question.pk, stranger.pk))  # 잠금은 풀려 있음
+        await ai_answer.release(self.question.pk, stranger.pk)
+
+
+class ProtectedDownloadTests(TestCase):
+    """첨부파일 다운로드: 권한 검사는 Django, 전송은 nginx(X-Accel-Redirect) 또는 Range 를 지원하는 개발용 전송."""
+
+    def setUp(self):
+        import tempfile
+        from django.core.files.base import ContentFile
+        from django.test import override_settings
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        media = override_settings(MEDIA_ROOT=tmp.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.author = User.objects.create_user('kakao_writer', password='pw-12345')
+        self.question = Question.objects.create(
+            author=self.author, subject='자료', content='첨부', create_date=timezone.now(),
+            category=Category.objects.create(name='문의'),
+        )
+        self.question.file.save('보고서.txt', ContentFile(b'0123456789'))
+        self.url = reverse('community:download_file', args=[self.question.pk])
+
+    def test_inquiry_file_requires_author(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        self.assertNotIn('X-Accel-Redirect', response)
+
+    def test_nginx_backend_hands_off_with_korean_filename(self):
+        from django.test import override_settings
+
+        self.client.force_login(self.author)
+        with override_settings(PROTECTED_MEDIA_BACKEND='nginx'):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected/question_files/%EB%B3%B4%EA%B3%A0%EC%84%9C.txt')
+        self.assertEqual(response['Content-Disposition'],
+                         "attachment; filename*=utf-8''%EB%B3%B4%EA%B3%A0%EC%84%9C.txt")
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+
+    def test_django_backend_serves_ranges(self):
+        from django.test import override_settings
+
+        self.client.force_login(self.author)
+        with override_settings(PROTECTED_MEDIA_BACKEND='django'):
+            response = self.client.get(self.url, HTTP_RANGE='bytes=2-5')
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(b''.join(response.streaming_content), b'2345')
+            self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+
+            response = self.client.get(self.url, HTTP_RANGE='bytes=-3')
+            self.assertEqual(b''.join(response.streaming_content), b'789')
+
+            self.assertEqual(self.client.get(self.url, HTTP_RANGE='bytes=20-').status_code, 416)
+
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+            self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+
+@override_settings(SQLITE_WRITE_QUEUE=True, SQLITE_WRITE_QUEUE_INTERVAL=3600)
+class PortfolioViewCountTests(TestCase):
+    """포트폴리오 조회수: 쓰기 큐가 반영하기 전이라도 화면에는 이번 조회가 더해진 값을 보여준다."""
+
+    def test_view_count_includes_queued_increment(self):
+        from common.services import write_queue
+        from .models import Portfolio
+
+        owner = User.objects.create_user('owner', password='pw-12345')
+        Portfolio.objects.create(user=owner, is_public=True, approval_status='approved', view_count=4)
+
+        response = self.client.get(reverse('community:portfolio_view', args=[owner.id]))
+        self.assertEqual(response.context['portfolio'].view_count, 5)
+        self.assertEqual(Portfolio.objects.get(user=owner).view_count, 4)  # DB 반영은 다음 주기
+        write_queue.flush()
+        self.assertEqual(Portfolio.objects.get(user=owner).view_count, 5)
@@ -34,6 +34,7 @@ urlpatterns = [
          answer_views.answer_modify, name='answer_modify'),
     path('answer/delete/<int:answer_id>/',
          answer_views.answer_delete, name='answer_delete'),
+    path('answer/ai/<int:question_id>/stream/', answer_views.answer_ai_stream, name='answer_ai_stream'),
 
     # vote
     path('question/vote/<int:question_id>/', question_views.question_vote, name='question_vote'),
@@ -72,7 +73,7 @@ urlpatterns = [
     path('baseball/leaderboard/', baseball_views.baseball_leaderboard, name='baseball_leaderboard'),
     path('baseball/<int:game_id>/', baseball_views.baseball_play, name='baseball_play'),
     path('baseball/<int:game_id>/guess/', baseball_views.baseball_guess, name='baseball_guess'),
-    path('baseball/<int:game_id>/update-time/', baseball_views.baseball_update_time, name='baseball_update_time'),
+    path('baseball/<int:game_id>/clock/', baseball_views.baseball_clock, name='baseball_clock'),
     path('baseball/<int:game_id>/giveup/', baseball_views.baseball_giveup, name='baseball_giveup'),
     
     # guestbook_views.py - 방명록
@@ -96,7 +97,7 @@ urlpatterns = [
     path('minesweeper/<int:game_id>/', minesweeper_views.minesweeper_play, name='minesweeper_play'),
     path('minesweeper/<int:game_id>/reveal/', minesweeper_views.minesweeper_reveal, name='minesweeper_reveal'),
     path('minesweeper/<int:game_id>/flag/', minesweeper_views.minesweeper_flag, name='minesweeper_flag'),
-    path('minesweeper/<int:game_id>/update-time/', minesweeper_views.minesweeper_update_time, name='minesweeper_update_time'),
+    path('minesweeper/<int:game_id>/clock/', minesweeper_views.minesweeper_clock, name='minesweeper_clock'),
     path('minesweeper/leaderboard/', minesweeper_views.minesweeper_leaderboard, name='minesweeper_leaderboard'),
 
     # portfolio_views.py - 포트폴리오
@@ -1,11 +1,14 @@
 
 from django.contrib import messages
-from django.shortcuts import render, get_object_or_404, redirect, resolve_url
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import render, get_object_or_404, aget_object_or_404, redirect, resolve_url
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
+from django.views.decorators.http import require_POST
 
 from ..forms import AnswerForm
 from ..models import Question, Answer
+from ..services import ai_answer
 from ..utils import award_points, deduct_points
 from common.models import PointHistory
 
@@ -90,4 +93,38 @@ def answer_vote(request, answer_id):
         answer.voter.add(request.user)
         messages.success(request, '답변을 추천했습니다')
     return redirect('{}#answer_{}'.format(
-                resolve_url('community:detail', question_id=answer.question.id), answer.id))
\ No newline at end of file
+                resolve_url('community:detail', question_id=answer.question.id), answer.id))
+
+
+@login_required(login_url='common:login')
+@require_POST
+async def answer_ai_stream(request, question_id):
+    """AI 답변 초안을 SSE 로 스트리밍하고 완료되면 Answer(is_ai=True) 로 저장 (services.ai_answer)"""
+    user = await request.auser()
+    question = await aget_object_or_404(Question.objects.select_related('category'), pk=question_id, is_deleted=False)
+
+    # 문의 게시판은 관리자/작성자만 열람 가능 (detail 과 같은 규칙)
+    if question.category and question.category.name == '문의':
+        if not (user.is_staff or user.pk == question.author_id):
+            return JsonResponse({'error': '문의글은 관리자만 확인할 수 있습니다.'}, status=403)
+
+    existing = await Answer.objects.filter(question=question, is_ai=True, is_deleted=False).afirst()
+    if existing is not None:
+        return JsonResponse({'answer_id': existing.pk, 'url': ai_answer.answer_url(existing)})
+
+    refused = await ai_answer.acquire(question.pk, user.pk)
+    if refused == 'busy':
+        return JsonResponse({'error': '이 게시글의 AI 답변을 이미 생성하고 있습니다.'}, status=409)
+    if refused == 'limit':
+        return JsonResponse({'error': '진행 중인 AI 답변 생성이 끝난 뒤 다시 시도해주세요.'}, status=429)
+
+    # 위 확인과 acquire 사이에 다른 요청이 생성을 끝냈을 수 있으므로 잠금을 잡은 뒤 다시 확인
+    existing = await Answer.objects.filter(question=question, is_ai=True, is_deleted=False).afirst()
+    if existing is not None:
+        await ai_answer.release(question.pk, user.pk)
+        return JsonResponse({'answer_id': existing.pk, 'url': ai_answer.answer_url(existing)})
+
+    response = StreamingHttpResponse(ai_answer.stream(question, user.pk), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx 가 조각을 모아 보내지 않도록
+    return response
@@ -2,7 +2,7 @@
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.shortcuts import render, get_object_or_404, redirect
 from django.db.models import Q, Count, F
-from django.http import Http404, FileResponse, HttpResponse
+from django.http import Http404, HttpResponse
 from django.core.cache import cache
 from django.conf import settings
 from django.contrib.auth.models import User
@@ -10,10 +10,9 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db import transaction
 import time
-import os
-import mimetypes
 
 
+from common.services import protected_media, write_queue
 from ..models import Question, Answer, Comment, Category, DailyVisitor
 
 DEFAULT_CATEGORIES = ['HRD', '데이터분석', '프로그래밍', '자유게시판', '앨범', '공지사항', '문의']
@@ -179,7 +178,7 @@ def detail(request, question_id):
     last_view = request.session.get(session_key, 0)
     now = int(time.time())
     if now - last_view > 300:
-        Question.objects.filter(pk=question_id).update(view_count=F('view_count') + 1)
+        write_queue.increment(Question, question_id, 'view_count')
         request.session[session_key] = now
 
     # 답변 정렬 방식
@@ -224,6 +223,7 @@ def detail(request, question_id):
         'answer_list': answer_list,  # 템플릿에서 for answer in answer_list
         'sort': sort,
         'series_nav': series_nav,
+        'has_ai_answer': any(answer.is_ai for answer in answer_list),  # AI 답변 초안 버튼 표시 여부
     }
     template = 'community/mobile/question_detail.html' if getattr(request, 'is_mobile', False) else 'community/question_detail.html'
     return render(request, template, context)
@@ -288,16 +288,14 @@ def download_file(request, question_id):
         raise Http404("파일이 존재하지 않습니다.")
 
     MAX_DOWNLOAD_SIZE = 100 * 1024 * 1024  # 100MB
-    if question.file.size > MAX_DOWNLOAD_SIZE:
-        messages.error(request, '파일이 너무 큽니다.')
-        return redirect('community:detail', question_id=question.id)
-
-    # FileField를 직접 사용하여 파일 제공 (경로 조작 방지)
     try:
-        response = FileResponse(question.file.open('rb'))
-        response['Content-Type'] = mimetypes.guess_type(question.file.name)[0] or 'application/octet-stream'
-        response['Content-Disposition'] = f'attachment; filename="{os.path.basename(question.file.name)}"'
-        return response
+        if question.file.size > MAX_DOWNLOAD_SIZE:
+            messages.error(request, '파일이 너무 큽니다.')
+            return redirect('community:detail', question_id=question.id)
+
+        # FileField를 직접 사용하여 파일 제공 (경로 조작 방지)
+        # 전송은 PROTECTED_MEDIA_BACKEND 에 맡김 (운영: nginx X-Accel-Redirect 로 워커를 바로 반환)
+        return protected_media.serve(request, question.file)
     except FileNotFoundError:
         raise Http404("파일이 존재하지 않습니다.")
 
@@ -345,10 +343,12 @@ def series_detail(request, slug):
 
 def games_index(request):
     """게임 대시보드 - 모든 게임 목록"""
-    from ..models import NumberBaseballGame, Game2048, GuestBook, MinesweeperGame
-    from django.db.models import F
+    from ..services.game_stats import get_game_stats
+
+    # 각 게임의 통계 정보 (테이블당 1회 집계, 짧은 TTL 캐시)
+    stats = get_game_stats()
+    games = stats['games']
 
-    # 각 게임의 통계 정보
     games_info = [
         {
             'name': '숫자야구',
@@ -357,8 +357,8 @@ def games_index(request):
             'url': 'community:baseball_start',
             'icon': '⚾',
             'color': 'warning',
-            'total_games': NumberBaseballGame.objects.count(),
-            'active_games': NumberBaseballGame.objects.filter(status='playing').count(),
+            'total_games': games['baseball']['total'],
+            'active_games': games['baseball']['active'],
             'features': ['싱글 플레이', '논리 퍼즐', '추리 게임'],
         },
         {
@@ -368,8 +368,8 @@ def games_index(request):
             'url': 'community:game2048_start',
             'icon': '🎮',
             'color': 'info',
-            'total_games': Game2048.objects.count(),
-            'active_games': Game2048.objects.filter(status='playing').count(),
+            'total_games': games['game2048']['total'],
+            'active_games': games['game2048']['active'],
             'features': ['퍼즐', '싱글 플레이', '키보드 조작'],
         },
         {
@@ -379,19 +379,17 @@ def games_index(request):
             'url': 'community:minesweeper_start',
             'icon': '💣',
             'color': 'danger',
-            'total_games': MinesweeperGame.objects.count(),
-            'active_games': MinesweeperGame.objects.filter(status='playing').count(),
+            'total_games': games['minesweeper']['total'],
+            'active_games': games['minesweeper']['active'],
             'features': ['논리 퍼즐', '싱글 플레이', '3가지 난이도'],
         },
     ]
 
     # 최근 활동 통계
     recent_stats = {
-        'total_games_played': (
-            NumberBaseballGame.objects.count() +
-            Game2048.objects.count() +
-            MinesweeperGame.objects.count()
-        ),
+        'total_games_played': stats['total_games_played'],
+        'games_today': stats['games_today'],
+        'unique_players': stats['unique_players'],
         'active_players': request.user.is_authenticated,
     }
 
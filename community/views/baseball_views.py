@@ -16,6 +16,7 @@ import random
 import logging
 
 from ..models import NumberBaseballGame, NumberBaseballAttempt
+from ..services import game_archive, game_clock
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,12 @@ def baseball_create(request):
         difficulty=difficulty  # 같은 난이도의 게임만
     ).first()
 
+    # 제한 시간이 지난 게임은 이어하지 않고 지금 종료 처리 (지연 평가)
+    if existing_game and game_clock.expired_reason(existing_game):
+        game_clock.finish(existing_game, 'timeout')
+        existing_game.save()
+        existing_game = None
+
     if existing_game:
         logger.info(f"User {request.user.username} resuming existing baseball game {existing_game.id} - difficulty: {difficulty}")
         return redirect('community:baseball_play', game_id=existing_game.id)
@@ -99,13 +106,14 @@ def baseball_play(request, game_id):
         player=request.user
     )
 
-    # prefetch로 시도 기록을 한 번에 가져오기 (N+1 쿼리 방지)
-    attempts = game.attempt_records.all().order_by('create_date')
+    # 시도 기록 한 번에 가져오기 (보관된 게임은 보관소에서 읽음)
+    attempts = game_archive.baseball_attempts(game)
 
     context = {
         'game': game,
         'attempts': attempts,
-        'remaining_attempts': game.max_attempts - game.attempts
+        'remaining_attempts': game.max_attempts - game.attempts,
+        'clock': game_clock.clock_state(game),
     }
     return render(request, 'community/baseball_play.html', context)
 
@@ -136,19 +144,19 @@ def baseball_guess(request, game_id):
     if game.status != 'playing':
         return JsonResponse({'success': False, 'message': '이미 종료된 게임입니다.'})
 
-    # 비활동 시간 체크 (하드모드)
-    if game.inactivity_limit > 0 and game.last_activity_time:
-        inactive_seconds = (timezone.now() - game.last_activity_time).total_seconds()
-        if inactive_seconds >= game.inactivity_limit:
-            game.status = 'timeout'
-            game.end_date = timezone.now()
-            game.save()
-            return JsonResponse({
-                'success': False,
-                'game_over': True,
-                'message': f'비활동 시간 초과! {game.inactivity_limit}초 동안 입력이 없어 게임이 종료되었습니다.',
-                'secret': game.secret_number
-            })
+    # 시간 제한·비활동 제한 지연 평가 (서버 시계 기준)
+    now = timezone.now()
+    reason = game_clock.expired_reason(game, now)
+    if reason:
+        game_clock.finish(game, 'timeout', now)
+        game.save()
+        logger.info(f"User {request.user.username} timed out baseball game {game_id} - difficulty: {game.difficulty}, reason: {reason}")
+        return JsonResponse({
+            'success': False,
+            'game_over': True,
+            'message': _timeout_message(game, reason),
+            'secret': game.secret_number
+        })
 
     guess = request.POST.get('guess', '').strip()
 
@@ -176,7 +184,7 @@ def baseball_guess(request, game_id):
     # 시도 기록
     with transaction.atomic():
         game.attempts += 1
-        game.last_activity_time = timezone.now()  # 활동 시간 업데이트
+        game_clock.touch(game, now)  # 첫 추측이면 시계 시작, 활동 시간 갱신
 
         NumberBaseballAttempt.objects.create(
             game=game,
@@ -204,8 +212,7 @@ def baseball_guess(request, game_id):
 
         # 정답 확인
         if strikes == 4:
-            game.status = 'won'
-            game.end_date = timezone.now()
+            game_clock.finish(game, 'won', now)
             game.save()
 
             time_bonus = ""
@@ -226,8 +233,7 @@ def baseball_guess(request, game_id):
 
         # 기회 소진
         if game.attempts >= game.max_attempts:
-            game.status = 'giveup'
-            game.end_date = timezone.now()
+            game_clock.finish(game, 'giveup', now)
             game.save()
 
             logger.info(f"User {request.user.username} lost baseball game {game_id} - difficulty: {game.difficulty}, attempts: {game.attempts}")
@@ -250,71 +256,76 @@ def baseball_guess(request, game_id):
         'balls': balls,
         'attempts': game.attempts,
         'remaining': game.max_attempts - game.attempts,
-        'penalty_message': penalty_message if 'penalty_message' in locals() else ""
+        'penalty_message': penalty_message if 'penalty_message' in locals() else "",
+        'clock': game_clock.clock_state(game, now),
     })
 
 
+def _timeout_message(game, reason):
+    """시간 초과 사유별 안내 메시지"""
+    if reason == 'inactivity':
+        return f'비활동 시간 초과! {game.inactivity_limit}초 동안 입력이 없어 게임이 종료되었습니다.'
+    return f'제한 시간 초과! 정답은 {game.secret_number}였습니다.'
+
+
 @login_required
-def baseball_update_time(request, game_id):
+def baseball_clock(request, game_id):
     """
-    게임 시간 업데이트
+    숫자야구 서버 시계 조회 및 일시정지/재개
+
+    경과 시간은 서버 타임스탬프로만 계산하므로 클라이언트가 주기적으로
+    시간을 보고할 필요가 없습니다. 클라이언트는 로컬 카운트다운이 끝났을 때나
+    화면 복귀 시에만 호출하며, 제한 시간 초과는 이 시점에 지연 평가됩니다.
+
+    GET: 시계 상태 조회
+    POST action=pause|resume: 일시정지 이벤트 기록 (제한 없는 일반 모드만)
 
     Args:
         game_id (int): 게임 ID
 
     Returns:
-        JsonResponse: 업데이트 결과 및 시간 초과 여부
+        JsonResponse: 시계 상태 및 시간 초과 여부
     """
-    if request.method != 'POST':
-        return JsonResponse({'success': False, 'message': 'POST 요청만 허용됩니다.'})
-
     game = get_object_or_404(NumberBaseballGame, id=game_id, player=request.user)
 
     if game.status != 'playing':
-        return JsonResponse({'success': False, 'message': '이미 종료된 게임입니다.'})
+        return JsonResponse({'success': False, 'message': '이미 종료된 게임입니다.', 'clock': game_clock.clock_state(game)})
 
-    time_elapsed = int(request.POST.get('time', 0))
-    game.time_elapsed = time_elapsed
-
-    # 전체 시간 제한 체크
-    if game.time_limit > 0 and time_elapsed >= game.time_limit:
-        game.status = 'timeout'
-        game.end_date = timezone.now()
+    now = timezone.now()
+    reason = game_clock.expired_reason(game, now)
+    if reason:
+        game_clock.finish(game, 'timeout', now)
         game.save()
 
-        logger.info(f"User {request.user.username} timed out baseball game {game_id} - difficulty: {game.difficulty}, time_elapsed: {time_elapsed}")
+        logger.info(f"User {request.user.username} timed out baseball game {game_id} - difficulty: {game.difficulty}, reason: {reason}")
 
         return JsonResponse({
             'success': True,
             'timeout': True,
-            'message': f'제한 시간 초과! 정답은 {game.secret_number}였습니다.',
-            'secret': game.secret_number
+            'inactivity_timeout': reason == 'inactivity',
+            'message': _timeout_message(game, reason),
+            'secret': game.secret_number,
+            'clock': game_clock.clock_state(game, now),
         })
 
-    # 비활동 시간 체크
-    if game.inactivity_limit > 0 and game.last_activity_time:
-        inactive_seconds = (timezone.now() - game.last_activity_time).total_seconds()
-        if inactive_seconds >= game.inactivity_limit:
-            game.status = 'timeout'
-            game.end_date = timezone.now()
-            game.save()
-
-            logger.info(f"User {request.user.username} inactivity timeout baseball game {game_id} - difficulty: {game.difficulty}, inactive_seconds: {inactive_seconds}")
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        if action == 'pause':
+            if not game_clock.can_pause(game):
+                return JsonResponse({'success': False, 'message': '이 난이도에서는 일시정지할 수 없습니다.'})
+            changed = game_clock.pause(game, now)
+        elif action == 'resume':
+            changed = game_clock.resume(game, now)
+        else:
+            return JsonResponse({'success': False, 'message': '잘못된 요청입니다.'})
 
-            return JsonResponse({
-                'success': True,
-                'timeout': True,
-                'inactivity_timeout': True,
-                'message': f'비활동 시간 초과! {game.inactivity_limit}초 동안 입력이 없어 게임이 종료되었습니다.',
-                'secret': game.secret_number
-            })
+        if changed:
+            game.save(update_fields=game_clock.CLOCK_FIELDS)
 
-    game.save()
     return JsonResponse({
         'success': True,
         'timeout': False,
-        'inactive_seconds': int((timezone.now() - game.last_activity_time).total_seconds()) if game.last_activity_time else 0,
-        'inactivity_limit': game.inactivity_limit
+        'clock': game_clock.clock_state(game, now),
     })
 
 
@@ -339,8 +350,7 @@ def baseball_giveup(request, game_id):
     if game.status != 'playing':
         return JsonResponse({'success': False, 'message': '이미 종료된 게임입니다.'})
 
-    game.status = 'giveup'
-    game.end_date = timezone.now()
+    game_clock.finish(game, 'giveup')
     game.save()
 
     logger.info(f"User {request.user.username} gave up on baseball game {game_id}")
@@ -19,6 +19,7 @@ import logging
 import json
 
 from ..models import Game2048
+from ..services import game2048_state
 
 logger = logging.getLogger(__name__)
 
@@ -184,6 +185,7 @@ def game2048_move(request, game_id):
             game.end_date = timezone.now()
             game.save()
             del request.session[session_key]
+            game2048_state.discard(game_id)
             logger.info(f"User {request.user.username} timed out 2048 game {game_id} - difficulty: {game.difficulty}, score: {game_data['score']}")
             return JsonResponse({
                 'success': False,
@@ -269,6 +271,7 @@ def game2048_move(request, game_id):
         game.save()
 
         del request.session[session_key]
+        game2048_state.discard(game_id)
         logger.info(f"User {request.user.username} won 2048 game {game_id} - difficulty: {game.difficulty}, score: {game_data['score']}, best_score: {game.best_score}")
 
     # 패배 확인 (더 이상 이동 불가능)
@@ -292,9 +295,11 @@ def game2048_move(request, game_id):
         game.save()
 
         del request.session[session_key]
+        game2048_state.discard(game_id)
         logger.info(f"User {request.user.username} lost 2048 game {game_id} - difficulty: {game.difficulty}, score: {game_data['score']}, best_score: {game.best_score}")
     else:
-        # 게임 진행 중: 세션만 업데이트 (DB 저장 안 함)
+        # 게임 진행 중: 세션 업데이트 + 캐시 스냅샷 (DB는 CHECKPOINT_INTERVAL 마다 한 번)
+        game2048_state.checkpoint(game_id, game_data)
         request.session[session_key] = game_data
         request.session.modified = True
 
@@ -379,6 +384,7 @@ def game2048_submit_final(request, game_id):
     game.save()
 
     del request.session[session_key]
+    game2048_state.discard(game_id)
 
     return JsonResponse({'success': True, 'message': '최종 점수가 저장되었습니다.'})
 
@@ -17,6 +17,7 @@ import random
 import logging
 
 from ..models import MinesweeperGame
+from ..services import game_clock, minesweeper_boards
 
 logger = logging.getLogger(__name__)
 
@@ -45,18 +46,15 @@ def minesweeper_create(request):
         HttpResponse: 게임 플레이 페이지로 리다이렉트
     """
     difficulty = request.GET.get('difficulty', 'easy')
+    if difficulty not in minesweeper_boards.DIFFICULTY_SETTINGS:
+        difficulty = 'easy'
+    settings = minesweeper_boards.DIFFICULTY_SETTINGS[difficulty]
 
-    # 난이도별 설정
-    difficulty_settings = {
-        'easy': {'rows': 9, 'cols': 9, 'mines': 10},
-        'medium': {'rows': 16, 'cols': 16, 'mines': 40},
-        'hard': {'rows': 16, 'cols': 30, 'mines': 99},
-    }
-
-    settings = difficulty_settings.get(difficulty, difficulty_settings['easy'])
+    # 미리 검증된 보드 풀에서 꺼내기 (비었으면 동기 생성)
+    board = minesweeper_boards.new_board(difficulty)
 
     # 새 게임 생성
-    game = MinesweeperGame.objects.create(
+    game = MinesweeperGame(
         player=request.user,
         difficulty=difficulty,
         rows=settings['rows'],
@@ -64,8 +62,10 @@ def minesweeper_create(request):
         mines_count=settings['mines']
     )
 
-    # 지뢰 배치
-    place_mines(game)
+    # 지뢰 배치 후 시작 칸 영역을 미리 공개 (추측 없는 풀이는 이 칸에서 시작)
+    place_mines(game, board['mines'])
+    game.board_state['start'] = board['start']
+    game.board_state['revealed'] = reveal_cell(game, *board['start'])
     game.save()
 
     logger.info(f"New minesweeper game created by {request.user.username} (ID: {game.id}, difficulty: {difficulty})")
@@ -91,6 +91,7 @@ def minesweeper_play(request, game_id):
 
     context = {
         'game': game,
+        'clock': game_clock.clock_state(game),
     }
     return render(request, 'community/minesweeper_play.html', context)
 
@@ -117,7 +118,8 @@ def minesweeper_leaderboard(request):
     if difficulty not in ['easy', 'medium', 'hard']:
         difficulty = 'easy'
 
-    qs = MinesweeperGame.objects.filter(difficulty=difficulty)
+    # 방치되어 자동 정리된 게임은 승률 지표에서 제외
+    qs = MinesweeperGame.objects.filter(difficulty=difficulty).exclude(status='abandoned')
     total_games = qs.count()
     wins_qs = qs.filter(status='won')
     losses_qs = qs.filter(status='lost')
@@ -238,10 +240,13 @@ def minesweeper_reveal(request, game_id):
     if [row, col] in game.board_state['flagged']:
         return JsonResponse({'success': False, 'message': '깃발이 꽂혀있습니다.'})
 
+    # 첫 공개면 서버 시계 시작, 일시정지 중이면 재개
+    now = timezone.now()
+    game_clock.touch(game, now)
+
     # 지뢰를 밟았는지 확인
     if [row, col] in game.board_state['mines']:
-        game.status = 'lost'
-        game.end_date = timezone.now()
+        game_clock.finish(game, 'lost', now)
         game.save()
 
         return JsonResponse({
@@ -249,7 +254,8 @@ def minesweeper_reveal(request, game_id):
             'hit_mine': True,
             'game_over': True,
             'message': '지뢰를 밟았습니다!',
-            'mines': game.board_state['mines']
+            'mines': game.board_state['mines'],
+            'time_elapsed': game.time_elapsed,
         })
 
     # 칸 공개 (연쇄 공개 포함)
@@ -261,8 +267,7 @@ def minesweeper_reveal(request, game_id):
     total_cells = game.rows * game.cols
     revealed_count = len(game.board_state['revealed'])
     if revealed_count == total_cells - game.mines_count:
-        game.status = 'won'
-        game.end_date = timezone.now()
+        game_clock.finish(game, 'won', now)
         game.save()
 
         return JsonResponse({
@@ -271,7 +276,8 @@ def minesweeper_reveal(request, game_id):
             'game_over': True,
             'won': True,
             'message': '축하합니다! 모든 지뢰를 찾았습니다!',
-            'mines': game.board_state['mines']
+            'mines': game.board_state['mines'],
+            'time_elapsed': game.time_elapsed,
         })
 
     return JsonResponse({
@@ -312,6 +318,8 @@ def minesweeper_flag(request, game_id):
     if [row, col] in game.board_state['revealed']:
         return JsonResponse({'success': False, 'message': '이미 공개된 칸입니다.'})
 
+    game_clock.touch(game)
+
     # 깃발 토글
     if [row, col] in game.board_state['flagged']:
         game.board_state['flagged'].remove([row, col])
@@ -330,48 +338,63 @@ def minesweeper_flag(request, game_id):
 
 
 @login_required
-def minesweeper_update_time(request, game_id):
+def minesweeper_clock(request, game_id):
     """
-    게임 시간 업데이트
+    지뢰찾기 서버 시계 조회 및 일시정지/재개
+
+    소요 시간은 첫 입력·종료 시각으로 서버에서 계산하므로
+    클라이언트가 주기적으로 시간을 보고하지 않습니다.
+    리더보드가 소요 시간으로 순위를 매기므로 pause 는 받아들이지 않습니다
+    (game_clock.can_pause). resume 은 이전에 일시정지된 게임을 재개할 때만 씁니다.
+
+    GET: 시계 상태 조회
+    POST action=pause|resume: 일시정지 이벤트 기록
 
     Args:
         game_id (int): 게임 ID
 
     Returns:
-        JsonResponse: 업데이트 결과
+        JsonResponse: 시계 상태
     """
-    if request.method != 'POST':
-        return JsonResponse({'success': False, 'message': 'POST 요청만 허용됩니다.'})
-
     game = get_object_or_404(MinesweeperGame, id=game_id, player=request.user)
 
-    if game.status == 'playing':
-        time_elapsed = int(request.POST.get('time', 0))
-        game.time_elapsed = time_elapsed
-        game.save()
+    if game.status != 'playing':
+        return JsonResponse({'success': False, 'message': '게임이 종료되었습니다.', 'clock': game_clock.clock_state(game)})
+
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        if action == 'pause':
+            changed = game_clock.pause(game)
+        elif action == 'resume':
+            changed = game_clock.resume(game)
+        else:
+            return JsonResponse({'success': False, 'message': '잘못된 요청입니다.'})
 
-        return JsonResponse({'success': True})
+        if changed:
+            game.save(update_fields=game_clock.CLOCK_FIELDS)
 
-    return JsonResponse({'success': False, 'message': '게임이 종료되었습니다.'})
+    return JsonResponse({'success': True, 'clock': game_clock.clock_state(game)})
 
 
 # ========== 게임 로직 헬퍼 함수 ==========
 
-def place_mines(game):
+def place_mines(game, mines=None):
     """
-    지뢰를 랜덤하게 배치
+    지뢰를 배치
 
     Args:
         game (MinesweeperGame): 게임 인스턴스
+        mines (list): 지뢰 좌표 목록 (없으면 랜덤 배치)
     """
-    mines = []
-    while len(mines) < game.mines_count:
-        row = random.randint(0, game.rows - 1)
-        col = random.randint(0, game.cols - 1)
-        if [row, col] not in mines:
-            mines.append([row, col])
-
-    game.board_state['mines'] = mines
+    if mines is None:
+        mines = []
+        while len(mines) < game.mines_count:
+            row = random.randint(0, game.rows - 1)
+            col = random.randint(0, game.cols - 1)
+            if [row, col] not in mines:
+                mines.append([row, col])
+
+    game.board_state['mines'] = [list(mine) for mine in mines]
     game.board_state['revealed'] = []
     game.board_state['flagged'] = []
 
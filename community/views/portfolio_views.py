@@ -4,9 +4,10 @@ from django.contrib.auth.models import User
 from django.http import JsonResponse, HttpResponseForbidden
 from django.utils import timezone
 from django.db import models
-from django.db.models import F, Max
+from django.db.models import Max
 import json
 
+from common.services import write_queue
 from ..models import Portfolio, Project, Experience, PortfolioCollection, CollectionProject, CollectionExperience
 
 
@@ -89,8 +90,8 @@ def portfolio_view(request, user_id):
 
     # 조회수 증가 (본인 제외)
     if request.user != user:
-        Portfolio.objects.filter(pk=portfolio.pk).update(view_count=F('view_count') + 1)
-        portfolio.refresh_from_db()
+        write_queue.increment(Portfolio, portfolio.pk, 'view_count')
+        portfolio.view_count += 1  # 큐가 켜져 있으면 DB 반영 전이므로 다시 읽지 않고 화면에만 더함
 
     # 프로젝트 목록 (순서대로)
     projects = portfolio.projects.all()
@@ -675,8 +676,8 @@ def portfolio_collection_detail(request, slug):
 
     # 조회수 증가 (본인 제외)
     if request.user != collection.user:
-        PortfolioCollection.objects.filter(pk=collection.pk).update(view_count=F('view_count') + 1)
-        collection.refresh_from_db()
+        write_queue.increment(PortfolioCollection, collection.pk, 'view_count')
+        collection.view_count += 1  # 큐가 켜져 있으면 DB 반영 전이므로 다시 읽지 않고 화면에만 더함
 
     projects = collection.projects.all().order_by('order')
     experiences = collection.experiences.all().order_by('order')
@@ -12,13 +12,15 @@ from datetime import timedelta
 from django.utils.dateparse import parse_datetime
 from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.models import Count
+from django.db.models import Count, F
 from django.conf import settings
 import requests
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
 from ..models import WordChainGame, WordChainEntry, WordChainChatMessage
+from ..services import game_archive
+from common.services import http_client
 from django.views.decorators.http import require_POST, require_GET
 from django.utils import timezone
 from django.contrib.auth import get_user_model
@@ -85,7 +87,7 @@ def check_word_exists(word):
         }
 
         logger.info(f"[단어검증] API 호출: {api_url}, params: q={word}, method=exact")
-        response = requests.get(api_url, params=params, timeout=5)
+        response = http_client.get('krdict', api_url, params=params)
         logger.info(f"[단어검증] API 응답: status={response.status_code}")
 
         # 응답 확인
@@ -127,6 +129,9 @@ def check_word_exists(word):
             # XML 파싱 오류
             return True, "사전 API 응답 파싱 오류 (기본 검증 통과)"
 
+    except http_client.CircuitOpen:
+        # 사전 API 가 연속으로 실패해 잠시 호출을 멈춘 상태 (워커를 타임아웃만큼 묶지 않음)
+        return True, "사전 API 일시 중단 (기본 검증 통과)"
     except requests.exceptions.Timeout:
         # 타임아웃 시 기본 검증으로 통과 (게임 진행 방해하지 않기)
         return True, "사전 API 응답 지연 (기본 검증 통과)"
@@ -139,15 +144,15 @@ def wordchain_list(request):
     """끝말잇기 게임 목록"""
     # 대기중, 활성, 종료된 게임을 분리
     waiting_games = WordChainGame.objects.filter(status='waiting').annotate(
-        entry_count=Count('entries')
+        entry_count=Count('entries') + F('archived_entry_count')
     ).order_by('-create_date')
 
     active_games = WordChainGame.objects.filter(status='active').annotate(
-        entry_count=Count('entries')
+        entry_count=Count('entries') + F('archived_entry_count')
     ).order_by('-create_date')
 
     finished_games = WordChainGame.objects.filter(status='finished').annotate(
-        entry_count=Count('entries')
+        entry_count=Count('entries') + F('archived_entry_count')
     ).order_by('-end_date')[:10]  # 최근 종료된 게임 10개만
 
     # 페이징 (대기중 + 활성 게임)
@@ -310,7 +315,11 @@ def wordchain_start(request, game_id):
 def wordchain_detail(request, game_id):
     """끝말잇기 게임 상세"""
     game = get_object_or_404(WordChainGame, id=game_id)
-    entries = game.entries.select_related('author').order_by('create_date')
+    if game.archived_at:
+        # 보관된 게임은 보관소에서 단어 기록을 읽음
+        entries = game_archive.wordchain_entries(game)
+    else:
+        entries = game.entries.select_related('author').order_by('create_date')
 
     # 타임아웃 체크 - 게임이 활성 상태인 경우
     if game.status == 'active' and game.start_date:
@@ -336,7 +345,7 @@ def wordchain_detail(request, game_id):
     context = {
         'game': game,
         'entries': entries,
-        'total_entries': entries.count(),
+        'total_entries': len(entries),
         'participants': participants_list,
         'participant_count': participants_list.count(),
         'timeout_seconds': settings.WORDCHAIN_TIMEOUT,  # 템플릿에 타임아웃 시간 전달
@@ -562,6 +571,7 @@ def wordchain_get_chats(request, game_id):
     game = get_object_or_404(WordChainGame, id=game_id)
     since = request.GET.get('since')
     qs = game.chat_messages.select_related('author')
+    parsed = None
     if since:
         try:
             # parse a variety of datetime formats (including ISO and space-separated)
@@ -578,8 +588,14 @@ def wordchain_get_chats(request, game_id):
             # fall back: ignore since and return recent messages
             pass
 
+    if game.archived_at:
+        # 보관된 게임은 보관소에서 채팅 기록을 읽음
+        rows = [m for m in game_archive.wordchain_chats(game) if parsed is None or m.create_date > parsed][:200]
+    else:
+        rows = qs.order_by('create_date')[:200]
+
     messages = []
-    for m in qs.order_by('create_date')[:200]:
+    for m in rows:
         try:
             author_display = m.author.profile.display_name
         except Exception:
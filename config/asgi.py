@@ -19,6 +19,21 @@ django_asgi_app = get_asgi_application()
 
 # Import routing after Django is set up
 from community.routing import websocket_urlpatterns
+from common.services import claude
+from django.urls import Resolver404, get_resolver
+
+
+def warm_up_urlconf():
+    """URLconf 와 그 뷰 모듈들을 미리 import (첫 요청이 로딩을 기다리지 않게)"""
+    try:
+        get_resolver().resolve('/')  # 첫 resolve 때 모든 url_patterns 가 로드됨
+    except Resolver404:
+        pass
+
+
+# AI 답변 스트리밍의 첫 요청이 SDK import·URLconf 로딩을 기다리지 않도록 시작할 때 미리 준비
+claude.warm_up()
+warm_up_urlconf()
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
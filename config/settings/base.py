@@ -63,6 +63,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'common.middleware.MetricsMiddleware',  # 요청 지표 수집 (/common/admin/monitor/metrics/)
+    'common.middleware.SQLProfilerMiddleware',  # 표본 요청 SQL 프로파일링·N+1 탐지
     'csp.middleware.CSPMiddleware',  # Content Security Policy
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -145,9 +147,29 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            # 요청마다 새로 연결하지 않고 재사용, 요청 시작 시 끊긴 연결은 교체
+            'CONN_MAX_AGE': int(os.environ.get('SQLITE_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 20)),  # 쓰기 잠금 대기(초)
+                # 트랜잭션 시작 때 쓰기 잠금을 잡아, 읽다가 쓰기로 올릴 때 바로 'database is locked' 나는 것을 방지
+                'transaction_mode': 'IMMEDIATE',
+            },
         }
     }
 
+# SQLite 연결마다 적용할 PRAGMA (common.services.sqlite_profile, connection_created 시그널)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',       # 읽기와 쓰기가 서로 막지 않음
+    'synchronous': 'NORMAL',     # WAL 에서는 체크포인트 때만 fsync (전원 장애 시 최근 커밋만 유실, DB 손상 없음)
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_MB', 128)) * 1024 * 1024,
+    'cache_size': -int(os.environ.get('SQLITE_CACHE_MB', 32)) * 1024,  # 음수 = KiB 단위
+    'temp_store': 'MEMORY',
+}
+# 조회수 같은 작은 증가 쓰기를 워커에서 모아 주기적으로 한 트랜잭션에 반영 (common.services.write_queue)
+SQLITE_WRITE_QUEUE = os.environ.get('SQLITE_WRITE_QUEUE', 'False').lower() == 'true'
+SQLITE_WRITE_QUEUE_INTERVAL = float(os.environ.get('SQLITE_WRITE_QUEUE_INTERVAL', 1.0))  # 반영 간격(초)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -203,6 +225,18 @@ STATICFILES_FINDERS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# 업로드 이미지 반응형 파생본 (common.services.image_derivatives, 워커: build_image_derivatives --loop)
+IMAGE_DERIVATIVE_WIDTHS = tuple(
+    int(width) for width in os.environ.get('IMAGE_DERIVATIVE_WIDTHS', '320,640,1280,1920').split(',') if width.strip()
+)  # srcset 너비 버킷(px)
+IMAGE_DERIVATIVE_QUALITY = int(os.environ.get('IMAGE_DERIVATIVE_QUALITY', '80'))  # WebP·JPEG 품질
+IMAGE_DERIVATIVE_THREADS = int(os.environ.get('IMAGE_DERIVATIVE_THREADS', '1'))  # 저장 후 바로 만드는 프로세스당 스레드 수 (0=워커 명령어만)
+IMAGE_DERIVATIVE_INTERVAL = float(os.environ.get('IMAGE_DERIVATIVE_INTERVAL', '60'))  # --loop 워커 확인 간격(초)
+
+# 권한 검사 후 파일 전송 (common.services.protected_media — 첨부파일 다운로드)
+PROTECTED_MEDIA_BACKEND = os.environ.get('PROTECTED_MEDIA_BACKEND', 'django')  # nginx (X-Accel-Redirect, 운영) | django (워커가 직접 전송, Range 지원) | 클래스 경로
+PROTECTED_MEDIA_INTERNAL_URL = os.environ.get('PROTECTED_MEDIA_INTERNAL_URL', '/protected/')  # nginx internal 위치 (MEDIA_ROOT 를 alias)
+
 # 파일 업로드 제한 설정 (20MB)
 FILE_UPLOAD_MAX_MEMORY_SIZE = 20 * 1024 * 1024  # 20MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 20 * 1024 * 1024  # 20MB
@@ -223,6 +257,22 @@ LOGOUT_REDIRECT_URL = '/'  # 로그아웃 후 이동하는 URL
 
 # Anthropic Claude API 설정
 ANTHROPIC_API_KEY = os.environ.get('ANTHROPIC_API_KEY', '')
+CLAUDE_BACKEND = os.environ.get('CLAUDE_BACKEND', 'anthropic')  # anthropic | fake (오프라인 대역, 테스트·부하 테스트용)
+CLAUDE_TIMEOUT = float(os.environ.get('CLAUDE_TIMEOUT', '120'))  # 요청 타임아웃(초)
+CLAUDE_MAX_RETRIES = int(os.environ.get('CLAUDE_MAX_RETRIES', '3'))  # 429·5xx·529·연결 오류 재시도 횟수
+CLAUDE_RETRY_BASE = float(os.environ.get('CLAUDE_RETRY_BASE', '1.0'))  # 재시도 백오프 기준(초), full jitter
+CLAUDE_MAX_CONCURRENCY = int(os.environ.get('CLAUDE_MAX_CONCURRENCY', '4'))  # 프로세스당 동시에 기다리는 API 요청 수 (배치 생성 등)
+CLAUDE_REQUESTS_PER_MINUTE = int(os.environ.get('CLAUDE_REQUESTS_PER_MINUTE', '0'))  # 프로세스당 분당 요청 수 (0=제한 없음, 조직 RPM 한도에 맞춤)
+CLAUDE_RESPONSE_CACHE = os.environ.get('CLAUDE_RESPONSE_CACHE', 'django')  # django | memory | 클래스 경로 | 빈 값(끔)
+CLAUDE_CACHE_TTL = int(os.environ.get('CLAUDE_CACHE_TTL', '3600'))  # 캐시한 응답 유지 시간(초)
+CLAUDE_CACHE_MAX_ENTRIES = int(os.environ.get('CLAUDE_CACHE_MAX_ENTRIES', '256'))  # memory 캐시 최대 항목 수
+CLAUDE_CACHE_MAX_BYTES = int(os.environ.get('CLAUDE_CACHE_MAX_BYTES', '65536'))  # 이보다 긴 응답은 캐시하지 않음
+
+# AI 답변 초안 스트리밍 (community.services.ai_answer, ASGI)
+AI_ANSWER_MODEL = os.environ.get('AI_ANSWER_MODEL', 'claude-haiku-4-5-20251001')  # 첫 토큰이 빠른 모델
+AI_ANSWER_MAX_TOKENS = int(os.environ.get('AI_ANSWER_MAX_TOKENS', '1024'))  # 답변 최대 출력 토큰
+AI_ANSWER_USER_CONCURRENCY = int(os.environ.get('AI_ANSWER_USER_CONCURRENCY', '1'))  # 사용자당 동시 생성 수
+AI_ANSWER_LOCK_TIMEOUT = int(os.environ.get('AI_ANSWER_LOCK_TIMEOUT', '180'))  # 질문·사용자 잠금 최대 유지(초), 비정상 종료 대비
 
 # AI 로그 지적사항 → 자동 수정 PR 연동 (GitHub)
 #  관리자가 대시보드에서 지적사항을 '승인'하면 Django 가 repository_dispatch 로
@@ -235,6 +285,11 @@ GITHUB_REPO = os.environ.get('GITHUB_REPO', 'inucreativehrd21/TechChang')  # own
 KAKAO_REST_API_KEY = os.environ.get('KAKAO_REST_API_KEY', '')
 KAKAO_CLIENT_SECRET = os.environ.get('KAKAO_CLIENT_SECRET', '')
 
+# 외부 HTTP 호출 (common.services.http_client — 카카오·사전·GitHub·Google 공통 연결 풀/서킷 브레이커)
+HTTP_CLIENT_BREAKER_FAILURES = int(os.environ.get('HTTP_CLIENT_BREAKER_FAILURES', 5))  # 연속 실패 N번이면 차단
+HTTP_CLIENT_BREAKER_RESET = float(os.environ.get('HTTP_CLIENT_BREAKER_RESET', 30))  # 차단 후 시험 요청까지(초)
+HTTP_CLIENT_STUB_URL = os.environ.get('HTTP_CLIENT_STUB_URL', '')  # 오프라인 부하 테스트용 스텁 서버 (운영에서는 비움)
+
 # Google Search Console API (방문자 리포트의 검색 노출/클릭/CTR 지표)
 #  인증은 둘 중 하나 (OAuth 우선):
 #   - GSC_OAUTH_TOKEN     : OAuth 2.0 클라이언트로 1회 발급한 토큰(token.json) 경로
@@ -251,6 +306,22 @@ WORDCHAIN_TIMEOUT = int(os.environ.get('WORDCHAIN_TIMEOUT', 30))  # 기본 30초
 WORDCHAIN_USE_DICTIONARY_API = os.environ.get('WORDCHAIN_USE_DICTIONARY_API', 'True').lower() == 'true'
 KOREAN_DICT_API_KEY = os.environ.get('KOREAN_DICT_API_KEY', '')  # 국립국어원 한국어기초사전 API 키
 
+# 방치 게임 정리 (reap_stale_games 커맨드 / 선택적 주기 작업)
+STALE_GAME_TIMEOUT = int(os.environ.get('STALE_GAME_TIMEOUT', 6 * 60 * 60))  # 마지막 활동 후 6시간
+STALE_GAME_REAPER_INTERVAL = int(os.environ.get('STALE_GAME_REAPER_INTERVAL', 0))  # 0이면 비활성화 (cron 사용)
+MINESWEEPER_POOL_SIZE = int(os.environ.get('MINESWEEPER_POOL_SIZE', 50))  # 난이도별 미리 검증된 보드 수 (fill_minesweeper_pool)
+GAME_ARCHIVE_AFTER_DAYS = int(os.environ.get('GAME_ARCHIVE_AFTER_DAYS', 30))  # 종료 후 30일 지난 게임 기록 보관 (archive_finished_games)
+
+# 서버 모니터 시스템 지표 샘플러 (common.services.system_metrics)
+SYSTEM_METRICS_INTERVAL = int(os.environ.get('SYSTEM_METRICS_INTERVAL', 15))  # 샘플 간격(초), 0이면 비활성화
+SYSTEM_METRICS_CAPACITY = int(os.environ.get('SYSTEM_METRICS_CAPACITY', 240))  # 링 버퍼 크기 (15초 × 240 = 1시간)
+
+# 요청·캐시·게임·Claude 지표 (common.services.metrics, Prometheus 텍스트 형식)
+METRICS_DIR = os.environ.get('METRICS_DIR', '')  # 워커별 mmap 파일 디렉터리 (비우면 logs/metrics)
+TEST_RUNNER = 'common.test_runner.TestRunner'  # 테스트 중 METRICS_DIR 을 임시 디렉터리로
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')  # 스크레이퍼용 Bearer 토큰 (비우면 관리자 OTP 세션만 허용)
+SQL_PROFILER_SAMPLE_RATE = float(os.environ.get('SQL_PROFILER_SAMPLE_RATE', 0))  # SQL 프로파일링 표본 비율 (0이면 끔, 운영 권장 0.01)
+
 # 보안 미들웨어 설정 (환경변수로 조정 가능)
 RATE_LIMIT_REQUESTS = int(os.environ.get('RATE_LIMIT_REQUESTS', 300))  # 시간당 요청 제한
 RATE_LIMIT_WINDOW = int(os.environ.get('RATE_LIMIT_WINDOW', 3600))   # 1시간 윈도우
@@ -272,17 +343,31 @@ TRUSTED_HEALTHCHECK_PATHS = _split_patterns(
     os.environ.get('TRUSTED_HEALTHCHECK_PATHS', '/health,/status')
 )
 
-# 캐시 설정 (메모리 기반 - 간단한 설정)
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-        'TIMEOUT': 300,
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000,
+# 캐시 설정 (hit/miss 지표 수집)
+# shm: /dev/shm 공유 메모리 캐시 — 한 호스트의 모든 gunicorn 워커가 공유 (운영 권장)
+# locmem: 워커(프로세스)별 캐시 — 개발·테스트 기본값
+if os.environ.get('DJANGO_CACHE_BACKEND', 'locmem') == 'shm':
+    CACHES = {
+        'default': {
+            'BACKEND': 'common.cache_backends.InstrumentedSharedMemoryCache',
+            'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', ''),  # 비우면 /dev/shm/techchang-cache
+            'TIMEOUT': 300,
+        }
+    }
+    # 세션: 공유 캐시에서 읽고, 바뀐 세션만 DB 에 모아서 반영 (로그인 키는 즉시)
+    SESSION_ENGINE = 'common.session_backends'
+    SESSION_VOLATILE_PREFIXES = ('viewed_question_', 'visited_')  # DB 에 저장하지 않는 세션 키
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'common.cache_backends.InstrumentedLocMemCache',
+            'LOCATION': 'unique-snowflake',
+            'TIMEOUT': 300,
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000,
+            }
         }
     }
-}
 
 # 로깅 설정 (안전한 버전)
 import os
@@ -387,6 +472,14 @@ SERVER_EMAIL = os.environ.get(
 ADMINS = [
     ('Admin', os.environ.get('DJANGO_ADMIN_EMAIL', DEFAULT_FROM_EMAIL)),
 ]
+
+# 메일 발송 큐 (common.services.mail_queue, 워커: send_queued_mail --loop)
+EMAIL_QUEUE_BATCH_SIZE = int(os.environ.get('EMAIL_QUEUE_BATCH_SIZE', 50))  # SMTP 연결 하나로 보낼 최대 메일 수
+EMAIL_QUEUE_INTERVAL = float(os.environ.get('EMAIL_QUEUE_INTERVAL', 5))  # 워커 확인 간격(초)
+EMAIL_QUEUE_MAX_ATTEMPTS = int(os.environ.get('EMAIL_QUEUE_MAX_ATTEMPTS', 6))  # 넘기면 dead
+EMAIL_QUEUE_BACKOFF = int(os.environ.get('EMAIL_QUEUE_BACKOFF', 30))  # 첫 재시도 대기(초), 실패마다 2배 (최대 1시간)
+EMAIL_QUEUE_KEEP_DAYS = int(os.environ.get('EMAIL_QUEUE_KEEP_DAYS', 14))  # 발송 완료 행 보관 기간
+EMAIL_QUEUE_SEND_SENSITIVE_NOW = os.environ.get('EMAIL_QUEUE_SEND_SENSITIVE_NOW', 'true').lower() == 'true'  # 인증 코드·임시 비밀번호·OTP 는 커밋 직후 바로 발송
 MANAGERS = ADMINS
 
 # 추가 보안 설정
@@ -64,8 +64,10 @@ limit_request_field_size = 8192
 enable_stdio_inheritance = True
 
 def on_starting(server):
-    """서버 시작시 실행"""
+    """서버 시작시 실행 - 이전 실행의 지표 파일 정리"""
     server.log.info("Django mysite 서버가 시작됩니다...")
+    from common.services.metrics import reset_directory
+    reset_directory()
 
 def on_reload(server):
     """리로드시 실행"""
@@ -73,4 +75,19 @@ def on_reload(server):
 
 def worker_int(worker):
     """워커 인터럽트시 실행"""
-    worker.log.info("워커가 중단됩니다: %s", worker.pid)
\ No newline at end of file
+    worker.log.info("워커가 중단됩니다: %s", worker.pid)
+
+def post_fork(server, worker):
+    """워커 포크 직후 실행 - 방치 게임 주기 정리·시스템 지표 샘플러 (각각 파일 잠금을 잡은 한 워커만)"""
+    # preload_app 마스터에서 열린 DB 연결을 워커가 물려받아 공유하지 않도록 닫는다 (CONN_MAX_AGE 재사용 연결)
+    from django.db import connections
+    connections.close_all()
+    from community.services.game_reaper import start_periodic_reaper
+    from common.services.system_metrics import start_sampler
+    start_periodic_reaper()
+    start_sampler()
+
+def child_exit(server, worker):
+    """워커 종료시 실행 - 종료된 워커의 카운터 지표를 보관 파일로 합치고 게이지 파일 삭제"""
+    from common.services.metrics import mark_process_dead
+    mark_process_dead(worker.pid)